@@ -0,0 +1,68 @@
+"""add_system_error_fingerprint
+
+Revision ID: a7c4e2f9b1d3
+Revises: f6b3d9a2c4e7
+Create Date: 2026-10-19 14:00:00.000000
+
+Adds system_errors.fingerprint = md5(component || E'\\n' || error_message)
+with a partial unique index over unresolved rows, so ErrorTracker can flush
+aggregated occurrences with INSERT ... ON CONFLICT. Existing unresolved
+duplicates are merged into their most recent row first.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c4e2f9b1d3'
+down_revision: Union[str, Sequence[str], None] = 'f6b3d9a2c4e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'system_errors',
+        sa.Column('fingerprint', sa.String(length=32), nullable=True, comment='md5(component + 换行 + error_message)'),
+    )
+    op.execute("UPDATE system_errors SET fingerprint = md5(component || E'\\n' || error_message)")
+
+    # 合并未解决的重复错误：计数累加到最近一条，其余标记为已解决
+    op.execute(
+        """
+        WITH ranked AS (
+            SELECT id, fingerprint,
+                   row_number() OVER (PARTITION BY fingerprint ORDER BY last_occurred_at DESC, id DESC) AS rn,
+                   sum(occurrence_count) OVER (PARTITION BY fingerprint) AS total,
+                   min(first_occurred_at) OVER (PARTITION BY fingerprint) AS first_at
+            FROM system_errors
+            WHERE is_resolved = false
+        )
+        UPDATE system_errors AS e
+        SET occurrence_count = CASE WHEN r.rn = 1 THEN r.total ELSE e.occurrence_count END,
+            first_occurred_at = CASE WHEN r.rn = 1 THEN r.first_at ELSE e.first_occurred_at END,
+            is_resolved = (r.rn <> 1),
+            resolved_at = CASE WHEN r.rn = 1 THEN e.resolved_at ELSE now() END,
+            resolution_note = CASE WHEN r.rn = 1 THEN e.resolution_note ELSE 'merged duplicate' END
+        FROM ranked AS r
+        WHERE e.id = r.id
+        """
+    )
+
+    op.alter_column('system_errors', 'fingerprint', nullable=False)
+    op.create_index(
+        'uq_system_errors_open_fingerprint',
+        'system_errors',
+        ['fingerprint'],
+        unique=True,
+        postgresql_where=sa.text('is_resolved = false'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_system_errors_open_fingerprint', table_name='system_errors')
+    op.drop_column('system_errors', 'fingerprint')
@@ -0,0 +1,60 @@
+"""add_llm_usage_rollups
+
+Revision ID: b3e8d1c6f2a4
+Revises: a7c4e2f9b1d3
+Create Date: 2026-10-19 15:00:00.000000
+
+Adds llm_usage_rollups: per-(agent, provider, model) LLM call counts, tokens,
+cost and latency percentiles, written by LLMTelemetry every rollup interval.
+Daily spend for DAILY_COST_ALERT_THRESHOLD is summed from this table.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e8d1c6f2a4'
+down_revision: Union[str, Sequence[str], None] = 'a7c4e2f9b1d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'llm_usage_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('bucket_end', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('agent_name', sa.String(length=100), nullable=False),
+        sa.Column('provider', sa.String(length=50), nullable=False),
+        sa.Column('model', sa.String(length=200), nullable=False),
+        sa.Column('calls', sa.Integer(), nullable=False),
+        sa.Column('errors', sa.Integer(), nullable=False),
+        sa.Column('prompt_tokens', sa.Integer(), nullable=False),
+        sa.Column('completion_tokens', sa.Integer(), nullable=False),
+        sa.Column('cache_read_tokens', sa.Integer(), nullable=False),
+        sa.Column('cost_usd', sa.Float(), nullable=False),
+        sa.Column('latency_p50_ms', sa.Float(), nullable=True),
+        sa.Column('latency_p95_ms', sa.Float(), nullable=True),
+        sa.Column('latency_p99_ms', sa.Float(), nullable=True),
+        sa.Column('ttfb_p95_ms', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_llm_usage_rollups_id'), 'llm_usage_rollups', ['id'], unique=False)
+    op.create_index('ix_llm_usage_rollups_bucket_start', 'llm_usage_rollups', ['bucket_start'], unique=False)
+    # 按 agent 查询历史
+    op.create_index(
+        'ix_llm_usage_rollups_agent_bucket', 'llm_usage_rollups', ['agent_name', 'bucket_start'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_llm_usage_rollups_agent_bucket', table_name='llm_usage_rollups')
+    op.drop_index('ix_llm_usage_rollups_bucket_start', table_name='llm_usage_rollups')
+    op.drop_index(op.f('ix_llm_usage_rollups_id'), table_name='llm_usage_rollups')
+    op.drop_table('llm_usage_rollups')
@@ -0,0 +1,37 @@
+"""add_equity_curve_stats_to_portfolio
+
+Revision ID: b7e1c4d92a10
+Revises: 71975ee8943c
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e1c4d92a10'
+down_revision: Union[str, Sequence[str], None] = '71975ee8943c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Streaming equity-curve state for incremental max_drawdown / sharpe_ratio
+    op.add_column('portfolios', sa.Column('equity_peak_value', sa.NUMERIC(20, 8), nullable=True, comment='历史最高总价值'))
+    op.add_column('portfolios', sa.Column('equity_last_value', sa.NUMERIC(20, 8), nullable=True, comment='上一个快照的总价值'))
+    op.add_column('portfolios', sa.Column('returns_count', sa.Integer(), server_default='0', nullable=False, comment='已统计的周期收益数量'))
+    op.add_column('portfolios', sa.Column('returns_mean', sa.Float(), server_default='0', nullable=False, comment='周期收益率均值 (Welford)'))
+    op.add_column('portfolios', sa.Column('returns_m2', sa.Float(), server_default='0', nullable=False, comment='周期收益率离差平方和 (Welford)'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('portfolios', 'returns_m2')
+    op.drop_column('portfolios', 'returns_mean')
+    op.drop_column('portfolios', 'returns_count')
+    op.drop_column('portfolios', 'equity_last_value')
+    op.drop_column('portfolios', 'equity_peak_value')
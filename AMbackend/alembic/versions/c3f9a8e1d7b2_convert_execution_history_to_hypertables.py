@@ -0,0 +1,116 @@
+"""convert_execution_history_to_hypertables
+
+Revision ID: c3f9a8e1d7b2
+Revises: b7e1c4d92a10
+Create Date: 2026-10-19 10:00:00.000000
+
+Converts strategy_executions / agent_executions / portfolio_snapshots into
+TimescaleDB hypertables partitioned on their time columns, enables native
+compression and (optionally) retention policies.
+
+Hypertables require every unique constraint to include the partitioning
+column, so the primary keys become (id, <time column>). The foreign keys
+that referenced strategy_executions.id alone (agent_executions and trades)
+are dropped at the database level; the ORM relationships keep working.
+
+Skipped entirely when the timescaledb extension is not available.
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f9a8e1d7b2'
+down_revision: Union[str, Sequence[str], None] = 'b7e1c4d92a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, time column, compress segmentby, retention days)
+HYPERTABLES = [
+    ('strategy_executions', 'execution_time', 'portfolio_id', settings.STRATEGY_EXECUTION_RETENTION_DAYS),
+    ('agent_executions', 'executed_at', 'agent_name', settings.AGENT_EXECUTION_RETENTION_DAYS),
+    ('portfolio_snapshots', 'snapshot_time', 'portfolio_id', settings.PORTFOLIO_SNAPSHOT_RETENTION_DAYS),
+]
+
+# Foreign keys that point at strategy_executions.id
+REFERENCING_FKS = [
+    ('agent_executions', 'agent_executions_strategy_execution_id_fkey'),
+    ('trades', 'trades_execution_id_fkey'),
+]
+
+
+def _timescaledb_available() -> bool:
+    bind = op.get_bind()
+    return bool(bind.execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'timescaledb'")
+    ).scalar())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _timescaledb_available():
+        logger.warning("timescaledb extension not available, skipping hypertable conversion")
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS timescaledb")
+
+    for table, fk_name in REFERENCING_FKS:
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {fk_name}")
+
+    chunk_days = settings.TIMESCALE_CHUNK_INTERVAL_DAYS
+    compress_days = settings.TIMESCALE_COMPRESS_AFTER_DAYS
+
+    for table, time_column, segment_by, retention_days in HYPERTABLES:
+        # Primary key must include the partitioning column
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {table}_pkey")
+        op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, {time_column})")
+
+        op.execute(
+            f"SELECT create_hypertable('{table}', '{time_column}', "
+            f"chunk_time_interval => INTERVAL '{chunk_days} days', "
+            f"migrate_data => true, create_default_indexes => false, if_not_exists => true)"
+        )
+
+        op.execute(
+            f"ALTER TABLE {table} SET ("
+            f"timescaledb.compress, "
+            f"timescaledb.compress_segmentby = '{segment_by}', "
+            f"timescaledb.compress_orderby = '{time_column} DESC')"
+        )
+        op.execute(
+            f"SELECT add_compression_policy('{table}', INTERVAL '{compress_days} days', "
+            f"if_not_exists => true)"
+        )
+
+        if retention_days > 0:
+            op.execute(
+                f"SELECT add_retention_policy('{table}', INTERVAL '{retention_days} days', "
+                f"if_not_exists => true)"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    TimescaleDB cannot turn a hypertable back into a plain table in place;
+    this removes the policies and decompresses all chunks. Restoring plain
+    tables (and the dropped foreign keys) requires a dump and reload.
+    """
+    if not _timescaledb_available():
+        return
+
+    for table, _, _, _ in HYPERTABLES:
+        op.execute(f"SELECT remove_retention_policy('{table}', if_exists => true)")
+        op.execute(f"SELECT remove_compression_policy('{table}', if_exists => true)")
+        op.execute(
+            f"SELECT decompress_chunk(c, if_compressed => true) FROM show_chunks('{table}') c"
+        )
+        op.execute(f"ALTER TABLE {table} SET (timescaledb.compress = false)")
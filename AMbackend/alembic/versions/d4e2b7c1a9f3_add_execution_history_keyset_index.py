@@ -0,0 +1,43 @@
+"""add_execution_history_keyset_index
+
+Revision ID: d4e2b7c1a9f3
+Revises: c3f9a8e1d7b2
+Create Date: 2026-10-19 11:00:00.000000
+
+Replaces idx_executions_portfolio_time with (portfolio_id, execution_time, id)
+so the execution history cursor (execution_time, id) is served by a single
+index range scan.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e2b7c1a9f3'
+down_revision: Union[str, Sequence[str], None] = 'c3f9a8e1d7b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'idx_executions_portfolio_time_id',
+        'strategy_executions',
+        ['portfolio_id', 'execution_time', 'id'],
+        unique=False,
+    )
+    op.drop_index('idx_executions_portfolio_time', table_name='strategy_executions')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        'idx_executions_portfolio_time',
+        'strategy_executions',
+        ['portfolio_id', 'execution_time'],
+        unique=False,
+    )
+    op.drop_index('idx_executions_portfolio_time_id', table_name='strategy_executions')
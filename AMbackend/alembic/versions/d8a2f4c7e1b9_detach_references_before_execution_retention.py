@@ -0,0 +1,101 @@
+"""detach_references_before_execution_retention
+
+Revision ID: d8a2f4c7e1b9
+Revises: b3e8d1c6f2a4
+Create Date: 2026-10-20 09:00:00.000000
+
+c3f9a8e1d7b2 dropped the foreign keys from trades.execution_id and
+agent_executions.strategy_execution_id to strategy_executions.id. A plain
+retention policy then drops old execution chunks and leaves those columns
+pointing at deleted rows.
+
+Replaces the strategy_executions retention policy with a TimescaleDB job
+running prune_strategy_executions(): for every chunk about to be dropped it
+sets the referencing trades / agent_executions columns to NULL (the trades
+themselves are kept), then drops the chunks.
+
+Skipped entirely when the timescaledb extension is not available.
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8a2f4c7e1b9'
+down_revision: Union[str, Sequence[str], None] = 'b3e8d1c6f2a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PRUNE_PROCEDURE = """
+CREATE OR REPLACE PROCEDURE prune_strategy_executions(job_id INT, config JSONB)
+LANGUAGE plpgsql AS $$
+DECLARE
+    retention INTERVAL := make_interval(days => (config->>'retention_days')::INT);
+    chunk REGCLASS;
+BEGIN
+    FOR chunk IN SELECT show_chunks('strategy_executions', older_than => retention) LOOP
+        EXECUTE format(
+            'UPDATE trades SET execution_id = NULL WHERE execution_id IN (SELECT id FROM %s)',
+            chunk
+        );
+        EXECUTE format(
+            'UPDATE agent_executions SET strategy_execution_id = NULL '
+            'WHERE strategy_execution_id IN (SELECT id FROM %s)',
+            chunk
+        );
+    END LOOP;
+    PERFORM drop_chunks('strategy_executions', older_than => retention);
+END
+$$
+"""
+
+
+def _timescaledb_installed() -> bool:
+    bind = op.get_bind()
+    return bool(bind.execute(
+        sa.text("SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'")
+    ).scalar())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _timescaledb_installed():
+        logger.warning("timescaledb extension not installed, skipping execution retention job")
+        return
+
+    op.execute(PRUNE_PROCEDURE)
+    op.execute("SELECT remove_retention_policy('strategy_executions', if_exists => true)")
+
+    retention_days = settings.STRATEGY_EXECUTION_RETENTION_DAYS
+    if retention_days > 0:
+        op.execute(
+            "SELECT add_job('prune_strategy_executions', INTERVAL '1 day', "
+            f"config => '{{\"retention_days\": {retention_days}}}')"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not _timescaledb_installed():
+        return
+
+    op.execute(
+        "SELECT delete_job(job_id) FROM timescaledb_information.jobs "
+        "WHERE proc_name = 'prune_strategy_executions'"
+    )
+    op.execute("DROP PROCEDURE IF EXISTS prune_strategy_executions(INT, JSONB)")
+
+    retention_days = settings.STRATEGY_EXECUTION_RETENTION_DAYS
+    if retention_days > 0:
+        op.execute(
+            f"SELECT add_retention_policy('strategy_executions', INTERVAL '{retention_days} days', "
+            f"if_not_exists => true)"
+        )
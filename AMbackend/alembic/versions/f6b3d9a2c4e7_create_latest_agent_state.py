@@ -0,0 +1,78 @@
+"""create_latest_agent_state
+
+Revision ID: f6b3d9a2c4e7
+Revises: d4e2b7c1a9f3
+Create Date: 2026-10-19 13:00:00.000000
+
+One row per agent holding its latest successful execution. Maintained by
+AgentExecutionRecorder on every successful record; backfilled here from
+agent_executions with a single DISTINCT ON query.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6b3d9a2c4e7'
+down_revision: Union[str, Sequence[str], None] = 'd4e2b7c1a9f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'latest_agent_state',
+        sa.Column('agent_name', sa.String(length=50), nullable=False, comment='Agent名称'),
+        sa.Column('execution_id', sa.UUID(), nullable=False, comment='对应的 agent_executions.id'),
+        sa.Column('agent_display_name', sa.String(length=100), nullable=True),
+        sa.Column('executed_at', postgresql.TIMESTAMP(), nullable=False),
+        sa.Column('execution_duration_ms', sa.Integer(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('signal', sa.String(length=20), nullable=False),
+        sa.Column('confidence', postgresql.NUMERIC(precision=3, scale=2), nullable=False),
+        sa.Column('score', postgresql.NUMERIC(precision=5, scale=2), nullable=False),
+        sa.Column('reasoning', sa.Text(), nullable=True, comment='reasoning 预览（截断）'),
+        sa.Column('agent_specific_data', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('market_macro', postgresql.JSONB(astext_type=sa.Text()), nullable=True, comment='market_data_snapshot 中的 macro 部分'),
+        sa.Column('llm_provider', sa.String(length=50), nullable=True),
+        sa.Column('llm_model', sa.String(length=100), nullable=True),
+        sa.Column('tokens_used', sa.Integer(), nullable=True),
+        sa.Column('llm_cost', postgresql.NUMERIC(precision=10, scale=6), nullable=True),
+        sa.Column('caller_type', sa.String(length=50), nullable=True),
+        sa.Column('caller_id', sa.UUID(), nullable=True),
+        sa.Column('strategy_execution_id', sa.UUID(), nullable=True),
+        sa.Column('template_execution_batch_id', sa.UUID(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('updated_at', postgresql.TIMESTAMP(), nullable=False),
+        sa.PrimaryKeyConstraint('agent_name'),
+    )
+
+    op.execute(
+        """
+        INSERT INTO latest_agent_state (
+            agent_name, execution_id, agent_display_name, executed_at,
+            execution_duration_ms, status, signal, confidence, score, reasoning,
+            agent_specific_data, market_macro, llm_provider, llm_model,
+            tokens_used, llm_cost, caller_type, caller_id,
+            strategy_execution_id, template_execution_batch_id, user_id, updated_at
+        )
+        SELECT DISTINCT ON (agent_name)
+            agent_name, id, agent_display_name, executed_at,
+            execution_duration_ms, status, signal, confidence, score, left(reasoning, 200),
+            agent_specific_data, market_data_snapshot -> 'macro', llm_provider, llm_model,
+            tokens_used, llm_cost, caller_type, caller_id,
+            strategy_execution_id, template_execution_batch_id, user_id, now()
+        FROM agent_executions
+        WHERE status = 'success'
+        ORDER BY agent_name, executed_at DESC
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('latest_agent_state')
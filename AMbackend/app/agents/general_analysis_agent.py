@@ -1,11 +1,14 @@
 """GeneralAnalysisAgent - Research Result Synthesis and Final Answer Generation"""
 
 import json
-from typing import List, Dict, Any
+from contextlib import aclosing
+from typing import List, Dict, Any, AsyncIterator, Tuple
 
 from app.services.llm.manager import llm_manager
+from app.services.llm.structured_output import output_tool
 from app.schemas.llm import Message
 from app.utils.json_parser import parse_llm_json, JSONParseError
+from app.utils.json_stream import JsonFieldStreamer
 from app.schemas.research import GeneralAnalysisOutput
 from app.schemas.agents import AgentOutput
 
@@ -182,6 +185,14 @@ Be thorough, insightful, and actionable. Your synthesis is the final output user
 ⚠️ REMINDER: Respond with ONLY the JSON object. Start with {{ and end with }}. No other text.
 """
 
+    OUTPUT_FIELDS = ["answer", "summary", "key_insights", "confidence", "sources"]
+    OUTPUT_TOOL = output_tool(
+        "submit_synthesis",
+        GeneralAnalysisOutput,
+        OUTPUT_FIELDS,
+        "Submit the synthesized answer",
+    )
+
     def __init__(self):
         """Initialize GeneralAnalysisAgent"""
         self.agent_name = "general_analysis_agent"
@@ -203,24 +214,68 @@ Be thorough, insightful, and actionable. Your synthesis is the final output user
         Returns:
             GeneralAnalysisOutput with synthesized answer
         """
-        # Build synthesis prompt
-        prompt = self._build_synthesis_prompt(
-            user_message, agent_outputs, chat_history or []
+        messages = self._build_messages(user_message, agent_outputs, chat_history)
+
+        # Call LLM (Claude Sonnet 4.5 Thinking)
+        response = await llm_manager.chat_for_agent(
+            agent_name=self.agent_name,
+            messages=messages,
+            structured_output=self.OUTPUT_TOOL,
         )
 
-        # Prepend system prompt for Claude Thinking
-        full_prompt = f"{self.SYSTEM_PROMPT}\n\n{prompt}"
+        # Parse response
+        return self._to_output(self._parse_llm_response(response.content))
 
-        # Call LLM (Claude Sonnet 4.5 Thinking)
-        messages = [Message(role="user", content=full_prompt)]
+    async def synthesize_stream(
+        self,
+        user_message: str,
+        agent_outputs: Dict[str, AgentOutput],
+        chat_history: List[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streaming variant of ``synthesize``
 
-        response = await llm_manager.chat_for_agent(
+        The "answer" field is decoded from the JSON while the model is still
+        generating it, so the user sees text long before the full response
+        (summary, insights, confidence) is complete.
+
+        Yields:
+            ("answer_delta", str) for each new piece of answer text, then
+            ("result", GeneralAnalysisOutput) once the response is parsed
+        """
+        messages = self._build_messages(user_message, agent_outputs, chat_history)
+
+        streamer = JsonFieldStreamer("answer")
+        chunks: List[str] = []
+        async with aclosing(llm_manager.chat_stream_for_agent(
             agent_name=self.agent_name, messages=messages
+        )) as stream:
+            async for chunk in stream:
+                chunks.append(chunk)
+                delta = streamer.feed(chunk)
+                if delta:
+                    yield "answer_delta", delta
+
+        yield "result", self._to_output(self._parse_llm_response("".join(chunks)))
+
+    def _build_messages(
+        self,
+        user_message: str,
+        agent_outputs: Dict[str, AgentOutput],
+        chat_history: List[Dict[str, Any]] = None,
+    ) -> List[Message]:
+        """Build the synthesis request messages"""
+        prompt = self._build_synthesis_prompt(
+            user_message, agent_outputs, chat_history or []
         )
 
-        # Parse response
-        output = self._parse_llm_response(response.content)
+        return [
+            Message(role="system", content=self.SYSTEM_PROMPT, cache_control=True),
+            Message(role="user", content=prompt),
+        ]
 
+    @staticmethod
+    def _to_output(output: Dict[str, Any]) -> GeneralAnalysisOutput:
         return GeneralAnalysisOutput(
             answer=output["answer"],
             summary=output["summary"],
@@ -300,31 +355,11 @@ Return ONLY the JSON output, no other text.
             Parsed synthesis dictionary
         """
         try:
-            # Try to extract JSON from response
-            if "```json" in content:
-                json_start = content.find("```json") + 7
-                json_end = content.find("```", json_start)
-                json_str = content[json_start:json_end].strip()
-            elif "```" in content:
-                json_start = content.find("```") + 3
-                json_end = content.find("```", json_start)
-                json_str = content[json_start:json_end].strip()
-            else:
-                json_str = content.strip()
-
-            # Parse JSON
-            output = parse_llm_json(content)
-
-            # Validate required fields
-            required_fields = ["answer", "summary", "key_insights", "confidence", "sources"]
-            for field in required_fields:
-                if field not in output:
-                    raise ValueError(f"Missing required field: {field}")
-
-            # Validate confidence range
-            confidence = float(output["confidence"])
-            if not 0.0 <= confidence <= 1.0:
-                raise ValueError(f"Confidence must be between 0 and 1: {confidence}")
+            output = parse_llm_json(
+                content,
+                expected_fields=self.OUTPUT_FIELDS,
+                schema=GeneralAnalysisOutput,
+            )
 
             return output
 
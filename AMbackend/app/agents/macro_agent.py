@@ -3,8 +3,9 @@
 from typing import Dict, Any
 
 from app.services.llm.manager import llm_manager
+from app.services.llm.structured_output import output_tool
 from app.schemas.llm import Message
-from app.utils.json_parser import parse_llm_json, JSONParseError
+from app.utils.json_parser import json_validator, parse_llm_json, JSONParseError
 from app.schemas.agents import (
     MacroAnalysisOutput,
     SignalType,
@@ -112,6 +113,22 @@ Your confidence should reflect:
 ⚠️ FINAL REMINDER: Respond with ONLY the JSON object. NO MARKDOWN formatting in string values. Start with { and end with }.
 """
 
+    OUTPUT_FIELDS = [
+        "signal",
+        "confidence",
+        "score",
+        "reasoning",
+        "macro_indicators",
+        "key_factors",
+        "risk_assessment",
+    ]
+    OUTPUT_TOOL = output_tool(
+        "submit_macro_analysis",
+        MacroAnalysisOutput,
+        OUTPUT_FIELDS,
+        "Submit the macroeconomic analysis of Bitcoin",
+    )
+
     def __init__(self):
         """Initialize MacroAgent"""
         self.agent_name = "macro_agent"
@@ -133,14 +150,17 @@ Your confidence should reflect:
         # Build analysis prompt
         analysis_prompt = self._build_analysis_prompt(market_data)
 
-        # Prepend system prompt to user message for Claude thinking models
-        full_prompt = f"{self.SYSTEM_PROMPT}\n\n{analysis_prompt}"
+        messages = [
+            Message(role="system", content=self.SYSTEM_PROMPT, cache_control=True),
+            Message(role="user", content=analysis_prompt),
+        ]
 
         # Call LLM
-        messages = [Message(role="user", content=full_prompt)]
-
         response = await llm_manager.chat_for_agent(
-            agent_name=self.agent_name, messages=messages
+            agent_name=self.agent_name,
+            messages=messages,
+            structured_output=self.OUTPUT_TOOL,
+            validate=json_validator(self.OUTPUT_FIELDS, MacroAnalysisOutput),
         )
 
         # Parse LLM response
@@ -160,7 +180,7 @@ Your confidence should reflect:
             key_factors=analysis["key_factors"],
             risk_assessment=analysis["risk_assessment"],
             # Add full conversation for UI display
-            prompt_sent=full_prompt,
+            prompt_sent="\n\n".join(msg.content for msg in messages),
             llm_response=response.content,
         )
 
@@ -213,50 +233,11 @@ Return your analysis in the specified JSON format."""
             Parsed analysis dictionary
         """
         try:
-            # Try to extract JSON from response
-            # LLM might wrap JSON in markdown code blocks
-            if "```json" in content:
-                json_start = content.find("```json") + 7
-                json_end = content.find("```", json_start)
-                json_str = content[json_start:json_end].strip()
-            elif "```" in content:
-                json_start = content.find("```") + 3
-                json_end = content.find("```", json_start)
-                json_str = content[json_start:json_end].strip()
-            else:
-                # Assume entire response is JSON
-                json_str = content.strip()
-
-            # Parse JSON
-            analysis = parse_llm_json(content)
-
-            # Validate required fields
-            required_fields = [
-                "signal",
-                "confidence",
-                "score",
-                "reasoning",
-                "macro_indicators",
-                "key_factors",
-                "risk_assessment",
-            ]
-            for field in required_fields:
-                if field not in analysis:
-                    raise ValueError(f"Missing required field: {field}")
-
-            # Validate signal type
-            if analysis["signal"] not in ["BULLISH", "BEARISH", "NEUTRAL"]:
-                raise ValueError(f"Invalid signal type: {analysis['signal']}")
-
-            # Validate confidence range
-            confidence = float(analysis["confidence"])
-            if not 0.0 <= confidence <= 1.0:
-                raise ValueError(f"Confidence must be between 0 and 1: {confidence}")
-
-            # Validate score range
-            score = float(analysis["score"])
-            if not -100.0 <= score <= 100.0:
-                raise ValueError(f"Score must be between -100 and 100: {score}")
+            analysis = parse_llm_json(
+                content,
+                expected_fields=self.OUTPUT_FIELDS,
+                schema=MacroAnalysisOutput,
+            )
 
             return analysis
 
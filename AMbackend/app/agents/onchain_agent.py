@@ -3,8 +3,9 @@
 from typing import Dict, Any
 from app.schemas.agents import OnChainAnalysisOutput, SignalType, AgentOutput
 from app.services.llm.manager import llm_manager
+from app.services.llm.structured_output import output_tool
 from app.schemas.llm import Message
-from app.utils.json_parser import parse_llm_json, JSONParseError
+from app.utils.json_parser import json_validator, parse_llm_json, JSONParseError
 
 
 class OnChainAgent:
@@ -110,6 +111,22 @@ Your confidence should reflect:
 ⚠️ FINAL REMINDER: Respond with ONLY the JSON object. NO MARKDOWN formatting in string values. Start with { and end with }.
 """
 
+    OUTPUT_FIELDS = [
+        "signal",
+        "confidence",
+        "score",
+        "reasoning",
+        "onchain_metrics",
+        "network_health",
+        "key_observations",
+    ]
+    OUTPUT_TOOL = output_tool(
+        "submit_onchain_analysis",
+        OnChainAnalysisOutput,
+        OUTPUT_FIELDS,
+        "Submit the on-chain analysis of Bitcoin",
+    )
+
     def __init__(self):
         self.name = "onchain_agent"
         self.agent_name = "onchain_agent"
@@ -129,14 +146,17 @@ Your confidence should reflect:
         # Build analysis prompt
         analysis_prompt = self._build_analysis_prompt(user_query, market_data)
 
-        # Prepend system prompt to user message
-        full_prompt = f"{self.SYSTEM_PROMPT}\n\n{analysis_prompt}"
+        messages = [
+            Message(role="system", content=self.SYSTEM_PROMPT, cache_control=True),
+            Message(role="user", content=analysis_prompt),
+        ]
 
         # Get LLM response
-        messages = [Message(role="user", content=full_prompt)]
         llm_response = await llm_manager.chat_for_agent(
             agent_name=self.agent_name,
             messages=messages,
+            structured_output=self.OUTPUT_TOOL,
+            validate=json_validator(self.OUTPUT_FIELDS, OnChainAnalysisOutput),
         )
 
         # Parse LLM response
@@ -156,7 +176,7 @@ Your confidence should reflect:
             network_health=analysis["network_health"],
             key_observations=analysis["key_observations"],
             # Add full conversation for UI display
-            prompt_sent=full_prompt,
+            prompt_sent="\n\n".join(msg.content for msg in messages),
             llm_response=llm_response.content,
         )
 
@@ -239,58 +259,17 @@ Return your analysis in the specified JSON format."""
             Parsed analysis dictionary
         """
         try:
-            # Try to extract JSON from response
-            if "```json" in content:
-                json_start = content.find("```json") + 7
-                json_end = content.find("```", json_start)
-                json_str = content[json_start:json_end].strip()
-            elif "```" in content:
-                json_start = content.find("```") + 3
-                json_end = content.find("```", json_start)
-                json_str = content[json_start:json_end].strip()
-            else:
-                # Assume entire response is JSON
-                json_str = content.strip()
-
-            # Parse JSON
-            analysis = parse_llm_json(content)
-
-            # Validate required fields
-            required_fields = [
-                "signal",
-                "confidence",
-                "score",
-                "reasoning",
-                "onchain_metrics",
-                "network_health",
-                "key_observations",
-            ]
-            for field in required_fields:
-                if field not in analysis:
-                    raise ValueError(f"Missing required field: {field}")
-
-            # Validate signal type
-            if analysis["signal"] not in ["BULLISH", "BEARISH", "NEUTRAL"]:
-                raise ValueError(f"Invalid signal type: {analysis['signal']}")
-
-            # Validate confidence range
-            confidence = float(analysis["confidence"])
-            if not 0.0 <= confidence <= 1.0:
-                raise ValueError(f"Confidence must be between 0 and 1: {confidence}")
-
-            # Validate score range
-            score = float(analysis["score"])
-            if not -100.0 <= score <= 100.0:
-                raise ValueError(f"Score must be between -100 and 100: {score}")
+            analysis = parse_llm_json(
+                content,
+                expected_fields=self.OUTPUT_FIELDS,
+                schema=OnChainAnalysisOutput,
+            )
 
             # Validate network_health
+            analysis["network_health"] = str(analysis["network_health"]).strip().upper()
             if analysis["network_health"] not in ["HEALTHY", "MODERATE", "CONGESTED"]:
                 raise ValueError(f"Invalid network_health: {analysis['network_health']}")
 
-            # Validate key_observations is a list
-            if not isinstance(analysis["key_observations"], list):
-                raise ValueError("key_observations must be a list")
-
             return analysis
 
         except (JSONParseError, ValueError) as e:
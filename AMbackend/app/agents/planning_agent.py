@@ -3,6 +3,7 @@
 from typing import List, Dict, Any
 
 from app.services.llm.manager import llm_manager
+from app.services.llm.structured_output import output_tool
 from app.schemas.llm import Message
 from app.schemas.research import (
     PlanningAgentOutput,
@@ -136,6 +137,14 @@ Example JSON format (replace with your actual analysis):
 ⚠️ FINAL REMINDER: Respond with ONLY the JSON object. NO MARKDOWN formatting in string values. Start with {{{{ and end with }}}}.
 """
 
+    OUTPUT_FIELDS = ["task_breakdown", "execution_strategy", "reasoning"]
+    OUTPUT_TOOL = output_tool(
+        "submit_research_plan",
+        PlanningAgentOutput,
+        OUTPUT_FIELDS,
+        "Submit the research plan",
+    )
+
     def __init__(self):
         """Initialize PlanningAgent"""
         self.agent_name = "planning_agent"
@@ -162,14 +171,16 @@ Example JSON format (replace with your actual analysis):
         # Build planning prompt
         prompt = self._build_planning_prompt(user_message, chat_history or [])
 
-        # Prepend system prompt for Claude Thinking
-        full_prompt = f"{system_prompt}\n\n{prompt}"
+        messages = [
+            Message(role="system", content=system_prompt, cache_control=True),
+            Message(role="user", content=prompt),
+        ]
 
         # Call LLM (Claude Sonnet 4.5 Thinking)
-        messages = [Message(role="user", content=full_prompt)]
-
         response = await llm_manager.chat_for_agent(
-            agent_name=self.agent_name, messages=messages
+            agent_name=self.agent_name,
+            messages=messages,
+            structured_output=self.OUTPUT_TOOL,
         )
 
         # Parse response
@@ -228,25 +239,13 @@ Consider:
         """
         try:
             # Use robust JSON parser
+            # Schema enforces task_breakdown/execution_strategy structure
             output = parse_llm_json(
                 content,
-                expected_fields=["task_breakdown", "execution_strategy", "reasoning"]
+                expected_fields=self.OUTPUT_FIELDS,
+                schema=PlanningAgentOutput,
             )
 
-            # Validate task_breakdown structure
-            task_breakdown = output["task_breakdown"]
-            if "analysis_phase" not in task_breakdown:
-                raise ValueError("Missing analysis_phase in task_breakdown")
-            if "decision_phase" not in task_breakdown:
-                raise ValueError("Missing decision_phase in task_breakdown")
-
-            # Validate execution_strategy structure
-            exec_strategy = output["execution_strategy"]
-            required_exec_fields = ["parallel_agents", "sequential_after", "estimated_time"]
-            for field in required_exec_fields:
-                if field not in exec_strategy:
-                    raise ValueError(f"Missing {field} in execution_strategy")
-
             return output
 
         except (JSONParseError, ValueError) as e:
@@ -8,8 +8,11 @@ from typing import Dict, Any
 import logging
 
 from app.services.llm.manager import llm_manager
+from app.core.config import settings
 from app.schemas.llm import Message
-from app.utils.json_parser import parse_llm_json
+from app.schemas.agents import RegimeFilterOutput
+from app.services.llm.prompt_encoder import PromptEncoder, encode_table
+from app.utils.json_parser import json_validator, parse_llm_json
 
 logger = logging.getLogger(__name__)
 
@@ -144,12 +147,15 @@ class RegimeFilterAgent:
             )
             
             # Step 4: 调用LLM (可选增强)
-            full_prompt = f"{self.SYSTEM_PROMPT}\n\n{analysis_prompt}"
-            messages = [Message(role="user", content=full_prompt)]
+            messages = [
+                Message(role="system", content=self.SYSTEM_PROMPT, cache_control=True),
+                Message(role="user", content=analysis_prompt),
+            ]
             
             response = await llm_manager.chat_for_agent(
                 agent_name=self.agent_name,
-                messages=messages
+                messages=messages,
+                validate=json_validator(["regime_score"], RegimeFilterOutput),
             )
             
             # Step 5: 解析LLM响应
@@ -310,26 +316,26 @@ class RegimeFilterAgent:
         sentiment = market_data.get("sentiment", {})
         btc = market_data.get("assets", {}).get("BTC", {})
         
+        # score: 标准化分数(-1到+1, 正值看多/负值看空); value: 实际值
+        rows = [
+            {"dimension": "宏观", "indicator": "dxy", "score": normalized_scores.get("dxy"), "value": macro.get("dxy")},
+            {"dimension": "宏观", "indicator": "fed_rate%", "score": normalized_scores.get("fed_rate"), "value": macro.get("fed_rate")},
+            {"dimension": "宏观", "indicator": "etf_flow", "score": normalized_scores.get("etf_flow"), "value": None},
+            {"dimension": "情绪", "indicator": "fear_greed", "score": normalized_scores.get("fear_greed"), "value": sentiment.get("fear_greed_value")},
+            {"dimension": "衍生品", "indicator": "funding_rate", "score": normalized_scores.get("funding_rate"), "value": btc.get("funding_rate")},
+            {"dimension": "衍生品", "indicator": "oi_chg24h%", "score": normalized_scores.get("open_interest"), "value": btc.get("open_interest_change_24h")},
+            {"dimension": "衍生品", "indicator": "futures_premium%", "score": normalized_scores.get("futures_premium"), "value": btc.get("futures_premium")},
+            {"dimension": "链上", "indicator": "mvrv_z", "score": normalized_scores.get("mvrv"), "value": None},
+        ]
+        encoder = PromptEncoder(settings.AGENT_PROMPT_TOKEN_BUDGET)
+        encoder.add("各维度分数", encode_table(rows, ["indicator", "dimension", "score", "value"]))
+
         prompt = f"""请分析当前市场环境并输出Regime Score:
 
 **规则引擎已计算的初步分数**: {base_score:.2f}/100
 
-**各维度标准化分数** (范围-1到+1, 正值看多/负值看空):
-- 宏观流动性:
-  * DXY美元指数: {normalized_scores.get('dxy', 0):.2f} (实际值: {macro.get('dxy', 'N/A')})
-  * 联邦基金利率: {normalized_scores.get('fed_rate', 0):.2f} (实际值: {macro.get('fed_rate', 'N/A')}%)
-  * ETF流入: {normalized_scores.get('etf_flow', 0):.2f}
-
-- 市场情绪:
-  * Fear & Greed: {normalized_scores.get('fear_greed', 0):.2f} (实际值: {sentiment.get('fear_greed_value', 'N/A')})
-
-- 衍生品健康度:
-  * 资金费率: {normalized_scores.get('funding_rate', 0):.2f} (实际值: {btc.get('funding_rate', 'N/A')})
-  * 持仓量变化24h: {normalized_scores.get('open_interest', 0):.2f} (实际值: {btc.get('open_interest_change_24h', 'N/A')}%)
-  * 期货溢价率: {normalized_scores.get('futures_premium', 0):.2f} (实际值: {btc.get('futures_premium', 'N/A')}%)
-
-- 链上信号:
-  * MVRV Z-Score: {normalized_scores.get('mvrv', 0):.2f}
+**各维度标准化分数** (score范围-1到+1, 正值看多/负值看空; value为实际值):
+{encoder.render()}
 
 **你的任务**:
 1. 验证初步分数{base_score:.2f}是否合理
@@ -346,11 +352,7 @@ class RegimeFilterAgent:
     def _parse_llm_response(self, content: str, base_score: float) -> Dict[str, Any]:
         """解析LLM响应"""
         try:
-            result = parse_llm_json(content)
-            
-            # 验证必需字段
-            if "regime_score" not in result:
-                raise ValueError("Missing regime_score field")
+            result = parse_llm_json(content, expected_fields=["regime_score"], schema=RegimeFilterOutput)
             
             regime_score = float(result["regime_score"])
             
@@ -93,12 +93,12 @@ You MUST respond with ONLY valid JSON (no markdown, no code blocks):
         # Build routing prompt
         prompt = self._build_routing_prompt(user_message, chat_history or [])
 
-        # Prepend system prompt for GPT-5
-        full_prompt = f"{self.SYSTEM_PROMPT}\n\n{prompt}"
+        messages = [
+            Message(role="system", content=self.SYSTEM_PROMPT, cache_control=True),
+            Message(role="user", content=prompt),
+        ]
 
         # Call LLM (GPT-5)
-        messages = [Message(role="user", content=full_prompt)]
-
         response = await llm_manager.chat_for_agent(
             agent_name=self.agent_name, messages=messages
         )
@@ -148,18 +148,10 @@ Make your routing decision now. Return ONLY the JSON output, no other text.
             # Use robust JSON parser
             output = parse_llm_json(
                 content,
-                expected_fields=["decision", "reasoning", "confidence"]
+                expected_fields=["decision", "reasoning", "confidence"],
+                schema=SuperAgentOutput,
             )
 
-            # Validate decision type
-            if output["decision"] not in ["DIRECT_ANSWER", "ROUTE_TO_PLANNING"]:
-                raise ValueError(f"Invalid decision type: {output['decision']}")
-
-            # Validate confidence range
-            confidence = float(output["confidence"])
-            if not 0.0 <= confidence <= 1.0:
-                raise ValueError(f"Confidence must be between 0 and 1: {confidence}")
-
             # Ensure direct_answer exists for DIRECT_ANSWER decision
             if output["decision"] == "DIRECT_ANSWER" and not output.get(
                 "direct_answer"
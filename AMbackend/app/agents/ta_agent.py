@@ -3,8 +3,11 @@
 from typing import Dict, Any, List
 
 from app.services.llm.manager import llm_manager
+from app.services.llm.structured_output import output_tool
+from app.core.config import settings
 from app.schemas.llm import Message
-from app.utils.json_parser import parse_llm_json, JSONParseError
+from app.services.llm.prompt_encoder import PromptEncoder, encode_fields, encode_table
+from app.utils.json_parser import json_validator, parse_llm_json, JSONParseError
 from app.schemas.agents import (
     TechnicalAnalysisOutput,
     SignalType,
@@ -147,6 +150,24 @@ Your confidence should reflect:
 ⚠️ FINAL REMINDER: Respond with ONLY the JSON object. NO MARKDOWN formatting in string values. Start with { and end with }.
 """
 
+    OUTPUT_FIELDS = [
+        "signal",
+        "confidence",
+        "score",
+        "reasoning",
+        "technical_indicators",
+        "support_levels",
+        "resistance_levels",
+        "trend_analysis",
+    ]
+    OUTPUT_TOOL = output_tool(
+        "submit_technical_analysis",
+        TechnicalAnalysisOutput,
+        OUTPUT_FIELDS,
+        "Submit the technical analysis of Bitcoin",
+        optional=["key_patterns"],
+    )
+
     def __init__(self):
         """Initialize TAAgent"""
         self.agent_name = "ta_agent"
@@ -178,14 +199,17 @@ Your confidence should reflect:
         # Build analysis prompt
         analysis_prompt = self._build_analysis_prompt(market_data, indicators)
 
-        # Prepend system prompt to user message for Claude thinking models
-        full_prompt = f"{self.SYSTEM_PROMPT}\n\n{analysis_prompt}"
+        messages = [
+            Message(role="system", content=self.SYSTEM_PROMPT, cache_control=True),
+            Message(role="user", content=analysis_prompt),
+        ]
 
         # Call LLM
-        messages = [Message(role="user", content=full_prompt)]
-
         response = await llm_manager.chat_for_agent(
-            agent_name=self.agent_name, messages=messages
+            agent_name=self.agent_name,
+            messages=messages,
+            structured_output=self.OUTPUT_TOOL,
+            validate=json_validator(self.OUTPUT_FIELDS, TechnicalAnalysisOutput),
         )
 
         # Parse LLM response
@@ -207,7 +231,7 @@ Your confidence should reflect:
             trend_analysis=analysis["trend_analysis"],
             key_patterns=analysis.get("key_patterns", []),
             # Add full conversation for UI display
-            prompt_sent=full_prompt,
+            prompt_sent="\n\n".join(msg.content for msg in messages),
             llm_response=response.content,
         )
 
@@ -217,55 +241,53 @@ Your confidence should reflect:
         """Build the analysis prompt with market data and indicators"""
         ind = indicators.get("indicators", {})
 
-        # Extract current price
-        btc_price = market_data.get("btc_price", 0)
-        price_change_24h = market_data.get("price_change_24h", 0)
-
-        # Extract indicator values with None handling
-        ema = ind.get("ema", {})
-        rsi = ind.get("rsi", {})
-        macd = ind.get("macd", {})
-        bb = ind.get("bollinger_bands", {})
-
-        # Helper function to format values safely
-        def safe_format(value, format_str=".2f", default="N/A"):
-            if value is None:
-                return default
-            try:
-                if format_str == ",.2f":
-                    return f"{float(value):,.2f}"
-                else:
-                    return f"{float(value):.2f}"
-            except (ValueError, TypeError):
-                return default
-
-        prompt = f"""Analyze the current technical setup and generate a trading signal for Bitcoin:
-
-**Current Market Data:**
-- BTC Price: ${btc_price:,.2f}
-- 24h Change: {price_change_24h:+.2f}%
-
-**Technical Indicators:**
-
-**EMAs (Exponential Moving Averages):**
-- EMA 9: ${safe_format(ema.get('period_9'), ',.2f')}
-- EMA 20: ${safe_format(ema.get('period_20'), ',.2f')}
-- EMA 50: ${safe_format(ema.get('period_50'), ',.2f')}
-- EMA 200: ${safe_format(ema.get('period_200'), ',.2f')}
-
-**RSI (Relative Strength Index):**
-- Current RSI: {safe_format(rsi.get('value'))}
-- Period: {rsi.get('period', 14)}
-
-**MACD:**
-- MACD Line: {safe_format(macd.get('macd'))}
-- Signal Line: {safe_format(macd.get('signal'))}
-- Histogram: {safe_format(macd.get('histogram'))}
-
-**Bollinger Bands:**
-- Upper Band: ${safe_format(bb.get('upper'), ',.2f')}
-- Middle Band: ${safe_format(bb.get('middle'), ',.2f')}
-- Lower Band: ${safe_format(bb.get('lower'), ',.2f')}
+        ema = ind.get("ema") or {}
+        rsi = ind.get("rsi") or {}
+        macd = ind.get("macd") or {}
+        bb = ind.get("bollinger_bands") or {}
+
+        encoder = PromptEncoder(settings.AGENT_PROMPT_TOKEN_BUDGET)
+        encoder.add(
+            "Market",
+            encode_fields(
+                {
+                    "btc_price": market_data.get("btc_price"),
+                    "chg24h%": market_data.get("price_change_24h"),
+                },
+                digits=6,
+            ),
+        )
+        encoder.add(
+            "Indicators",
+            encode_table(
+                [
+                    {
+                        "asset": "BTC",
+                        "ema9": ema.get("period_9"),
+                        "ema20": ema.get("period_20"),
+                        "ema50": ema.get("period_50"),
+                        "ema200": ema.get("period_200"),
+                        f"rsi{rsi.get('period', 14)}": rsi.get("value"),
+                        "macd": macd.get("macd"),
+                        "macd_signal": macd.get("signal"),
+                        "macd_hist": macd.get("histogram"),
+                        "bb_up": bb.get("upper"),
+                        "bb_mid": bb.get("middle"),
+                        "bb_low": bb.get("lower"),
+                    }
+                ],
+                [
+                    "asset", "ema9", "ema20", "ema50", "ema200", f"rsi{rsi.get('period', 14)}",
+                    "macd", "macd_signal", "macd_hist", "bb_up", "bb_mid", "bb_low",
+                ],
+                digits=6,
+            ),
+        )
+
+        prompt = f"""Analyze the current technical setup and generate a trading signal for Bitcoin.
+EMAs, RSI, MACD (line/signal/histogram) and Bollinger Bands (upper/middle/lower):
+
+{encoder.render()}
 
 Provide a comprehensive technical analysis and generate a trading signal.
 
@@ -293,50 +315,11 @@ Return your analysis in the specified JSON format."""
             Parsed analysis dictionary
         """
         try:
-            # Try to extract JSON from response
-            if "```json" in content:
-                json_start = content.find("```json") + 7
-                json_end = content.find("```", json_start)
-                json_str = content[json_start:json_end].strip()
-            elif "```" in content:
-                json_start = content.find("```") + 3
-                json_end = content.find("```", json_start)
-                json_str = content[json_start:json_end].strip()
-            else:
-                # Assume entire response is JSON
-                json_str = content.strip()
-
-            # Parse JSON
-            analysis = parse_llm_json(content)
-
-            # Validate required fields
-            required_fields = [
-                "signal",
-                "confidence",
-                "score",
-                "reasoning",
-                "technical_indicators",
-                "support_levels",
-                "resistance_levels",
-                "trend_analysis",
-            ]
-            for field in required_fields:
-                if field not in analysis:
-                    raise ValueError(f"Missing required field: {field}")
-
-            # Validate signal type
-            if analysis["signal"] not in ["BULLISH", "BEARISH", "NEUTRAL"]:
-                raise ValueError(f"Invalid signal type: {analysis['signal']}")
-
-            # Validate confidence range
-            confidence = float(analysis["confidence"])
-            if not 0.0 <= confidence <= 1.0:
-                raise ValueError(f"Confidence must be between 0 and 1: {confidence}")
-
-            # Validate score range
-            score = float(analysis["score"])
-            if not -100.0 <= score <= 100.0:
-                raise ValueError(f"Score must be between -100 and 100: {score}")
+            analysis = parse_llm_json(
+                content,
+                expected_fields=self.OUTPUT_FIELDS,
+                schema=TechnicalAnalysisOutput,
+            )
 
             # Validate support/resistance are lists
             if not isinstance(analysis["support_levels"], list):
@@ -9,8 +9,11 @@ import logging
 from datetime import datetime
 
 from app.services.llm.manager import llm_manager
+from app.core.config import settings
 from app.schemas.llm import Message
-from app.utils.json_parser import parse_llm_json
+from app.schemas.agents import TAMomentumOutput
+from app.services.llm.prompt_encoder import PromptEncoder, encode_table
+from app.utils.json_parser import json_validator, parse_llm_json
 from app.services.indicators.calculator import IndicatorCalculator
 
 logger = logging.getLogger(__name__)
@@ -37,6 +40,11 @@ class TAMomentumAgent:
     
     # 支持的交易品种
     SUPPORTED_ASSETS = ["BTC", "ETH", "SOL"]
+    # 指标表列顺序 (PromptEncoder)
+    INDICATOR_COLUMNS = [
+        "asset", "ema9", "ema21", "ema50", "ema200", "rsi14", "dif", "dea", "hist",
+        "bb_up", "bb_mid", "bb_low", "atr14", "vol", "vol_avg20",
+    ]
     
     # 时间框架权重
     TIMEFRAME_WEIGHTS = {
@@ -199,12 +207,15 @@ class TAMomentumAgent:
             )
             
             # Step 3: 调用LLM进行综合分析
-            full_prompt = f"{self.SYSTEM_PROMPT}\n\n{analysis_prompt}"
-            messages = [Message(role="user", content=full_prompt)]
+            messages = [
+                Message(role="system", content=self.SYSTEM_PROMPT, cache_control=True),
+                Message(role="user", content=analysis_prompt),
+            ]
             
             response = await llm_manager.chat_for_agent(
                 agent_name=self.agent_name,
-                messages=messages
+                messages=messages,
+                validate=json_validator(["asset_analyses"], TAMomentumOutput),
             )
             
             # Step 4: 解析LLM响应
@@ -429,52 +440,58 @@ class TAMomentumAgent:
     ) -> str:
         """构建分析prompt"""
         
-        prompt = "请分析以下技术指标数据并输出最佳交易机会:\n\n"
-        
-        for asset in self.SUPPORTED_ASSETS:
-            if asset not in indicators_by_asset:
-                continue
-            
-            indicators = indicators_by_asset[asset]
-            asset_data = assets.get(asset, {})
-            
-            prompt += f"## {asset}\n"
-            prompt += f"**当前价格**: {indicators.get('current_price', 0):.2f}\n"
-            prompt += f"**24h涨跌**: {indicators.get('price_change_24h', 0):.2f}%\n"
-            prompt += f"**资金费率**: {asset_data.get('funding_rate', 0):.4f}%\n\n"
-            
-            # 15分钟指标
-            ind_15m = indicators.get("15m", {})
-            if ind_15m:
-                prompt += "**15分钟级别**:\n"
-                prompt += f"- EMA: 9={ind_15m.get('ema_9', 0):.2f}, 21={ind_15m.get('ema_21', 0):.2f}, "
-                prompt += f"50={ind_15m.get('ema_50', 0):.2f}, 200={ind_15m.get('ema_200', 0):.2f}\n"
-                prompt += f"- RSI(14): {ind_15m.get('rsi_14', 0):.2f}\n"
-                macd_15 = ind_15m.get('macd', {})
-                prompt += f"- MACD: DIF={macd_15.get('dif', 0):.2f}, DEA={macd_15.get('dea', 0):.2f}, "
-                prompt += f"Histogram={macd_15.get('histogram', 0):.2f}\n"
-                bbands_15 = ind_15m.get('bbands', {})
-                prompt += f"- 布林带: Upper={bbands_15.get('upper', 0):.2f}, Middle={bbands_15.get('middle', 0):.2f}, "
-                prompt += f"Lower={bbands_15.get('lower', 0):.2f}\n"
-                prompt += f"- ATR(14): {ind_15m.get('atr_14', 0):.2f}\n"
-                prompt += f"- 成交量: 当前={ind_15m.get('volume', 0):.2f}, 20均={ind_15m.get('volume_avg_20', 0):.2f}\n\n"
-            
-            # 60分钟指标
-            ind_60m = indicators.get("60m", {})
-            if ind_60m:
-                prompt += "**60分钟级别**:\n"
-                prompt += f"- EMA: 9={ind_60m.get('ema_9', 0):.2f}, 21={ind_60m.get('ema_21', 0):.2f}, "
-                prompt += f"50={ind_60m.get('ema_50', 0):.2f}, 200={ind_60m.get('ema_200', 0):.2f}\n"
-                prompt += f"- RSI(14): {ind_60m.get('rsi_14', 0):.2f}\n"
-                macd_60 = ind_60m.get('macd', {})
-                prompt += f"- MACD: DIF={macd_60.get('dif', 0):.2f}, DEA={macd_60.get('dea', 0):.2f}, "
-                prompt += f"Histogram={macd_60.get('histogram', 0):.2f}\n"
-                bbands_60 = ind_60m.get('bbands', {})
-                prompt += f"- 布林带: Upper={bbands_60.get('upper', 0):.2f}, Middle={bbands_60.get('middle', 0):.2f}, "
-                prompt += f"Lower={bbands_60.get('lower', 0):.2f}\n"
-                prompt += f"- ATR(14): {ind_60m.get('atr_14', 0):.2f}\n"
-                prompt += f"- 成交量: 当前={ind_60m.get('volume', 0):.2f}, 20均={ind_60m.get('volume_avg_20', 0):.2f}\n\n"
-        
+        encoder = PromptEncoder(settings.AGENT_PROMPT_TOKEN_BUDGET)
+        analyzed = [a for a in self.SUPPORTED_ASSETS if a in indicators_by_asset]
+
+        encoder.add(
+            "行情",
+            encode_table(
+                [
+                    {
+                        "asset": asset,
+                        "price": indicators_by_asset[asset].get("current_price"),
+                        "chg24h%": indicators_by_asset[asset].get("price_change_24h"),
+                        "funding%": assets.get(asset, {}).get("funding_rate"),
+                    }
+                    for asset in analyzed
+                ],
+                ["asset", "price", "chg24h%", "funding%"],
+                digits=5,
+            ),
+            priority=0,
+        )
+
+        # 60分钟级别优先保留, 超出预算时先省略15分钟级别
+        for timeframe, priority in (("60m", 1), ("15m", 2)):
+            rows = []
+            for asset in analyzed:
+                ind = indicators_by_asset[asset].get(timeframe) or {}
+                if not ind:
+                    continue
+                macd = ind.get("macd") or {}
+                bbands = ind.get("bbands") or {}
+                rows.append({
+                    "asset": asset,
+                    "ema9": ind.get("ema_9"),
+                    "ema21": ind.get("ema_21"),
+                    "ema50": ind.get("ema_50"),
+                    "ema200": ind.get("ema_200"),
+                    "rsi14": ind.get("rsi_14"),
+                    "dif": macd.get("dif"),
+                    "dea": macd.get("dea"),
+                    "hist": macd.get("histogram"),
+                    "bb_up": bbands.get("upper"),
+                    "bb_mid": bbands.get("middle"),
+                    "bb_low": bbands.get("lower"),
+                    "atr14": ind.get("atr_14"),
+                    "vol": ind.get("volume"),
+                    "vol_avg20": ind.get("volume_avg_20"),
+                })
+            encoder.add(f"{timeframe}指标", encode_table(rows, self.INDICATOR_COLUMNS, digits=5), priority)
+
+        prompt = "请分析以下技术指标数据并输出最佳交易机会 (MACD: dif/dea/hist; 布林带: bb_up/bb_mid/bb_low):\n\n"
+        prompt += encoder.render() + "\n"
+
         prompt += """
 请基于以上数据:
 1. 评估每个币种的趋势、动量、入场时机
@@ -492,11 +509,7 @@ class TAMomentumAgent:
     ) -> Dict[str, Any]:
         """解析LLM响应"""
         try:
-            result = parse_llm_json(content)
-            
-            # 验证必需字段
-            if "asset_analyses" not in result:
-                raise ValueError("Missing asset_analyses field")
+            result = parse_llm_json(content, expected_fields=["asset_analyses"], schema=TAMomentumOutput)
             
             # 确保所有分析的币种都有indicators数据
             for asset, analysis in result.get("asset_analyses", {}).items():
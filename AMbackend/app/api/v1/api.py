@@ -16,6 +16,7 @@ from app.api.v1.endpoints import (
     system_monitoring,
     agent_monitor,
     api_test,
+    realtime,
 )
 
 
@@ -99,3 +100,9 @@ api_router.include_router(
     prefix="/api-test",
     tags=["api-test"],
 )
+
+api_router.include_router(
+    realtime.router,
+    prefix="/realtime",
+    tags=["realtime"],
+)
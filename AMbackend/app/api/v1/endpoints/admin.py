@@ -1,14 +1,16 @@
 """Admin API Endpoints"""
 
+import asyncio
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from pydantic import BaseModel
 from apscheduler.triggers.interval import IntervalTrigger
 
+from app.core.auth_cache import auth_cache
 from app.core.deps import get_db, get_current_admin_user
 from app.models.user import User
 from app.models.portfolio import Portfolio
@@ -17,12 +19,17 @@ from app.schemas.admin import (
     AdminStrategyItem,
     StrategyToggleRequest,
     StrategyToggleResponse,
+    AdminUserUpdateRequest,
+    StoredLogEntry,
 )
+from app.schemas.auth import User as UserSchema
 from app.services.strategy.scheduler import strategy_scheduler
 from app.services.agents.agent_manager import agent_manager
 from app.services.tools.tool_manager import tool_manager
 from app.services.apis.api_manager import api_manager
 from app.services.monitoring.error_tracker import error_tracker
+from app.services.monitoring.log_tail import tail_lines
+from app.services.monitoring import log_store as log_store_module
 import os
 import re
 from pathlib import Path
@@ -214,6 +221,39 @@ async def toggle_strategy(
         raise HTTPException(status_code=500, detail=f"Failed to toggle strategy: {str(e)}")
 
 
+@router.patch("/users/{user_id}", response_model=UserSchema)
+async def update_user(
+    user_id: int,
+    request: AdminUserUpdateRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """
+    修改用户角色或启用状态（仅管理员）
+
+    提交后立即从认证缓存中移除该用户，变更对下一个请求生效
+    """
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if not user:
+        raise HTTPException(status_code=404, detail=f"User {user_id} not found")
+
+    if request.role is not None:
+        user.role = request.role
+    if request.is_active is not None:
+        user.is_active = request.is_active
+
+    await db.commit()
+    await db.refresh(user)
+    auth_cache.forget_user(user)
+
+    logger.info(
+        f"Admin {current_user.email} updated user {user_id}: "
+        f"role={user.role}, is_active={user.is_active}"
+    )
+    return user
+
+
 @router.patch("/strategies/{portfolio_id}/params")
 async def update_strategy_params(
     portfolio_id: str,
@@ -668,20 +708,8 @@ async def get_debug_logs(
         log_entries = []
         if log_file_path.exists():
             try:
-                with open(log_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    all_lines = f.readlines()
-                    # 只读取最后N行
-                    recent_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
-                    
-                    for line in recent_lines:
-                        line = line.strip()
-                        if not line:
-                            continue
-                        
-                        # 解析日志行
-                        entry = _parse_log_line(line)
-                        if entry:
-                            log_entries.append(entry)
+                # 从文件末尾读取最后N行并解析，在线程池中执行，不阻塞事件循环
+                log_entries = await asyncio.to_thread(_read_log_entries, log_file_path, lines)
             except Exception as e:
                 logger.error(f"读取日志文件失败: {e}")
                 log_entries = []
@@ -738,6 +766,71 @@ async def get_debug_logs(
         raise HTTPException(status_code=500, detail=f"Failed to get debug logs: {str(e)}")
 
 
+def _read_log_entries(log_file_path: Path, lines: int) -> List[LogEntry]:
+    """读取日志文件最后N行并解析（同步，在线程池中调用）"""
+    log_entries = []
+    for line in tail_lines(log_file_path, lines):
+        line = line.strip()
+        if not line:
+            continue
+
+        # 解析日志行
+        entry = _parse_log_line(line)
+        if entry:
+            log_entries.append(entry)
+    return log_entries
+
+
+def _to_unix(value: Optional[datetime]) -> Optional[float]:
+    """datetime -> unix 秒（无时区视为 UTC）"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+@router.get("/debug/logs/search", response_model=List[StoredLogEntry])
+async def search_debug_logs(
+    level: str = Query("WARNING", description="最低级别: DEBUG, INFO, WARNING, ERROR, CRITICAL"),
+    since: Optional[datetime] = Query(None, description="起始时间 (UTC)"),
+    until: Optional[datetime] = Query(None, description="结束时间 (UTC)"),
+    component: Optional[str] = Query(None, description="组件（logger名前缀），如 app.services.strategy"),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """
+    按级别/时间窗口/组件检索日志（仅Admin）
+
+    需要开启 LOG_STORE_ENABLED；查询走 SQLite 索引，与日志文件大小无关
+    """
+    store = log_store_module.log_store
+    if store is None:
+        raise HTTPException(status_code=404, detail="Log store is not enabled (LOG_STORE_ENABLED)")
+
+    min_level = logging.getLevelName(level.upper())
+    if not isinstance(min_level, int):
+        raise HTTPException(status_code=400, detail=f"Unknown log level: {level}")
+
+    rows = await asyncio.to_thread(
+        store.query,
+        min_level=min_level,
+        since=_to_unix(since),
+        until=_to_unix(until),
+        component=component,
+        limit=limit,
+    )
+    return [
+        StoredLogEntry(
+            created_at=datetime.fromtimestamp(row["created_at"], timezone.utc),
+            level=row["level"],
+            component=row["component"],
+            message=row["message"],
+        )
+        for row in rows
+    ]
+
+
 def _parse_log_line(line: str) -> Optional[LogEntry]:
     """解析日志行"""
     try:
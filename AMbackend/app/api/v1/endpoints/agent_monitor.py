@@ -8,11 +8,11 @@ from typing import List, Optional
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, func
 from pydantic import BaseModel
 
 from app.core.deps import get_db, get_optional_user
-from app.models import AgentExecution, User
+from app.models import User
+from app.services.agents.execution_recorder import agent_execution_recorder
 
 logger = logging.getLogger(__name__)
 
@@ -43,10 +43,14 @@ class AgentStats(BaseModel):
     agent_name: str
     agent_display_name: str
     total_executions: int
+    success_executions: int
+    success_rate: float
     recent_signal: str
     recent_score: float
     last_executed: datetime
     avg_duration_ms: int
+    p50_duration_ms: int
+    p95_duration_ms: int
 
 
 @router.get("/executions")
@@ -68,19 +72,11 @@ async def get_agent_executions(
         # 计算时间范围
         since = datetime.utcnow() - timedelta(hours=hours)
 
-        # 构建查询
-        query = select(AgentExecution).where(
-            AgentExecution.executed_at >= since
+        # 只查询列表需要的列（reasoning 在SQL中截断）
+        executions = await agent_execution_recorder.get_recent_executions(
+            db, since=since, agent_name=agent_name, limit=limit
         )
 
-        if agent_name:
-            query = query.where(AgentExecution.agent_name == agent_name)
-
-        query = query.order_by(desc(AgentExecution.executed_at)).limit(limit)
-
-        result = await db.execute(query)
-        executions = result.scalars().all()
-
         return {
             "executions": [
                 {
@@ -93,7 +89,7 @@ async def get_agent_executions(
                     "signal": ex.signal,
                     "confidence": float(ex.confidence),
                     "score": float(ex.score),
-                    "reasoning": ex.reasoning[:200] if ex.reasoning else "",  # 截断
+                    "reasoning": ex.reasoning or "",  # 已在SQL中截断
                     "strategy_execution_id": str(ex.strategy_execution_id) if ex.strategy_execution_id else None,
                     "user_id": ex.user_id,
                 }
@@ -117,43 +113,18 @@ async def get_agent_stats(
     """
     获取各Agent的统计信息
 
-    - 每个Agent的执行次数、最新信号、平均耗时等
+    - 每个Agent的执行次数、成功率、最新信号、平均/P50/P95耗时等
     - 未登录用户也可访问
     """
     try:
         since = datetime.utcnow() - timedelta(hours=hours)
 
-        # 查询所有agent的最新执行
-        query = select(AgentExecution).where(
-            AgentExecution.executed_at >= since
-        )
-        result = await db.execute(query)
-        all_executions = result.scalars().all()
-
-        # 按agent_name分组统计
-        from collections import defaultdict
-        agent_groups = defaultdict(list)
-        for ex in all_executions:
-            agent_groups[ex.agent_name].append(ex)
-
-        stats = []
-        for agent_name, execs in agent_groups.items():
-            # 按执行时间排序，最新的在前
-            execs_sorted = sorted(execs, key=lambda x: x.executed_at, reverse=True)
-            latest = execs_sorted[0]
-
-            stats.append({
-                "agent_name": agent_name,
-                "agent_display_name": latest.agent_display_name,
-                "total_executions": len(execs),
-                "recent_signal": latest.signal,
-                "recent_score": float(latest.score),
-                "last_executed": latest.executed_at.isoformat() + "Z" if not latest.executed_at.isoformat().endswith('Z') else latest.executed_at.isoformat(),
-                "avg_duration_ms": int(sum(e.execution_duration_ms for e in execs) / len(execs)),
-            })
-
-        # 按最后执行时间倒序排列
-        stats.sort(key=lambda x: x["last_executed"], reverse=True)
+        # 计数、成功率、耗时分位数和最新信号在SQL中聚合（每个Agent一行，已按最后执行时间倒序）
+        stats = await agent_execution_recorder.get_agent_stats(db, since)
+
+        for item in stats:
+            last_executed = item["last_executed"].isoformat()
+            item["last_executed"] = last_executed if last_executed.endswith('Z') else last_executed + "Z"
 
         return {
             "stats": stats,
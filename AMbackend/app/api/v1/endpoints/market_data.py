@@ -1,8 +1,9 @@
 """Market data API endpoints"""
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from typing import Optional
 
+from app.core.http_cache import etag_matches, json_response, make_etag, not_modified
 from app.services.data_collectors.manager import data_manager
 from app.schemas.market_data import MarketDataSnapshot
 from app.schemas.indicators import TechnicalIndicators
@@ -74,6 +75,7 @@ async def get_current_prices():
 
 @router.get("/ohlcv")
 async def get_ohlcv_data(
+    request: Request,
     symbol: str = Query("BTCUSDT", description="Trading pair symbol"),
     interval: str = Query("1h", description="Candle interval (1m, 5m, 15m, 1h, 4h, 1d)"),
     limit: int = Query(100, description="Number of candles", ge=1, le=1000)
@@ -87,14 +89,27 @@ async def get_ohlcv_data(
         limit: Number of candles (1-1000)
 
     Returns list of candles with open, high, low, close, volume data.
+
+    ETag 由缓存的抓取时间生成；客户端已持有当前版本时直接返回 304，不请求 Binance
     """
+    binance = data_manager.binance
+    version = binance.get_ohlcv_version(symbol=symbol, interval=interval, limit=limit)
+    if version is not None:
+        etag = make_etag("ohlcv", symbol, interval, limit, version.isoformat())
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
     try:
-        data = await data_manager.binance.get_ohlcv(
+        data = await binance.get_ohlcv(
             symbol=symbol,
             interval=interval,
             limit=limit
         )
-        return {"symbol": symbol, "interval": interval, "data": [candle.dict() for candle in data]}
+        content = {"symbol": symbol, "interval": interval, "data": [candle.dict() for candle in data]}
+
+        version = binance.get_ohlcv_version(symbol=symbol, interval=interval, limit=limit)
+        etag = make_etag("ohlcv", symbol, interval, limit, version.isoformat()) if version is not None else None
+        return json_response(content, etag)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -0,0 +1,60 @@
+"""Realtime API endpoints
+
+服务端推送（SSE）：组合估值、策略执行、交易、Exploration视图更新的增量事件
+"""
+
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.deps import get_current_user
+from app.models.user import User
+from app.services.realtime.event_bus import event_bus
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    topics: Optional[str] = Query(
+        None,
+        description="逗号分隔的主题过滤，如 portfolio.valuation,trade.executed；为空订阅全部",
+    ),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    SSE 事件流
+
+    事件:
+    - portfolio.valuation: 估值发生变化的组合 [{id, total_value, total_pnl, total_pnl_percent}]
+    - execution.completed: 策略实例执行完成 {portfolio_id, execution_id, signal, status, ...}
+    - trade.executed: 模拟交易成交 {portfolio_id, trade_id, symbol, side, amount, price, ...}
+    - exploration.updated: Exploration 物化视图已重建，前端重新拉取 /exploration/*
+
+    组合估值、执行和交易事件只推送当前用户自己组合的数据
+
+    每 REALTIME_HEARTBEAT_SECONDS 秒发送一次注释心跳，保持代理连接
+    """
+    topic_filter = [t.strip() for t in topics.split(",") if t.strip()] if topics else None
+    subscription = event_bus.subscribe(topic_filter, user_id=current_user.id)
+
+    async def event_stream():
+        with subscription:
+            yield f"retry: {settings.REALTIME_HEARTBEAT_SECONDS * 1000}\n\n"
+            while not await request.is_disconnected():
+                event = await subscription.get(timeout=settings.REALTIME_HEARTBEAT_SECONDS)
+                yield event.to_sse() if event is not None else ": ping\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
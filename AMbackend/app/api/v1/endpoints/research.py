@@ -2,6 +2,7 @@
 
 from typing import List, Optional
 import uuid
+from contextlib import aclosing
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
@@ -9,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 import json
 
 from app.workflows.research_workflow import research_workflow
+from app.services.llm.admission import LLMPriority, set_llm_priority
 from app.core.deps import get_db, get_current_user
 from app.models.user import User
 
@@ -38,7 +40,9 @@ async def research_chat(
     """
     Research Chat endpoint with Server-Sent Events (SSE)
 
-    Process user question through multi-agent workflow and stream results in real-time
+    Process user question through multi-agent workflow and stream results in real-time.
+    The synthesized answer is streamed token by token as ``answer_delta`` events
+    before the complete ``final_answer`` event.
 
     Args:
         request: ResearchChatRequest with message and optional chat_history
@@ -49,6 +53,10 @@ async def research_chat(
         StreamingResponse with SSE events
     """
     try:
+        # Research chat LLM calls queue behind trading-critical strategy agents
+        # (request-scoped context, inherited by the streaming response task)
+        set_llm_priority(LLMPriority.RESEARCH)
+
         # Generate conversation ID for tracking
         conversation_id = str(uuid.uuid4())
 
@@ -67,16 +75,18 @@ async def research_chat(
         async def event_generator():
             """Generate SSE events from workflow"""
             try:
-                async for event in research_workflow.process_question(
+                # aclosing: a client disconnect closes the workflow and frees the LLM stream slot
+                async with aclosing(research_workflow.process_question(
                     user_message=request.message,
                     chat_history=chat_history,
                     db=db,
                     user_id=user_id,
                     conversation_id=conversation_id,
-                ):
-                    # Format as SSE
-                    event_data = json.dumps(event, ensure_ascii=False)
-                    yield f"data: {event_data}\n\n"
+                )) as events:
+                    async for event in events:
+                        # Format as SSE
+                        event_data = json.dumps(event, ensure_ascii=False)
+                        yield f"data: {event_data}\n\n"
 
                 # Send completion event
                 yield f"data: {json.dumps({'type': 'done'})}\n\n"
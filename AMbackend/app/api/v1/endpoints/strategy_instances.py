@@ -10,7 +10,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
 
 from app.core.deps import get_db, get_current_user, get_current_trader_or_admin, get_optional_user
+from app.core.http_cache import etag_matches, json_response, make_etag, not_modified
 from app.models.user import User
+from app.schemas.strategy import StrategyStatus
 from app.services.strategy.definition_service import definition_service
 from app.services.strategy.instance_service import instance_service
 from app.services.strategy.marketplace_service import marketplace_service  # 复用详情查询
@@ -78,8 +80,15 @@ class CreateInstanceResponse(BaseModel):
 
 # ========== API Endpoints ==========
 
+# 按用户标记 user_activated，响应不可被共享缓存
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+# 执行详情响应格式变化时递增，使客户端旧 ETag 失效
+EXECUTION_DETAIL_ETAG_VERSION = 1
+
+
 @router.get("/")
 async def get_strategy_instances(
+    request: Request,
     risk_level: Optional[str] = Query(None, description="Risk level filter: low, medium, medium-high, high"),
     sort_by: str = Query("return", description="Sort by: return, risk, tvl, sharpe"),
     user_id: Optional[int] = Query(None, description="Filter by user ID (optional)"),
@@ -96,19 +105,31 @@ async def get_strategy_instances(
     - **risk_level**: 可选，筛选风险等级 (low, medium, medium-high, high)
     - **sort_by**: 排序方式，默认return (return, risk, tvl, sharpe)
     - **user_id**: 可选，只显示指定用户的策略（默认显示所有）
+
+    ETag 由列表缓存版本生成；客户端已持有当前版本时直接返回 304，不查询数据库
     """
-    try:
-        # 如果没有指定user_id，显示所有用户的策略（策略市场是公开的）
-        filter_user_id = user_id  # None表示显示所有
+    # 如果没有指定user_id，显示所有用户的策略（策略市场是公开的）
+    filter_user_id = user_id  # None表示显示所有
+    current_user_id = current_user.id if current_user else None
 
+    version = marketplace_service.get_marketplace_list_version(filter_user_id, risk_level, sort_by)
+    if version is not None:
+        etag = make_etag("marketplace", version, current_user_id)
+        if etag_matches(request, etag):
+            return not_modified(etag, PRIVATE_CACHE_CONTROL)
+
+    try:
         result = await marketplace_service.get_marketplace_list(
             db=db,
             user_id=filter_user_id,
             risk_level=risk_level,
             sort_by=sort_by,
-            current_user_id=current_user.id if current_user else None,
+            current_user_id=current_user_id,
         )
-        return result
+
+        version = marketplace_service.get_marketplace_list_version(filter_user_id, risk_level, sort_by)
+        etag = make_etag("marketplace", version, current_user_id) if version is not None else None
+        return json_response(result, etag, PRIVATE_CACHE_CONTROL)
     except Exception as e:
         logger.error(f"获取策略市场列表失败: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to get marketplace strategies: {str(e)}")
@@ -434,11 +455,25 @@ async def get_strategy_executions(
     portfolio_id: str,
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor（游标分页，忽略 page）"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """获取策略执行历史（复用原有逻辑）"""
+    """
+    获取策略执行历史
+
+    - 默认按 page 分页
+    - 传入 cursor 时按 (execution_time, id) 游标分页，深页与首页一样快
+    """
     try:
+        if cursor:
+            return await marketplace_service.get_strategy_executions_keyset(
+                db=db,
+                portfolio_id=portfolio_id,
+                cursor=cursor,
+                page_size=page_size,
+            )
+
         result = await marketplace_service.get_strategy_executions(
             db=db,
             portfolio_id=portfolio_id,
@@ -446,6 +481,8 @@ async def get_strategy_executions(
             page_size=page_size,
         )
         return result
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"获取执行历史失败: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -453,6 +490,7 @@ async def get_strategy_executions(
 
 @router.get("/executions/{execution_id}")
 async def get_execution_detail(
+    request: Request,
     execution_id: str,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -461,13 +499,22 @@ async def get_execution_detail(
     获取策略执行详情，包括所有agent调用过程和LLM对话
 
     - **execution_id**: Strategy Execution UUID
+
+    已结束（completed/failed）的执行不再变化，ETag 只由执行ID生成，
+    客户端已缓存时直接返回 304，不查询数据库；运行中的执行不返回 ETag
     """
+    etag = make_etag("execution-detail", execution_id, EXECUTION_DETAIL_ETAG_VERSION)
+    if etag_matches(request, etag):
+        return not_modified(etag, PRIVATE_CACHE_CONTROL)
+
     try:
         result = await marketplace_service.get_execution_detail(
             db=db,
             execution_id=execution_id,
         )
-        return result
+        if result.status not in (StrategyStatus.COMPLETED.value, StrategyStatus.FAILED.value):
+            etag = None
+        return json_response(result, etag, PRIVATE_CACHE_CONTROL)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
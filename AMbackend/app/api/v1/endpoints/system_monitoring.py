@@ -1,11 +1,16 @@
 """System monitoring and error tracking endpoints"""
 
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_db, get_current_user
 from app.services.monitoring.error_tracker import error_tracker
+from app.services.llm.response_cache import llm_response_cache
+from app.services.llm.admission import admission_controller
+from app.services.llm.latency import latency_tracker
+from app.services.llm.telemetry import llm_telemetry
 from app.models.user import User
 
 router = APIRouter()
@@ -96,6 +101,59 @@ async def resolve_error(
         raise HTTPException(status_code=500, detail=f"标记错误失败: {str(e)}")
 
 
+@router.get("/llm/cache")
+async def get_llm_cache_stats(
+    current_user: User = Depends(get_current_user),
+):
+    """LLM响应缓存命中率、节省的token与成本（按Agent）"""
+    return llm_response_cache.stats()
+
+
+@router.get("/llm/admission")
+async def get_llm_admission_stats(
+    current_user: User = Depends(get_current_user),
+):
+    """LLM准入控制：各 provider/model 的并发、TPM占用与各优先级通道排队时间"""
+    return admission_controller.stats()
+
+
+@router.get("/llm/latency")
+async def get_llm_latency_stats(
+    current_user: User = Depends(get_current_user),
+):
+    """各 provider/model 的延迟分位数、当前对冲延迟，以及各Agent的对冲/故障转移次数"""
+    return latency_tracker.stats()
+
+
+@router.get("/llm/usage")
+async def get_llm_usage(
+    window_minutes: Optional[int] = Query(None, ge=1, le=1440, description="统计窗口(分钟)，默认内存中全部调用"),
+    current_user: User = Depends(get_current_user),
+):
+    """最近LLM调用的延迟/TTFB分位数、token与花费（按Agent/模型），以及当日预算状态"""
+    return llm_telemetry.summary(window_minutes * 60 if window_minutes else None)
+
+
+@router.get("/llm/usage/history")
+async def get_llm_usage_history(
+    hours: int = Query(24, ge=1, le=24 * 90, description="回溯小时数"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """llm_usage_rollups 汇总的调用次数、token与花费（按Agent/模型）"""
+    try:
+        since = datetime.now(timezone.utc) - timedelta(hours=hours)
+        rows = await llm_telemetry.history(db, since)
+        return {
+            "hours": hours,
+            "cost_usd": round(sum(row["cost_usd"] for row in rows), 6),
+            "by_agent_model": rows,
+            "budget": llm_telemetry.budget_status(),
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"获取LLM用量历史失败: {str(e)}")
+
+
 @router.get("/system/health")
 async def system_health(
     db: AsyncSession = Depends(get_db),
@@ -0,0 +1,276 @@
+"""Authentication caches for Firebase ID tokens and user rows
+
+- TokenCache: bounded LRU of verified claims keyed by the token's SHA-256,
+  each entry expiring at the token's own ``exp``
+- FirebaseKeySet: Google's securetoken signing certificates, refreshed in the
+  background ahead of their Cache-Control max-age, so tokens are verified
+  locally without blocking the event loop on a key fetch
+- UserCache: short-lived cache of User rows by Firebase UID, merged into the
+  request session without a query
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from google.auth import jwt as google_jwt
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.firebase import verify_firebase_token
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+class TokenCache:
+    """Bounded LRU of decoded token claims, honoring each token's ``exp``"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = self.key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        claims, expires_at = entry
+        if time.time() >= expires_at:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return claims
+
+    def set(self, token: str, claims: Dict[str, Any]) -> None:
+        expires_at = claims.get("exp")
+        if not expires_at:
+            return
+
+        key = self.key(token)
+        self._entries[key] = (claims, float(expires_at))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class FirebaseKeySet:
+    """Firebase ID token signing certificates with background refresh"""
+
+    CERTS_URL = (
+        "https://www.googleapis.com/robot/v1/metadata/x509/"
+        "securetoken@system.gserviceaccount.com"
+    )
+    ISSUER_PREFIX = "https://securetoken.google.com/"
+    # Refresh this long before the certificates' max-age runs out
+    REFRESH_MARGIN_SECONDS = 300
+    MIN_REFRESH_SECONDS = 60
+    CLOCK_SKEW_SECONDS = 10
+
+    def __init__(self):
+        self._certs: Dict[str, str] = {}
+        self._expires_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return bool(self._certs) and time.time() < self._expires_at
+
+    async def refresh(self) -> float:
+        """Fetch the current certificates, returning their max-age in seconds"""
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.get(self.CERTS_URL)
+            response.raise_for_status()
+
+        match = re.search(r"max-age=(\d+)", response.headers.get("cache-control", ""))
+        max_age = float(match.group(1)) if match else 3600.0
+
+        self._certs = response.json()
+        self._expires_at = time.time() + max_age
+        logger.info(f"🔑 Firebase signing keys refreshed: {len(self._certs)} keys, max-age {int(max_age)}s")
+        return max_age
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                max_age = await self.refresh()
+                delay = max(max_age - self.REFRESH_MARGIN_SECONDS, self.MIN_REFRESH_SECONDS)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Firebase signing key refresh failed: {e}")
+                delay = self.MIN_REFRESH_SECONDS
+            await asyncio.sleep(delay)
+
+    def has_key_for(self, token: str) -> bool:
+        """Whether the token's ``kid`` is in the current key set"""
+        if not self.ready:
+            return False
+        try:
+            header = google_jwt.decode_header(token)
+        except Exception:
+            return False
+        return header.get("kid") in self._certs
+
+    def verify(self, token: str, project_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Verify a Firebase ID token against the cached keys
+
+        Applies the same checks as ``firebase_admin.auth.verify_id_token``
+        (signature, exp/iat, audience, issuer, subject), without the optional
+        revocation check.
+        """
+        try:
+            claims = google_jwt.decode(
+                token,
+                certs=self._certs,
+                audience=project_id,
+                clock_skew_in_seconds=self.CLOCK_SKEW_SECONDS,
+            )
+        except Exception as e:
+            logger.info(f"Invalid Firebase ID token: {e}")
+            return None
+
+        subject = claims.get("sub")
+        if claims.get("iss") != self.ISSUER_PREFIX + project_id:
+            return None
+        if not isinstance(subject, str) or not subject or len(subject) > 128:
+            return None
+
+        claims["uid"] = subject
+        return claims
+
+
+class UserCache:
+    """Short-lived cache of User rows keyed by Firebase UID"""
+
+    def __init__(self, ttl_seconds: int, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[User, float]]" = OrderedDict()
+
+    def get(self, firebase_uid: str) -> Optional[User]:
+        entry = self._entries.get(firebase_uid)
+        if entry is None:
+            return None
+
+        user, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[firebase_uid]
+            return None
+
+        self._entries.move_to_end(firebase_uid)
+        return user
+
+    def set(self, firebase_uid: str, user: User) -> None:
+        if self.ttl_seconds <= 0:
+            return
+
+        self._entries[firebase_uid] = (user, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(firebase_uid)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, firebase_uid: Optional[str] = None) -> None:
+        """Drop one user (e.g. after a role change) or the whole cache"""
+        if firebase_uid is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(firebase_uid, None)
+
+
+class AuthCache:
+    """Token verification and user lookup used by the auth dependencies"""
+
+    def __init__(self):
+        self.tokens = TokenCache(settings.AUTH_TOKEN_CACHE_SIZE)
+        self.keys = FirebaseKeySet()
+        self.users = UserCache(settings.AUTH_USER_CACHE_TTL_SECONDS, settings.AUTH_TOKEN_CACHE_SIZE)
+
+    async def start(self) -> None:
+        """Start the background signing key refresh"""
+        if settings.FIREBASE_PROJECT_ID:
+            await self.keys.start()
+
+    async def stop(self) -> None:
+        await self.keys.stop()
+
+    async def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Verify a Firebase ID token
+
+        Returns cached claims when the token was seen before and has not
+        expired. Otherwise verifies locally against the cached key set, or
+        falls back to the Firebase Admin SDK in a worker thread when the keys
+        are not loaded yet or the token's ``kid`` is unknown.
+
+        Returns:
+            Decoded token claims or None if invalid
+        """
+        claims = self.tokens.get(token)
+        if claims is not None:
+            return claims
+
+        project_id = settings.FIREBASE_PROJECT_ID
+        if project_id and self.keys.has_key_for(token):
+            claims = self.keys.verify(token, project_id)
+        else:
+            claims = await asyncio.to_thread(verify_firebase_token, token)
+
+        if claims is not None:
+            self.tokens.set(token, claims)
+        return claims
+
+    async def get_user(self, db: AsyncSession, firebase_uid: str) -> Optional[User]:
+        """
+        Return the cached User attached to ``db`` without a query
+
+        ``merge(load=False)`` copies the cached row into the request session,
+        so endpoints can keep using ``current_user`` with that session.
+        """
+        cached = self.users.get(firebase_uid)
+        if cached is None:
+            return None
+        return await db.merge(cached, load=False)
+
+    def remember_user(self, firebase_uid: str, user: User) -> None:
+        self.users.set(firebase_uid, user)
+
+    def forget_user(self, user: User) -> None:
+        """Drop a user after its role or active flag changed (call after commit)"""
+        if user.google_id:
+            self.users.invalidate(user.google_id)
+
+
+# Global instance
+auth_cache = AuthCache()
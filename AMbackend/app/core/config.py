@@ -1,6 +1,6 @@
 """Application configuration management"""
 
-from typing import List
+from typing import Dict, List
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator
 
@@ -31,6 +31,24 @@ class Settings(BaseSettings):
     DATABASE_POOL_SIZE: int = 10
     DATABASE_MAX_OVERFLOW: int = 20
 
+    # TimescaleDB (执行历史 hypertable: strategy_executions / agent_executions / portfolio_snapshots)
+    TIMESCALE_CHUNK_INTERVAL_DAYS: int = 7
+    TIMESCALE_COMPRESS_AFTER_DAYS: int = 7
+    # 保留天数, 0 = 永久保留
+    STRATEGY_EXECUTION_RETENTION_DAYS: int = 0
+    AGENT_EXECUTION_RETENTION_DAYS: int = 0
+    PORTFOLIO_SNAPSHOT_RETENTION_DAYS: int = 0
+    # 记录Agent执行时同步 upsert latest_agent_state，Exploration 页面按主键读取
+    AGENT_LATEST_STATE_TABLE_ENABLED: bool = True
+    # Exploration页面物化视图同步到Redis（多worker部署时开启）
+    EXPLORATION_DASHBOARD_REDIS_ENABLED: bool = False
+    EXPLORATION_DASHBOARD_REDIS_SYNC_SECONDS: int = 5
+    # 实时推送（SSE）：每个连接的事件队列上限、心跳间隔；多worker部署时经Redis pub/sub扇出
+    REALTIME_QUEUE_SIZE: int = 256
+    REALTIME_HEARTBEAT_SECONDS: int = 15
+    REALTIME_REDIS_ENABLED: bool = False
+    REALTIME_REDIS_CHANNEL: str = "realtime:events"
+
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_CACHE_TTL: int = 3600
@@ -53,6 +71,10 @@ class Settings(BaseSettings):
     # Firebase Admin SDK (service account for backend)
     FIREBASE_SERVICE_ACCOUNT_PATH: str = ""  # Path to service account JSON
 
+    # Auth cache: verified ID tokens (until exp) and user rows by Firebase UID
+    AUTH_TOKEN_CACHE_SIZE: int = 10000
+    AUTH_USER_CACHE_TTL_SECONDS: int = 60
+
     # LLM Providers
     OPENROUTER_API_KEY: str = ""
     OPENROUTER_BASE_URL: str = "https://openrouter.ai/api/v1"
@@ -63,6 +85,39 @@ class Settings(BaseSettings):
     DEFAULT_LLM_PROVIDER: str = "tuzi"
     DEFAULT_LLM_MODEL: str = "claude-3.5-sonnet"
 
+    # LLM response cache for business agents (per-agent TTLs in AgentLLMConfig.CACHE_POLICIES)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 512
+    LLM_CACHE_REDIS_ENABLED: bool = False
+    # LLM admission control per (provider, model): max concurrent requests and tokens/minute (0 = unlimited)
+    # LLM_MODEL_LIMITS overrides by "provider:model" or "provider",
+    # e.g. {"openrouter:anthropic/claude-sonnet-4.5": {"concurrency": 4, "tpm": 400000}}
+    LLM_ADMISSION_ENABLED: bool = True
+    LLM_DEFAULT_CONCURRENCY: int = 8
+    LLM_DEFAULT_TPM: int = 0
+    LLM_MODEL_LIMITS: Dict[str, Dict[str, int]] = {}
+    # Hedged requests: after the primary model's p95 latency (clamped; default until enough samples),
+    # send the same request to the agent's fallback provider and keep the first valid response
+    LLM_HEDGING_ENABLED: bool = True
+    LLM_HEDGE_DEFAULT_DELAY_SECONDS: float = 30.0
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = 5.0
+    LLM_HEDGE_MAX_DELAY_SECONDS: float = 90.0
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    # Token budget for the market-data part of agent prompts (PromptEncoder drops low-priority sections beyond it)
+    AGENT_PROMPT_TOKEN_BUDGET: int = 1200
+    # Agents request structured output as a forced tool call (models rejecting tools fall back to prompt JSON)
+    LLM_STRUCTURED_OUTPUT_ENABLED: bool = True
+    # How long a model that rejected the tool call is sent prompt-mode requests only
+    LLM_PROMPT_MODE_TTL_SECONDS: int = 3600
+
+    # Offline stub LLM provider (app/services/llm/stub.py): replaces all providers when enabled
+    LLM_STUB_ENABLED: bool = False
+    LLM_STUB_TTFB_SECONDS: float = 1.5  # median time to first token (log-normal)
+    LLM_STUB_TTFB_SIGMA: float = 0.5
+    LLM_STUB_TOKENS_PER_SECOND: float = 80.0
+    LLM_STUB_ERROR_RATE: float = 0.0  # injected HTTP 429/5xx
+    LLM_STUB_MALFORMED_RATE: float = 0.0  # injected non-JSON completions
+
     # Data Sources
     BINANCE_API_KEY: str = ""
     BINANCE_API_SECRET: str = ""
@@ -72,14 +127,32 @@ class Settings(BaseSettings):
     # Monitoring
     SENTRY_DSN: str = ""
     ENABLE_MONITORING: bool = False
+    # 系统错误按指纹在内存聚合，后台线程定时批量 upsert（关闭则在调用方会话中直接 upsert）
+    ERROR_TRACKER_BUFFERED: bool = True
+    ERROR_TRACKER_FLUSH_SECONDS: int = 5
+    ERROR_TRACKER_MAX_PENDING: int = 1000
 
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "json"
+    # 日志索引存储（SQLite），供 /admin/debug/logs/search 按级别/时间/组件检索
+    LOG_STORE_ENABLED: bool = False
+    LOG_STORE_PATH: str = ".pids/logs.db"
+    LOG_STORE_LEVEL: str = "WARNING"
+    LOG_STORE_RETENTION_DAYS: int = 7
 
     # Cost Tracking
     DAILY_COST_ALERT_THRESHOLD: float = 50.0
     ENABLE_COST_ALERTS: bool = True
+    # LLM 调用遥测：最近 N 次调用的内存环形缓冲 + 每 N 秒写入 llm_usage_rollups
+    LLM_TELEMETRY_RING_SIZE: int = 5000
+    LLM_TELEMETRY_ROLLUP_SECONDS: int = 60
+    # 当日花费达到阈值的该比例时告警（达到阈值时再告警一次）
+    LLM_COST_WARNING_RATIO: float = 0.8
+    # 达到阈值的该比例后，非交易通道请求降级：限制 max_tokens 并延迟准入（0 = 关闭）
+    LLM_BUDGET_THROTTLE_RATIO: float = 0.9
+    LLM_BUDGET_THROTTLE_MAX_TOKENS: int = 4096
+    LLM_BUDGET_THROTTLE_DELAY_SECONDS: float = 2.0
 
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:3010"]
@@ -87,6 +160,10 @@ class Settings(BaseSettings):
     CORS_METHODS: List[str] = ["*"]
     CORS_HEADERS: List[str] = ["*"]
 
+    # Response compression (gzip, brotli when installed) for JSON bodies above the threshold
+    RESPONSE_COMPRESSION_ENABLED: bool = True
+    RESPONSE_COMPRESSION_MIN_BYTES: int = 1024
+
     @field_validator("CORS_ORIGINS", mode="before")
     @classmethod
     def parse_cors_origins(cls, v):
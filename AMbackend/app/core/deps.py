@@ -8,7 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.db.session import AsyncSessionLocal
-from app.core.firebase import verify_firebase_token
+from app.core.auth_cache import auth_cache
 from app.models.user import User
 
 
@@ -36,6 +36,31 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def _get_user_by_firebase_uid(db: AsyncSession, firebase_uid: str) -> Optional[User]:
+    """
+    Load the user for a Firebase UID, served from the user cache when possible
+
+    Args:
+        db: Database session
+        firebase_uid: Firebase UID (stored in User.google_id)
+
+    Returns:
+        User attached to ``db`` or None if not registered yet
+    """
+    user = await auth_cache.get_user(db, firebase_uid)
+    if user is not None:
+        return user
+
+    # Query user from database using Firebase UID
+    result = await db.execute(
+        select(User).where(User.google_id == firebase_uid)  # Using google_id to store Firebase UID
+    )
+    user = result.scalar_one_or_none()
+    if user is not None:
+        auth_cache.remember_user(firebase_uid, user)
+    return user
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db),
@@ -61,8 +86,8 @@ async def get_current_user(
 
     token = credentials.credentials
 
-    # Verify Firebase token
-    decoded_token = verify_firebase_token(token)
+    # Verify Firebase token (cached until the token's exp)
+    decoded_token = await auth_cache.verify_token(token)
 
     if decoded_token is None:
         raise credentials_exception
@@ -72,11 +97,7 @@ async def get_current_user(
     if firebase_uid is None:
         raise credentials_exception
 
-    # Query user from database using Firebase UID
-    result = await db.execute(
-        select(User).where(User.google_id == firebase_uid)  # Using google_id to store Firebase UID
-    )
-    user = result.scalar_one_or_none()
+    user = await _get_user_by_firebase_uid(db, firebase_uid)
 
     if user is None:
         # Create new user if doesn't exist
@@ -100,6 +121,7 @@ async def get_current_user(
         db.add(user)
         await db.commit()
         await db.refresh(user)
+        auth_cache.remember_user(firebase_uid, user)
 
     if not user.is_active:
         raise HTTPException(
@@ -220,8 +242,8 @@ async def get_optional_user(
     
     token = credentials.credentials
     
-    # Verify Firebase token
-    decoded_token = verify_firebase_token(token)
+    # Verify Firebase token (cached until the token's exp)
+    decoded_token = await auth_cache.verify_token(token)
     
     if decoded_token is None:
         return None
@@ -231,11 +253,7 @@ async def get_optional_user(
     if firebase_uid is None:
         return None
     
-    # Query user from database using Firebase UID
-    result = await db.execute(
-        select(User).where(User.google_id == firebase_uid)
-    )
-    user = result.scalar_one_or_none()
+    user = await _get_user_by_firebase_uid(db, firebase_uid)
     
     if user and not user.is_active:
         return None
@@ -0,0 +1,63 @@
+"""Conditional GET helpers (strong ETags, If-None-Match, 304)
+
+ETags are derived from a data version (execution id, cache build time,
+snapshot time), so handlers can answer ``304 Not Modified`` before touching
+the database or upstream APIs. ``CompressionMiddleware`` appends the content
+coding to the ETag of compressed bodies (``"abc-gzip"``); matching ignores
+that suffix.
+"""
+
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+from app.core.serialization import ORJSONResponse
+
+# ETag suffixes added by CompressionMiddleware per content coding
+ENCODING_SUFFIXES = ("-gzip", "-br")
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag from version parts"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def _strip_tag(tag: str) -> str:
+    tag = tag.strip().removeprefix("W/")
+    for suffix in ENCODING_SUFFIXES:
+        if tag.endswith(suffix + '"'):
+            return tag[: -len(suffix) - 1] + '"'
+    return tag
+
+
+def etag_matches(request: Request, etag: Optional[str]) -> bool:
+    """Whether the request's If-None-Match covers ``etag``"""
+    if not etag:
+        return False
+
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+
+    candidates = {_strip_tag(tag) for tag in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def not_modified(etag: str, cache_control: str = "no-cache") -> Response:
+    """304 response carrying the validator"""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def json_response(content: Any, etag: Optional[str], cache_control: str = "no-cache") -> ORJSONResponse:
+    """
+    JSON response with validator headers
+
+    Handlers return this whether or not a version (``etag``) is known, so
+    both paths render through the same encoder.
+    """
+    headers = {"Cache-Control": cache_control}
+    if etag:
+        headers["ETag"] = etag
+    return ORJSONResponse(content=content, headers=headers)
@@ -1,12 +1,20 @@
 """Custom middleware for error handling and logging"""
 
+import gzip
 import time
-from typing import Callable
+from typing import Callable, Optional
 from fastapi import Request, Response, status
 from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import traceback
 
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
 
 class ErrorHandlerMiddleware(BaseHTTPMiddleware):
     """Middleware to handle all errors and return consistent JSON responses"""
@@ -69,3 +77,118 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
 
         return response
+
+
+class CompressionMiddleware:
+    """
+    Content-negotiated gzip / brotli compression for buffered responses
+
+    - Only single-body responses at or above ``minimum_size`` with a compressible
+      content type are compressed; streaming responses (SSE) pass through untouched
+    - Brotli is preferred when the client accepts it and the ``brotli`` package is installed
+    - Strong ETags get the content coding appended (``"abc"`` -> ``"abc-gzip"``)
+      so compressed and identity representations never share a validator
+    """
+
+    COMPRESSIBLE_TYPES = ("application/json", "text/html", "text/plain", "text/css", "application/javascript")
+    GZIP_LEVEL = 6
+    BROTLI_QUALITY = 5
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    @staticmethod
+    def choose_encoding(accept_encoding: str) -> Optional[str]:
+        """Pick br / gzip from Accept-Encoding (honoring q=0)"""
+        accepted = {}
+        for item in accept_encoding.split(","):
+            coding, _, params = item.strip().partition(";")
+            quality = 1.0
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            if coding:
+                accepted[coding.strip().lower()] = quality
+
+        wildcard = accepted.get("*", 0.0)
+        if brotli is not None and accepted.get("br", wildcard) > 0:
+            return "br"
+        if accepted.get("gzip", wildcard) > 0:
+            return "gzip"
+        return None
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.BROTLI_QUALITY)
+        return gzip.compress(body, compresslevel=self.GZIP_LEVEL)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        streaming = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, streaming
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            if streaming:
+                await send(message)
+                return
+
+            headers = MutableHeaders(scope=start_message)
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            content_type = headers.get("content-type", "").split(";")[0].strip()
+
+            if more_body or start_message["status"] in (204, 304):
+                streaming = more_body
+                if start_message["status"] == 304:
+                    self._rewrite_not_modified_etag(scope, headers, encoding)
+                await send(start_message)
+                await send(message)
+                return
+
+            if content_type in self.COMPRESSIBLE_TYPES:
+                headers.add_vary_header("Accept-Encoding")
+                if len(body) >= self.minimum_size and "content-encoding" not in headers:
+                    body = self.compress(body, encoding)
+                    headers["Content-Encoding"] = encoding
+                    headers["Content-Length"] = str(len(body))
+                    etag = headers.get("etag")
+                    if etag and etag.startswith('"') and etag.endswith('"'):
+                        headers["ETag"] = f'{etag[:-1]}-{encoding}"'
+                    message = {**message, "body": body}
+
+            await send(start_message)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _rewrite_not_modified_etag(scope: Scope, headers: MutableHeaders, encoding: str) -> None:
+        """304: echo the validator in the form the client cached (compressed or not)"""
+        etag = headers.get("etag")
+        if not etag or not etag.endswith('"'):
+            return
+        compressed_tag = f'{etag[:-1]}-{encoding}"'
+        if compressed_tag in Headers(scope=scope).get("if-none-match", ""):
+            headers["ETag"] = compressed_tag
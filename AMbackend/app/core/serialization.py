@@ -0,0 +1,71 @@
+"""Project-wide JSON serialization built on orjson
+
+Used for API responses (default FastAPI response class), JSONB binds on every
+async engine, and JSONB snapshots written by the strategy/agent recorders.
+
+orjson handles datetime/date/UUID/Enum/dataclass and NumPy natively; the
+``default`` hook covers Decimal, Pydantic models (JSON mode, so the models'
+own encoders apply), sets and datetime subclasses such as ``pandas.Timestamp``.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, BaseModel):
+        # JSON mode applies the model's own encoders (UTCAwareBaseModel offsets)
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if hasattr(obj, "dict"):
+        return obj.dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes"""
+    return orjson.dumps(obj, default=_default, option=OPTIONS)
+
+
+def dumps_str(obj: Any) -> str:
+    """Serialize to a JSON string (SQLAlchemy ``json_serializer``)"""
+    return dumps(obj).decode("utf-8")
+
+
+loads = orjson.loads
+
+
+def to_jsonable(obj: Any) -> Any:
+    """
+    Convert to plain JSON types (dict/list/str/float/int/bool/None)
+
+    Replaces the recursive Python walks used before storing snapshots in
+    JSONB: one orjson round-trip in C instead of an isinstance chain per node.
+    """
+    return orjson.loads(dumps(obj))
+
+
+# SQLAlchemy engine kwargs: JSON/JSONB columns serialize through orjson
+ENGINE_JSON_KWARGS = {
+    "json_serializer": dumps_str,
+    "json_deserializer": loads,
+}
+
+
+class ORJSONResponse(JSONResponse):
+    """Default API response class rendering through :func:`dumps`"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
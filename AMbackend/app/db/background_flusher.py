@@ -0,0 +1,75 @@
+"""Periodic background flush with its own event loop and engine
+
+In-memory buffers that are written to the database in batches (error
+tracker, LLM telemetry rollups) flush from a daemon thread running its own
+event loop, with a single-connection engine that is independent of request
+sessions and the application pool.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.serialization import ENGINE_JSON_KWARGS
+
+
+class BackgroundFlusher:
+    """Call ``flush(db)`` every ``interval_seconds`` in a background thread"""
+
+    def __init__(
+        self,
+        name: str,
+        interval_seconds: float,
+        flush: Callable[[AsyncSession], Awaitable[Any]],
+    ):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self._flush = flush
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the thread (no-op when running)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=lambda: asyncio.run(self._run()),
+                name=self.name,
+                daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the thread after a final flush"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop_event.set()
+        thread.join(timeout)
+        self._thread = None
+
+    async def _run(self) -> None:
+        engine = create_async_engine(
+            settings.DATABASE_URL,
+            pool_size=1,
+            max_overflow=0,
+            pool_pre_ping=True,
+            **ENGINE_JSON_KWARGS,
+        )
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        try:
+            # The wakeup that sees the stop request still flushes, even if
+            # stop() was called before the loop started
+            stopping = False
+            while not stopping:
+                stopping = await asyncio.to_thread(self._stop_event.wait, self.interval_seconds)
+                async with session_factory() as db:
+                    await self._flush(db)
+        finally:
+            await engine.dispose()
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sess
 from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
+from app.core.serialization import ENGINE_JSON_KWARGS
 
 
 # Create async engine
@@ -15,6 +16,7 @@ engine = create_async_engine(
     pool_size=settings.DATABASE_POOL_SIZE,
     max_overflow=settings.DATABASE_MAX_OVERFLOW,
     poolclass=NullPool if settings.ENVIRONMENT == "test" else None,
+    **ENGINE_JSON_KWARGS,
 )
 
 # Create async session factory
@@ -0,0 +1,222 @@
+"""TimescaleDB hypertable management
+
+执行历史表 (strategy_executions / agent_executions / portfolio_snapshots) 在迁移
+c3f9a8e1d7b2 中被转换为 hypertable。本模块负责:
+- 按配置应用/更新压缩和保留策略 (可重复执行)
+  strategy_executions 被 trades / agent_executions 引用 (外键已在迁移中删除),
+  其保留由 prune_strategy_executions 作业执行: 先将引用置空, 再删除过期 chunk
+- 手动压缩旧 chunk
+- 查询 hypertable 的 chunk 数量和压缩前后大小
+
+按时间列过滤的查询 (如 get_executions_by_time_range) 会自动只扫描相关 chunk。
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HypertableSpec:
+    """hypertable 配置"""
+    table: str
+    time_column: str
+    segment_by: str
+    retention_setting: str
+    # 保留作业的存储过程 (先解除引用再删 chunk), None 则使用 add_retention_policy
+    prune_procedure: Optional[str] = None
+
+    @property
+    def retention_days(self) -> int:
+        return getattr(settings, self.retention_setting)
+
+
+HYPERTABLES: List[HypertableSpec] = [
+    HypertableSpec(
+        table="strategy_executions",
+        time_column="execution_time",
+        segment_by="portfolio_id",
+        retention_setting="STRATEGY_EXECUTION_RETENTION_DAYS",
+        prune_procedure="prune_strategy_executions",
+    ),
+    HypertableSpec(
+        table="agent_executions",
+        time_column="executed_at",
+        segment_by="agent_name",
+        retention_setting="AGENT_EXECUTION_RETENTION_DAYS",
+    ),
+    HypertableSpec(
+        table="portfolio_snapshots",
+        time_column="snapshot_time",
+        segment_by="portfolio_id",
+        retention_setting="PORTFOLIO_SNAPSHOT_RETENTION_DAYS",
+    ),
+]
+
+
+async def is_timescaledb_enabled(db: AsyncSession) -> bool:
+    """检查 timescaledb 扩展是否已安装"""
+    result = await db.execute(
+        text("SELECT EXISTS(SELECT 1 FROM pg_extension WHERE extname = 'timescaledb')")
+    )
+    return bool(result.scalar())
+
+
+async def get_hypertables(db: AsyncSession) -> List[str]:
+    """已转换为 hypertable 的表名"""
+    result = await db.execute(
+        text("SELECT hypertable_name FROM timescaledb_information.hypertables")
+    )
+    return [row[0] for row in result.all()]
+
+
+async def apply_policies(
+    db: AsyncSession,
+    compress_after_days: Optional[int] = None,
+) -> Dict[str, Dict[str, Optional[int]]]:
+    """
+    按当前配置重新应用压缩和保留策略
+
+    Args:
+        db: 数据库会话
+        compress_after_days: 覆盖 TIMESCALE_COMPRESS_AFTER_DAYS
+
+    Returns:
+        {table: {"compress_after_days": N, "retention_days": M or None}}
+    """
+    compress_after = compress_after_days or settings.TIMESCALE_COMPRESS_AFTER_DAYS
+    existing = set(await get_hypertables(db))
+    applied = {}
+
+    for spec in HYPERTABLES:
+        if spec.table not in existing:
+            logger.warning(f"{spec.table} 不是 hypertable, 跳过 (请先运行 alembic upgrade)")
+            continue
+
+        await db.execute(
+            text(
+                f"ALTER TABLE {spec.table} SET ("
+                f"timescaledb.compress, "
+                f"timescaledb.compress_segmentby = '{spec.segment_by}', "
+                f"timescaledb.compress_orderby = '{spec.time_column} DESC')"
+            )
+        )
+        await db.execute(
+            text(f"SELECT remove_compression_policy('{spec.table}', if_exists => true)")
+        )
+        await db.execute(
+            text(f"SELECT add_compression_policy('{spec.table}', make_interval(days => :days))"),
+            {"days": compress_after},
+        )
+
+        await db.execute(
+            text(f"SELECT remove_retention_policy('{spec.table}', if_exists => true)")
+        )
+        if spec.prune_procedure:
+            await db.execute(
+                text(
+                    "SELECT delete_job(job_id) FROM timescaledb_information.jobs "
+                    "WHERE proc_name = :proc"
+                ),
+                {"proc": spec.prune_procedure},
+            )
+        retention_days = spec.retention_days
+        if retention_days > 0 and spec.prune_procedure:
+            await db.execute(
+                text(
+                    f"SELECT add_job('{spec.prune_procedure}', INTERVAL '1 day', "
+                    f"config => jsonb_build_object('retention_days', CAST(:days AS INT)))"
+                ),
+                {"days": retention_days},
+            )
+        elif retention_days > 0:
+            await db.execute(
+                text(f"SELECT add_retention_policy('{spec.table}', make_interval(days => :days))"),
+                {"days": retention_days},
+            )
+
+        applied[spec.table] = {
+            "compress_after_days": compress_after,
+            "retention_days": retention_days or None,
+        }
+        logger.info(
+            f"✓ {spec.table}: 压缩 {compress_after} 天后, "
+            f"保留 {retention_days or '永久'} 天"
+        )
+
+    await db.commit()
+    return applied
+
+
+async def compress_chunks(db: AsyncSession, older_than_days: int) -> Dict[str, int]:
+    """
+    立即压缩早于 N 天的 chunk (不等待后台策略)
+
+    Returns:
+        {table: 压缩的chunk数量}
+    """
+    existing = set(await get_hypertables(db))
+    compressed = {}
+
+    for spec in HYPERTABLES:
+        if spec.table not in existing:
+            continue
+        result = await db.execute(
+            text(
+                f"SELECT compress_chunk(c, if_not_compressed => true) "
+                f"FROM show_chunks('{spec.table}', older_than => make_interval(days => :days)) c"
+            ),
+            {"days": older_than_days},
+        )
+        compressed[spec.table] = len(result.all())
+
+    await db.commit()
+    return compressed
+
+
+async def get_hypertable_stats(db: AsyncSession) -> List[Dict]:
+    """
+    各 hypertable 的 chunk 数量与压缩前后大小
+
+    Returns:
+        [{"table", "total_chunks", "compressed_chunks",
+          "before_compression_bytes", "after_compression_bytes", "total_bytes"}]
+    """
+    existing = set(await get_hypertables(db))
+    stats = []
+
+    for spec in HYPERTABLES:
+        if spec.table not in existing:
+            continue
+
+        size_result = await db.execute(
+            text(f"SELECT hypertable_size('{spec.table}')")
+        )
+        compression_result = await db.execute(
+            text(
+                "SELECT total_chunks, number_compressed_chunks, "
+                "before_compression_total_bytes, after_compression_total_bytes "
+                f"FROM hypertable_compression_stats('{spec.table}')"
+            )
+        )
+        row = compression_result.first()
+
+        stats.append({
+            "table": spec.table,
+            "time_column": spec.time_column,
+            "total_chunks": row[0] if row else 0,
+            "compressed_chunks": row[1] if row else 0,
+            "before_compression_bytes": row[2] if row else None,
+            "after_compression_bytes": row[3] if row else None,
+            "total_bytes": size_result.scalar(),
+            "retention_days": spec.retention_days or None,
+        })
+
+    return stats
@@ -6,6 +6,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.core.config import settings
+from app.core.middleware import CompressionMiddleware
+from app.core.serialization import ORJSONResponse
 from app.api.v1.api import api_router
 
 
@@ -16,6 +18,13 @@ async def lifespan(app: FastAPI):
     print(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
     print(f"Environment: {settings.ENVIRONMENT}")
 
+    # Indexed log store (LOG_STORE_ENABLED)
+    try:
+        from app.services.monitoring.log_store import install_log_store
+        install_log_store()
+    except Exception as e:
+        print(f"⚠ Warning: Log store initialization failed: {e}")
+
     # Initialize Firebase
     try:
         from app.core.firebase import initialize_firebase
@@ -25,6 +34,13 @@ async def lifespan(app: FastAPI):
         print(f"⚠ Warning: Firebase initialization failed: {e}")
         print("  App will continue but authentication may not work properly")
 
+    # Start Firebase signing key refresh (token verification without blocking on key fetches)
+    try:
+        from app.core.auth_cache import auth_cache
+        await auth_cache.start()
+    except Exception as e:
+        print(f"⚠ Warning: Auth cache start failed: {e}")
+
     # Start Strategy Scheduler
     try:
         from app.services.strategy.scheduler import strategy_scheduler
@@ -36,6 +52,20 @@ async def lifespan(app: FastAPI):
         import traceback
         traceback.print_exc()
 
+    # Start LLM telemetry rollups (llm_usage_rollups, daily cost budget)
+    try:
+        from app.services.llm.telemetry import llm_telemetry
+        llm_telemetry.start()
+    except Exception as e:
+        print(f"⚠ Warning: LLM telemetry start failed: {e}")
+
+    # Start realtime event bus (Redis listener when REALTIME_REDIS_ENABLED)
+    try:
+        from app.services.realtime.event_bus import event_bus
+        await event_bus.start()
+    except Exception as e:
+        print(f"⚠ Warning: Realtime event bus start failed: {e}")
+
     yield
 
     # Shutdown
@@ -49,6 +79,34 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"⚠ Warning: Strategy scheduler shutdown failed: {e}")
 
+    # Write pending LLM usage rollups (before the error tracker: may raise cost alerts)
+    try:
+        from app.services.llm.telemetry import llm_telemetry
+        llm_telemetry.stop()
+    except Exception as e:
+        print(f"⚠ Warning: LLM telemetry flush failed: {e}")
+
+    # Flush buffered system errors
+    try:
+        from app.services.monitoring.error_tracker import error_ingestion_queue
+        error_ingestion_queue.stop()
+    except Exception as e:
+        print(f"⚠ Warning: Error tracker flush failed: {e}")
+
+    # Stop Firebase signing key refresh
+    try:
+        from app.core.auth_cache import auth_cache
+        await auth_cache.stop()
+    except Exception as e:
+        print(f"⚠ Warning: Auth cache shutdown failed: {e}")
+
+    # Stop realtime event bus
+    try:
+        from app.services.realtime.event_bus import event_bus
+        await event_bus.stop()
+    except Exception as e:
+        print(f"⚠ Warning: Realtime event bus shutdown failed: {e}")
+
 
 def create_application() -> FastAPI:
     """Create and configure FastAPI application"""
@@ -61,6 +119,7 @@ def create_application() -> FastAPI:
         redoc_url="/redoc",
         openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     # Configure CORS
@@ -72,6 +131,13 @@ def create_application() -> FastAPI:
         allow_headers=settings.CORS_HEADERS,
     )
 
+    # Configure response compression
+    if settings.RESPONSE_COMPRESSION_ENABLED:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.RESPONSE_COMPRESSION_MIN_BYTES,
+        )
+
     # Include API routers
     app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
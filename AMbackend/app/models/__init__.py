@@ -5,7 +5,7 @@
 
 from app.models.base import Base
 from app.models.user import User
-from app.models.agent_execution import AgentExecution
+from app.models.agent_execution import AgentExecution, LatestAgentState
 from app.models.strategy_execution import StrategyExecution
 from app.models.portfolio import Portfolio, PortfolioHolding, Trade, PortfolioSnapshot
 from app.models.strategy_definition import StrategyDefinition
@@ -17,6 +17,7 @@ __all__ = [
     "Base",
     "User",
     "AgentExecution",
+    "LatestAgentState",
     "StrategyExecution",
     "Portfolio",
     "PortfolioHolding",
@@ -6,7 +6,7 @@
 
 from sqlalchemy import Column, String, Integer, Text, ForeignKey, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB, TIMESTAMP, NUMERIC
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy import text as sa_text
 import uuid
 from datetime import datetime
@@ -38,7 +38,7 @@ class AgentExecution(Base):
     agent_display_name = Column(String(100), comment="显示名称: The Oracle, Momentum Scout, Data Warden")
 
     # 执行信息
-    executed_at = Column(TIMESTAMP, nullable=False, index=True, comment="执行时间")
+    executed_at = Column(TIMESTAMP, nullable=False, index=True, comment="执行时间")  # TimescaleDB hypertable 分区列
     execution_duration_ms = Column(Integer, comment="执行耗时（毫秒）")
     status = Column(String(20), default='success', comment="执行状态: success, failed, timeout")
 
@@ -54,13 +54,17 @@ class AgentExecution(Base):
         nullable=False,
         comment="Agent专属数据: MacroAgent: {etf_flow, fed_rate, ...}, TAAgent: {ema_21, rsi_14, ...}, OnChainAgent: {mvrv, nvt, ...}"
     )
-    market_data_snapshot = Column(JSONB, comment="执行时的完整市场数据（用于复现分析）")
+    # 大字段延迟加载（group="llm_payload"），只有详情接口通过 undefer_group 读取
+    market_data_snapshot = deferred(
+        Column(JSONB, comment="执行时的完整市场数据（用于复现分析）"),
+        group="llm_payload",
+    )
 
     # LLM调用追踪
     llm_provider = Column(String(50), comment="LLM供应商: tuzi, openrouter")
     llm_model = Column(String(100), comment="LLM模型: claude-sonnet-4-5-thinking-all")
-    llm_prompt = Column(Text, comment="发送给LLM的完整prompt")
-    llm_response = Column(Text, comment="LLM原始响应")
+    llm_prompt = deferred(Column(Text, comment="发送给LLM的完整prompt"), group="llm_payload")
+    llm_response = deferred(Column(Text, comment="LLM原始响应"), group="llm_payload")
     tokens_used = Column(Integer, comment="Token消耗")
     llm_cost = Column(NUMERIC(10, 6), comment="LLM调用成本（USD）")
 
@@ -72,10 +76,10 @@ class AgentExecution(Base):
     )
     caller_id = Column(UUID(as_uuid=True), index=True, comment="调用方ID: conversation_id (可为NULL)")
 
-    # 💡 策略系统专用关联（强类型外键）
+    # 💡 策略系统专用关联（strategy_executions 是 hypertable，不能作为外键目标，
+    # 关联关系见下方 relationship 的 primaryjoin）
     strategy_execution_id = Column(
         UUID(as_uuid=True),
-        ForeignKey("strategy_executions.id"),
         comment="策略执行ID (可为NULL) - 策略系统的强关联"
     )
 
@@ -98,7 +102,11 @@ class AgentExecution(Base):
 
     # Relationships
     user = relationship("User", back_populates="agent_executions")
-    strategy_execution = relationship("StrategyExecution", back_populates="agent_executions")
+    strategy_execution = relationship(
+        "StrategyExecution",
+        primaryjoin="foreign(AgentExecution.strategy_execution_id) == StrategyExecution.id",
+        back_populates="agent_executions",
+    )
 
     # 约束
     __table_args__ = (
@@ -152,3 +160,45 @@ class AgentExecution(Base):
             "user_id": str(self.user_id) if self.user_id else None,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
+
+
+class LatestAgentState(Base):
+    """每个Agent最新一次成功执行的物化状态
+
+    由 AgentExecutionRecorder 在每次成功记录时 upsert（按 executed_at 只前进不后退），
+    Exploration 页面按主键 agent_name 读取，无需在 agent_executions 上排序扫描。
+    只保留展示所需的列，reasoning 截断为预览长度。
+    """
+    __tablename__ = "latest_agent_state"
+
+    agent_name = Column(String(50), primary_key=True, comment="Agent名称")
+    execution_id = Column(UUID(as_uuid=True), nullable=False, comment="对应的 agent_executions.id")
+    agent_display_name = Column(String(100))
+
+    executed_at = Column(TIMESTAMP, nullable=False)
+    execution_duration_ms = Column(Integer)
+    status = Column(String(20), nullable=False)
+
+    signal = Column(String(20), nullable=False)
+    confidence = Column(NUMERIC(3, 2), nullable=False)
+    score = Column(NUMERIC(5, 2), nullable=False)
+    reasoning = Column(Text, comment="reasoning 预览（截断）")
+
+    agent_specific_data = Column(JSONB)
+    market_macro = Column(JSONB, comment="market_data_snapshot 中的 macro 部分")
+
+    llm_provider = Column(String(50))
+    llm_model = Column(String(100))
+    tokens_used = Column(Integer)
+    llm_cost = Column(NUMERIC(10, 6))
+
+    caller_type = Column(String(50))
+    caller_id = Column(UUID(as_uuid=True))
+    strategy_execution_id = Column(UUID(as_uuid=True))
+    template_execution_batch_id = Column(UUID(as_uuid=True))
+    user_id = Column(Integer)
+
+    updated_at = Column(TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<LatestAgentState(agent={self.agent_name}, signal={self.signal}, executed_at={self.executed_at})>"
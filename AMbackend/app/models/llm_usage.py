@@ -0,0 +1,42 @@
+"""LLM usage rollup model"""
+
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index
+from sqlalchemy.sql import func
+from app.models.base import Base
+
+
+class LLMUsageRollup(Base):
+    """LLM 调用汇总表 (每个刷新周期每个 agent/provider/model 一行)"""
+
+    __tablename__ = "llm_usage_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # 汇总时间窗口 (UTC, 不跨天)
+    bucket_start = Column(DateTime(timezone=True), nullable=False)
+    bucket_end = Column(DateTime(timezone=True), nullable=False)
+
+    agent_name = Column(String(100), nullable=False)  # 非 agent 调用为 '-'
+    provider = Column(String(50), nullable=False)
+    model = Column(String(200), nullable=False)
+
+    # 调用次数与 token
+    calls = Column(Integer, nullable=False, default=0)
+    errors = Column(Integer, nullable=False, default=0)
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    cache_read_tokens = Column(Integer, nullable=False, default=0)
+    cost_usd = Column(Float, nullable=False, default=0.0)
+
+    # 延迟分位数 (毫秒, 窗口内成功调用)
+    latency_p50_ms = Column(Float, nullable=True)
+    latency_p95_ms = Column(Float, nullable=True)
+    latency_p99_ms = Column(Float, nullable=True)
+    ttfb_p95_ms = Column(Float, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_llm_usage_rollups_bucket_start", "bucket_start"),
+        Index("ix_llm_usage_rollups_agent_bucket", "agent_name", "bucket_start"),
+    )
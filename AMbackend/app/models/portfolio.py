@@ -52,6 +52,13 @@ class Portfolio(Base):
     max_drawdown = Column(Float, server_default='0')
     sharpe_ratio = Column(Float)
 
+    # 权益曲线流式统计（由 performance_analytics 按快照增量维护）
+    equity_peak_value = Column(NUMERIC(20, 8), nullable=True, comment="历史最高总价值")
+    equity_last_value = Column(NUMERIC(20, 8), nullable=True, comment="上一个快照的总价值")
+    returns_count = Column(Integer, server_default='0', nullable=False, comment="已统计的周期收益数量")
+    returns_mean = Column(Float, server_default='0', nullable=False, comment="周期收益率均值 (Welford)")
+    returns_m2 = Column(Float, server_default='0', nullable=False, comment="周期收益率离差平方和 (Welford)")
+
     # 状态
     is_active = Column(Boolean, server_default='true', comment="实例开关")
     
@@ -124,7 +131,8 @@ class Trade(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     portfolio_id = Column(UUID(as_uuid=True), ForeignKey("portfolios.id", ondelete="CASCADE"), nullable=False)
-    execution_id = Column(UUID(as_uuid=True), ForeignKey("strategy_executions.id"))
+    # strategy_executions 是 hypertable，不能作为外键目标（关联见 execution 的 primaryjoin）
+    execution_id = Column(UUID(as_uuid=True))
 
     symbol = Column(String(20), nullable=False, index=True)
     trade_type = Column(String(10), nullable=False, index=True)
@@ -155,7 +163,11 @@ class Trade(Base):
 
     # Relationships
     portfolio = relationship("Portfolio", back_populates="trades")
-    execution = relationship("StrategyExecution", back_populates="trades")
+    execution = relationship(
+        "StrategyExecution",
+        primaryjoin="foreign(Trade.execution_id) == StrategyExecution.id",
+        back_populates="trades",
+    )
 
     __table_args__ = (
         Index('idx_trades_portfolio', 'portfolio_id', 'executed_at'),
@@ -174,7 +186,7 @@ class PortfolioSnapshot(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     portfolio_id = Column(UUID(as_uuid=True), ForeignKey("portfolios.id", ondelete="CASCADE"), nullable=False)
-    snapshot_time = Column(TIMESTAMP, nullable=False, index=True)
+    snapshot_time = Column(TIMESTAMP, nullable=False, index=True)  # TimescaleDB hypertable 分区列
 
     total_value = Column(NUMERIC(20, 8), nullable=False)
     balance = Column(NUMERIC(20, 8), nullable=False)
@@ -14,7 +14,7 @@ class StrategyExecution(Base):
     __tablename__ = "strategy_executions"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    execution_time = Column(TIMESTAMP, nullable=False, index=True)
+    execution_time = Column(TIMESTAMP, nullable=False, index=True)  # TimescaleDB hypertable 分区列
     strategy_name = Column(String(100), nullable=False, index=True)
     status = Column(String(20), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
@@ -49,12 +49,22 @@ class StrategyExecution(Base):
 
     # Relationships
     user = relationship("User", back_populates="strategy_executions")
-    agent_executions = relationship("AgentExecution", back_populates="strategy_execution", cascade="all, delete-orphan")
-    trades = relationship("Trade", back_populates="execution")
+    # 引用方没有外键（hypertable），关联条件需显式指定
+    agent_executions = relationship(
+        "AgentExecution",
+        primaryjoin="StrategyExecution.id == foreign(AgentExecution.strategy_execution_id)",
+        back_populates="strategy_execution",
+        cascade="all, delete-orphan",
+    )
+    trades = relationship(
+        "Trade",
+        primaryjoin="StrategyExecution.id == foreign(Trade.execution_id)",
+        back_populates="execution",
+    )
 
     __table_args__ = (
         Index('idx_executions_user_time', 'user_id', 'execution_time'),
-        Index('idx_executions_portfolio_time', 'portfolio_id', 'execution_time'),
+        Index('idx_executions_portfolio_time_id', 'portfolio_id', 'execution_time', 'id'),  # 执行历史游标分页
     )
 
     def __repr__(self):
@@ -1,6 +1,6 @@
 """System error tracking model"""
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON, Index, text
 from sqlalchemy.sql import func
 from app.models.base import Base
 
@@ -21,6 +21,7 @@ class SystemError(Base):
     component = Column(String(200), nullable=False)  # 'BinanceCollector', 'MacroAgent', 'Scheduler', etc.
     error_message = Column(Text, nullable=False)  # 简短错误信息
     error_details = Column(Text)  # 详细堆栈信息
+    fingerprint = Column(String(32), nullable=False)  # md5(component + "\n" + error_message), 去重键
     
     # 上下文信息
     context = Column(JSON)  # 错误发生时的上下文数据
@@ -42,3 +43,13 @@ class SystemError(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # 同一指纹最多一条未解决记录，ErrorTracker 以此做 INSERT ... ON CONFLICT 聚合
+        Index(
+            "uq_system_errors_open_fingerprint",
+            "fingerprint",
+            unique=True,
+            postgresql_where=text("is_resolved = false"),
+        ),
+    )
+
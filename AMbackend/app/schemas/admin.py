@@ -1,6 +1,7 @@
 """Admin API Schemas"""
 
-from typing import List, Optional, Dict
+from datetime import datetime
+from typing import List, Literal, Optional, Dict
 from pydantic import BaseModel, Field
 from app.schemas.base import UTCAwareBaseModel
 
@@ -53,3 +54,19 @@ class StrategyToggleResponse(BaseModel):
     portfolio_id: str = Field(..., description="策略ID")
     is_active: bool = Field(..., description="当前状态")
     message: str = Field(..., description="消息")
+
+
+class AdminUserUpdateRequest(BaseModel):
+    """用户角色/状态更新请求"""
+
+    role: Optional[Literal["user", "trader", "admin"]] = Field(None, description="目标角色")
+    is_active: Optional[bool] = Field(None, description="是否启用")
+
+
+class StoredLogEntry(UTCAwareBaseModel):
+    """日志索引存储中的条目"""
+
+    created_at: datetime = Field(..., description="记录时间 (UTC)")
+    level: str = Field(..., description="日志级别")
+    component: str = Field(..., description="组件（logger名）")
+    message: str = Field(..., description="日志内容")
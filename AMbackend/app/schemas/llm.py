@@ -9,6 +9,13 @@ class Message(BaseModel):
 
     role: str = Field(..., description="Message role: system, user, or assistant")
     content: str = Field(..., description="Message content")
+    cache_control: bool = Field(
+        False,
+        description=(
+            "Mark the prompt prefix up to this message for provider-side prompt caching; "
+            "keep static instructions here and per-call data in later messages"
+        ),
+    )
 
 
 class LLMResponse(BaseModel):
@@ -17,7 +24,13 @@ class LLMResponse(BaseModel):
     content: str = Field(..., description="Generated content")
     model: str = Field(..., description="Model used")
     provider: str = Field(..., description="Provider name")
-    usage: Optional[Dict[str, int]] = Field(None, description="Token usage stats")
+    usage: Optional[Dict[str, int]] = Field(
+        None,
+        description=(
+            "Token usage stats: prompt_tokens (including cached), completion_tokens, total_tokens, "
+            "cache_read_tokens, cache_write_tokens"
+        ),
+    )
     metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
 
 
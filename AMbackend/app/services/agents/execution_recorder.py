@@ -2,11 +2,13 @@
 
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, desc
+from sqlalchemy import select, and_, or_, desc, func
+from sqlalchemy.dialects.postgresql import insert
 
-from app.models.agent_execution import AgentExecution
+from app.core.config import settings
+from app.core.serialization import to_jsonable
+from app.models.agent_execution import AgentExecution, LatestAgentState
 from app.schemas.agents import (
     MacroAnalysisOutput,
     TechnicalAnalysisOutput,
@@ -26,31 +28,117 @@ class AgentExecutionRecorder:
         'ta_momentum': 'Momentum TA',      # 动量策略
     }
 
+    # 列表/摘要查询中 reasoning 的截断长度（在SQL中截断）
+    REASONING_PREVIEW_CHARS = 200
+
+    @classmethod
+    def summary_columns(cls) -> list:
+        """列表/摘要查询只取的列（不含 prompt/response/市场快照/agent_specific_data 等大字段）"""
+        return [
+            AgentExecution.id,
+            AgentExecution.agent_name,
+            AgentExecution.agent_display_name,
+            AgentExecution.executed_at,
+            AgentExecution.execution_duration_ms,
+            AgentExecution.status,
+            AgentExecution.signal,
+            AgentExecution.confidence,
+            AgentExecution.score,
+            func.left(AgentExecution.reasoning, cls.REASONING_PREVIEW_CHARS).label('reasoning'),
+            AgentExecution.caller_type,
+            AgentExecution.caller_id,
+            AgentExecution.strategy_execution_id,
+            AgentExecution.template_execution_batch_id,
+            AgentExecution.user_id,
+            AgentExecution.llm_provider,
+            AgentExecution.llm_model,
+            AgentExecution.tokens_used,
+            AgentExecution.llm_cost,
+        ]
+
+    @classmethod
+    def latest_summary_columns(cls) -> list:
+        """Mind Hub 展示最新结果所需的列（在 summary_columns 基础上加 agent_specific_data 和快照中的 macro）"""
+        return cls.summary_columns() + [
+            AgentExecution.agent_specific_data,
+            AgentExecution.market_data_snapshot['macro'].label('market_macro'),
+        ]
+
     @staticmethod
-    def _serialize_for_json(obj: Any) -> Any:
-        """
-        递归序列化对象以便存储到 JSONB
+    def latest_state_columns() -> list:
+        """latest_agent_state 中与 latest_summary_columns() 同名的列"""
+        return [
+            LatestAgentState.execution_id.label('id'),
+            LatestAgentState.agent_name,
+            LatestAgentState.agent_display_name,
+            LatestAgentState.executed_at,
+            LatestAgentState.execution_duration_ms,
+            LatestAgentState.status,
+            LatestAgentState.signal,
+            LatestAgentState.confidence,
+            LatestAgentState.score,
+            LatestAgentState.reasoning,
+            LatestAgentState.caller_type,
+            LatestAgentState.caller_id,
+            LatestAgentState.strategy_execution_id,
+            LatestAgentState.template_execution_batch_id,
+            LatestAgentState.user_id,
+            LatestAgentState.llm_provider,
+            LatestAgentState.llm_model,
+            LatestAgentState.tokens_used,
+            LatestAgentState.llm_cost,
+            LatestAgentState.agent_specific_data,
+            LatestAgentState.market_macro,
+        ]
+
+    async def _save(self, db: AsyncSession, execution: AgentExecution) -> AgentExecution:
+        """保存执行记录，并在同一事务中更新 latest_agent_state"""
+        db.add(execution)
+        await db.flush()
+        await self._upsert_latest_state(db, execution)
+        await db.commit()
+        await db.refresh(execution)
 
-        处理:
-        - datetime → ISO 8601 字符串
-        - Decimal → float
-        - Pydantic models → dict
-        - dict/list → 递归处理
-        """
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, Decimal):
-            return float(obj)
-        elif hasattr(obj, 'dict'):  # Pydantic model
-            return AgentExecutionRecorder._serialize_for_json(obj.dict())
-        elif isinstance(obj, dict):
-            return {k: AgentExecutionRecorder._serialize_for_json(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [AgentExecutionRecorder._serialize_for_json(item) for item in obj]
-        elif isinstance(obj, tuple):
-            return [AgentExecutionRecorder._serialize_for_json(item) for item in obj]
-        else:
-            return obj
+        return execution
+
+    async def _upsert_latest_state(self, db: AsyncSession, execution: AgentExecution) -> None:
+        """成功的执行写入 latest_agent_state（只在 executed_at 更新时覆盖）"""
+        if not settings.AGENT_LATEST_STATE_TABLE_ENABLED or execution.status != 'success':
+            return
+
+        snapshot = execution.market_data_snapshot
+        values = {
+            'agent_name': execution.agent_name,
+            'execution_id': execution.id,
+            'agent_display_name': execution.agent_display_name,
+            'executed_at': execution.executed_at,
+            'execution_duration_ms': execution.execution_duration_ms,
+            'status': execution.status,
+            'signal': execution.signal,
+            'confidence': execution.confidence,
+            'score': execution.score,
+            'reasoning': (execution.reasoning or '')[:self.REASONING_PREVIEW_CHARS],
+            'agent_specific_data': execution.agent_specific_data,
+            'market_macro': snapshot.get('macro') if isinstance(snapshot, dict) else None,
+            'llm_provider': execution.llm_provider,
+            'llm_model': execution.llm_model,
+            'tokens_used': execution.tokens_used,
+            'llm_cost': execution.llm_cost,
+            'caller_type': execution.caller_type,
+            'caller_id': execution.caller_id,
+            'strategy_execution_id': execution.strategy_execution_id,
+            'template_execution_batch_id': execution.template_execution_batch_id,
+            'user_id': execution.user_id,
+            'updated_at': datetime.utcnow(),
+        }
+
+        stmt = insert(LatestAgentState).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[LatestAgentState.agent_name],
+            set_={key: stmt.excluded[key] for key in values if key != 'agent_name'},
+            where=stmt.excluded.executed_at >= LatestAgentState.executed_at,
+        )
+        await db.execute(stmt)
 
     async def record_macro_agent(
         self,
@@ -83,7 +171,7 @@ class AgentExecutionRecorder:
             AgentExecution: 保存的执行记录
         """
         # 序列化 market_data 以确保可以存储到 JSONB
-        serialized_market_data = self._serialize_for_json(market_data)
+        serialized_market_data = to_jsonable(market_data)
 
         execution = AgentExecution(
             agent_name='macro_agent',
@@ -121,11 +209,7 @@ class AgentExecutionRecorder:
             template_execution_batch_id=template_execution_batch_id,  # 🆕 批次ID
         )
 
-        db.add(execution)
-        await db.commit()
-        await db.refresh(execution)
-
-        return execution
+        return await self._save(db, execution)
 
     async def record_ta_agent(
         self,
@@ -157,7 +241,7 @@ class AgentExecutionRecorder:
             AgentExecution: 保存的执行记录
         """
         # 序列化 market_data 以确保可以存储到 JSONB
-        serialized_market_data = self._serialize_for_json(market_data)
+        serialized_market_data = to_jsonable(market_data)
 
         execution = AgentExecution(
             agent_name='ta_agent',
@@ -198,11 +282,7 @@ class AgentExecutionRecorder:
             template_execution_batch_id=template_execution_batch_id,  # 🆕 批次ID
         )
 
-        db.add(execution)
-        await db.commit()
-        await db.refresh(execution)
-
-        return execution
+        return await self._save(db, execution)
 
     async def record_onchain_agent(
         self,
@@ -234,7 +314,7 @@ class AgentExecutionRecorder:
             AgentExecution: 保存的执行记录
         """
         # 序列化 market_data 以确保可以存储到 JSONB
-        serialized_market_data = self._serialize_for_json(market_data)
+        serialized_market_data = to_jsonable(market_data)
 
         execution = AgentExecution(
             agent_name='onchain_agent',
@@ -273,23 +353,25 @@ class AgentExecutionRecorder:
             template_execution_batch_id=template_execution_batch_id,  # 🆕 批次ID
         )
 
-        db.add(execution)
-        await db.commit()
-        await db.refresh(execution)
-
-        return execution
+        return await self._save(db, execution)
 
     async def get_latest_executions(
         self,
         db: AsyncSession,
         agent_names: Optional[List[str]] = None,
         user_id: Optional[int] = None,
+        summary: bool = False,
     ) -> Dict[str, AgentExecution]:
         """获取最新的Agent执行结果（用于Mind Hub显示）
 
+        单条 DISTINCT ON 查询取回所有Agent的最新成功执行；
+        summary=True 且不按用户过滤时直接按主键读取 latest_agent_state。
+
         Args:
             agent_names: Agent名称列表，默认查询所有业务Agent
             user_id: 用户ID，如果提供则只查询该用户的执行记录
+            summary: True 时返回 Row（summary_columns() + agent_specific_data +
+                     market_data_snapshot 中的 macro 部分，列名 market_macro）
 
         Returns:
             {
@@ -301,47 +383,164 @@ class AgentExecutionRecorder:
         if agent_names is None:
             agent_names = ['macro_agent', 'ta_agent', 'onchain_agent']
 
-        results = {}
+        if summary and user_id is None and settings.AGENT_LATEST_STATE_TABLE_ENABLED:
+            result = await db.execute(
+                select(*self.latest_state_columns())
+                .where(LatestAgentState.agent_name.in_(agent_names))
+            )
+            return {row.agent_name: row for row in result.all()}
 
-        for agent_name in agent_names:
-            query = select(AgentExecution).where(
-                    and_(
-                        AgentExecution.agent_name == agent_name,
-                        AgentExecution.status == 'success'
-                    )
+        query = (
+            select(*self.latest_summary_columns() if summary else (AgentExecution,))
+            .where(
+                and_(
+                    AgentExecution.agent_name.in_(agent_names),
+                    AgentExecution.status == 'success'
                 )
-            
-            # 如果提供了user_id，添加用户过滤条件
-            # 只查询该用户的记录（策略执行时Agent记录的user_id是portfolio的user_id）
-            if user_id is not None:
-                query = query.where(AgentExecution.user_id == user_id)
-            
-            query = query.order_by(desc(AgentExecution.executed_at)).limit(1)
-            
-            result = await db.execute(query)
-            execution = result.scalar_one_or_none()
-            if execution:
-                results[agent_name] = execution
+            )
+        )
+
+        # 如果提供了user_id，添加用户过滤条件
+        # 只查询该用户的记录（策略执行时Agent记录的user_id是portfolio的user_id）
+        if user_id is not None:
+            query = query.where(AgentExecution.user_id == user_id)
 
-        return results
+        query = (
+            query.distinct(AgentExecution.agent_name)
+            .order_by(AgentExecution.agent_name, desc(AgentExecution.executed_at))
+        )
+
+        result = await db.execute(query)
+        executions = result.all() if summary else result.scalars().all()
+
+        return {execution.agent_name: execution for execution in executions}
+
+    async def get_recent_executions(
+        self,
+        db: AsyncSession,
+        since: datetime,
+        agent_name: Optional[str] = None,
+        limit: int = 50,
+    ):
+        """最近的Agent执行列表（只查询 summary_columns()，reasoning 已截断）
+
+        Args:
+            since: 起始时间
+            agent_name: 只查询指定Agent
+            limit: 返回数量
+
+        Returns:
+            Row列表，按执行时间倒序
+        """
+        query = select(*self.summary_columns()).where(AgentExecution.executed_at >= since)
+
+        if agent_name:
+            query = query.where(AgentExecution.agent_name == agent_name)
+
+        result = await db.execute(
+            query.order_by(desc(AgentExecution.executed_at)).limit(limit)
+        )
+        return result.all()
+
+    async def get_agent_stats(
+        self,
+        db: AsyncSession,
+        since: datetime,
+    ) -> List[Dict[str, Any]]:
+        """按Agent聚合统计（全部在SQL中完成，只返回每个Agent一行）
+
+        Args:
+            since: 统计起始时间
+
+        Returns:
+            [{
+                'agent_name', 'agent_display_name', 'total_executions',
+                'success_executions', 'success_rate', 'avg_duration_ms',
+                'p50_duration_ms', 'p95_duration_ms',
+                'recent_signal', 'recent_score', 'last_executed'
+            }]，按最后执行时间倒序
+        """
+        in_window = AgentExecution.executed_at >= since
+        duration = AgentExecution.execution_duration_ms
+
+        # 计数、均值与分位数在同一次窗口扫描中计算（分位数无法由小时桶合并，只读所需列）
+        agg = (
+            select(
+                AgentExecution.agent_name.label('agent_name'),
+                func.count().label('total_executions'),
+                func.count().filter(AgentExecution.status == 'success').label('success_executions'),
+                func.avg(duration).label('avg_duration_ms'),
+                func.percentile_cont(0.5).within_group(duration).label('p50_duration_ms'),
+                func.percentile_cont(0.95).within_group(duration).label('p95_duration_ms'),
+            )
+            .where(in_window)
+            .group_by(AgentExecution.agent_name)
+            .subquery('agg')
+        )
+
+        # 每个Agent窗口内最新一条
+        latest = (
+            select(
+                AgentExecution.agent_name,
+                AgentExecution.agent_display_name,
+                AgentExecution.signal,
+                AgentExecution.score,
+                AgentExecution.executed_at,
+            )
+            .where(in_window)
+            .distinct(AgentExecution.agent_name)
+            .order_by(AgentExecution.agent_name, desc(AgentExecution.executed_at))
+            .subquery('latest')
+        )
+
+        result = await db.execute(
+            select(agg, latest.c.agent_display_name, latest.c.signal,
+                   latest.c.score, latest.c.executed_at)
+            .join(latest, latest.c.agent_name == agg.c.agent_name)
+            .order_by(desc(latest.c.executed_at))
+        )
+        rows = result.mappings().all()
+
+        stats = []
+        for row in rows:
+            total = row['total_executions']
+            success = row['success_executions']
+
+            stats.append({
+                'agent_name': row['agent_name'],
+                'agent_display_name': row['agent_display_name'],
+                'total_executions': total,
+                'success_executions': success,
+                'success_rate': round(success / total, 4) if total else 0.0,
+                'avg_duration_ms': int(row['avg_duration_ms'] or 0),
+                'p50_duration_ms': int(row['p50_duration_ms'] or 0),
+                'p95_duration_ms': int(row['p95_duration_ms'] or 0),
+                'recent_signal': row['signal'],
+                'recent_score': float(row['score']),
+                'last_executed': row['executed_at'],
+            })
+
+        return stats
 
     async def get_executions_by_caller(
         self,
         db: AsyncSession,
         caller_type: str,
         caller_id: str,
+        summary: bool = False,
     ) -> List[AgentExecution]:
         """按调用方查询Agent执行结果（用于追溯分析）
 
         Args:
             caller_type: 'research_chat' 或 'strategy_system'
             caller_id: conversation_id 或 strategy_execution_id
+            summary: True 时只查询 summary_columns() 并返回行（reasoning 已截断）
 
         Returns:
-            AgentExecution列表，按执行时间排序
+            AgentExecution列表（summary=True 时为 Row 列表），按执行时间排序
         """
         result = await db.execute(
-            select(AgentExecution)
+            select(*self.summary_columns() if summary else (AgentExecution,))
             .where(
                 and_(
                     AgentExecution.caller_type == caller_type,
@@ -351,28 +550,30 @@ class AgentExecutionRecorder:
             .order_by(AgentExecution.executed_at)
         )
 
-        return result.scalars().all()
+        return result.all() if summary else result.scalars().all()
 
     async def get_executions_by_strategy(
         self,
         db: AsyncSession,
         strategy_execution_id: str,
+        summary: bool = False,
     ) -> List[AgentExecution]:
         """按策略执行ID查询Agent执行结果（策略系统专用）
 
         Args:
             strategy_execution_id: 策略执行ID
+            summary: True 时只查询 summary_columns() 并返回行（reasoning 已截断）
 
         Returns:
-            AgentExecution列表，按执行时间排序
+            AgentExecution列表（summary=True 时为 Row 列表），按执行时间排序
         """
         result = await db.execute(
-            select(AgentExecution)
+            select(*self.summary_columns() if summary else (AgentExecution,))
             .where(AgentExecution.strategy_execution_id == strategy_execution_id)
             .order_by(AgentExecution.executed_at)
         )
 
-        return result.scalars().all()
+        return result.all() if summary else result.scalars().all()
 
     async def get_executions_by_time_range(
         self,
@@ -380,6 +581,7 @@ class AgentExecutionRecorder:
         agent_name: str,
         start_time: datetime,
         end_time: datetime,
+        summary: bool = False,
     ) -> List[AgentExecution]:
         """按时间范围查询Agent执行历史（用于趋势分析）
 
@@ -387,12 +589,13 @@ class AgentExecutionRecorder:
             agent_name: Agent名称
             start_time: 开始时间
             end_time: 结束时间
+            summary: True 时只查询 summary_columns() 并返回行（reasoning 已截断）
 
         Returns:
-            AgentExecution列表，按执行时间排序
+            AgentExecution列表（summary=True 时为 Row 列表），按执行时间排序
         """
         result = await db.execute(
-            select(AgentExecution)
+            select(*self.summary_columns() if summary else (AgentExecution,))
             .where(
                 and_(
                     AgentExecution.agent_name == agent_name,
@@ -404,7 +607,7 @@ class AgentExecutionRecorder:
             .order_by(AgentExecution.executed_at)
         )
 
-        return result.scalars().all()
+        return result.all() if summary else result.scalars().all()
 
     async def record_generic_agent(
         self,
@@ -439,8 +642,8 @@ class AgentExecutionRecorder:
             AgentExecution: 保存的执行记录
         """
         # 序列化数据
-        serialized_market_data = self._serialize_for_json(market_data)
-        serialized_output = self._serialize_for_json(output)
+        serialized_market_data = to_jsonable(market_data)
+        serialized_output = to_jsonable(output)
         
         # 获取显示名称
         display_name = self.DISPLAY_NAMES.get(agent_name, agent_name)
@@ -519,11 +722,7 @@ class AgentExecutionRecorder:
             template_execution_batch_id=template_execution_batch_id,
         )
         
-        db.add(execution)
-        await db.commit()
-        await db.refresh(execution)
-        
-        return execution
+        return await self._save(db, execution)
 
 
 # 全局实例
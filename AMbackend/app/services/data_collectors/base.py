@@ -62,6 +62,29 @@ class DataCollector(ABC):
 
         return cached_item.get("data")
 
+    def get_cache_timestamp(self, cache_key: str, max_age_seconds: int = 60) -> Optional[datetime]:
+        """
+        Get the timestamp of cached data if available and not expired
+
+        Used as the data version for ETags without touching the data itself
+
+        Args:
+            cache_key: Key for cached data
+            max_age_seconds: Maximum age of cached data in seconds
+
+        Returns:
+            Cache timestamp or None if not available/expired
+        """
+        cached_item = self.cache.get(cache_key)
+        if cached_item is None or cached_item.get("timestamp") is None:
+            return None
+
+        cache_time = cached_item["timestamp"]
+        if (datetime.utcnow() - cache_time).total_seconds() > max_age_seconds:
+            return None
+
+        return cache_time
+
     def set_cache(self, cache_key: str, data: Any):
         """
         Set cached data with current timestamp
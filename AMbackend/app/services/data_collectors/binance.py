@@ -1,6 +1,6 @@
 """Binance price data collector"""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 from app.services.data_collectors.base import DataCollector
@@ -14,6 +14,8 @@ class BinanceCollector(DataCollector):
     Documentation: https://binance-docs.github.io/apidocs/spot/en/
     """
 
+    OHLCV_CACHE_SECONDS = 300
+
     def __init__(self, api_key: str = "", api_secret: str = ""):
         """
         Initialize Binance collector
@@ -56,6 +58,29 @@ class BinanceCollector(DataCollector):
 
         return result
 
+    @staticmethod
+    def ohlcv_cache_key(symbol: str, interval: str, limit: int) -> str:
+        return f"ohlcv_{symbol}_{interval}_{limit}"
+
+    def get_ohlcv_version(
+        self, symbol: str = "BTCUSDT", interval: str = "1h", limit: int = 100
+    ) -> Optional[datetime]:
+        """
+        Fetch time of the cached OHLCV data (None if not cached or expired)
+
+        Args:
+            symbol: Trading pair symbol
+            interval: Candle interval
+            limit: Number of candles
+
+        Returns:
+            Snapshot time used as the data version
+        """
+        return self.get_cache_timestamp(
+            self.ohlcv_cache_key(symbol, interval, limit),
+            max_age_seconds=self.OHLCV_CACHE_SECONDS,
+        )
+
     async def get_ohlcv(
         self, symbol: str = "BTCUSDT", interval: str = "1h", limit: int = 100
     ) -> List[OHLCVData]:
@@ -75,8 +100,8 @@ class BinanceCollector(DataCollector):
 
         API Endpoint: GET /api/v3/klines?symbol=BTCUSDT&interval=1h&limit=100
         """
-        cache_key = f"ohlcv_{symbol}_{interval}_{limit}"
-        cached = await self.get_cached_data(cache_key, max_age_seconds=300)
+        cache_key = self.ohlcv_cache_key(symbol, interval, limit)
+        cached = await self.get_cached_data(cache_key, max_age_seconds=self.OHLCV_CACHE_SECONDS)
         if cached:
             return cached
 
@@ -3,14 +3,24 @@
 from app.services.llm.base import LLMProvider
 from app.services.llm.openrouter import OpenRouterProvider
 from app.services.llm.tuzi import TuziProvider
+from app.services.llm.stub import StubLLMProvider, StubProfile
 from app.services.llm.manager import LLMManager, llm_manager, ProviderType, AgentLLMConfig
+from app.services.llm.admission import LLMPriority, llm_priority, admission_controller
+from app.services.llm.telemetry import LLMCallRecord, llm_telemetry
 
 __all__ = [
     "LLMProvider",
     "OpenRouterProvider",
     "TuziProvider",
+    "StubLLMProvider",
+    "StubProfile",
     "LLMManager",
     "llm_manager",
     "ProviderType",
     "AgentLLMConfig",
+    "LLMPriority",
+    "llm_priority",
+    "admission_controller",
+    "LLMCallRecord",
+    "llm_telemetry",
 ]
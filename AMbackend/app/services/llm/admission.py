@@ -0,0 +1,315 @@
+"""Per-(provider, model) admission control for LLM requests
+
+Strategy batches, parallel agent gathers and concurrent research chats all
+share the same provider rate limits. Every request passes through a limiter
+for its (provider, model) that bounds:
+
+- concurrency: requests in flight at once
+- tokens per minute: a sliding 60s window of estimated request tokens,
+  corrected to the reported usage when the response arrives
+
+Waiting requests are admitted strictly by priority lane, then FIFO, so
+trading-critical strategy agents go ahead of research chat.
+
+The lane comes from a context variable: the scheduler runs its jobs in the
+TRADING lane, the research chat endpoint sets RESEARCH, everything else is
+DEFAULT. Callers wait on their own event loop (the scheduler runs each job in
+a separate loop and thread), so limiter state is guarded by a threading lock
+and waiters are woken with ``call_soon_threadsafe``.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TPM_WINDOW_SECONDS = 60.0
+
+
+class LLMPriority(IntEnum):
+    """Admission lanes (lower value is admitted first)"""
+
+    TRADING = 0
+    DEFAULT = 1
+    RESEARCH = 2
+
+
+_current_priority: ContextVar[LLMPriority] = ContextVar("llm_priority", default=LLMPriority.DEFAULT)
+
+
+def get_llm_priority() -> LLMPriority:
+    """Lane of LLM calls made from the current context"""
+    return _current_priority.get()
+
+
+def set_llm_priority(priority: LLMPriority) -> Token:
+    """Set the lane for the rest of the current context (e.g. one request)"""
+    return _current_priority.set(priority)
+
+
+@contextmanager
+def llm_priority(priority: LLMPriority):
+    """Run a block with LLM calls in the given lane"""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    tokens: int = field(compare=False)
+    loop: asyncio.AbstractEventLoop = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    admitted: bool = field(default=False, compare=False)
+    cancelled: bool = field(default=False, compare=False)
+    reservation: Optional[List[float]] = field(default=None, compare=False)
+
+
+class _Limiter:
+    """Concurrency + tokens-per-minute state for one (provider, model)"""
+
+    def __init__(self, concurrency: int, tpm: int):
+        self.concurrency = concurrency
+        self.tpm = tpm
+        self.in_flight = 0
+        # Reservations in the TPM window: [timestamp, tokens]
+        self.window: Deque[List[float]] = deque()
+        self.waiting: List[_Waiter] = []
+
+    def _prune(self, now: float) -> None:
+        while self.window and now - self.window[0][0] >= TPM_WINDOW_SECONDS:
+            self.window.popleft()
+
+    def window_tokens(self, now: float) -> int:
+        self._prune(now)
+        return int(sum(entry[1] for entry in self.window))
+
+    def can_admit(self, tokens: int, now: float) -> bool:
+        if self.concurrency > 0 and self.in_flight >= self.concurrency:
+            return False
+        if self.tpm <= 0:
+            return True
+        used = self.window_tokens(now)
+        # A request larger than the whole budget still runs once the window is empty
+        return used + tokens <= self.tpm or used == 0
+
+    def admit(self, tokens: int, now: float) -> List[float]:
+        self.in_flight += 1
+        reservation = [now, float(tokens)]
+        if self.tpm > 0:
+            self.window.append(reservation)
+        return reservation
+
+    def retry_after(self, now: float) -> Optional[float]:
+        """Seconds until the oldest TPM reservation leaves the window"""
+        if self.tpm <= 0 or not self.window:
+            return None
+        return max(TPM_WINDOW_SECONDS - (now - self.window[0][0]), 0.01)
+
+
+class _QueueStats:
+    """Queue-time samples for one lane of one (provider, model)"""
+
+    def __init__(self, max_samples: int = 1000):
+        self.admitted = 0
+        self.queued = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.samples: Deque[float] = deque(maxlen=max_samples)
+
+    def record(self, wait: float) -> None:
+        self.admitted += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.samples.append(wait)
+        if wait > 0:
+            self.queued += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+        p95 = ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)] if ordered else 0.0
+        return {
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "avg_wait_ms": round(self.total_wait / self.admitted * 1000, 2) if self.admitted else 0.0,
+            "p95_wait_ms": round(p95 * 1000, 2),
+            "max_wait_ms": round(self.max_wait * 1000, 2),
+        }
+
+
+class Permit:
+    """Admission for one request; release with the actual token usage"""
+
+    def __init__(self, controller: "AdmissionController", key: Tuple[str, str], reservation: Optional[List[float]]):
+        self._controller = controller
+        self._key = key
+        self._reservation = reservation
+        self._released = False
+
+    def release(self, total_tokens: Optional[int] = None) -> None:
+        if self._released:
+            return
+        self._released = True
+        self._controller._release(self._key, self._reservation, total_tokens)
+
+
+class AdmissionController:
+    """Priority-laned concurrency/TPM limiter per (provider, model)"""
+
+    def __init__(self):
+        self._limiters: Dict[Tuple[str, str], _Limiter] = {}
+        self._stats: Dict[Tuple[str, str], Dict[LLMPriority, _QueueStats]] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _limits_for(provider: str, model: str) -> Tuple[int, int]:
+        limits = settings.LLM_MODEL_LIMITS.get(f"{provider}:{model}") or settings.LLM_MODEL_LIMITS.get(provider) or {}
+        return (
+            int(limits.get("concurrency", settings.LLM_DEFAULT_CONCURRENCY)),
+            int(limits.get("tpm", settings.LLM_DEFAULT_TPM)),
+        )
+
+    def _limiter(self, key: Tuple[str, str]) -> _Limiter:
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = _Limiter(*self._limits_for(*key))
+            self._limiters[key] = limiter
+            self._stats[key] = {lane: _QueueStats() for lane in LLMPriority}
+        return limiter
+
+    async def acquire(
+        self,
+        provider: str,
+        model: str,
+        tokens: int,
+        priority: Optional[LLMPriority] = None,
+    ) -> Permit:
+        """
+        Wait for a slot for (provider, model)
+
+        Args:
+            provider: Provider name
+            model: Model identifier
+            tokens: Estimated total tokens of the request (TPM budget)
+            priority: Lane (default: the context's lane)
+
+        Returns:
+            Permit to release when the request finishes
+        """
+        key = (provider, model)
+        lane = priority if priority is not None else get_llm_priority()
+        loop = asyncio.get_running_loop()
+        enqueued_at = time.monotonic()
+
+        with self._lock:
+            limiter = self._limiter(key)
+            now = time.monotonic()
+            if not limiter.waiting and limiter.can_admit(tokens, now):
+                reservation = limiter.admit(tokens, now)
+                self._stats[key][lane].record(0.0)
+                return Permit(self, key, reservation)
+
+            waiter = _Waiter(lane, next(self._seq), tokens, loop, loop.create_future())
+            heapq.heappush(limiter.waiting, waiter)
+            depth = len(limiter.waiting)
+
+        if depth in (10, 50, 100):
+            logger.warning(f"⏳ LLM admission queue for {key[0]}:{key[1]} reached {depth} requests")
+
+        try:
+            while True:
+                with self._lock:
+                    if waiter.admitted:
+                        break
+                    timeout = limiter.retry_after(time.monotonic())
+                # Woken by a release, or by the TPM window moving on
+                await asyncio.wait({waiter.future}, timeout=timeout)
+                with self._lock:
+                    if waiter.admitted:
+                        break
+                    self._dispatch(key, limiter)
+        except asyncio.CancelledError:
+            with self._lock:
+                waiter.cancelled = True
+                admitted = waiter.admitted
+            if admitted:
+                self._release(key, waiter.reservation, 0)
+            raise
+
+        with self._lock:
+            self._stats[key][lane].record(time.monotonic() - enqueued_at)
+        return Permit(self, key, waiter.reservation)
+
+    def _release(self, key: Tuple[str, str], reservation: Optional[List[float]], total_tokens: Optional[int]) -> None:
+        with self._lock:
+            limiter = self._limiters[key]
+            limiter.in_flight -= 1
+            # Replace the estimate with the reported usage
+            if reservation is not None and total_tokens is not None:
+                reservation[1] = float(total_tokens)
+            self._dispatch(key, limiter)
+
+    def _dispatch(self, key: Tuple[str, str], limiter: _Limiter) -> None:
+        """Admit waiters in lane order while limits allow (caller holds the lock)"""
+        now = time.monotonic()
+        while limiter.waiting:
+            head = limiter.waiting[0]
+            if head.cancelled:
+                heapq.heappop(limiter.waiting)
+                continue
+            if not limiter.can_admit(head.tokens, now):
+                return
+
+            heapq.heappop(limiter.waiting)
+            try:
+                head.loop.call_soon_threadsafe(_wake, head.future)
+            except RuntimeError:
+                # Waiter's event loop already closed
+                continue
+            head.reservation = limiter.admit(head.tokens, now)
+            head.admitted = True
+
+    def stats(self) -> Dict[str, Any]:
+        """Limits, in-flight/queued counts and queue-time metrics per (provider, model) and lane"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                f"{provider}:{model}": {
+                    "concurrency_limit": limiter.concurrency,
+                    "tpm_limit": limiter.tpm,
+                    "in_flight": limiter.in_flight,
+                    "waiting": sum(1 for w in limiter.waiting if not w.cancelled),
+                    "window_tokens": limiter.window_tokens(now),
+                    "lanes": {
+                        lane.name.lower(): stats.to_dict()
+                        for lane, stats in self._stats[(provider, model)].items()
+                    },
+                }
+                for (provider, model), limiter in self._limiters.items()
+            }
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+# Global instance
+admission_controller = AdmissionController()
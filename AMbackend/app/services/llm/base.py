@@ -1,7 +1,11 @@
 """LLM Provider abstract base class"""
 
+import json
+import time
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
+
+import httpx
 
 from app.schemas.llm import LLMResponse, Message
 
@@ -9,6 +13,12 @@ from app.schemas.llm import LLMResponse, Message
 class LLMProvider(ABC):
     """Abstract base class for LLM providers"""
 
+    # Model pricing (per 1M tokens), overridden by providers
+    MODEL_PRICING: Dict[str, Dict[str, float]] = {}
+    # Prompt cache pricing relative to the input price (Anthropic: reads 0.1x, writes 1.25x)
+    CACHE_READ_PRICE_RATIO = 0.1
+    CACHE_WRITE_PRICE_RATIO = 1.25
+
     def __init__(self, api_key: str, base_url: str):
         """
         Initialize LLM provider
@@ -47,6 +57,79 @@ class LLMProvider(ABC):
         """
         pass
 
+    async def chat_stream(
+        self,
+        messages: List[Message],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion as content deltas
+
+        Providers with server-sent events support override this; the default
+        yields the whole completion from ``chat`` as a single delta.
+
+        Args:
+            messages: List of chat messages
+            model: Model name/identifier
+            temperature: Sampling temperature (0-2)
+            max_tokens: Maximum tokens to generate
+            **kwargs: Additional provider-specific parameters
+
+        Yields:
+            Generated text fragments in order
+        """
+        response = await self.chat(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs,
+        )
+        if response.content:
+            yield response.content
+
+    @staticmethod
+    def _timed_client(timeout: float, timing: Dict[str, float]) -> httpx.AsyncClient:
+        """
+        AsyncClient that records the time to first byte of each request
+
+        ``timing["ttfb_seconds"]`` is set to the seconds between sending the
+        request and receiving the response headers (per-call telemetry).
+        """
+
+        async def on_request(request: httpx.Request) -> None:
+            timing["sent"] = time.monotonic()
+
+        async def on_response(response: httpx.Response) -> None:
+            timing["ttfb_seconds"] = time.monotonic() - timing.get("sent", time.monotonic())
+
+        return httpx.AsyncClient(
+            timeout=timeout, event_hooks={"request": [on_request], "response": [on_response]}
+        )
+
+    @staticmethod
+    async def _iter_sse_events(response: httpx.Response) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Parse ``data:`` lines of a server-sent events response as JSON
+
+        Comment/keep-alive lines are skipped; ``[DONE]`` ends the stream.
+        """
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if not data:
+                continue
+            if data == "[DONE]":
+                break
+            try:
+                yield json.loads(data)
+            except json.JSONDecodeError:
+                continue
+
     @abstractmethod
     def get_available_models(self) -> List[str]:
         """
@@ -57,17 +140,75 @@ class LLMProvider(ABC):
         """
         pass
 
-    def _format_messages(self, messages: List[Message]) -> List[Dict[str, str]]:
+    def _format_messages(
+        self, messages: List[Message], cache_control: bool = False
+    ) -> List[Dict[str, Any]]:
         """
         Format messages to provider-specific format
 
         Args:
             messages: List of Message objects
+            cache_control: Emit Anthropic ``cache_control`` breakpoints for
+                messages marked ``cache_control=True`` (content becomes a
+                list of text parts)
 
         Returns:
             List of message dictionaries
         """
-        return [{"role": msg.role, "content": msg.content} for msg in messages]
+        return [
+            {"role": msg.role, "content": self._format_content(msg, cache_control)}
+            for msg in messages
+        ]
+
+    @staticmethod
+    def _format_content(msg: Message, cache_control: bool = False) -> Any:
+        if not (cache_control and msg.cache_control):
+            return msg.content
+        return [{"type": "text", "text": msg.content, "cache_control": {"type": "ephemeral"}}]
+
+    @staticmethod
+    def _build_usage(
+        prompt_tokens: int,
+        completion_tokens: int,
+        cache_read_tokens: int = 0,
+        cache_write_tokens: int = 0,
+    ) -> Dict[str, int]:
+        """Normalized LLMResponse.usage (prompt_tokens includes cached tokens)"""
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "cache_read_tokens": cache_read_tokens,
+            "cache_write_tokens": cache_write_tokens,
+        }
+
+    def calculate_cost(self, model: str, usage: Optional[Dict[str, int]]) -> float:
+        """
+        Cost of a completed request from its reported token usage
+
+        Args:
+            model: Model name
+            usage: LLMResponse.usage
+
+        Returns:
+            Cost in USD (0.0 for unknown models)
+        """
+        pricing = self.MODEL_PRICING.get(model)
+        if not pricing or not usage:
+            return 0.0
+
+        cache_read = usage.get("cache_read_tokens", 0)
+        cache_write = usage.get("cache_write_tokens", 0)
+        uncached = max(usage.get("prompt_tokens", 0) - cache_read - cache_write, 0)
+
+        input_tokens = (
+            uncached
+            + cache_read * self.CACHE_READ_PRICE_RATIO
+            + cache_write * self.CACHE_WRITE_PRICE_RATIO
+        )
+        input_cost = input_tokens / 1_000_000 * pricing["input"]
+        output_cost = usage.get("completion_tokens", 0) / 1_000_000 * pricing["output"]
+        return input_cost + output_cost
 
     async def estimate_cost(
         self, messages: List[Message], model: str, completion_tokens: int = 100
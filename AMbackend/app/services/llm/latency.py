@@ -0,0 +1,124 @@
+"""Per-(provider, model) LLM latency histograms
+
+Successful provider calls are recorded in log-spaced buckets; the p95 of the
+primary model drives the hedge delay of ``LLMManager.chat_for_agent`` (fire a
+backup request to the fallback provider once the primary is slower than 95%
+of recent calls). Counts are halved once a histogram holds ``decay_after``
+samples, so old latency regimes fade out.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+def _bucket_bounds(start: float = 0.1, factor: float = 1.25, limit: float = 600.0) -> List[float]:
+    bounds = []
+    bound = start
+    while bound < limit:
+        bounds.append(round(bound, 3))
+        bound *= factor
+    bounds.append(limit)
+    return bounds
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram (seconds) with count halving"""
+
+    BOUNDS = _bucket_bounds()
+
+    def __init__(self, decay_after: int = 1000):
+        self.decay_after = decay_after
+        self.counts = [0.0] * (len(self.BOUNDS) + 1)
+        self.total = 0.0
+        self.samples = 0
+
+    def record(self, seconds: float) -> None:
+        index = len(self.BOUNDS)
+        for i, bound in enumerate(self.BOUNDS):
+            if seconds <= bound:
+                index = i
+                break
+
+        self.counts[index] += 1
+        self.total += 1
+        self.samples += 1
+        if self.total >= self.decay_after:
+            self.counts = [c / 2 for c in self.counts]
+            self.total /= 2
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None when empty)"""
+        if self.total <= 0:
+            return None
+
+        rank = q * self.total
+        cumulative = 0.0
+        for i, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank and count > 0:
+                return self.BOUNDS[min(i, len(self.BOUNDS) - 1)]
+        return self.BOUNDS[-1]
+
+
+class LatencyTracker:
+    """Latency histograms and hedge counters keyed by (provider, model)"""
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._hedges: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, model: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.setdefault((provider, model), LatencyHistogram())
+            histogram.record(seconds)
+
+    def percentile(self, provider: str, model: str, q: float) -> Optional[float]:
+        with self._lock:
+            histogram = self._histograms.get((provider, model))
+            return histogram.percentile(q) if histogram else None
+
+    def hedge_delay(self, provider: str, model: str) -> float:
+        """
+        Seconds to wait on the primary before firing a backup request
+
+        p95 of the model once LLM_HEDGE_MIN_SAMPLES calls were seen, otherwise
+        LLM_HEDGE_DEFAULT_DELAY_SECONDS, clamped to the configured bounds.
+        """
+        with self._lock:
+            histogram = self._histograms.get((provider, model))
+            p95 = histogram.percentile(0.95) if histogram else None
+            enough = histogram is not None and histogram.samples >= settings.LLM_HEDGE_MIN_SAMPLES
+
+        delay = p95 if enough and p95 is not None else settings.LLM_HEDGE_DEFAULT_DELAY_SECONDS
+        return min(max(delay, settings.LLM_HEDGE_MIN_DELAY_SECONDS), settings.LLM_HEDGE_MAX_DELAY_SECONDS)
+
+    def record_hedge(self, agent_name: str, outcome: str) -> None:
+        """Count a hedge outcome: fired / backup_won / primary_won / failover"""
+        with self._lock:
+            counters = self._hedges.setdefault(agent_name, {})
+            counters[outcome] = counters.get(outcome, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            models = {
+                f"{provider}:{model}": {
+                    "samples": histogram.samples,
+                    "p50_seconds": histogram.percentile(0.5),
+                    "p95_seconds": histogram.percentile(0.95),
+                    "p99_seconds": histogram.percentile(0.99),
+                }
+                for (provider, model), histogram in self._histograms.items()
+            }
+            hedges = {agent: dict(counters) for agent, counters in self._hedges.items()}
+
+        for key, entry in models.items():
+            provider, model = key.split(":", 1)
+            entry["hedge_delay_seconds"] = self.hedge_delay(provider, model)
+        return {"models": models, "hedges": hedges}
+
+
+# Global instance
+latency_tracker = LatencyTracker()
@@ -1,24 +1,47 @@
 """LLM Manager for managing multiple providers"""
 
-from typing import Dict, List, Optional
+import asyncio
+import logging
+import re
+import time
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 from enum import Enum
 
+import httpx
+
 from app.core.config import settings
 from app.services.llm.base import LLMProvider
 from app.services.llm.openrouter import OpenRouterProvider
 from app.services.llm.tuzi import TuziProvider
+from app.services.llm.stub import StubLLMProvider, StubProfile
+from app.services.llm.response_cache import cache_key, llm_response_cache
+from app.services.llm.admission import LLMPriority, admission_controller, get_llm_priority
+from app.services.llm.latency import latency_tracker
+from app.services.llm.prompt_encoder import estimate_tokens
+from app.services.llm.telemetry import NO_AGENT, LLMCallRecord, llm_telemetry
+from app.services.llm.structured_output import STRUCTURED_OUTPUT_KWARG
 from app.schemas.llm import LLMResponse, Message
 
+logger = logging.getLogger(__name__)
+
 
 class ProviderType(str, Enum):
     """LLM provider types"""
 
     OPENROUTER = "openrouter"
     TUZI = "tuzi"
+    STUB = "stub"
 
 
 class AgentLLMConfig:
-    """LLM configuration for different agents"""
+    """
+    LLM configuration for different agents
+
+    ``fallback`` names the alternate provider/model used for hedged requests
+    and failover (see ``LLMManager._hedged_chat``); its ``max_tokens`` caps
+    the primary's max_tokens for the fallback model.
+    """
 
     # Agent-specific LLM configurations
     AGENT_CONFIGS = {
@@ -26,6 +49,7 @@ class AgentLLMConfig:
             "provider": ProviderType.OPENROUTER,
             "model": "openai/gpt-4o-mini",
             "temperature": 0.3,
+            "fallback": {"provider": ProviderType.TUZI, "model": "gpt-4o-mini"},
         },
         # Research Chat Agents
         "super_agent": {
@@ -34,20 +58,35 @@ class AgentLLMConfig:
             "temperature": 0.3,
             "max_tokens": 2048,
             "response_format": {"type": "json_object"},  # Force JSON output
+            "fallback": {
+                "provider": ProviderType.OPENROUTER,
+                "model": "openai/chatgpt-4o-latest",
+                "max_tokens": 16384,  # GPT-4o output limit
+            },
         },
         "planning_agent": {
             "provider": ProviderType.OPENROUTER,
             "model": "anthropic/claude-sonnet-4.5",  # Claude Sonnet 4.5 via OpenRouter
             "temperature": 0.5,
             "max_tokens": 200000,  # 200k tokens
-            # Claude via OpenRouter doesn't support response_format, relies on prompt
+            # No response_format for Claude: forced tool call (structured_output), prompt fallback
+            "fallback": {
+                "provider": ProviderType.TUZI,
+                "model": "claude-sonnet-4-5-thinking-all",
+                "max_tokens": 64000,  # Claude Sonnet 4.5 output limit
+            },
         },
         "general_analysis_agent": {
             "provider": ProviderType.OPENROUTER,
             "model": "anthropic/claude-sonnet-4.5",  # Claude Sonnet 4.5 via OpenRouter
             "temperature": 0.6,
             "max_tokens": 200000,  # 200k tokens
-            # Claude via OpenRouter doesn't support response_format, relies on prompt
+            # No response_format for Claude: forced tool call (structured_output), prompt fallback
+            "fallback": {
+                "provider": ProviderType.TUZI,
+                "model": "claude-sonnet-4-5-thinking-all",
+                "max_tokens": 64000,  # Claude Sonnet 4.5 output limit
+            },
         },
         # Business Agents (used by both Research Chat and Strategy)
         "macro_agent": {
@@ -55,28 +94,67 @@ class AgentLLMConfig:
             "model": "anthropic/claude-sonnet-4.5",  # Claude Sonnet 4.5 via OpenRouter
             "temperature": 1.0,
             "max_tokens": 200000,  # 200k tokens
-            # Claude via OpenRouter doesn't support response_format, relies on prompt
+            # No response_format for Claude: forced tool call (structured_output), prompt fallback
+            "fallback": {
+                "provider": ProviderType.TUZI,
+                "model": "claude-sonnet-4-5-thinking-all",
+                "max_tokens": 64000,  # Claude Sonnet 4.5 output limit
+            },
         },
         "onchain_agent": {
             "provider": ProviderType.OPENROUTER,
             "model": "anthropic/claude-sonnet-4.5",  # Claude Sonnet 4.5 via OpenRouter
             "temperature": 0.7,
             "max_tokens": 200000,  # 200k tokens
-            # Claude via OpenRouter doesn't support response_format, relies on prompt
+            # No response_format for Claude: forced tool call (structured_output), prompt fallback
+            "fallback": {
+                "provider": ProviderType.TUZI,
+                "model": "claude-sonnet-4-5-thinking-all",
+                "max_tokens": 64000,  # Claude Sonnet 4.5 output limit
+            },
         },
         "ta_agent": {
             "provider": ProviderType.OPENROUTER,
             "model": "anthropic/claude-sonnet-4.5",  # Claude Sonnet 4.5 via OpenRouter
             "temperature": 0.6,
             "max_tokens": 200000,  # 200k tokens
-            # Claude via OpenRouter doesn't support response_format, relies on prompt
+            # No response_format for Claude: forced tool call (structured_output), prompt fallback
+            "fallback": {
+                "provider": ProviderType.TUZI,
+                "model": "claude-sonnet-4-5-thinking-all",
+                "max_tokens": 64000,  # Claude Sonnet 4.5 output limit
+            },
         },
     }
 
+    # Response cache policies for business agents (see app/services/llm/response_cache.py)
+    # - ttl_seconds: how long a response is reused
+    # - fingerprint_digits: bucket numeric prompt inputs to N significant digits
+    #   and ignore timestamps (omit for exact prompt matching)
+    CACHE_POLICIES = {
+        # FRED/macro inputs refresh hourly
+        "macro_agent": {"ttl_seconds": 3600, "fingerprint_digits": 3},
+        "onchain_agent": {"ttl_seconds": 1800, "fingerprint_digits": 3},
+        "regime_filter_agent": {"ttl_seconds": 1800, "fingerprint_digits": 3},
+        # Price-driven agents: shorter TTL, finer buckets
+        "ta_agent": {"ttl_seconds": 900, "fingerprint_digits": 4},
+        "ta_momentum_agent": {"ttl_seconds": 900, "fingerprint_digits": 4},
+    }
+
 
 class LLMManager:
     """Manager for multiple LLM providers with dynamic switching"""
 
+    # Completion size assumed for admission until the real usage is known
+    # (agent max_tokens are upper bounds, not expectations)
+    ESTIMATED_COMPLETION_TOKENS = 2048
+    # finish_reason values of replies cut off at max_tokens (never cached)
+    TRUNCATED_FINISH_REASONS = ("length", "max_tokens")
+    # HTTP statuses with which a provider rejects a tool-call request (the
+    # error body must also name the tools, see _tool_call_rejected)
+    TOOL_REJECTED_STATUSES = (400, 404, 422)
+    TOOL_ERROR_PATTERN = re.compile(r"\btool(?:s|_choice|_use|_calls?)?\b", re.IGNORECASE)
+
     def __init__(self):
         """Initialize LLM manager with all configured providers"""
         self.providers: Dict[ProviderType, LLMProvider] = {}
@@ -94,6 +172,44 @@ class LLMManager:
                 api_key=settings.TUZI_API_KEY, base_url=settings.TUZI_BASE_URL
             )
 
+        # (provider, model) that rejected structured output tool calls -> monotonic
+        # time until which they are called in prompt mode only
+        self.prompt_mode_models: Dict[Tuple[str, str], float] = {}
+
+        # Offline stub replaces every provider (load tests, local development)
+        self.stub_mode = False
+        if settings.LLM_STUB_ENABLED:
+            self.use_stub()
+
+    def use_stub(self, provider: Optional[StubLLMProvider] = None) -> StubLLMProvider:
+        """
+        Route all requests to the offline stub provider
+
+        Agent calls go to the stub with ``model=<agent_name>`` (no fallback),
+        so the stub can answer with that agent's canned JSON.
+
+        Args:
+            provider: Configured stub (default: StubProfile from settings)
+
+        Returns:
+            The active stub provider
+        """
+        provider = provider or StubLLMProvider(StubProfile.from_settings())
+        self.providers[ProviderType.STUB] = provider
+        self.stub_mode = True
+        return provider
+
+    def get_agent_config(self, agent_name: str) -> Optional[Dict[str, Any]]:
+        """Effective LLM configuration of an agent (None = defaults)"""
+        config = AgentLLMConfig.AGENT_CONFIGS.get(agent_name)
+        if not self.stub_mode:
+            return config
+        return {
+            "provider": ProviderType.STUB,
+            "model": agent_name,
+            "temperature": (config or {}).get("temperature", 0.7),
+        }
+
     async def chat(
         self,
         messages: List[Message],
@@ -101,17 +217,32 @@ class LLMManager:
         model: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
+        priority: Optional[LLMPriority] = None,
+        agent_name: Optional[str] = None,
         **kwargs,
     ) -> LLMResponse:
         """
         Send chat completion request to specified provider
 
+        Requests wait for admission to the (provider, model) concurrency and
+        tokens-per-minute budget, in the lane of the calling context. Every
+        provider call is recorded in ``llm_telemetry``; near the daily cost
+        budget, non-trading requests are soft-throttled first.
+
+        A ``structured_output`` tool definition (see ``structured_output.py``)
+        is sent as a forced tool call. If the model rejects tools, the request
+        is retried in prompt mode (own admission permit and telemetry record)
+        and, once that succeeds, the model stays in prompt mode for
+        LLM_PROMPT_MODE_TTL_SECONDS.
+
         Args:
             messages: List of chat messages
             provider: Provider to use (default from settings)
             model: Model to use (default from settings)
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
+            priority: Admission lane (default: lane of the calling context)
+            agent_name: Calling agent (telemetry label only)
             **kwargs: Additional parameters
 
         Returns:
@@ -123,7 +254,7 @@ class LLMManager:
         """
         # Use default provider if not specified
         if provider is None:
-            provider = ProviderType(settings.DEFAULT_LLM_PROVIDER)
+            provider = ProviderType.STUB if self.stub_mode else ProviderType(settings.DEFAULT_LLM_PROVIDER)
 
         if provider not in self.providers:
             raise ValueError(f"Provider {provider} not configured")
@@ -133,39 +264,170 @@ class LLMManager:
             model = settings.DEFAULT_LLM_MODEL
 
         provider_instance = self.providers[provider]
-
-        return await provider_instance.chat(
+        provider_name = ProviderType(provider).value
+        max_tokens = await self._budget_throttle(priority, max_tokens)
+        if not settings.LLM_STRUCTURED_OUTPUT_ENABLED or self._in_prompt_mode(provider_name, model):
+            kwargs.pop(STRUCTURED_OUTPUT_KWARG, None)
+
+        request = dict(
+            provider_instance=provider_instance,
+            provider_name=provider_name,
             messages=messages,
             model=model,
             temperature=temperature,
             max_tokens=max_tokens,
-            **kwargs,
+            priority=priority,
+            agent_name=agent_name,
         )
+        try:
+            return await self._call_provider(**request, **kwargs)
+        except httpx.HTTPStatusError as e:
+            if not self._tool_call_rejected(e, kwargs):
+                raise
+            logger.warning(
+                f"{provider_name}:{model} rejected structured output tool call "
+                f"(HTTP {e.response.status_code}), retrying in prompt mode"
+            )
+        kwargs.pop(STRUCTURED_OUTPUT_KWARG)
+        response = await self._call_provider(**request, **kwargs)
+        self.prompt_mode_models[(provider_name, model)] = (
+            time.monotonic() + settings.LLM_PROMPT_MODE_TTL_SECONDS
+        )
+        return response
+
+    async def _call_provider(
+        self,
+        provider_instance: LLMProvider,
+        provider_name: str,
+        messages: List[Message],
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        priority: Optional[LLMPriority],
+        agent_name: Optional[str],
+        **kwargs,
+    ) -> LLMResponse:
+        """One provider request under its own admission permit, recorded in telemetry"""
+        permit = None
+        if settings.LLM_ADMISSION_ENABLED:
+            permit = await admission_controller.acquire(
+                provider_name, model, self._estimate_request_tokens(messages, max_tokens), priority
+            )
+
+        total_tokens = None
+        started = time.monotonic()
+        try:
+            response = await provider_instance.chat(
+                messages=messages,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs,
+            )
+            # Provider latency only (admission queue time excluded)
+            latency = time.monotonic() - started
+            latency_tracker.record(provider_name, model, latency)
+            usage = response.usage or {}
+            total_tokens = usage.get("total_tokens")
+            llm_telemetry.record(
+                LLMCallRecord(
+                    agent_name=agent_name or NO_AGENT,
+                    provider=provider_name,
+                    model=model,
+                    latency_seconds=latency,
+                    ttfb_seconds=(response.metadata or {}).get("ttfb_seconds"),
+                    prompt_tokens=usage.get("prompt_tokens", 0),
+                    completion_tokens=usage.get("completion_tokens", 0),
+                    cache_read_tokens=usage.get("cache_read_tokens", 0),
+                    cost_usd=self.calculate_cost(response),
+                )
+            )
+            return response
+        except Exception as e:
+            llm_telemetry.record(
+                LLMCallRecord(
+                    agent_name=agent_name or NO_AGENT,
+                    provider=provider_name,
+                    model=model,
+                    latency_seconds=time.monotonic() - started,
+                    error=type(e).__name__,
+                )
+            )
+            raise
+        finally:
+            if permit is not None:
+                permit.release(total_tokens)
 
     async def chat_for_agent(
         self,
         agent_name: str,
         messages: List[Message],
         max_tokens: Optional[int] = None,
+        use_cache: bool = True,
+        validate: Optional[Callable[[str], bool]] = None,
         **kwargs,
     ) -> LLMResponse:
         """
         Send chat request using agent-specific configuration
 
+        Agents with an entry in ``AgentLLMConfig.CACHE_POLICIES`` are served
+        from the response cache when the same (normalized) request was
+        answered within the agent's TTL. A reply is only cached if it was not
+        cut off at max_tokens and ``validate`` accepts its content.
+
         Args:
             agent_name: Name of the agent (e.g., "macro_agent")
             messages: List of chat messages
             max_tokens: Maximum tokens to generate
+            use_cache: Set False to bypass the response cache
+            validate: Whether the reply content is usable (e.g. ``json_validator``)
             **kwargs: Additional parameters
 
         Returns:
             LLMResponse with generated content
         """
-        config = AgentLLMConfig.AGENT_CONFIGS.get(agent_name)
+        policy = AgentLLMConfig.CACHE_POLICIES.get(agent_name)
+        if not (use_cache and policy and settings.LLM_CACHE_ENABLED):
+            return await self._chat_for_agent(agent_name, messages, max_tokens, **kwargs)
+
+        key = cache_key(
+            agent_name,
+            self._agent_signature(agent_name, max_tokens, kwargs),
+            messages,
+            policy.get("fingerprint_digits"),
+        )
+        cached = await llm_response_cache.get(agent_name, key)
+        if cached is not None:
+            return cached
+
+        response = await self._chat_for_agent(agent_name, messages, max_tokens, **kwargs)
+        finish_reason = (response.metadata or {}).get("finish_reason")
+        if finish_reason in self.TRUNCATED_FINISH_REASONS:
+            return response
+        if validate is not None and not validate(response.content):
+            return response
+        await llm_response_cache.set(
+            agent_name,
+            key,
+            response,
+            ttl_seconds=policy["ttl_seconds"],
+            cost_usd=self.calculate_cost(response),
+        )
+        return response
+
+    async def _chat_for_agent(
+        self,
+        agent_name: str,
+        messages: List[Message],
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> LLMResponse:
+        """Uncached ``chat_for_agent`` (agent config + fallback)"""
+        config = self.get_agent_config(agent_name)
 
         if config is None:
             # Use default configuration
-            return await self.chat(messages=messages, max_tokens=max_tokens, **kwargs)
+            return await self.chat(messages=messages, max_tokens=max_tokens, agent_name=agent_name, **kwargs)
 
         provider = config["provider"]
         model = config["model"]
@@ -180,35 +442,355 @@ class LLMManager:
         if "response_format" in config and "response_format" not in kwargs:
             kwargs["response_format"] = config["response_format"]
 
-        try:
-            return await self.chat(
+        def primary_call():
+            return self.chat(
                 messages=messages,
                 provider=provider,
                 model=model,
                 temperature=temperature,
                 max_tokens=max_tokens,
+                agent_name=agent_name,
                 **kwargs,
             )
+
+        fallback = config.get("fallback")
+        if not fallback or fallback["provider"] not in self.providers:
+            return await primary_call()
+
+        # Merge fallback response_format if present
+        fallback_kwargs = kwargs.copy()
+        if "response_format" in fallback:
+            fallback_kwargs["response_format"] = fallback["response_format"]
+
+        def backup_call():
+            return self.chat(
+                messages=messages,
+                provider=fallback["provider"],
+                model=fallback["model"],
+                temperature=temperature,
+                max_tokens=self._fallback_max_tokens(fallback, max_tokens),
+                agent_name=agent_name,
+                **fallback_kwargs,
+            )
+
+        if settings.LLM_HEDGING_ENABLED:
+            delay = latency_tracker.hedge_delay(ProviderType(provider).value, model)
+            return await self._hedged_chat(agent_name, primary_call, backup_call, delay)
+
+        try:
+            return await primary_call()
         except Exception as e:
-            # Try fallback if configured
-            fallback = config.get("fallback")
-            if fallback:
-                print(f"Primary provider failed, trying fallback: {e}")
-
-                # Merge fallback response_format if present
-                fallback_kwargs = kwargs.copy()
-                if "response_format" in fallback:
-                    fallback_kwargs["response_format"] = fallback["response_format"]
-
-                return await self.chat(
-                    messages=messages,
-                    provider=fallback["provider"],
-                    model=fallback["model"],
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                    **fallback_kwargs,
-                )
+            logger.warning(f"Primary provider failed for {agent_name}, trying fallback: {e}")
+            latency_tracker.record_hedge(agent_name, "failover")
+            return await backup_call()
+
+    async def _hedged_chat(
+        self,
+        agent_name: str,
+        primary_call: Callable[[], Awaitable[LLMResponse]],
+        backup_call: Callable[[], Awaitable[LLMResponse]],
+        delay: float,
+    ) -> LLMResponse:
+        """
+        Hedged request: primary first, backup provider after ``delay`` seconds
+
+        The first non-empty response wins and the other request is cancelled.
+        If the primary fails before the hedge delay the backup starts at once
+        (failover); if both fail the primary's error is raised.
+        """
+        primary = asyncio.create_task(primary_call())
+        backup: Optional[asyncio.Task] = None
+        pending = {primary}
+        errors: Dict[asyncio.Task, Exception] = {}
+
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                logger.info(f"⏱️ {agent_name}: primary slower than {delay:.1f}s, sending hedged request")
+                latency_tracker.record_hedge(agent_name, "fired")
+                backup = asyncio.create_task(backup_call())
+                pending.add(backup)
+
+            while True:
+                for task in done:
+                    try:
+                        response = task.result()
+                    except Exception as e:
+                        errors[task] = e
+                        continue
+                    if not response.content:
+                        errors[task] = ValueError("Empty LLM response")
+                        continue
+
+                    if backup is not None:
+                        won = "backup_won" if task is backup else "primary_won"
+                        latency_tracker.record_hedge(agent_name, won)
+                        response.metadata = {**(response.metadata or {}), "hedge": won}
+                    return response
+
+                if backup is None:
+                    logger.warning(f"Primary provider failed for {agent_name}, trying fallback: {errors[primary]}")
+                    latency_tracker.record_hedge(agent_name, "failover")
+                    backup = asyncio.create_task(backup_call())
+                    pending.add(backup)
+
+                if not pending:
+                    raise errors.get(primary) or errors[backup]
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            losers = [task for task in (primary, backup) if task is not None and not task.done()]
+            for task in losers:
+                task.cancel()
+            # Let the cancelled calls unwind (release admission permits, close connections)
+            await asyncio.gather(*losers, return_exceptions=True)
+
+    @staticmethod
+    def _fallback_max_tokens(fallback: Dict[str, Any], max_tokens: Optional[int]) -> Optional[int]:
+        """Primary max_tokens capped at the fallback model's limit"""
+        limit = fallback.get("max_tokens")
+        if limit is None or max_tokens is None:
+            return max_tokens
+        return min(max_tokens, limit)
+
+    @classmethod
+    def _estimate_request_tokens(cls, messages: List[Message], max_tokens: Optional[int]) -> int:
+        """Rough token estimate for the TPM budget (4 chars ≈ 1 token)"""
+        prompt_tokens = sum(len(msg.content) for msg in messages) // 4
+        completion_tokens = min(max_tokens or cls.ESTIMATED_COMPLETION_TOKENS, cls.ESTIMATED_COMPLETION_TOKENS)
+        return prompt_tokens + completion_tokens
+
+    def _in_prompt_mode(self, provider: str, model: str) -> bool:
+        """Whether (provider, model) recently rejected structured output tool calls"""
+        until = self.prompt_mode_models.get((provider, model))
+        if until is None:
+            return False
+        if until > time.monotonic():
+            return True
+        del self.prompt_mode_models[(provider, model)]
+        return False
+
+    def _tool_call_rejected(self, error: httpx.HTTPStatusError, kwargs: Dict[str, Any]) -> bool:
+        """
+        Whether the provider rejected the structured output tool call itself
+
+        Other client errors (context length, max_tokens, unknown model) are not
+        retried: the error body has to name the tools.
+        """
+        if STRUCTURED_OUTPUT_KWARG not in kwargs:
+            return False
+        if error.response.status_code not in self.TOOL_REJECTED_STATUSES:
+            return False
+        try:
+            body = error.response.text
+        except httpx.ResponseNotRead:
+            return False
+        return bool(self.TOOL_ERROR_PATTERN.search(body))
+
+    @staticmethod
+    async def _budget_throttle(priority: Optional[LLMPriority], max_tokens: Optional[int]) -> Optional[int]:
+        """
+        Soft throttle near the daily cost budget (non-trading lanes only)
+
+        Waits LLM_BUDGET_THROTTLE_DELAY_SECONDS and caps ``max_tokens`` at
+        LLM_BUDGET_THROTTLE_MAX_TOKENS; otherwise returns ``max_tokens`` as-is.
+        """
+        lane = priority if priority is not None else get_llm_priority()
+        if not llm_telemetry.should_throttle(lane):
+            return max_tokens
+
+        cap = settings.LLM_BUDGET_THROTTLE_MAX_TOKENS
+        await asyncio.sleep(settings.LLM_BUDGET_THROTTLE_DELAY_SECONDS)
+        return min(max_tokens, cap) if max_tokens else cap
+
+    def _agent_signature(
+        self, agent_name: str, max_tokens: Optional[int], kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Effective provider/model/sampling parameters of an agent call (cache key part)"""
+        config = self.get_agent_config(agent_name) or {}
+        params = dict(kwargs)
+        if "response_format" in config and "response_format" not in params:
+            params["response_format"] = config["response_format"]
+
+        return {
+            "provider": config.get("provider", settings.DEFAULT_LLM_PROVIDER),
+            "model": config.get("model", settings.DEFAULT_LLM_MODEL),
+            "temperature": config.get("temperature", 0.7),
+            "max_tokens": max_tokens or config.get("max_tokens"),
+            "params": params,
+        }
+
+    def calculate_cost(self, response: LLMResponse) -> float:
+        """
+        Cost in USD of a completed response, from its provider's pricing
+
+        Args:
+            response: LLMResponse returned by a provider
+
+        Returns:
+            Cost in USD (0.0 if the provider or model is unknown)
+        """
+        try:
+            provider = self.providers.get(ProviderType(response.provider))
+        except ValueError:
+            return 0.0
+        if provider is None:
+            return 0.0
+        return provider.calculate_cost(response.model, response.usage)
+
+    async def chat_stream(
+        self,
+        messages: List[Message],
+        provider: Optional[ProviderType] = None,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        agent_name: Optional[str] = None,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion from the specified provider
+
+        Same arguments as ``chat``. Time to first byte is the time to the
+        first delta; token usage is estimated from the prompt and the output.
+
+        The admission permit is held until the stream ends or is closed;
+        consume it with ``contextlib.aclosing`` so an abandoned stream frees
+        its slot (and the provider connection) immediately, not at GC.
+
+        Yields:
+            Content deltas as they arrive
+
+        Raises:
+            ValueError: If provider not available
+            Exception: If API call fails
+        """
+        if provider is None:
+            provider = ProviderType.STUB if self.stub_mode else ProviderType(settings.DEFAULT_LLM_PROVIDER)
+
+        if provider not in self.providers:
+            raise ValueError(f"Provider {provider} not configured")
+
+        if model is None:
+            model = settings.DEFAULT_LLM_MODEL
+
+        provider_name = ProviderType(provider).value
+        max_tokens = await self._budget_throttle(None, max_tokens)
+        # Tool-call arguments are not streamed as text: prompt mode
+        kwargs.pop(STRUCTURED_OUTPUT_KWARG, None)
+
+        permit = None
+        if settings.LLM_ADMISSION_ENABLED:
+            permit = await admission_controller.acquire(
+                provider_name, model, self._estimate_request_tokens(messages, max_tokens)
+            )
+
+        record = LLMCallRecord(
+            agent_name=agent_name or NO_AGENT, provider=provider_name, model=model, latency_seconds=0.0
+        )
+        output: List[str] = []
+        started = time.monotonic()
+        try:
+            async with aclosing(self.providers[provider].chat_stream(
+                messages=messages,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs,
+            )) as stream:
+                async for delta in stream:
+                    if record.ttfb_seconds is None:
+                        record.ttfb_seconds = time.monotonic() - started
+                    output.append(delta)
+                    yield delta
+        except Exception as e:
+            record.error = type(e).__name__
             raise
+        finally:
+            if permit is not None:
+                permit.release()
+            record.latency_seconds = time.monotonic() - started
+            record.prompt_tokens = sum(estimate_tokens(msg.content) for msg in messages)
+            record.completion_tokens = estimate_tokens("".join(output))
+            record.cost_usd = self.providers[provider].calculate_cost(
+                model,
+                {"prompt_tokens": record.prompt_tokens, "completion_tokens": record.completion_tokens},
+            )
+            llm_telemetry.record(record)
+
+    async def chat_stream_for_agent(
+        self,
+        agent_name: str,
+        messages: List[Message],
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion using agent-specific configuration
+
+        The configured fallback is only tried when the primary provider fails
+        before producing any output; a failure mid-stream is raised as-is.
+
+        Args:
+            agent_name: Name of the agent (e.g., "general_analysis_agent")
+            messages: List of chat messages
+            max_tokens: Maximum tokens to generate
+            **kwargs: Additional parameters
+
+        Yields:
+            Content deltas as they arrive
+        """
+        config = self.get_agent_config(agent_name)
+
+        if config is None:
+            async with aclosing(self.chat_stream(
+                messages=messages, max_tokens=max_tokens, agent_name=agent_name, **kwargs
+            )) as stream:
+                async for delta in stream:
+                    yield delta
+            return
+
+        temperature = config.get("temperature", 0.7)
+        if max_tokens is None:
+            max_tokens = config.get("max_tokens")
+        if "response_format" in config and "response_format" not in kwargs:
+            kwargs["response_format"] = config["response_format"]
+
+        started = False
+        try:
+            async with aclosing(self.chat_stream(
+                messages=messages,
+                provider=config["provider"],
+                model=config["model"],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                agent_name=agent_name,
+                **kwargs,
+            )) as stream:
+                async for delta in stream:
+                    started = True
+                    yield delta
+        except Exception as e:
+            fallback = config.get("fallback")
+            if started or not fallback:
+                raise
+
+            logger.warning(f"Primary provider failed for {agent_name}, trying fallback: {e}")
+            fallback_kwargs = kwargs.copy()
+            if "response_format" in fallback:
+                fallback_kwargs["response_format"] = fallback["response_format"]
+
+            async with aclosing(self.chat_stream(
+                messages=messages,
+                provider=fallback["provider"],
+                model=fallback["model"],
+                temperature=temperature,
+                max_tokens=self._fallback_max_tokens(fallback, max_tokens),
+                agent_name=agent_name,
+                **fallback_kwargs,
+            )) as stream:
+                async for delta in stream:
+                    yield delta
 
     async def estimate_cost(
         self,
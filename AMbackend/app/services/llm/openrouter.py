@@ -1,9 +1,14 @@
 """OpenRouter LLM Provider implementation"""
 
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 import httpx
 
 from app.services.llm.base import LLMProvider
+from app.services.llm.structured_output import (
+    STRUCTURED_OUTPUT_KWARG,
+    openai_tool_arguments,
+    openai_tool_params,
+)
 from app.schemas.llm import LLMResponse, Message
 
 
@@ -58,17 +63,95 @@ class OpenRouterProvider(LLMProvider):
             httpx.HTTPError: If API request fails
         """
         url = f"{self.base_url}/chat/completions"
+        payload = self._build_payload(messages, model, temperature, max_tokens, **kwargs)
 
-        headers = {
+        timing: Dict[str, float] = {}
+        async with self._timed_client(60.0, timing) as client:
+            response = await client.post(url, headers=self._headers(), json=payload)
+            response.raise_for_status()
+            data = response.json()
+
+        # Extract content (tool-call arguments in structured output mode) and usage
+        message = data["choices"][0]["message"]
+        arguments = openai_tool_arguments(message) if "tools" in payload else None
+        content = arguments if arguments is not None else message.get("content") or ""
+        usage = data.get("usage") or {}
+        prompt_details = usage.get("prompt_tokens_details") or {}
+
+        return LLMResponse(
+            content=content,
+            model=model,
+            provider="openrouter",
+            usage=self._build_usage(
+                prompt_tokens=usage.get("prompt_tokens", 0),
+                completion_tokens=usage.get("completion_tokens", 0),
+                cache_read_tokens=prompt_details.get("cached_tokens") or 0,
+                cache_write_tokens=prompt_details.get("cache_write_tokens") or 0,
+            ),
+            metadata={
+                "finish_reason": data["choices"][0].get("finish_reason"),
+                "id": data.get("id"),
+                "ttfb_seconds": timing.get("ttfb_seconds"),
+                "structured_output": "tool" if arguments is not None else None,
+            },
+        )
+
+    async def chat_stream(
+        self,
+        messages: List[Message],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion from OpenRouter (``"stream": true``)
+
+        Yields:
+            Content deltas as they arrive
+
+        Raises:
+            httpx.HTTPError: If API request fails
+            RuntimeError: If OpenRouter reports an error mid-stream
+        """
+        url = f"{self.base_url}/chat/completions"
+        payload = self._build_payload(messages, model, temperature, max_tokens, **kwargs)
+        payload["stream"] = True
+
+        async with httpx.AsyncClient(timeout=60.0) as client:
+            async with client.stream("POST", url, headers=self._headers(), json=payload) as response:
+                response.raise_for_status()
+                async for event in self._iter_sse_events(response):
+                    if "error" in event:
+                        raise RuntimeError(f"OpenRouter stream error: {event['error']}")
+
+                    choices = event.get("choices") or []
+                    if not choices:
+                        continue
+                    delta = (choices[0].get("delta") or {}).get("content")
+                    if delta:
+                        yield delta
+
+    def _headers(self) -> Dict[str, str]:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
             "HTTP-Referer": "https://automoney.ai",  # Optional
             "X-Title": "AutoMoney",  # Optional
         }
 
+    def _build_payload(
+        self,
+        messages: List[Message],
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs,
+    ) -> Dict[str, Any]:
         payload = {
             "model": model,
-            "messages": self._format_messages(messages),
+            # Anthropic models need explicit cache breakpoints; others cache prefixes automatically
+            "messages": self._format_messages(messages, cache_control=model.startswith("anthropic/")),
             "temperature": temperature,
         }
 
@@ -79,32 +162,15 @@ class OpenRouterProvider(LLMProvider):
         if "response_format" in kwargs:
             payload["response_format"] = kwargs.pop("response_format")
 
+        # Structured output: forced tool call (replaces response_format)
+        tool = kwargs.pop(STRUCTURED_OUTPUT_KWARG, None)
+        if tool:
+            payload.pop("response_format", None)
+            payload.update(openai_tool_params(tool))
+
         # Add any extra kwargs
         payload.update(kwargs)
-
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            data = response.json()
-
-        # Extract content and usage
-        content = data["choices"][0]["message"]["content"]
-        usage = data.get("usage", {})
-
-        return LLMResponse(
-            content=content,
-            model=model,
-            provider="openrouter",
-            usage={
-                "prompt_tokens": usage.get("prompt_tokens", 0),
-                "completion_tokens": usage.get("completion_tokens", 0),
-                "total_tokens": usage.get("total_tokens", 0),
-            },
-            metadata={
-                "finish_reason": data["choices"][0].get("finish_reason"),
-                "id": data.get("id"),
-            },
-        )
+        return payload
 
     def get_available_models(self) -> List[str]:
         """Get list of available OpenRouter models"""
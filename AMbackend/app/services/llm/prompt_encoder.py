@@ -0,0 +1,163 @@
+"""Compact, token-budgeted encoding of market data for agent prompts
+
+Agents used to spell every indicator out as prose ("- EMA 20: $64,321.98").
+This module renders the same values as small pipe-separated tables:
+
+    ## 60m
+    asset|ema9|ema21|rsi14|atr14
+    BTC|64322|64100|41.3|512
+    ETH|2462|2455|38.92|21.7
+
+- numbers are rounded by magnitude (4 significant digits by default, whole
+  part never truncated)
+- columns missing in every row are dropped; columns with the same value in
+  every row are hoisted into one ``key=value`` line
+- sections are added with a priority, and the lowest-priority sections are
+  dropped (and listed as omitted) when the rendered prompt would exceed the
+  token budget
+
+``estimate_tokens`` is a local approximation of BPE token counts (CJK
+characters ~1 token each, digits ~3 per token, words ~4 chars per token),
+accurate enough for budgeting without a tokenizer dependency.
+"""
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+MISSING = "-"
+
+_TOKEN_PIECES = re.compile(r"[\u3000-\u9fff\uff00-\uffef]|\d+|[A-Za-z]+|\S")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of ``text``"""
+    tokens = 0
+    for piece in _TOKEN_PIECES.findall(text):
+        first = piece[0]
+        if first.isdigit():
+            tokens += math.ceil(len(piece) / 3)
+        elif first.isascii() and first.isalpha():
+            tokens += math.ceil(len(piece) / 4)
+        else:
+            tokens += 1
+    return tokens
+
+
+def fmt_number(value: Any, digits: int = 4) -> str:
+    """
+    Compact number: ``digits`` significant digits, whole part never truncated
+
+    64321.98 -> "64322", 2461.537 -> "2462", 41.273 -> "41.27",
+    0.000123 -> "0.000123", None/NaN -> "-"
+    """
+    if value is None or isinstance(value, bool):
+        return MISSING if value is None else str(value).lower()
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return str(value)
+    if math.isnan(number) or math.isinf(number):
+        return MISSING
+    if number == 0:
+        return "0"
+
+    magnitude = math.floor(math.log10(abs(number))) + 1
+    decimals = max(digits - magnitude, 0)
+    text = f"{number:.{decimals}f}"
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    return "0" if text in ("-0", "") else text
+
+
+def encode_table(rows: Sequence[Dict[str, Any]], columns: Sequence[str], digits: int = 4) -> str:
+    """
+    Render rows as a pipe-separated table
+
+    Args:
+        rows: One dict per row
+        columns: Column order (the first column is the row label and always kept)
+        digits: Significant digits for numbers
+    """
+    cells = [[fmt_number(row.get(col), digits) for col in columns] for row in rows]
+    if not cells:
+        return ""
+
+    kept: List[int] = [0]
+    shared: List[str] = []
+    for i in range(1, len(columns)):
+        values = [row[i] for row in cells]
+        if all(v == MISSING for v in values):
+            continue
+        if len(cells) > 1 and len(set(values)) == 1:
+            shared.append(f"{columns[i]}={values[0]}")
+            continue
+        kept.append(i)
+
+    lines = []
+    if shared:
+        lines.append(" ".join(shared))
+    lines.append("|".join(columns[i] for i in kept))
+    lines.extend("|".join(row[i] for i in kept) for row in cells)
+    return "\n".join(lines)
+
+
+def encode_fields(fields: Dict[str, Any], digits: int = 4) -> str:
+    """Render a flat dict as ``key=value`` pairs on one line (missing values dropped)"""
+    return " ".join(
+        f"{key}={fmt_number(value, digits)}" for key, value in fields.items() if value is not None
+    )
+
+
+@dataclass
+class _Section:
+    title: str
+    body: str
+    priority: int
+    order: int
+
+
+class PromptEncoder:
+    """
+    Collects prompt sections and renders them within a token budget
+
+    Example:
+        encoder = PromptEncoder(budget_tokens=800)
+        encoder.add("price", encode_fields({"btc": 64321.9}), priority=0)
+        encoder.add("15m", encode_table(rows, columns), priority=2)
+        text = encoder.render()
+    """
+
+    def __init__(self, budget_tokens: Optional[int] = None):
+        self.budget_tokens = budget_tokens
+        self._sections: List[_Section] = []
+
+    def add(self, title: str, body: str, priority: int = 0) -> "PromptEncoder":
+        """Add a section (lower priority value = kept longer)"""
+        if body:
+            self._sections.append(_Section(title, body, priority, len(self._sections)))
+        return self
+
+    def render(self) -> str:
+        """Sections in insertion order, dropping the lowest-priority ones over budget"""
+        kept = list(self._sections)
+        omitted: List[str] = []
+
+        while (
+            self.budget_tokens
+            and len(kept) > 1
+            and estimate_tokens(self._join(kept, omitted)) > self.budget_tokens
+        ):
+            drop = max(kept, key=lambda s: (s.priority, s.order))
+            kept.remove(drop)
+            omitted.append(drop.title)
+
+        return self._join(kept, omitted)
+
+    @staticmethod
+    def _join(sections: List[_Section], omitted: List[str]) -> str:
+        parts = [f"## {s.title}\n{s.body}" for s in sections]
+        if omitted:
+            parts.append(f"(omitted for length: {', '.join(omitted)})")
+        return "\n".join(parts)
@@ -0,0 +1,220 @@
+"""Deterministic cache for agent LLM responses
+
+Business agents build their prompts from market data that often barely moves
+between scheduler periods (FRED macro data is cached for an hour, on-chain
+metrics update slowly), so identical or near-identical prompts are common.
+
+Entries are keyed by (agent, provider, model, temperature, request params,
+normalized prompt hash). Normalization collapses whitespace; agents with a
+``fingerprint_digits`` policy additionally mask timestamps and round every
+number in the prompt to N significant digits, so inputs that only differ in
+noise share a bucket.
+
+Entries live in an in-process LRU shared by the API and scheduler threads and,
+with LLM_CACHE_REDIS_ENABLED, in Redis so they survive restarts and are shared
+between workers.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.serialization import dumps, loads
+from app.schemas.llm import LLMResponse, Message
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_TIMESTAMP = re.compile(
+    r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?"
+)
+# Standalone numbers only: "ema_20" or "v1.2.3" are left alone. ASCII word
+# boundaries, so numbers next to CJK text ("价格64321.98美元") are still bucketed
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?(?![\w.])", re.ASCII)
+
+
+def normalize_prompt(text: str, fingerprint_digits: Optional[int] = None) -> str:
+    """
+    Canonical form of a prompt for cache keys
+
+    Args:
+        text: Prompt text
+        fingerprint_digits: Round numbers to this many significant digits and
+            mask timestamps (None = whitespace normalization only)
+    """
+    text = _WHITESPACE.sub(" ", text).strip()
+    if fingerprint_digits is None:
+        return text
+
+    text = _TIMESTAMP.sub("<ts>", text)
+    return _NUMBER.sub(lambda m: f"{float(m.group()):.{fingerprint_digits}g}", text)
+
+
+def cache_key(
+    agent_name: str,
+    signature: Dict[str, Any],
+    messages: List[Message],
+    fingerprint_digits: Optional[int] = None,
+) -> str:
+    """SHA-256 cache key of the call signature and normalized messages"""
+    material = {
+        "agent": agent_name,
+        "signature": signature,
+        "messages": [
+            [msg.role, normalize_prompt(msg.content, fingerprint_digits)] for msg in messages
+        ],
+    }
+    return hashlib.sha256(dumps(material)).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for one agent"""
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    tokens_saved: int = 0
+    cost_saved_usd: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LLMResponseCache:
+    """Two-level (memory + optional Redis) cache of agent LLM responses"""
+
+    REDIS_KEY_PREFIX = "llm:cache:"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        # key -> (expires_at, entry); entry = {"response": {...}, "cost_usd": float}
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._stats: Dict[str, CacheStats] = {}
+        # Shared by the API loop and the scheduler's per-job loops
+        self._lock = threading.Lock()
+
+    async def get(self, agent_name: str, key: str) -> Optional[LLMResponse]:
+        """Cached response for ``key``, counting a hit or miss for the agent"""
+        entry = self._get_local(key)
+        if entry is None and settings.LLM_CACHE_REDIS_ENABLED:
+            entry = await self._get_redis(key)
+
+        with self._lock:
+            stats = self._stats.setdefault(agent_name, CacheStats())
+            if entry is None:
+                stats.misses += 1
+                return None
+
+            response = LLMResponse.model_validate(entry["response"])
+            stats.hits += 1
+            stats.tokens_saved += (response.usage or {}).get("total_tokens", 0)
+            stats.cost_saved_usd += entry.get("cost_usd", 0.0)
+
+        response.metadata = {**(response.metadata or {}), "cache_hit": True}
+        return response
+
+    async def set(
+        self,
+        agent_name: str,
+        key: str,
+        response: LLMResponse,
+        ttl_seconds: int,
+        cost_usd: float = 0.0,
+    ) -> None:
+        """Store a response for ``ttl_seconds``"""
+        if ttl_seconds <= 0 or not response.content:
+            return
+
+        entry = {"response": response.model_dump(), "cost_usd": cost_usd}
+        self._set_local(key, entry, time.time() + ttl_seconds)
+        with self._lock:
+            self._stats.setdefault(agent_name, CacheStats()).stores += 1
+
+        if settings.LLM_CACHE_REDIS_ENABLED:
+            try:
+                import redis.asyncio as redis
+
+                # Callers run on different event loops; use a connection per call
+                async with redis.from_url(settings.REDIS_URL) as client:
+                    await client.set(self.REDIS_KEY_PREFIX + key, dumps(entry), ex=ttl_seconds)
+            except Exception as e:
+                logger.warning(f"LLM cache write to Redis failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-agent and total hit/miss/cost-saved metrics"""
+        with self._lock:
+            agents = {name: {**asdict(s), "hit_rate": s.hit_rate} for name, s in self._stats.items()}
+            entries = len(self._entries)
+
+        totals = CacheStats(
+            hits=sum(a["hits"] for a in agents.values()),
+            misses=sum(a["misses"] for a in agents.values()),
+            stores=sum(a["stores"] for a in agents.values()),
+            tokens_saved=sum(a["tokens_saved"] for a in agents.values()),
+            cost_saved_usd=sum(a["cost_saved_usd"] for a in agents.values()),
+        )
+        return {
+            "entries": entries,
+            "total": {**asdict(totals), "hit_rate": totals.hit_rate},
+            "agents": agents,
+        }
+
+    def clear(self) -> None:
+        """Drop in-memory entries and counters (Redis entries expire on their own)"""
+        with self._lock:
+            self._entries.clear()
+            self._stats.clear()
+
+    def _get_local(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+
+            expires_at, entry = item
+            if time.time() >= expires_at:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return entry
+
+    def _set_local(self, key: str, entry: Dict[str, Any], expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def _get_redis(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            import redis.asyncio as redis
+
+            async with redis.from_url(settings.REDIS_URL) as client:
+                async with client.pipeline(transaction=False) as pipe:
+                    body, ttl = await pipe.get(self.REDIS_KEY_PREFIX + key).ttl(
+                        self.REDIS_KEY_PREFIX + key
+                    ).execute()
+        except Exception as e:
+            logger.warning(f"LLM cache read from Redis failed: {e}")
+            return None
+
+        if body is None or ttl is None or ttl <= 0:
+            return None
+
+        entry = loads(body)
+        self._set_local(key, entry, time.time() + ttl)
+        return entry
+
+
+# Global instance
+llm_response_cache = LLMResponseCache(settings.LLM_CACHE_MAX_ENTRIES)
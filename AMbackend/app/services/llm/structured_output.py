@@ -0,0 +1,108 @@
+"""Structured output via a forced tool call
+
+Agents describe their LLM output as a tool whose parameters are the output
+fields of their Pydantic model. Providers send it as a tool definition with a
+forced ``tool_choice`` and return the tool-call arguments (a JSON document) as
+``LLMResponse.content``, with ``metadata["structured_output"] = "tool"``.
+
+This works for Claude models, which have no ``response_format``: the model
+cannot wrap the JSON in prose or fences, and the arguments follow the schema.
+Models that reject tools (e.g. Claude with extended thinking, which cannot be
+forced to call a tool) fall back to prompt mode in ``LLMManager``; agent
+prompts therefore keep their JSON format instructions.
+
+Example:
+    OUTPUT_TOOL = output_tool("submit_macro_analysis", MacroAnalysisOutput, fields, "...")
+    await llm_manager.chat_for_agent("macro_agent", messages, structured_output=OUTPUT_TOOL)
+"""
+
+from typing import Any, Dict, Optional, Sequence, Type
+
+from pydantic import BaseModel
+
+# chat() kwarg carrying the tool definition
+STRUCTURED_OUTPUT_KWARG = "structured_output"
+
+
+def output_tool(
+    name: str,
+    model: Type[BaseModel],
+    fields: Sequence[str],
+    description: str,
+    optional: Sequence[str] = (),
+) -> Dict[str, Any]:
+    """
+    Provider-neutral tool definition for ``fields`` of ``model``
+
+    Args:
+        name: Tool name (``^[a-zA-Z0-9_-]+$``)
+        model: Output model the fields are taken from
+        fields: Required fields the LLM produces
+        description: What the tool call submits
+        optional: Fields the LLM may omit
+
+    Returns:
+        ``{"name", "description", "parameters"}`` with a self-contained JSON schema
+    """
+    schema = model.model_json_schema()
+    defs = schema.get("$defs", {})
+    properties = {
+        field: _inline_refs(schema["properties"][field], defs) for field in [*fields, *optional]
+    }
+    return {
+        "name": name,
+        "description": description,
+        "parameters": {
+            "type": "object",
+            "properties": properties,
+            "required": list(fields),
+        },
+    }
+
+
+def _inline_refs(node: Any, defs: Dict[str, Any]) -> Any:
+    """Resolve ``$ref`` into ``$defs`` and drop titles (tool schemas must be self-contained)"""
+    if isinstance(node, list):
+        return [_inline_refs(item, defs) for item in node]
+    if not isinstance(node, dict):
+        return node
+    if "$ref" in node:
+        resolved = dict(defs.get(node["$ref"].rsplit("/", 1)[-1], {}))
+        resolved.update({key: value for key, value in node.items() if key != "$ref"})
+        return _inline_refs(resolved, defs)
+    return {key: _inline_refs(value, defs) for key, value in node.items() if key != "title"}
+
+
+def openai_tool_params(tool: Dict[str, Any]) -> Dict[str, Any]:
+    """Chat Completions ``tools`` + forced ``tool_choice`` for a tool definition"""
+    return {
+        "tools": [{"type": "function", "function": tool}],
+        "tool_choice": {"type": "function", "function": {"name": tool["name"]}},
+    }
+
+
+def claude_tool_params(tool: Dict[str, Any]) -> Dict[str, Any]:
+    """Messages API ``tools`` + forced ``tool_choice`` for a tool definition"""
+    return {
+        "tools": [
+            {"name": tool["name"], "description": tool["description"], "input_schema": tool["parameters"]}
+        ],
+        "tool_choice": {"type": "tool", "name": tool["name"]},
+    }
+
+
+def openai_tool_arguments(message: Dict[str, Any]) -> Optional[str]:
+    """Arguments JSON of the first function call in a Chat Completions message (None if none)"""
+    for call in message.get("tool_calls") or []:
+        function = call.get("function") or {}
+        if function.get("arguments"):
+            return function["arguments"]
+    return None
+
+
+def claude_tool_input(content_blocks: Sequence[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Input of the first ``tool_use`` block of a Messages API response (None if none)"""
+    for block in content_blocks:
+        if block.get("type") == "tool_use" and isinstance(block.get("input"), dict):
+            return block["input"]
+    return None
@@ -0,0 +1,296 @@
+"""Offline stub LLM provider
+
+Stands in for OpenRouter/Tuzi so ``LLMManager``, the agents and the scheduler
+can run without API keys, e.g. to load-test our own pipeline
+(``scripts/load_test_pipeline.py``) or to develop without burning credits.
+
+Each call sleeps for a simulated vendor latency: a log-normal time to first
+token plus completion tokens at a fixed rate. Errors (HTTP 429/5xx) and
+malformed, non-JSON completions can be injected at configurable rates. The
+completion is a canned, schema-valid JSON response for the agent named by the
+model (``LLMManager`` in stub mode sends ``model=<agent_name>``).
+
+Enable with LLM_STUB_ENABLED=true, or call ``llm_manager.use_stub()``.
+"""
+
+import asyncio
+import json
+import math
+import random
+import threading
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.schemas.llm import LLMResponse, Message
+from app.services.llm.base import LLMProvider
+from app.services.llm.prompt_encoder import estimate_tokens
+
+STUB_BASE_URL = "stub://local"
+# Characters per streamed delta
+STREAM_CHUNK_CHARS = 16
+
+# Canned completions per agent, valid for the agents' parsers and output schemas
+CANNED_RESPONSES: Dict[str, Dict[str, Any]] = {
+    "macro_agent": {
+        "signal": "BULLISH",
+        "confidence": 0.72,
+        "score": 35.0,
+        "reasoning": "Stub: easing rate expectations and a softer dollar support risk assets.",
+        "macro_indicators": {
+            "fed_policy": "NEUTRAL",
+            "dollar_strength": "WEAKENING",
+            "liquidity": "EXPANDING",
+        },
+        "key_factors": ["Softer DXY", "Stable fed funds rate", "M2 growth positive"],
+        "risk_assessment": "Moderate: inflation surprises could reverse rate expectations.",
+    },
+    "onchain_agent": {
+        "signal": "NEUTRAL",
+        "confidence": 0.6,
+        "score": 5.0,
+        "reasoning": "Stub: network activity is steady with normal mempool congestion.",
+        "onchain_metrics": {
+            "network_activity": "STABLE",
+            "fee_pressure": "LOW",
+            "hash_rate_trend": "RISING",
+        },
+        "network_health": "HEALTHY",
+        "key_observations": ["Fees near 30-day median", "Difficulty adjustment slightly positive"],
+    },
+    "ta_agent": {
+        "signal": "BULLISH",
+        "confidence": 0.68,
+        "score": 28.0,
+        "reasoning": "Stub: price holds above the 50 EMA with a positive MACD histogram.",
+        "technical_indicators": {"trend": "UPTREND", "momentum": "POSITIVE", "volatility": "NORMAL"},
+        "support_levels": [62000.0, 60500.0],
+        "resistance_levels": [66000.0, 68500.0],
+        "trend_analysis": "Higher lows on the daily chart; trend intact above 62k.",
+        "key_patterns": ["Bull flag"],
+    },
+    "regime_filter_agent": {
+        "regime_score": 62.0,
+        "regime_classification": "HEALTHY",
+        "confidence": 0.75,
+        "reasoning": "Stub: 宏观流动性中性偏松, 情绪温和, 衍生品未过热.",
+        "component_scores": {
+            "macro_liquidity": 0.2,
+            "market_sentiment": 0.3,
+            "derivatives_health": 0.4,
+            "onchain_signal": 0.1,
+        },
+        "key_factors": ["资金费率正常", "恐慌贪婪指数中性"],
+        "risk_level": "MEDIUM",
+        "recommended_multiplier": 1.1,
+    },
+    "ta_momentum_agent": {
+        "asset_analyses": {
+            asset: {
+                "signal": signal,
+                "signal_strength": strength,
+                "confidence": 0.7,
+                "entry_price": price,
+                "stop_loss_distance_atr": 2.0,
+                "take_profit_rr": 2.0,
+                "reasoning": "Stub: 60分钟多头排列, 15分钟动量确认.",
+                "technical_scores": {"trend": 0.7, "momentum": 0.6, "timing": 0.6, "risk": 0.5},
+                "key_levels": {"support": [price * 0.97], "resistance": [price * 1.03]},
+                "timeframe_alignment": 0.75,
+            }
+            for asset, signal, strength, price in (
+                ("BTC", "LONG", 0.78, 64000.0),
+                ("ETH", "NEUTRAL", 0.4, 2450.0),
+                ("SOL", "NEUTRAL", 0.35, 100.0),
+            )
+        },
+        "best_opportunity": {
+            "asset": "BTC",
+            "signal": "LONG",
+            "signal_strength": 0.78,
+            "confidence": 0.7,
+            "reasoning": "Stub: BTC 动量最强.",
+        },
+        "overall_momentum_strength": 0.6,
+        "market_trend": "UPTREND",
+        "reasoning": "Stub: BTC 上涨动量, ETH/SOL 中性.",
+    },
+    "super_agent": {
+        "decision": "ROUTE_TO_PLANNING",
+        "reasoning": "Stub: the question needs market analysis.",
+        "confidence": 0.9,
+        "direct_answer": None,
+    },
+    "planning_agent": {
+        "task_breakdown": {
+            "analysis_phase": [
+                {
+                    "agent": "macro_agent",
+                    "reason": "Stub: macro backdrop",
+                    "data_required": ["fed_rate", "dxy"],
+                    "priority": "high",
+                },
+                {
+                    "agent": "ta_agent",
+                    "reason": "Stub: price structure",
+                    "data_required": ["ohlcv", "indicators"],
+                    "priority": "high",
+                },
+            ],
+            "decision_phase": {"agent": "general_analysis_agent", "focus": "synthesis"},
+        },
+        "execution_strategy": {
+            "parallel_agents": ["macro_agent", "ta_agent"],
+            "sequential_after": [],
+            "estimated_time": "30s",
+        },
+        "reasoning": "Stub: macro and technical views cover the question.",
+    },
+    "general_analysis_agent": {
+        "answer": "Stub: macro and technical signals lean mildly bullish; size positions conservatively.",
+        "summary": "Mildly bullish",
+        "key_insights": ["Macro supportive", "Trend intact above 62k"],
+        "confidence": 0.7,
+        "sources": ["macro_agent", "ta_agent"],
+    },
+}
+
+DEFAULT_COMPLETION = "Stub response."
+
+
+@dataclass
+class StubProfile:
+    """Simulated vendor behaviour"""
+
+    # Log-normal time to first token: median seconds and shape (0 = constant)
+    ttfb_seconds: float = 1.5
+    ttfb_sigma: float = 0.5
+    # Completion generation speed
+    tokens_per_second: float = 80.0
+    # Probability of an injected HTTP 429/5xx error
+    error_rate: float = 0.0
+    # Probability of a non-JSON completion (exercises parse retries)
+    malformed_rate: float = 0.0
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_settings(cls) -> "StubProfile":
+        return cls(
+            ttfb_seconds=settings.LLM_STUB_TTFB_SECONDS,
+            ttfb_sigma=settings.LLM_STUB_TTFB_SIGMA,
+            tokens_per_second=settings.LLM_STUB_TOKENS_PER_SECOND,
+            error_rate=settings.LLM_STUB_ERROR_RATE,
+            malformed_rate=settings.LLM_STUB_MALFORMED_RATE,
+        )
+
+
+class StubLLMProvider(LLMProvider):
+    """LLMProvider returning canned agent JSON after a simulated latency"""
+
+    ERROR_STATUSES = (429, 500, 502, 503)
+
+    def __init__(
+        self,
+        profile: Optional[StubProfile] = None,
+        responses: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        super().__init__(api_key="stub", base_url=STUB_BASE_URL)
+        self.profile = profile or StubProfile()
+        self.responses = {**CANNED_RESPONSES, **(responses or {})}
+        self._random = random.Random(self.profile.seed)
+        self._lock = threading.Lock()
+        # model -> counters and simulated seconds
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    async def chat(
+        self,
+        messages: List[Message],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> LLMResponse:
+        content, ttfb, failure = self._plan(model)
+        seconds = ttfb if failure else ttfb + estimate_tokens(content) / self.profile.tokens_per_second
+        await asyncio.sleep(seconds)
+        self._record(model, seconds, failure)
+        if failure:
+            self._raise_http_error(failure)
+
+        return self._response(messages, model, content, ttfb)
+
+    async def chat_stream(
+        self,
+        messages: List[Message],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        content, ttfb, failure = self._plan(model)
+        await asyncio.sleep(ttfb)
+        if failure:
+            self._record(model, ttfb, failure)
+            self._raise_http_error(failure)
+
+        elapsed = ttfb
+        for start in range(0, len(content), STREAM_CHUNK_CHARS):
+            chunk = content[start:start + STREAM_CHUNK_CHARS]
+            delay = estimate_tokens(chunk) / self.profile.tokens_per_second
+            await asyncio.sleep(delay)
+            elapsed += delay
+            yield chunk
+        self._record(model, elapsed, None)
+
+    def get_available_models(self) -> List[str]:
+        return list(self.responses)
+
+    def stats(self) -> Dict[str, Any]:
+        """Calls, injected failures and simulated vendor seconds per model"""
+        with self._lock:
+            return {model: dict(counters) for model, counters in self._stats.items()}
+
+    def _plan(self, model: str) -> Tuple[str, float, Optional[int]]:
+        """Draw (content, time to first token, injected HTTP status or None) for one call"""
+        with self._lock:
+            ttfb = self.profile.ttfb_seconds
+            if self.profile.ttfb_sigma > 0:
+                ttfb *= math.exp(self._random.gauss(0.0, self.profile.ttfb_sigma))
+            failure = None
+            if self._random.random() < self.profile.error_rate:
+                failure = self._random.choice(self.ERROR_STATUSES)
+            malformed = self._random.random() < self.profile.malformed_rate
+
+        canned = self.responses.get(model)
+        if canned is None:
+            content = DEFAULT_COMPLETION
+        elif malformed:
+            content = f"Sure! Here is the analysis: {json.dumps(canned, ensure_ascii=False)[:-1]}"
+        else:
+            content = json.dumps(canned, ensure_ascii=False)
+        return content, ttfb, failure
+
+    def _record(self, model: str, seconds: float, failure: Optional[int]) -> None:
+        with self._lock:
+            counters = self._stats.setdefault(model, {"calls": 0, "errors": 0, "simulated_seconds": 0.0})
+            counters["calls"] += 1
+            counters["simulated_seconds"] += seconds
+            if failure:
+                counters["errors"] += 1
+
+    def _raise_http_error(self, status: int) -> None:
+        request = httpx.Request("POST", f"{STUB_BASE_URL}/chat/completions")
+        response = httpx.Response(status, request=request)
+        raise httpx.HTTPStatusError(f"Stub injected HTTP {status}", request=request, response=response)
+
+    def _response(self, messages: List[Message], model: str, content: str, ttfb: float) -> LLMResponse:
+        prompt_tokens = sum(estimate_tokens(msg.content) for msg in messages)
+        return LLMResponse(
+            content=content,
+            model=model,
+            provider="stub",
+            usage=self._build_usage(prompt_tokens, estimate_tokens(content)),
+            metadata={"finish_reason": "stop", "stub": True, "ttfb_seconds": ttfb},
+        )
@@ -0,0 +1,418 @@
+"""Per-call LLM telemetry: latency, tokens, cost and the daily budget
+
+``LLMManager`` records every provider call (agent, provider, model, time to
+first byte, total latency, token usage, cost, error) into:
+
+- an in-memory ring of the last LLM_TELEMETRY_RING_SIZE calls, which backs
+  the p50/p95/p99 and spend report of ``GET /monitoring/llm/usage``
+- per-(day, agent, provider, model) aggregates, written to
+  ``llm_usage_rollups`` every LLM_TELEMETRY_ROLLUP_SECONDS by a background
+  ``BackgroundFlusher`` (own thread, event loop and engine)
+
+Daily spend (UTC) is checked against DAILY_COST_ALERT_THRESHOLD on every
+call: crossing LLM_COST_WARNING_RATIO of it, and the threshold itself, is
+logged and tracked as a system error once per day (ENABLE_COST_ALERTS).
+From LLM_BUDGET_THROTTLE_RATIO of the threshold on, requests outside the
+trading lane are soft-throttled: ``max_tokens`` is capped and admission is
+delayed. After each rollup the spend is re-read from the table, so it
+includes other workers and survives restarts.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as dt_time, timezone
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.background_flusher import BackgroundFlusher
+from app.models.llm_usage import LLMUsageRollup
+from app.services.llm.admission import LLMPriority
+
+logger = logging.getLogger(__name__)
+
+# Agent label of calls made outside chat_for_agent
+NO_AGENT = "-"
+
+
+@dataclass
+class LLMCallRecord:
+    """One provider call (failed calls have ``error`` set and no usage)"""
+
+    agent_name: str
+    provider: str
+    model: str
+    latency_seconds: float
+    ttfb_seconds: Optional[float] = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cache_read_tokens: int = 0
+    cost_usd: float = 0.0
+    error: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def day(self) -> date:
+        return datetime.fromtimestamp(self.timestamp, timezone.utc).date()
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank q-quantile of ``values`` (None when empty)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(max(math.ceil(q * len(ordered)) - 1, 0), len(ordered) - 1)
+    return ordered[index]
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+class _Aggregate:
+    """Counters and latency samples of one group of calls"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cache_read_tokens = 0
+        self.cost_usd = 0.0
+        self.latencies: List[float] = []
+        self.ttfbs: List[float] = []
+
+    def add(self, record: LLMCallRecord) -> None:
+        self.calls += 1
+        if record.error:
+            self.errors += 1
+        else:
+            self.latencies.append(record.latency_seconds)
+            if record.ttfb_seconds is not None:
+                self.ttfbs.append(record.ttfb_seconds)
+        self.prompt_tokens += record.prompt_tokens
+        self.completion_tokens += record.completion_tokens
+        self.cache_read_tokens += record.cache_read_tokens
+        self.cost_usd += record.cost_usd
+
+    def merge(self, other: "_Aggregate") -> None:
+        self.calls += other.calls
+        self.errors += other.errors
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.cache_read_tokens += other.cache_read_tokens
+        self.cost_usd += other.cost_usd
+        self.latencies.extend(other.latencies)
+        self.ttfbs.extend(other.ttfbs)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.calls, 4) if self.calls else 0.0,
+            "latency_p50_ms": _ms(percentile(self.latencies, 0.5)),
+            "latency_p95_ms": _ms(percentile(self.latencies, 0.95)),
+            "latency_p99_ms": _ms(percentile(self.latencies, 0.99)),
+            "ttfb_p50_ms": _ms(percentile(self.ttfbs, 0.5)),
+            "ttfb_p95_ms": _ms(percentile(self.ttfbs, 0.95)),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cache_read_tokens": self.cache_read_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+        }
+
+
+# (day, agent, provider, model)
+_RollupKey = Tuple[date, str, str, str]
+
+
+class LLMTelemetry:
+    """Ring buffer, rollups and daily budget of LLM calls (thread-safe)"""
+
+    def __init__(self, ring_size: int, rollup_seconds: float):
+        self.rollup_seconds = rollup_seconds
+        self._ring: Deque[LLMCallRecord] = deque(maxlen=ring_size)
+        self._pending: Dict[_RollupKey, _Aggregate] = {}
+        self._pending_since = datetime.now(timezone.utc)
+        # Spend per UTC day: recorded locally since the last rollup, and the
+        # table total read back after it (None until the first rollup)
+        self._pending_spend: Dict[date, float] = {}
+        self._synced_spend: Optional[Tuple[date, float]] = None
+        self._local_spend: Dict[date, float] = {}
+        # Alert levels already raised per day, and alerts not yet tracked
+        self._alerted: Dict[date, set] = {}
+        self._pending_alerts: List[Dict[str, Any]] = []
+        self.throttled = 0
+        self._lock = threading.Lock()
+        self._flusher = BackgroundFlusher("llm-telemetry-rollup", rollup_seconds, self.flush)
+
+    def record(self, record: LLMCallRecord) -> None:
+        """Add a call to the ring, the pending rollup and the daily spend"""
+        day = record.day
+        with self._lock:
+            self._ring.append(record)
+            key = (day, record.agent_name, record.provider, record.model)
+            self._pending.setdefault(key, _Aggregate()).add(record)
+            if record.cost_usd:
+                self._pending_spend[day] = self._pending_spend.get(day, 0.0) + record.cost_usd
+                self._local_spend[day] = self._local_spend.get(day, 0.0) + record.cost_usd
+                # Local totals of past days are only needed until they are rolled up
+                for old in [d for d in self._local_spend if d < day]:
+                    del self._local_spend[old]
+                self._check_budget_locked(day)
+
+    def daily_spend(self, day: Optional[date] = None) -> float:
+        """Spend in USD of a UTC day (default today)"""
+        day = day or datetime.now(timezone.utc).date()
+        with self._lock:
+            return self._daily_spend_locked(day)
+
+    def _daily_spend_locked(self, day: date) -> float:
+        if self._synced_spend is not None and self._synced_spend[0] == day:
+            return self._synced_spend[1] + self._pending_spend.get(day, 0.0)
+        return self._local_spend.get(day, 0.0)
+
+    @staticmethod
+    def _budget_level(spend: float) -> Tuple[float, str]:
+        threshold = settings.DAILY_COST_ALERT_THRESHOLD
+        ratio = spend / threshold if threshold > 0 else 0.0
+        if threshold > 0 and ratio >= 1.0:
+            return ratio, "exceeded"
+        if threshold > 0 and ratio >= settings.LLM_COST_WARNING_RATIO:
+            return ratio, "warning"
+        return ratio, "ok"
+
+    def _check_budget_locked(self, day: date) -> None:
+        spend = self._daily_spend_locked(day)
+        ratio, level = self._budget_level(spend)
+        alerted = self._alerted.setdefault(day, set())
+        if level == "ok" or level in alerted or not settings.ENABLE_COST_ALERTS:
+            return
+
+        alerted.add(level)
+        threshold = settings.DAILY_COST_ALERT_THRESHOLD
+        message = f"LLM daily spend {level} {day.isoformat()}: ${spend:.2f} of ${threshold:.2f}"
+        logger.warning(message)
+        self._pending_alerts.append(
+            {
+                "severity": "critical" if level == "exceeded" else "warning",
+                # Stable per day and level, so repeats aggregate into one error
+                "error_message": f"LLM daily cost {level} ({day.isoformat()})",
+                "context": {"spend_usd": round(spend, 4), "threshold_usd": threshold, "ratio": round(ratio, 4)},
+            }
+        )
+
+    def budget_status(self) -> Dict[str, Any]:
+        """Today's spend against DAILY_COST_ALERT_THRESHOLD"""
+        today = datetime.now(timezone.utc).date()
+        spend = self.daily_spend(today)
+        ratio, level = self._budget_level(spend)
+        return {
+            "date": today.isoformat(),
+            "spend_usd": round(spend, 4),
+            "threshold_usd": settings.DAILY_COST_ALERT_THRESHOLD,
+            "ratio": round(ratio, 4),
+            "level": level,
+            "throttling": self._throttling(ratio),
+            "throttled_requests": self.throttled,
+            "synced": self._synced_spend is not None and self._synced_spend[0] == today,
+        }
+
+    @staticmethod
+    def _throttling(ratio: float) -> bool:
+        return settings.LLM_BUDGET_THROTTLE_RATIO > 0 and ratio >= settings.LLM_BUDGET_THROTTLE_RATIO
+
+    def should_throttle(self, priority: LLMPriority) -> bool:
+        """
+        Whether a request should be soft-throttled for the daily budget
+
+        Trading-lane requests are never throttled.
+        """
+        if priority == LLMPriority.TRADING or settings.DAILY_COST_ALERT_THRESHOLD <= 0:
+            return False
+        ratio, _ = self._budget_level(self.daily_spend())
+        if not self._throttling(ratio):
+            return False
+        with self._lock:
+            self.throttled += 1
+        return True
+
+    def summary(self, window_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Latency percentiles, tokens and spend per agent/model from the ring
+
+        Args:
+            window_seconds: Only calls within this many seconds (default: whole ring)
+        """
+        cutoff = time.time() - window_seconds if window_seconds else 0.0
+        with self._lock:
+            records = [r for r in self._ring if r.timestamp >= cutoff]
+            ring_size = len(self._ring)
+
+        groups: Dict[Tuple[str, str, str], _Aggregate] = {}
+        total = _Aggregate()
+        for record in records:
+            groups.setdefault((record.agent_name, record.provider, record.model), _Aggregate()).add(record)
+            total.add(record)
+
+        rows = [
+            {"agent_name": agent, "provider": provider, "model": model, **aggregate.to_dict()}
+            for (agent, provider, model), aggregate in groups.items()
+        ]
+        rows.sort(key=lambda row: row["cost_usd"], reverse=True)
+        return {
+            "window_seconds": window_seconds,
+            "calls_in_ring": ring_size,
+            "oldest_timestamp": records[0].timestamp if records else None,
+            "totals": total.to_dict(),
+            "by_agent_model": rows,
+            "budget": self.budget_status(),
+        }
+
+    def _drain(self) -> Tuple[Dict[_RollupKey, _Aggregate], Dict[date, float], datetime, List[Dict[str, Any]]]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            spend, self._pending_spend = self._pending_spend, {}
+            alerts, self._pending_alerts = self._pending_alerts, []
+            since, self._pending_since = self._pending_since, datetime.now(timezone.utc)
+        return pending, spend, since, alerts
+
+    def _requeue(self, pending: Dict[_RollupKey, _Aggregate], spend: Dict[date, float], since: datetime) -> None:
+        with self._lock:
+            for key, aggregate in pending.items():
+                current = self._pending.get(key)
+                if current is None:
+                    self._pending[key] = aggregate
+                else:
+                    current.merge(aggregate)
+            for day, cost in spend.items():
+                self._pending_spend[day] = self._pending_spend.get(day, 0.0) + cost
+            self._pending_since = min(self._pending_since, since)
+
+    async def flush(self, db: AsyncSession) -> int:
+        """Write pending rollups and budget alerts, then re-read today's spend"""
+        pending, spend, since, alerts = self._drain()
+        now = datetime.now(timezone.utc)
+
+        rows = []
+        for (day, agent, provider, model), aggregate in pending.items():
+            day_start = datetime.combine(day, dt_time.min, tzinfo=timezone.utc)
+            stats = aggregate.to_dict()
+            rows.append(
+                {
+                    "bucket_start": max(since, day_start),
+                    "bucket_end": min(now, datetime.combine(day, dt_time.max, tzinfo=timezone.utc)),
+                    "agent_name": agent,
+                    "provider": provider,
+                    "model": model,
+                    "calls": aggregate.calls,
+                    "errors": aggregate.errors,
+                    "prompt_tokens": aggregate.prompt_tokens,
+                    "completion_tokens": aggregate.completion_tokens,
+                    "cache_read_tokens": aggregate.cache_read_tokens,
+                    "cost_usd": aggregate.cost_usd,
+                    "latency_p50_ms": stats["latency_p50_ms"],
+                    "latency_p95_ms": stats["latency_p95_ms"],
+                    "latency_p99_ms": stats["latency_p99_ms"],
+                    "ttfb_p95_ms": stats["ttfb_p95_ms"],
+                }
+            )
+
+        today = now.date()
+        try:
+            if rows:
+                await db.execute(insert(LLMUsageRollup), rows)
+                await db.commit()
+            today_start = datetime.combine(today, dt_time.min, tzinfo=timezone.utc)
+            result = await db.execute(
+                select(func.coalesce(func.sum(LLMUsageRollup.cost_usd), 0.0)).where(
+                    LLMUsageRollup.bucket_start >= today_start
+                )
+            )
+            synced = float(result.scalar() or 0.0)
+        except Exception as e:
+            await db.rollback()
+            self._requeue(pending, spend, since)
+            with self._lock:
+                self._pending_alerts[:0] = alerts
+            logger.error(f"LLM usage rollup failed, {len(rows)} rows kept for retry: {e}")
+            return 0
+
+        with self._lock:
+            self._synced_spend = (today, synced)
+            self._check_budget_locked(today)
+            alerts.extend(self._pending_alerts)
+            self._pending_alerts = []
+
+        if alerts:
+            # Imported here: the error tracker is not needed by the request path
+            from app.services.monitoring.error_tracker import error_tracker
+
+            for alert in alerts:
+                await error_tracker.track_error(
+                    db,
+                    error_type="llm_cost",
+                    error_category="budget",
+                    severity=alert["severity"],
+                    component="LLMTelemetry",
+                    error_message=alert["error_message"],
+                    context=alert["context"],
+                )
+
+        if rows:
+            logger.debug(f"LLM usage rollup written: {len(rows)} rows, today ${synced:.4f}")
+        return len(rows)
+
+    async def history(self, db: AsyncSession, since: datetime) -> List[Dict[str, Any]]:
+        """Rolled-up calls, tokens and cost per agent/model since ``since``"""
+        result = await db.execute(
+            select(
+                LLMUsageRollup.agent_name,
+                LLMUsageRollup.provider,
+                LLMUsageRollup.model,
+                func.sum(LLMUsageRollup.calls),
+                func.sum(LLMUsageRollup.errors),
+                func.sum(LLMUsageRollup.prompt_tokens),
+                func.sum(LLMUsageRollup.completion_tokens),
+                func.sum(LLMUsageRollup.cost_usd),
+                func.max(LLMUsageRollup.latency_p95_ms),
+            )
+            .where(LLMUsageRollup.bucket_start >= since)
+            .group_by(LLMUsageRollup.agent_name, LLMUsageRollup.provider, LLMUsageRollup.model)
+            .order_by(func.sum(LLMUsageRollup.cost_usd).desc())
+        )
+        return [
+            {
+                "agent_name": agent,
+                "provider": provider,
+                "model": model,
+                "calls": int(calls or 0),
+                "errors": int(errors or 0),
+                "prompt_tokens": int(prompt or 0),
+                "completion_tokens": int(completion or 0),
+                "cost_usd": round(float(cost or 0.0), 6),
+                "max_bucket_latency_p95_ms": p95,
+            }
+            for agent, provider, model, calls, errors, prompt, completion, cost, p95 in result.all()
+        ]
+
+    def start(self) -> None:
+        """Start the background rollup thread (no-op when running)"""
+        self._flusher.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the background thread (pending rollups are written first)"""
+        self._flusher.stop(timeout)
+
+
+# Global instance
+llm_telemetry = LLMTelemetry(
+    ring_size=settings.LLM_TELEMETRY_RING_SIZE,
+    rollup_seconds=settings.LLM_TELEMETRY_ROLLUP_SECONDS,
+)
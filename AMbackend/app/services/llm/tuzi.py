@@ -1,9 +1,17 @@
 """Tuzi (兔子) LLM Provider implementation"""
 
-from typing import List, Optional
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
 import httpx
 
 from app.services.llm.base import LLMProvider
+from app.services.llm.structured_output import (
+    STRUCTURED_OUTPUT_KWARG,
+    claude_tool_input,
+    claude_tool_params,
+    openai_tool_arguments,
+    openai_tool_params,
+)
 from app.schemas.llm import LLMResponse, Message
 
 
@@ -81,30 +89,11 @@ class TuziProvider(LLMProvider):
     ) -> LLMResponse:
         """Handle Claude Messages API format"""
         url = f"{self.base_url}/v1/messages"
+        payload = self._claude_payload(messages, model, temperature, max_tokens, **kwargs)
 
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
-
-        # Convert our Message format to Claude Messages API format
-        formatted_messages = self._format_messages(messages)
-
-        payload = {
-            "model": model,
-            "messages": formatted_messages,
-            "max_tokens": max_tokens or 4096,  # Claude requires max_tokens
-        }
-
-        # Add optional parameters
-        if temperature is not None:
-            payload["temperature"] = temperature
-
-        # Add any extra kwargs
-        payload.update(kwargs)
-
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(url, headers=headers, json=payload)
+        timing: Dict[str, float] = {}
+        async with self._timed_client(120.0, timing) as client:
+            response = await client.post(url, headers=self._headers(), json=payload)
             response.raise_for_status()
             data = response.json()
 
@@ -112,7 +101,11 @@ class TuziProvider(LLMProvider):
         # Claude returns content as an array of content blocks
         content_blocks = data.get("content", [])
         content = ""
-        if content_blocks:
+        tool_input = claude_tool_input(content_blocks) if "tools" in payload else None
+        if tool_input is not None:
+            # Structured output mode: the tool input is the JSON document
+            content = json.dumps(tool_input, ensure_ascii=False)
+        elif content_blocks:
             # Join all text blocks
             content = "".join(
                 block.get("text", "")
@@ -120,22 +113,28 @@ class TuziProvider(LLMProvider):
                 if block.get("type") == "text"
             )
 
-        usage = data.get("usage", {})
+        usage = data.get("usage") or {}
+        # Claude input_tokens exclude cache reads/writes
+        cache_read = usage.get("cache_read_input_tokens") or 0
+        cache_write = usage.get("cache_creation_input_tokens") or 0
 
         return LLMResponse(
             content=content,
             model=model,
             provider="tuzi",
-            usage={
-                "prompt_tokens": usage.get("input_tokens", 0),
-                "completion_tokens": usage.get("output_tokens", 0),
-                "total_tokens": usage.get("input_tokens", 0) + usage.get("output_tokens", 0),
-            },
+            usage=self._build_usage(
+                prompt_tokens=usage.get("input_tokens", 0) + cache_read + cache_write,
+                completion_tokens=usage.get("output_tokens", 0),
+                cache_read_tokens=cache_read,
+                cache_write_tokens=cache_write,
+            ),
             metadata={
                 "finish_reason": data.get("stop_reason"),
                 "id": data.get("id"),
                 "model": data.get("model"),
                 "role": data.get("role"),
+                "ttfb_seconds": timing.get("ttfb_seconds"),
+                "structured_output": "tool" if tool_input is not None else None,
             },
         )
 
@@ -149,20 +148,150 @@ class TuziProvider(LLMProvider):
     ) -> LLMResponse:
         """Handle OpenAI Chat Completions API format (for GPT-5)"""
         url = f"{self.base_url}/v1/chat/completions"
+        payload = self._openai_payload(messages, model, temperature, max_tokens, **kwargs)
+
+        timing: Dict[str, float] = {}
+        async with self._timed_client(120.0, timing) as client:
+            response = await client.post(url, headers=self._headers(), json=payload)
+            response.raise_for_status()
+            data = response.json()
+
+        # Extract content (tool-call arguments in structured output mode) from OpenAI format response
+        choices = data.get("choices", [])
+        content = ""
+        arguments = None
+        if choices:
+            message = choices[0].get("message", {})
+            arguments = openai_tool_arguments(message) if "tools" in payload else None
+            content = arguments if arguments is not None else message.get("content") or ""
+
+        usage = data.get("usage") or {}
+        prompt_details = usage.get("prompt_tokens_details") or {}
+
+        return LLMResponse(
+            content=content,
+            model=model,
+            provider="tuzi",
+            usage=self._build_usage(
+                prompt_tokens=usage.get("prompt_tokens", 0),
+                completion_tokens=usage.get("completion_tokens", 0),
+                cache_read_tokens=prompt_details.get("cached_tokens") or 0,
+            ),
+            metadata={
+                "finish_reason": choices[0].get("finish_reason") if choices else None,
+                "id": data.get("id"),
+                "model": data.get("model"),
+                "ttfb_seconds": timing.get("ttfb_seconds"),
+                "structured_output": "tool" if arguments is not None else None,
+            },
+        )
+
+    async def chat_stream(
+        self,
+        messages: List[Message],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion from Tuzi
+
+        Claude models stream Messages API ``content_block_delta`` events;
+        OpenAI-format models stream Chat Completions ``choices[].delta``.
+
+        Yields:
+            Content deltas as they arrive
+
+        Raises:
+            httpx.HTTPError: If API request fails
+            RuntimeError: If the API reports an error mid-stream
+        """
+        if model in self.OPENAI_FORMAT_MODELS:
+            url = f"{self.base_url}/v1/chat/completions"
+            payload = self._openai_payload(messages, model, temperature, max_tokens, **kwargs)
+        else:
+            url = f"{self.base_url}/v1/messages"
+            payload = self._claude_payload(messages, model, temperature, max_tokens, **kwargs)
+        payload["stream"] = True
 
-        headers = {
+        async with httpx.AsyncClient(timeout=120.0) as client:
+            async with client.stream("POST", url, headers=self._headers(), json=payload) as response:
+                response.raise_for_status()
+                async for event in self._iter_sse_events(response):
+                    if "error" in event:
+                        raise RuntimeError(f"Tuzi stream error: {event.get('error')}")
+
+                    if event.get("type") == "content_block_delta":
+                        # Claude: text_delta carries text; thinking deltas are skipped
+                        delta = (event.get("delta") or {}).get("text")
+                    else:
+                        choices = event.get("choices") or []
+                        delta = (choices[0].get("delta") or {}).get("content") if choices else None
+
+                    if delta:
+                        yield delta
+
+    def _headers(self) -> Dict[str, str]:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
 
-        # Convert our Message format to OpenAI format
-        formatted_messages = [
-            {"role": msg.role, "content": msg.content} for msg in messages
-        ]
+    def _claude_payload(
+        self,
+        messages: List[Message],
+        model: str,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Build a Claude Messages API request body"""
+        # Messages API takes system prompts as a top-level block list
+        system_blocks = []
+        for msg in messages:
+            if msg.role == "system":
+                block = {"type": "text", "text": msg.content}
+                if msg.cache_control:
+                    block["cache_control"] = {"type": "ephemeral"}
+                system_blocks.append(block)
 
         payload = {
             "model": model,
-            "messages": formatted_messages,
+            "messages": self._format_messages(
+                [msg for msg in messages if msg.role != "system"], cache_control=True
+            ),
+            "max_tokens": max_tokens or 4096,  # Claude requires max_tokens
+        }
+        if system_blocks:
+            payload["system"] = system_blocks
+
+        # Add optional parameters
+        if temperature is not None:
+            payload["temperature"] = temperature
+
+        # Structured output: forced tool call
+        tool = kwargs.pop(STRUCTURED_OUTPUT_KWARG, None)
+        if tool:
+            kwargs.pop("response_format", None)
+            payload.update(claude_tool_params(tool))
+
+        # Add any extra kwargs
+        payload.update(kwargs)
+        return payload
+
+    def _openai_payload(
+        self,
+        messages: List[Message],
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Build an OpenAI Chat Completions request body"""
+        payload = {
+            "model": model,
+            "messages": self._format_messages(messages),
             "temperature": temperature,
             "stream": False,
         }
@@ -175,37 +304,15 @@ class TuziProvider(LLMProvider):
         if "response_format" in kwargs:
             payload["response_format"] = kwargs.pop("response_format")
 
+        # Structured output: forced tool call (replaces response_format)
+        tool = kwargs.pop(STRUCTURED_OUTPUT_KWARG, None)
+        if tool:
+            payload.pop("response_format", None)
+            payload.update(openai_tool_params(tool))
+
         # Add any extra kwargs
         payload.update(kwargs)
-
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            data = response.json()
-
-        # Extract content from OpenAI format response
-        choices = data.get("choices", [])
-        content = ""
-        if choices:
-            content = choices[0].get("message", {}).get("content", "")
-
-        usage = data.get("usage", {})
-
-        return LLMResponse(
-            content=content,
-            model=model,
-            provider="tuzi",
-            usage={
-                "prompt_tokens": usage.get("prompt_tokens", 0),
-                "completion_tokens": usage.get("completion_tokens", 0),
-                "total_tokens": usage.get("total_tokens", 0),
-            },
-            metadata={
-                "finish_reason": choices[0].get("finish_reason") if choices else None,
-                "id": data.get("id"),
-                "model": data.get("model"),
-            },
-        )
+        return payload
 
     def get_available_models(self) -> List[str]:
         """Get list of available Tuzi models"""
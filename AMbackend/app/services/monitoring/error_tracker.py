@@ -1,17 +1,170 @@
-"""System error tracking service"""
+"""System error tracking service
 
+track_error 不再在调用方事务里 SELECT + UPDATE/INSERT：
+错误按指纹 md5(component + "\n" + error_message) 在内存中聚合，
+由后台线程（BackgroundFlusher）每 ERROR_TRACKER_FLUSH_SECONDS 秒用独立连接批量
+INSERT ... ON CONFLICT (fingerprint) WHERE NOT is_resolved
+DO UPDATE SET occurrence_count = occurrence_count + n 写入。
+数据源宕机时每个批次、每个实例的重复错误只累加内存计数。
+"""
+
+import hashlib
 import logging
+import threading
 import traceback
-from datetime import datetime
-from typing import Optional, Dict, Any
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, func
+from sqlalchemy.dialects.postgresql import insert
 
+from app.core.config import settings
+from app.db.background_flusher import BackgroundFlusher
 from app.models.system_error import SystemError
 
 logger = logging.getLogger(__name__)
 
 
+def error_fingerprint(component: str, error_message: str) -> str:
+    """错误指纹（与迁移中的 md5(component || E'\\n' || error_message) 一致）"""
+    return hashlib.md5(f"{component}\n{error_message}".encode("utf-8")).hexdigest()
+
+
+def upsert_errors_statement(rows: List[Dict[str, Any]]):
+    """批量 upsert：未解决的同指纹记录累加次数并更新最近一次的堆栈/上下文"""
+    stmt = insert(SystemError).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[SystemError.fingerprint],
+        index_where=SystemError.is_resolved == False,
+        set_={
+            "occurrence_count": SystemError.occurrence_count + stmt.excluded.occurrence_count,
+            "last_occurred_at": stmt.excluded.last_occurred_at,
+            "error_details": stmt.excluded.error_details,
+            "context": stmt.excluded.context,
+            "updated_at": func.now(),
+        },
+    )
+
+
+@dataclass
+class PendingError:
+    """内存中聚合的错误（最近一次的内容 + 次数）"""
+    values: Dict[str, Any]
+    count: int
+    first_occurred_at: datetime
+    last_occurred_at: datetime
+
+    def to_row(self) -> Dict[str, Any]:
+        return {
+            **self.values,
+            "occurrence_count": self.count,
+            "first_occurred_at": self.first_occurred_at,
+            "last_occurred_at": self.last_occurred_at,
+            "is_resolved": False,
+        }
+
+
+class ErrorIngestionQueue:
+    """按指纹聚合错误，定时批量写入（线程安全，可从任意线程/事件循环调用 add）"""
+
+    def __init__(self, flush_interval_seconds: float, max_pending: int):
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_pending = max_pending
+        self._pending: Dict[str, PendingError] = {}
+        self._lock = threading.Lock()
+        self._flusher = BackgroundFlusher("error-tracker-flusher", flush_interval_seconds, self.flush)
+        # 队列满时丢弃的错误次数（累计），每次刷新记录新增部分
+        self.dropped = 0
+        self._dropped_logged = 0
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def add(self, values: Dict[str, Any], count: int = 1, occurred_at: Optional[datetime] = None) -> None:
+        """加入一次（或 count 次）错误发生"""
+        occurred_at = occurred_at or datetime.now(timezone.utc)
+        fingerprint = values["fingerprint"]
+
+        with self._lock:
+            pending = self._pending.get(fingerprint)
+            if pending is None:
+                if len(self._pending) >= self.max_pending:
+                    self.dropped += count
+                    return
+                self._pending[fingerprint] = PendingError(
+                    values=values,
+                    count=count,
+                    first_occurred_at=occurred_at,
+                    last_occurred_at=occurred_at,
+                )
+                return
+
+            pending.count += count
+            if occurred_at >= pending.last_occurred_at:
+                pending.values = values
+                pending.last_occurred_at = occurred_at
+            pending.first_occurred_at = min(pending.first_occurred_at, occurred_at)
+
+    def drain(self) -> List[PendingError]:
+        """取出全部待写入的错误"""
+        with self._lock:
+            pending, self._pending = list(self._pending.values()), {}
+        return pending
+
+    def requeue(self, pending: List[PendingError]) -> None:
+        """写入失败时放回队列，下次定时刷新重试"""
+        with self._lock:
+            for item in pending:
+                current = self._pending.get(item.values["fingerprint"])
+                if current is None:
+                    self._pending[item.values["fingerprint"]] = item
+                    continue
+                # 期间又发生过：保留较新的内容，合并次数与首次时间
+                current.count += item.count
+                current.first_occurred_at = min(current.first_occurred_at, item.first_occurred_at)
+
+    def stats(self) -> Dict[str, int]:
+        """队列状态（监控接口展示）"""
+        return {"pending": self.pending_count, "dropped": self.dropped}
+
+    async def flush(self, db: AsyncSession) -> int:
+        """写入当前聚合的错误，返回写入的指纹数"""
+        with self._lock:
+            newly_dropped, self._dropped_logged = self.dropped - self._dropped_logged, self.dropped
+        if newly_dropped:
+            logger.warning(
+                f"错误队列已满 ({self.max_pending} 类)，上次刷新后丢弃 {newly_dropped} 次错误，"
+                f"累计 {self.dropped} 次"
+            )
+
+        pending = self.drain()
+        if not pending:
+            return 0
+
+        try:
+            await db.execute(upsert_errors_statement([item.to_row() for item in pending]))
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            self.requeue(pending)
+            logger.error(f"错误记录批量写入失败，{len(pending)} 条待重试: {e}")
+            return 0
+
+        total = sum(item.count for item in pending)
+        logger.info(f"错误记录已写入: {len(pending)} 类 / {total} 次")
+        return len(pending)
+
+    def start(self) -> None:
+        """启动后台刷新线程（已启动时忽略）"""
+        self._flusher.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """停止后台线程（停止前写入剩余错误）"""
+        self._flusher.stop(timeout)
+
+
 class ErrorTracker:
     """系统错误追踪器"""
     
@@ -28,11 +181,15 @@ class ErrorTracker:
         user_id: Optional[int] = None,
         portfolio_id: Optional[str] = None,
         strategy_name: Optional[str] = None,
-    ) -> SystemError:
+    ) -> None:
         """
         记录系统错误
         
+        默认只放入内存聚合队列，由后台线程定时写入，不使用也不提交调用方的 db；
+        ERROR_TRACKER_BUFFERED=False 时在调用方的 db 上直接执行一次 upsert
+        
         Args:
+            db: 数据库会话（仅非缓冲模式使用）
             error_type: 错误类型 ('data_collection', 'agent_execution', 'strategy_execution')
             error_category: 错误分类 ('network', 'api', 'logic', 'timeout')
             severity: 严重程度 ('critical', 'error', 'warning', 'info')
@@ -43,60 +200,35 @@ class ErrorTracker:
             user_id: 用户ID
             portfolio_id: Portfolio ID
             strategy_name: 策略名称
-        
-        Returns:
-            SystemError对象
         """
+        values = {
+            "error_type": error_type,
+            "error_category": error_category,
+            "severity": severity,
+            "component": component,
+            "error_message": error_message,
+            "error_details": error_details,
+            "context": context,
+            "user_id": user_id,
+            "portfolio_id": str(portfolio_id) if portfolio_id else None,
+            "strategy_name": strategy_name,
+            "fingerprint": error_fingerprint(component, error_message),
+        }
+
+        if settings.ERROR_TRACKER_BUFFERED:
+            error_ingestion_queue.add(values)
+            error_ingestion_queue.start()
+            return
+
         try:
-            # 检查是否是重复错误(同一组件的同一错误消息)
-            result = await db.execute(
-                select(SystemError).where(
-                    and_(
-                        SystemError.component == component,
-                        SystemError.error_message == error_message,
-                        SystemError.is_resolved == False,
-                    )
-                ).order_by(SystemError.last_occurred_at.desc()).limit(1)
-            )
-            existing_error = result.scalar_one_or_none()
-            
-            if existing_error:
-                # 更新重复错误
-                existing_error.occurrence_count += 1
-                existing_error.last_occurred_at = datetime.utcnow()
-                existing_error.error_details = error_details  # 更新最新的堆栈
-                existing_error.context = context  # 更新最新的上下文
-                await db.commit()
-                
-                logger.info(f"更新重复错误: {component} - {error_message} (第{existing_error.occurrence_count}次)")
-                return existing_error
-            else:
-                # 创建新错误记录
-                error_record = SystemError(
-                    error_type=error_type,
-                    error_category=error_category,
-                    severity=severity,
-                    component=component,
-                    error_message=error_message,
-                    error_details=error_details,
-                    context=context,
-                    user_id=user_id,
-                    portfolio_id=portfolio_id,
-                    strategy_name=strategy_name,
-                )
-                
-                db.add(error_record)
-                await db.commit()
-                await db.refresh(error_record)
-                
-                logger.info(f"记录新错误: {component} - {error_message}")
-                return error_record
-                
+            now = datetime.now(timezone.utc)
+            row = PendingError(values=values, count=1, first_occurred_at=now, last_occurred_at=now).to_row()
+            await db.execute(upsert_errors_statement([row]))
+            await db.commit()
         except Exception as e:
             logger.error(f"记录错误失败: {e}", exc_info=True)
             await db.rollback()
             # 即使记录失败也不影响主流程
-            return None
     
     @staticmethod
     async def track_exception(
@@ -107,7 +239,7 @@ class ErrorTracker:
         severity: str = "error",
         context: Optional[Dict[str, Any]] = None,
         **kwargs
-    ) -> SystemError:
+    ) -> None:
         """
         从异常对象记录错误
         
@@ -204,8 +336,6 @@ class ErrorTracker:
     @staticmethod
     async def get_error_summary(db: AsyncSession) -> Dict[str, Any]:
         """获取错误摘要统计"""
-        from sqlalchemy import func
-        
         # 总错误数
         total_result = await db.execute(
             select(func.count(SystemError.id))
@@ -248,9 +378,15 @@ class ErrorTracker:
             "warning_count": severity_stats.get("warning", 0),
             "by_severity": severity_stats,
             "by_type": type_stats,
+            # 尚未写入数据库 / 因队列满被丢弃的错误
+            "ingestion": error_ingestion_queue.stats(),
         }
 
 
 # 全局实例
+error_ingestion_queue = ErrorIngestionQueue(
+    flush_interval_seconds=settings.ERROR_TRACKER_FLUSH_SECONDS,
+    max_pending=settings.ERROR_TRACKER_MAX_PENDING,
+)
 error_tracker = ErrorTracker()
 
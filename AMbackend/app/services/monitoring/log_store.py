@@ -0,0 +1,217 @@
+"""Indexed Log Store - 可按级别/时间/组件检索的日志存储
+
+日志文件只能顺序扫描；开启 LOG_STORE_ENABLED 后，根 logger 上挂载 LogStoreHandler，
+把 LOG_STORE_LEVEL 及以上的日志追加写入本地 SQLite（WAL），
+按 (levelno, created_at) 与 (component, created_at) 建索引，
+Admin 可在任意时间窗口内按级别/组件过滤，查询代价与文件大小无关。
+
+- emit() 只把记录放入队列，由后台线程批量写入，不阻塞调用方（包括事件循环）
+- 保留 LOG_STORE_RETENTION_DAYS 天，写入线程每小时清理一次
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS log_records (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    levelno INTEGER NOT NULL,
+    level TEXT NOT NULL,
+    component TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_log_records_level_time ON log_records (levelno, created_at);
+CREATE INDEX IF NOT EXISTS idx_log_records_component_time ON log_records (component, created_at);
+"""
+
+
+class LogStore:
+    """SQLite 日志存储（追加写入 + 索引查询）"""
+
+    MAX_MESSAGE_CHARS = 4000
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def append_many(self, records: Sequence[logging.LogRecord]) -> None:
+        """批量追加日志记录"""
+        rows = [
+            (
+                record.created,
+                record.levelno,
+                record.levelname,
+                record.name,
+                record.getMessage()[: self.MAX_MESSAGE_CHARS],
+            )
+            for record in records
+        ]
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT INTO log_records (created_at, levelno, level, component, message) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.commit()
+
+    def query(
+        self,
+        min_level: int = logging.WARNING,
+        max_level: Optional[int] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        component: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """
+        按级别区间、时间窗口（unix 秒）、组件（logger 名前缀）查询，最新的在前
+
+        Returns:
+            List[Dict]: {created_at, level, component, message}
+        """
+        conditions = ["levelno >= ?"]
+        params: List[Any] = [min_level]
+        if max_level is not None:
+            conditions.append("levelno <= ?")
+            params.append(max_level)
+        if since is not None:
+            conditions.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("created_at < ?")
+            params.append(until)
+        if component:
+            # 前缀匹配走 component 索引: app.services.strategy 匹配其下所有模块
+            conditions.append("component >= ? AND component < ?")
+            params.extend([component, component + "\uffff"])
+        params.append(limit)
+
+        sql = (
+            "SELECT created_at, level, component, message FROM log_records "
+            f"WHERE {' AND '.join(conditions)} ORDER BY created_at DESC LIMIT ?"
+        )
+        with self._lock:
+            rows = self._connection().execute(sql, params).fetchall()
+
+        return [
+            {"created_at": created_at, "level": level, "component": component, "message": message}
+            for created_at, level, component, message in rows
+        ]
+
+    def prune(self, before: float) -> int:
+        """删除 before 之前的记录，返回删除数量"""
+        with self._lock:
+            conn = self._connection()
+            deleted = conn.execute("DELETE FROM log_records WHERE created_at < ?", (before,)).rowcount
+            conn.commit()
+        return deleted
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class LogStoreHandler(logging.Handler):
+    """把日志记录排队，由后台线程批量写入 LogStore"""
+
+    BATCH_SIZE = 500
+    FLUSH_INTERVAL_SECONDS = 1.0
+    PRUNE_INTERVAL_SECONDS = 3600
+
+    def __init__(self, store: LogStore, level: int = logging.WARNING, retention_days: int = 7):
+        super().__init__(level)
+        self.store = store
+        self.retention_days = retention_days
+        self._queue: "queue.SimpleQueue[Optional[logging.LogRecord]]" = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write_loop, name="log-store-writer", daemon=True)
+        self._writer.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # 写入线程自身的日志不再入库，避免写入失败时递归
+        if record.name == __name__:
+            return
+        self._queue.put(record)
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._writer.join(timeout=5)
+        super().close()
+
+    def _write_loop(self) -> None:
+        last_prune = 0.0
+        while True:
+            batch: List[logging.LogRecord] = []
+            stop = False
+            try:
+                record = self._queue.get(timeout=self.FLUSH_INTERVAL_SECONDS)
+                while True:
+                    if record is None:
+                        stop = True
+                        break
+                    batch.append(record)
+                    if len(batch) >= self.BATCH_SIZE:
+                        break
+                    record = self._queue.get_nowait()
+            except queue.Empty:
+                pass
+
+            try:
+                if batch:
+                    self.store.append_many(batch)
+                if self.retention_days > 0 and time.time() - last_prune >= self.PRUNE_INTERVAL_SECONDS:
+                    self.store.prune(time.time() - self.retention_days * 86400)
+                    last_prune = time.time()
+            except Exception as e:
+                logger.warning(f"日志入库失败: {e}")
+
+            if stop:
+                return
+
+
+# 全局实例（LOG_STORE_ENABLED 时由 install_log_store 创建）
+log_store: Optional[LogStore] = None
+
+
+def install_log_store() -> Optional[LogStore]:
+    """在根 logger 上挂载 LogStoreHandler（未开启时返回 None）"""
+    global log_store
+
+    if not settings.LOG_STORE_ENABLED:
+        return None
+    if log_store is not None:
+        return log_store
+
+    log_store = LogStore(settings.LOG_STORE_PATH)
+    handler = LogStoreHandler(
+        log_store,
+        level=logging.getLevelName(settings.LOG_STORE_LEVEL.upper()),
+        retention_days=settings.LOG_STORE_RETENTION_DAYS,
+    )
+    logging.getLogger().addHandler(handler)
+    logger.info(f"📚 日志索引存储已启用: {settings.LOG_STORE_PATH} (>= {settings.LOG_STORE_LEVEL})")
+    return log_store
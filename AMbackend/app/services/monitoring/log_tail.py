@@ -0,0 +1,46 @@
+"""Log file tail reader
+
+从文件末尾按块向前读取最后 N 行，读取量只与 N 成正比，与日志文件大小无关。
+同步函数，异步端点中通过 asyncio.to_thread 调用，不阻塞事件循环。
+"""
+
+import os
+from pathlib import Path
+from typing import List, Union
+
+CHUNK_SIZE = 64 * 1024
+
+
+def tail_lines(path: Union[str, Path], lines: int, chunk_size: int = CHUNK_SIZE) -> List[str]:
+    """
+    读取文件最后 lines 行（不含换行符）
+
+    Args:
+        path: 日志文件路径
+        lines: 行数
+        chunk_size: 每次向前读取的字节数
+
+    Returns:
+        List[str]: 按文件顺序排列的最后 lines 行
+    """
+    if lines <= 0:
+        return []
+
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        buffer = b""
+
+        # 多读一个换行：最前面的一行可能不完整
+        while position > 0 and buffer.count(b"\n") <= lines:
+            read_size = min(chunk_size, position)
+            position -= read_size
+            f.seek(position)
+            buffer = f.read(read_size) + buffer
+
+    text = buffer.decode("utf-8", errors="ignore")
+    result = text.splitlines()
+    if position > 0 and result:
+        # 起点落在某一行中间，丢弃这一残行
+        result = result[1:]
+    return result[-lines:]
@@ -0,0 +1,22 @@
+"""Realtime services package
+
+服务端推送（SSE）事件总线模块
+"""
+
+from app.services.realtime.event_bus import (
+    Event,
+    EventBus,
+    InMemoryTransport,
+    RedisTransport,
+    Subscription,
+    event_bus,
+)
+
+__all__ = [
+    "Event",
+    "EventBus",
+    "InMemoryTransport",
+    "RedisTransport",
+    "Subscription",
+    "event_bus",
+]
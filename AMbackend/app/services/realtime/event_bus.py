@@ -0,0 +1,276 @@
+"""Event Bus - 进程内发布/订阅
+
+调度器（组合估值、模板批次执行）和模拟交易引擎在状态变化后发布精简的增量事件，
+/realtime/stream 的 SSE 连接订阅后直接推送给前端，前端不再需要轮询完整查询。
+
+- 调度器的 Job 运行在后台线程各自的事件循环中，订阅者的队列属于 API 事件循环，
+  跨循环投递统一走 loop.call_soon_threadsafe
+- 订阅者队列有上限，消费过慢时丢弃最旧的事件（增量事件以最新状态为准）
+- 属于某个用户的事件（组合估值、执行、交易）带 user_id，只投递给该用户的订阅；
+  user_id 为空的事件（Exploration 视图更新）投递给所有订阅者
+- 默认 InMemoryTransport 只在本进程内分发（测试也使用它）；
+  多 worker 部署时开启 REALTIME_REDIS_ENABLED，经 Redis pub/sub 扇出到所有 worker
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core.config import settings
+from app.core.serialization import dumps, loads, to_jsonable
+
+logger = logging.getLogger(__name__)
+
+# 事件主题
+TOPIC_PORTFOLIO_VALUATION = "portfolio.valuation"
+TOPIC_EXECUTION_COMPLETED = "execution.completed"
+TOPIC_TRADE_EXECUTED = "trade.executed"
+TOPIC_EXPLORATION_UPDATED = "exploration.updated"
+
+
+@dataclass
+class Event:
+    """推送事件"""
+    topic: str
+    data: Any
+    # 所属用户，None 表示公开事件
+    user_id: Optional[int] = None
+    ts: float = field(default_factory=time.time)
+
+    def to_json(self) -> bytes:
+        return dumps({"topic": self.topic, "data": self.data, "user_id": self.user_id, "ts": self.ts})
+
+    @classmethod
+    def from_json(cls, raw: Any) -> "Event":
+        payload = loads(raw)
+        return cls(
+            topic=payload["topic"],
+            data=payload["data"],
+            user_id=payload.get("user_id"),
+            ts=payload["ts"],
+        )
+
+    def to_sse(self) -> str:
+        """SSE 帧：event 为主题，data 为 JSON"""
+        return f"event: {self.topic}\ndata: {dumps(self.data).decode('utf-8')}\n\n"
+
+
+class Subscription:
+    """单个订阅者（一条 SSE 连接）"""
+
+    def __init__(
+        self,
+        bus: "EventBus",
+        topics: Optional[Iterable[str]],
+        maxsize: int,
+        user_id: Optional[int] = None,
+    ):
+        self._bus = bus
+        self.topics = frozenset(topics) if topics else None
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def matches(self, event: Event) -> bool:
+        if event.user_id is not None and event.user_id != self.user_id:
+            return False
+        return self.topics is None or event.topic in self.topics
+
+    def put(self, event: Event) -> None:
+        """放入事件（只在订阅者自己的事件循环中调用）；队列满时丢弃最旧的事件"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """等待下一个事件，超时返回 None"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self._bus.unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class InMemoryTransport:
+    """进程内传输：直接分发给本进程的订阅者"""
+
+    def __init__(self, bus: "EventBus"):
+        self._bus = bus
+
+    async def publish(self, event: Event) -> None:
+        self._bus.dispatch(event)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class RedisTransport:
+    """
+    Redis pub/sub 传输
+
+    发布只写入 Redis，本进程（包括发布者自己）的订阅者由 start() 启动的监听任务分发，
+    保证每个 worker 的每个事件只投递一次
+    """
+
+    RECONNECT_DELAY_SECONDS = 5
+
+    def __init__(self, bus: "EventBus", url: str, channel: str):
+        self._bus = bus
+        self._url = url
+        self._channel = channel
+        self._listener: Optional[asyncio.Task] = None
+
+    async def publish(self, event: Event) -> None:
+        import redis.asyncio as redis
+
+        try:
+            # 调度器与API运行在不同事件循环，每次使用独立连接
+            async with redis.from_url(self._url) as client:
+                await client.publish(self._channel, event.to_json())
+        except Exception as e:
+            logger.warning(f"实时事件发布到Redis失败: {event.topic} - {e}")
+
+    async def start(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _listen(self) -> None:
+        import redis.asyncio as redis
+
+        while True:
+            try:
+                async with redis.from_url(self._url) as client:
+                    async with client.pubsub() as pubsub:
+                        await pubsub.subscribe(self._channel)
+                        logger.info(f"📡 实时事件监听已启动: {self._channel}")
+                        async for message in pubsub.listen():
+                            if message.get("type") != "message":
+                                continue
+                            try:
+                                self._bus.dispatch(Event.from_json(message["data"]))
+                            except (ValueError, KeyError) as e:
+                                logger.warning(f"忽略无法解析的实时事件: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"实时事件监听断开，{self.RECONNECT_DELAY_SECONDS}s 后重连: {e}")
+                await asyncio.sleep(self.RECONNECT_DELAY_SECONDS)
+
+
+class EventBus:
+    """进程内发布/订阅总线"""
+
+    def __init__(self, transport=None):
+        self._subscriptions: List[Subscription] = []
+        # 发布方在调度器线程，订阅方在API事件循环
+        self._lock = threading.Lock()
+        self.transport = transport or InMemoryTransport(self)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(
+        self,
+        topics: Optional[Iterable[str]] = None,
+        user_id: Optional[int] = None,
+    ) -> Subscription:
+        """
+        订阅，必须在订阅者的事件循环中调用
+
+        Args:
+            topics: 主题过滤，为空表示全部主题
+            user_id: 订阅用户，只接收公开事件和该用户的事件
+        """
+        subscription = Subscription(self, topics, settings.REALTIME_QUEUE_SIZE, user_id)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    async def publish(self, topic: str, data: Any, user_id: Optional[int] = None) -> None:
+        """
+        发布事件（可在任意线程/事件循环中调用）
+
+        发布失败只记录日志，不影响调用方的业务流程
+
+        Args:
+            topic: 主题
+            data: 事件数据
+            user_id: 所属用户（组合所有者），None 表示公开事件
+        """
+        try:
+            event = Event(topic=topic, data=to_jsonable(data), user_id=user_id)
+            await self.transport.publish(event)
+        except Exception as e:
+            logger.warning(f"实时事件发布失败: {topic} - {e}")
+
+    def dispatch(self, event: Event) -> int:
+        """把事件投递给本进程中匹配的订阅者，返回投递数量"""
+        with self._lock:
+            targets = [s for s in self._subscriptions if s.matches(event)]
+
+        try:
+            current_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+
+        delivered = 0
+        for subscription in targets:
+            if subscription.loop is current_loop:
+                subscription.put(event)
+            else:
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription.put, event)
+                except RuntimeError:
+                    # 订阅者的事件循环已关闭
+                    self.unsubscribe(subscription)
+                    continue
+            delivered += 1
+        return delivered
+
+    async def start(self) -> None:
+        await self.transport.start()
+
+    async def stop(self) -> None:
+        await self.transport.stop()
+
+
+def _create_event_bus() -> EventBus:
+    bus = EventBus()
+    if settings.REALTIME_REDIS_ENABLED:
+        bus.transport = RedisTransport(bus, settings.REDIS_URL, settings.REALTIME_REDIS_CHANNEL)
+    return bus
+
+
+# 全局实例
+event_bus = _create_event_bus()
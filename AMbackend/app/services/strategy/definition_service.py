@@ -12,6 +12,7 @@ from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 
 from app.models import StrategyDefinition, Portfolio, User
+from app.services.strategy.marketplace_service import marketplace_service
 
 logger = logging.getLogger(__name__)
 
@@ -252,6 +253,7 @@ class DefinitionService:
         db.add(portfolio)
         await db.commit()
         await db.refresh(portfolio)
+        marketplace_service.invalidate_marketplace_cache()
         
         logger.info(
             f"Created strategy instance: {portfolio.instance_name} "
@@ -0,0 +1,179 @@
+"""Exploration Dashboard - Exploration页面公共数据物化
+
+/exploration/* 的默认视图与访问用户无关，只在策略模板批次执行完成后才会变化。
+本模块在批次完成时重建一次所有已注册视图，序列化后保存在内存中（可选同步到 Redis），
+请求直接返回序列化结果并支持 ETag / 304，读负载不再随访问人数增长。
+
+- 视图由 exploration 端点模块通过 register() 注册（builder 接收 db 返回可JSON化的dict）
+- 含有随时间变化字段（倒计时、相对时间）的视图可提供 refresh，
+  在返回前基于缓存数据重新计算，不访问数据库；每次响应内容都不同，
+  这类视图不返回 ETag（也就没有 304），避免客户端一直显示旧的倒计时
+- 多 worker 部署时开启 EXPLORATION_DASHBOARD_REDIS_ENABLED，
+  各 worker 每 EXPLORATION_DASHBOARD_REDIS_SYNC_SECONDS 秒从 Redis 同步一次
+"""
+
+import hashlib
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+Builder = Callable[[AsyncSession], Awaitable[Dict[str, Any]]]
+Refresher = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+def _serialize(data: Dict[str, Any]) -> Tuple[bytes, str]:
+    """序列化为JSON（与API默认响应类一致），返回 (body, 强ETag)"""
+    body = dumps(data)
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    return body, etag
+
+
+@dataclass
+class DashboardView:
+    """已注册的视图"""
+    builder: Builder
+    refresh: Optional[Refresher] = None
+
+
+@dataclass
+class DashboardPayload:
+    """物化后的视图"""
+    data: Dict[str, Any]
+    body: bytes
+    etag: str
+    built_at: datetime = field(default_factory=datetime.utcnow)
+    synced_at: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Any]) -> "DashboardPayload":
+        body, etag = _serialize(data)
+        return cls(data=data, body=body, etag=etag)
+
+    def render(self, refresh: Optional[Refresher] = None) -> Tuple[bytes, Optional[str]]:
+        """返回 (body, etag)；有 refresh 时基于缓存数据重新计算时间相关字段
+
+        重新计算后的内容每次请求都不同，不能共用一个强 ETag，此时 etag 为 None
+        """
+        if refresh is None:
+            return self.body, self.etag
+        body, _ = _serialize(refresh(self.data))
+        return body, None
+
+
+class ExplorationDashboard:
+    """Exploration 页面物化视图"""
+
+    REDIS_KEY_PREFIX = "exploration:dashboard:"
+
+    def __init__(self):
+        self._views: Dict[str, DashboardView] = {}
+        self._payloads: Dict[str, DashboardPayload] = {}
+
+    def register(self, name: str, builder: Builder, refresh: Optional[Refresher] = None) -> None:
+        """注册视图"""
+        self._views[name] = DashboardView(builder=builder, refresh=refresh)
+
+    def invalidate(self) -> None:
+        """清空内存中的所有视图（下次请求时按需重建）"""
+        self._payloads.clear()
+
+    async def rebuild(self, db: AsyncSession) -> int:
+        """
+        重建所有已注册视图（策略模板批次执行完成后由调度器调用）
+
+        Returns:
+            int: 成功重建的视图数量
+        """
+        rebuilt = 0
+        for name, view in self._views.items():
+            try:
+                payload = DashboardPayload.from_data(await view.builder(db))
+            except Exception as e:
+                # 保留旧视图，下次批次完成时再试
+                logger.error(f"Exploration视图重建失败: {name} - {e}", exc_info=True)
+                continue
+
+            self._payloads[name] = payload
+            await self._publish(name, payload)
+            rebuilt += 1
+
+        logger.info(f"Exploration视图已重建: {rebuilt}/{len(self._views)}")
+        return rebuilt
+
+    async def get(self, name: str, db: AsyncSession) -> Tuple[bytes, Optional[str]]:
+        """
+        获取视图的 (body, etag)；含 refresh 的视图 etag 为 None
+
+        内存命中直接返回；未命中（服务刚启动、尚无批次完成）时从 Redis 读取，
+        仍未命中则用当前请求的 db 构建一次并缓存
+        """
+        view = self._views[name]
+        payload = self._payloads.get(name)
+
+        if settings.EXPLORATION_DASHBOARD_REDIS_ENABLED and (
+            payload is None
+            or time.monotonic() - payload.synced_at >= settings.EXPLORATION_DASHBOARD_REDIS_SYNC_SECONDS
+        ):
+            payload = await self._sync_from_redis(name, payload)
+
+        if payload is None:
+            payload = DashboardPayload.from_data(await view.builder(db))
+            self._payloads[name] = payload
+            await self._publish(name, payload)
+
+        return payload.render(view.refresh)
+
+    async def _publish(self, name: str, payload: DashboardPayload) -> None:
+        """写入 Redis（未开启时跳过）"""
+        if not settings.EXPLORATION_DASHBOARD_REDIS_ENABLED:
+            return
+
+        try:
+            import redis.asyncio as redis
+
+            # 调度器与API运行在不同事件循环，每次使用独立连接
+            async with redis.from_url(settings.REDIS_URL) as client:
+                await client.set(
+                    self.REDIS_KEY_PREFIX + name,
+                    payload.body,
+                    ex=settings.REDIS_CACHE_TTL,
+                )
+        except Exception as e:
+            logger.warning(f"Exploration视图写入Redis失败: {name} - {e}")
+
+    async def _sync_from_redis(
+        self, name: str, current: Optional[DashboardPayload]
+    ) -> Optional[DashboardPayload]:
+        """从 Redis 同步视图；内容未变化时只刷新同步时间"""
+        try:
+            import redis.asyncio as redis
+
+            async with redis.from_url(settings.REDIS_URL) as client:
+                body = await client.get(self.REDIS_KEY_PREFIX + name)
+        except Exception as e:
+            logger.warning(f"Exploration视图读取Redis失败: {name} - {e}")
+            return current
+
+        if body is None:
+            return current
+
+        if current is not None and current.body == body:
+            current.synced_at = time.monotonic()
+            return current
+
+        payload = DashboardPayload.from_data(loads(body))
+        self._payloads[name] = payload
+        return payload
+
+
+# 全局实例
+exploration_dashboard = ExplorationDashboard()
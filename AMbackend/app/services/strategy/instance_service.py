@@ -12,6 +12,7 @@ from sqlalchemy import select, and_
 from sqlalchemy.orm import selectinload
 
 from app.models import Portfolio, User, StrategyDefinition
+from app.services.strategy.marketplace_service import marketplace_service
 
 logger = logging.getLogger(__name__)
 
@@ -130,6 +131,7 @@ class InstanceService:
         
         await db.commit()
         await db.refresh(portfolio)
+        marketplace_service.invalidate_marketplace_cache()
         
         logger.info(f"Updated strategy instance: {portfolio.instance_name} (ID: {portfolio.id})")
         return portfolio
@@ -159,6 +161,7 @@ class InstanceService:
         
         await db.delete(portfolio)
         await db.commit()
+        marketplace_service.invalidate_marketplace_cache()
         
         logger.info(f"Deleted strategy instance: {portfolio_id}")
         return True
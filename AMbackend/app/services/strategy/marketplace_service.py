@@ -1,12 +1,16 @@
 """Strategy Marketplace Service - 提供策略市场相关功能"""
 
+import base64
 import logging
-from typing import List, Dict, Any, Optional
+import time
+import uuid
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, and_, case, true, tuple_
+from sqlalchemy.orm import selectinload, undefer_group
 
 from app.models.portfolio import Portfolio, PortfolioSnapshot, Trade
 from app.models.strategy_execution import StrategyExecution
@@ -66,6 +70,24 @@ Our squad employs a disciplined approach to building positions during macro-favo
 Ideal For:
 Investors seeking long-term stable returns who trust in the fundamental value proposition of Bitcoin and Ethereum."""
 
+    # 市场列表历史曲线: 时间窗口与降采样点数
+    HISTORY_WINDOW_DAYS = 90
+    HISTORY_POINTS = 16
+
+    # 市场列表缓存有效期（快照写入时主动失效；TTL 兜底组合价值的实时重估）
+    LIST_CACHE_TTL_SECONDS = 60
+
+    # 执行历史总数缓存有效期与最大组合数（LRU 淘汰）
+    EXECUTION_COUNT_TTL_SECONDS = 30
+    EXECUTION_COUNT_CACHE_MAX_ENTRIES = 1024
+
+    def __init__(self):
+        # (user_id, risk_level, sort_by) -> (version, 缓存时间, [(owner_id, card)])
+        self._list_cache: Dict[tuple, Tuple[int, float, List[Tuple[int, StrategyMarketplaceCard]]]] = {}
+        self._list_cache_version = 0
+        # portfolio_id -> (缓存时间, 执行记录总数)
+        self._execution_count_cache: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+
     @staticmethod
     def _calculate_annualized_return(
         initial_value: Decimal, current_value: Decimal, days: int
@@ -136,38 +158,197 @@ Investors seeking long-term stable returns who trust in the fundamental value pr
         return tags
 
     @staticmethod
-    async def _get_portfolio_history(
-        db: AsyncSession, portfolio_id: str, limit: int = 16
-    ) -> List[HistoryPoint]:
-        """获取投资组合历史数据（归一化到100）"""
+    def _risk_level_expr():
+        """风险等级 SQL 表达式（数据库risk_level优先，否则根据max_drawdown映射，与_map_risk_level一致）"""
+        drawdown = func.coalesce(Portfolio.max_drawdown, 0)
+        return func.coalesce(
+            func.nullif(Portfolio.risk_level, ""),
+            case(
+                (drawdown < 10, "low"),
+                (drawdown < 20, "medium"),
+                (drawdown < 30, "medium-high"),
+                else_="high",
+            ),
+        )
+
+    @staticmethod
+    def _annualized_return_order_expr():
+        """
+        年化收益排序键 SQL 表达式
+
+        (g^(365/days) - 1) 关于 ln(g)/days 单调递增，按后者排序结果一致且不会溢出；
+        g <= 0 时年化收益按0处理
+        """
+        days = func.greatest(
+            func.floor(func.extract("epoch", func.localtimestamp() - Portfolio.created_at) / 86400),
+            1,
+        )
+        growth = Portfolio.total_value / func.nullif(Portfolio.initial_balance, 0)
+        return case(
+            (growth > 0, func.ln(growth) / days),
+            else_=0,
+        )
+
+    async def _get_portfolios_history(
+        self, db: AsyncSession, portfolio_ids: List[str]
+    ) -> Dict[str, List[HistoryPoint]]:
+        """
+        一次查询获取多个投资组合的历史数据（降采样，归一化到100）
+
+        每个组合取最近 HISTORY_WINDOW_DAYS 天内的快照，用 ntile 均匀分成
+        HISTORY_POINTS 段，每段取第一条
+        """
+        if not portfolio_ids:
+            return {}
+
+        window_start = datetime.utcnow() - timedelta(days=self.HISTORY_WINDOW_DAYS)
+        bucketed = (
+            select(
+                PortfolioSnapshot.portfolio_id,
+                PortfolioSnapshot.snapshot_time,
+                PortfolioSnapshot.total_value,
+                func.ntile(self.HISTORY_POINTS).over(
+                    partition_by=PortfolioSnapshot.portfolio_id,
+                    order_by=PortfolioSnapshot.snapshot_time,
+                ).label("bucket"),
+            )
+            .where(
+                PortfolioSnapshot.portfolio_id.in_(portfolio_ids),
+                PortfolioSnapshot.snapshot_time >= window_start,
+            )
+            .subquery()
+        )
         stmt = (
-            select(PortfolioSnapshot)
-            .where(PortfolioSnapshot.portfolio_id == portfolio_id)
-            .order_by(PortfolioSnapshot.snapshot_time.asc())
-            .limit(limit)
+            select(bucketed.c.portfolio_id, bucketed.c.snapshot_time, bucketed.c.total_value)
+            .distinct(bucketed.c.portfolio_id, bucketed.c.bucket)
+            .order_by(bucketed.c.portfolio_id, bucketed.c.bucket, bucketed.c.snapshot_time)
         )
         result = await db.execute(stmt)
-        snapshots = result.scalars().all()
-
-        if not snapshots:
-            return []
 
-        # 归一化到100基准
-        initial_value = float(snapshots[0].total_value)
-        if initial_value <= 0:
-            return []
+        rows_by_portfolio: Dict[str, List[Any]] = {}
+        for portfolio_id, snapshot_time, total_value in result.all():
+            rows_by_portfolio.setdefault(str(portfolio_id), []).append((snapshot_time, total_value))
 
-        history = []
-        for snapshot in snapshots:
-            normalized_value = (float(snapshot.total_value) / initial_value) * 100
-            history.append(
+        histories = {}
+        for portfolio_id, rows in rows_by_portfolio.items():
+            # 归一化到100基准
+            initial_value = float(rows[0][1])
+            if initial_value <= 0:
+                continue
+            histories[portfolio_id] = [
                 HistoryPoint(
-                    date=snapshot.snapshot_time.strftime("%Y-%m"),
-                    value=round(normalized_value, 2),
+                    date=snapshot_time.strftime("%Y-%m"),
+                    value=round((float(total_value) / initial_value) * 100, 2),
                 )
+                for snapshot_time, total_value in rows
+            ]
+
+        return histories
+
+    def invalidate_marketplace_cache(self) -> None:
+        """清空市场列表缓存（写入快照或增删改策略实例后调用）"""
+        self._list_cache_version += 1
+        self._list_cache.clear()
+
+    async def _build_marketplace_cards(
+        self,
+        db: AsyncSession,
+        user_id: Optional[int],
+        risk_level: Optional[str],
+        sort_by: str,
+    ) -> List[Tuple[int, StrategyMarketplaceCard]]:
+        """
+        查询并构建市场卡片（与当前用户无关的部分，可缓存）
+
+        Returns:
+            [(组合所属user_id, 卡片)]，已按sort_by排序
+        """
+        risk_expr = self._risk_level_expr()
+
+        # 查询所有激活的策略实例（新系统：is_active=True表示运行中的实例）
+        stmt = select(Portfolio, risk_expr.label("mapped_risk_level")).where(
+            Portfolio.is_active == True
+        )
+
+        # 如果指定用户，只返回该用户的策略实例
+        if user_id:
+            stmt = stmt.where(Portfolio.user_id == user_id)
+
+        # 风险等级过滤
+        if risk_level:
+            stmt = stmt.where(risk_expr == risk_level)
+
+        # 排序
+        if sort_by == "return":
+            stmt = stmt.order_by(self._annualized_return_order_expr().desc())
+        elif sort_by == "risk":
+            stmt = stmt.order_by(Portfolio.max_drawdown.asc())
+        elif sort_by == "tvl":
+            stmt = stmt.order_by(Portfolio.total_value.desc())
+        elif sort_by == "sharpe":
+            stmt = stmt.order_by(func.coalesce(Portfolio.sharpe_ratio, 0).desc())
+
+        result = await db.execute(stmt)
+        rows = result.all()
+
+        # 获取历史数据（所有组合一次查询）
+        histories = await self._get_portfolios_history(
+            db, [portfolio.id for portfolio, _ in rows]
+        )
+
+        strategies = []
+        for data_portfolio, mapped_risk_level in rows:
+            # 计算天数
+            days = (datetime.now() - data_portfolio.created_at).days
+            if days < 1:
+                days = 1
+
+            # 计算年化收益
+            annualized_return = self._calculate_annualized_return(
+                data_portfolio.initial_balance, data_portfolio.total_value, days
+            )
+
+            card = StrategyMarketplaceCard(
+                id=str(data_portfolio.id),  # 使用实例ID
+                name=data_portfolio.name or data_portfolio.instance_name,
+                subtitle=data_portfolio.instance_name or "Multi-Agent Strategy",
+                description=data_portfolio.instance_description or "Elite AI squad combining macro, onchain and technical analysis",
+                tags=self._generate_tags(data_portfolio),
+                annualized_return=annualized_return,
+                max_drawdown=data_portfolio.max_drawdown,
+                sharpe_ratio=data_portfolio.sharpe_ratio or 0.0,
+                pool_size=float(data_portfolio.total_value),
+                total_pnl=float(data_portfolio.total_pnl),
+                squad_size=3,  # 固定3个Agent
+                risk_level=mapped_risk_level,
+                history=histories.get(str(data_portfolio.id), []),
+                is_active=data_portfolio.is_active,
+                initial_balance=float(data_portfolio.initial_balance) if data_portfolio.initial_balance else None,
+                deployed_at=data_portfolio.created_at.isoformat(),
             )
+            strategies.append((data_portfolio.user_id, card))
 
-        return history
+        return strategies
+
+    def get_marketplace_list_version(
+        self,
+        user_id: Optional[int] = None,
+        risk_level: Optional[str] = None,
+        sort_by: str = "return",
+    ) -> Optional[str]:
+        """
+        市场列表缓存的数据版本（缓存版本号 + 构建时间），未缓存或已过期时返回 None
+
+        用于生成 ETag，命中时端点无需查询数据库即可返回 304
+        """
+        cached = self._list_cache.get((user_id, risk_level, sort_by))
+        if (
+            cached
+            and cached[0] == self._list_cache_version
+            and time.monotonic() - cached[1] < self.LIST_CACHE_TTL_SECONDS
+        ):
+            return f"{cached[0]}:{cached[1]}"
+        return None
 
     async def get_marketplace_list(
         self,
@@ -179,78 +360,31 @@ Investors seeking long-term stable returns who trust in the fundamental value pr
     ) -> StrategyMarketplaceListResponse:
         """获取策略市场列表（显示所有激活的策略实例）"""
         try:
-            # 查询所有激活的策略实例（新系统：is_active=True表示运行中的实例）
-            stmt = select(Portfolio).where(Portfolio.is_active == True)
-
-            # 如果指定用户，只返回该用户的策略实例
-            if user_id:
-                stmt = stmt.where(Portfolio.user_id == user_id)
-
-            result = await db.execute(stmt)
-            portfolios = result.scalars().all()
+            cache_key = (user_id, risk_level, sort_by)
+            version = self._list_cache_version
+            cached = self._list_cache.get(cache_key)
+
+            if (
+                cached
+                and cached[0] == version
+                and time.monotonic() - cached[1] < self.LIST_CACHE_TTL_SECONDS
+            ):
+                cards = cached[2]
+            else:
+                cards = await self._build_marketplace_cards(db, user_id, risk_level, sort_by)
+                # 构建期间缓存被失效过则不写入
+                if version == self._list_cache_version:
+                    self._list_cache[cache_key] = (version, time.monotonic(), cards)
 
+            # 按当前用户标记（不修改缓存中的卡片）
             strategies = []
-            for portfolio in portfolios:
-                # 新系统：每个portfolio都是独立的策略实例，直接使用
-                data_portfolio = portfolio
-
-                # 计算天数
-                days = (datetime.now() - data_portfolio.created_at).days
-                if days < 1:
-                    days = 1
-
-                # 计算年化收益
-                annualized_return = self._calculate_annualized_return(
-                    data_portfolio.initial_balance, data_portfolio.total_value, days
-                )
-
-                # 使用数据库中的风险等级（优先级：数据库risk_level > 根据max_drawdown映射）
-                if data_portfolio.risk_level:
-                    mapped_risk_level = data_portfolio.risk_level
-                else:
-                    mapped_risk_level = self._map_risk_level(data_portfolio.max_drawdown)
-
-                # 风险等级过滤
-                if risk_level and mapped_risk_level != risk_level:
-                    continue
-
-                # 获取历史数据
-                history = await self._get_portfolio_history(db, data_portfolio.id)
-
-                # 生成标签
-                tags = self._generate_tags(data_portfolio)
-
-                strategy_card = StrategyMarketplaceCard(
-                    id=str(data_portfolio.id),  # 使用实例ID
-                    name=data_portfolio.name or data_portfolio.instance_name,
-                    subtitle=data_portfolio.instance_name or "Multi-Agent Strategy",
-                    description=data_portfolio.instance_description or "Elite AI squad combining macro, onchain and technical analysis",
-                    tags=tags,
-                    annualized_return=annualized_return,
-                    max_drawdown=data_portfolio.max_drawdown,
-                    sharpe_ratio=data_portfolio.sharpe_ratio or 0.0,
-                    pool_size=float(data_portfolio.total_value),
-                    total_pnl=float(data_portfolio.total_pnl),
-                    squad_size=3,  # 固定3个Agent
-                    risk_level=mapped_risk_level,
-                    history=history,
-                    is_active=data_portfolio.is_active,
-                    initial_balance=float(data_portfolio.initial_balance) if data_portfolio.initial_balance else None,
-                    deployed_at=data_portfolio.created_at.isoformat(),
-                    user_activated=data_portfolio.user_id == current_user_id if current_user_id else False,  # 是否是当前用户的策略
-                    activated_portfolio_id=str(data_portfolio.id) if data_portfolio.user_id == current_user_id else None,  # 策略实例ID
-                )
-                strategies.append(strategy_card)
-
-            # 排序
-            if sort_by == "return":
-                strategies.sort(key=lambda x: x.annualized_return, reverse=True)
-            elif sort_by == "risk":
-                strategies.sort(key=lambda x: x.max_drawdown)
-            elif sort_by == "tvl":
-                strategies.sort(key=lambda x: x.pool_size, reverse=True)
-            elif sort_by == "sharpe":
-                strategies.sort(key=lambda x: x.sharpe_ratio, reverse=True)
+            for owner_id, card in cards:
+                if current_user_id and owner_id == current_user_id:
+                    card = card.model_copy(update={
+                        "user_activated": True,  # 是否是当前用户的策略
+                        "activated_portfolio_id": card.id,  # 策略实例ID
+                    })
+                strategies.append(card)
 
             return StrategyMarketplaceListResponse(strategies=strategies)
 
@@ -724,6 +858,7 @@ Investors seeking long-term stable returns who trust in the fundamental value pr
             if execution.template_execution_batch_id:
                 agent_stmt = (
                     select(AgentExecution)
+                    .options(undefer_group("llm_payload"))  # 详情需要完整prompt/response/快照
                     .where(AgentExecution.template_execution_batch_id == execution.template_execution_batch_id)
                     .order_by(AgentExecution.executed_at)
                 )
@@ -936,6 +1071,7 @@ Investors seeking long-term stable returns who trust in the fundamental value pr
 
             await db.commit()
             await db.refresh(portfolio)
+            self.invalidate_marketplace_cache()
 
             logger.info(
                 f"更新策略设置成功 - 组合: {portfolio.instance_name or portfolio.name}, "
@@ -980,6 +1116,146 @@ Investors seeking long-term stable returns who trust in the fundamental value pr
             logger.error(f"更新策略设置失败: {e}", exc_info=True)
             raise
 
+    @staticmethod
+    def _encode_execution_cursor(execution_time: datetime, execution_id: Any) -> str:
+        """编码执行历史游标 (execution_time, id)"""
+        raw = f"{execution_time.isoformat()}|{execution_id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_execution_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+        """
+        解码执行历史游标
+
+        Raises:
+            ValueError: 游标格式无效
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            raw = base64.urlsafe_b64decode(padded.encode()).decode()
+            time_str, id_str = raw.split("|", 1)
+            return datetime.fromisoformat(time_str), uuid.UUID(id_str)
+        except Exception:
+            raise ValueError(f"Invalid cursor: {cursor}")
+
+    async def _get_execution_count(self, db: AsyncSession, portfolio_id: str) -> int:
+        """执行记录总数（按组合缓存 EXECUTION_COUNT_TTL_SECONDS 秒，分页展示用，允许短暂滞后）"""
+        cached = self._execution_count_cache.get(portfolio_id)
+        if cached and time.monotonic() - cached[0] < self.EXECUTION_COUNT_TTL_SECONDS:
+            self._execution_count_cache.move_to_end(portfolio_id)
+            return cached[1]
+
+        result = await db.execute(
+            select(func.count())
+            .select_from(StrategyExecution)
+            .where(StrategyExecution.portfolio_id == portfolio_id)
+        )
+        total = result.scalar_one()
+        self._execution_count_cache[portfolio_id] = (time.monotonic(), total)
+        self._execution_count_cache.move_to_end(portfolio_id)
+        while len(self._execution_count_cache) > self.EXECUTION_COUNT_CACHE_MAX_ENTRIES:
+            self._execution_count_cache.popitem(last=False)
+        return total
+
+    @staticmethod
+    def _execution_history_stmt(portfolio_id: str):
+        """
+        执行历史查询（只取列表需要的列，LEFT JOIN LATERAL 取对应交易）
+
+        按 (execution_time, id) 倒序，由 idx_executions_portfolio_time_id 支持
+        """
+        trade = (
+            select(
+                Trade.trade_type,
+                Trade.symbol,
+                Trade.amount,
+                Trade.total_value,
+                Trade.realized_pnl,
+            )
+            .where(Trade.execution_id == StrategyExecution.id)
+            .where(Trade.portfolio_id == portfolio_id)
+            .limit(1)
+            .lateral("trade")
+        )
+        return (
+            select(
+                StrategyExecution.id,
+                StrategyExecution.execution_time,
+                StrategyExecution.signal,
+                StrategyExecution.conviction_score,
+                StrategyExecution.signal_strength,
+                trade.c.trade_type,
+                trade.c.symbol,
+                trade.c.amount,
+                trade.c.total_value,
+                trade.c.realized_pnl,
+            )
+            .outerjoin(trade, true())
+            .where(StrategyExecution.portfolio_id == portfolio_id)
+            .order_by(StrategyExecution.execution_time.desc(), StrategyExecution.id.desc())
+        )
+
+    @staticmethod
+    def _execution_history_item(row: Any, bullish_count: int, bearish_count: int) -> dict:
+        """执行历史行 -> 响应项"""
+        # 构建活动描述
+        action = "No action taken"
+        result_str = "--"
+
+        if row.trade_type:
+            if row.trade_type == "BUY":
+                action = f"Bought {float(row.amount):.8f} {row.symbol}"
+            elif row.trade_type == "SELL":
+                action = f"Sold {float(row.amount):.8f} {row.symbol}"
+
+            # 计算结果
+            if row.realized_pnl:
+                result_str = f"+${float(row.realized_pnl):.2f}" if float(row.realized_pnl) >= 0 else f"${float(row.realized_pnl):.2f}"
+            elif row.trade_type == "BUY":
+                result_str = f"${float(row.total_value):.2f}"
+
+        # 根据信号类型决定显示哪个连续计数
+        # 只在看涨(BUY)或看跌(SELL)时显示，HOLD不显示
+        signal = row.signal or "HOLD"
+        consecutive_count = None
+        if signal == "BUY" and bullish_count > 0:
+            consecutive_count = bullish_count
+        elif signal == "SELL" and bearish_count > 0:
+            consecutive_count = bearish_count
+
+        return {
+            "execution_id": str(row.id),
+            "date": row.execution_time.replace(tzinfo=timezone.utc).isoformat(),  # 标记为UTC时区
+            "signal": signal,
+            "action": action,
+            "result": result_str,
+            "agent": "Squad",  # 可以根据需要调整
+            "conviction_score": row.conviction_score,
+            "signal_strength": row.signal_strength,
+            "consecutive_count": consecutive_count,
+        }
+
+    @staticmethod
+    async def _get_signal_counts(db: AsyncSession, portfolio_id: str) -> Tuple[int, int]:
+        """
+        查询组合的连续看涨/看跌计数
+
+        Raises:
+            ValueError: 组合不存在
+        """
+        result = await db.execute(
+            select(
+                Portfolio.consecutive_bullish_count,
+                Portfolio.consecutive_bearish_count,
+            ).where(Portfolio.id == portfolio_id)
+        )
+        row = result.first()
+
+        if not row:
+            raise ValueError(f"Portfolio {portfolio_id} not found")
+
+        return row[0] or 0, row[1] or 0
+
     async def get_strategy_executions(
         self, db: AsyncSession, portfolio_id: str, page: int = 1, page_size: int = 50
     ) -> dict:
@@ -993,92 +1269,29 @@ Investors seeking long-term stable returns who trust in the fundamental value pr
             page_size: 每页数量
 
         Returns:
-            dict: 包含执行历史列表和分页信息
+            dict: 包含执行历史列表和分页信息，next_cursor 可用于
+                  get_strategy_executions_keyset 继续翻页
         """
         try:
-            # 查询该投资组合的用户ID和连续信号计数
-            result = await db.execute(
-                select(Portfolio).where(Portfolio.id == portfolio_id)
-            )
-            portfolio = result.scalar_one_or_none()
-
-            if not portfolio:
-                raise ValueError(f"Portfolio {portfolio_id} not found")
-
-            user_id = portfolio.user_id
-            bullish_count = portfolio.consecutive_bullish_count or 0
-            bearish_count = portfolio.consecutive_bearish_count or 0
+            bullish_count, bearish_count = await self._get_signal_counts(db, portfolio_id)
 
             # 计算偏移量
             offset = (page - 1) * page_size
 
-            # 查询总数 - 只查询当前 portfolio 的记录
-            count_stmt = (
-                select(func.count(StrategyExecution.id))
-                .where(StrategyExecution.portfolio_id == portfolio_id)
-            )
-            total_result = await db.execute(count_stmt)
-            total = total_result.scalar_one()
+            # 查询总数（缓存）
+            total = await self._get_execution_count(db, portfolio_id)
 
-            # 查询策略执行记录（分页） - 只查询当前 portfolio 的记录
-            stmt = (
-                select(StrategyExecution)
-                .where(StrategyExecution.portfolio_id == portfolio_id)
-                .order_by(StrategyExecution.execution_time.desc())
-                .offset(offset)
-                .limit(page_size)
-            )
+            # 查询策略执行记录及对应交易（分页），多取一行判断是否还有下一页
+            stmt = self._execution_history_stmt(portfolio_id).offset(offset).limit(page_size + 1)
             result = await db.execute(stmt)
-            executions = result.scalars().all()
-
-            # 转换为响应格式
-            items = []
-            for exe in executions:
-                # 获取对应的交易（如果有）
-                trade_stmt = (
-                    select(Trade)
-                    .where(Trade.execution_id == exe.id)
-                    .where(Trade.portfolio_id == portfolio_id)
-                )
-                trade_result = await db.execute(trade_stmt)
-                trade = trade_result.scalar_one_or_none()
-
-                # 构建活动描述
-                action = "No action taken"
-                result_str = "--"
-
-                if trade:
-                    if trade.trade_type == "BUY":
-                        action = f"Bought {float(trade.amount):.8f} {trade.symbol}"
-                    elif trade.trade_type == "SELL":
-                        action = f"Sold {float(trade.amount):.8f} {trade.symbol}"
-
-                    # 计算结果
-                    if trade.realized_pnl:
-                        result_str = f"+${float(trade.realized_pnl):.2f}" if float(trade.realized_pnl) >= 0 else f"${float(trade.realized_pnl):.2f}"
-                    elif trade.trade_type == "BUY":
-                        result_str = f"${float(trade.total_value):.2f}"
-
-                # 根据信号类型决定显示哪个连续计数
-                # 只在看涨(BUY)或看跌(SELL)时显示，HOLD不显示
-                signal = exe.signal or "HOLD"
-                consecutive_count = None
-                if signal == "BUY" and bullish_count > 0:
-                    consecutive_count = bullish_count
-                elif signal == "SELL" and bearish_count > 0:
-                    consecutive_count = bearish_count
-
-                items.append({
-                    "execution_id": str(exe.id),
-                    "date": exe.execution_time.replace(tzinfo=timezone.utc).isoformat(),  # 标记为UTC时区
-                    "signal": signal,
-                    "action": action,
-                    "result": result_str,
-                    "agent": "Squad",  # 可以根据需要调整
-                    "conviction_score": exe.conviction_score,
-                    "signal_strength": exe.signal_strength,
-                    "consecutive_count": consecutive_count,
-                })
+            rows = result.all()
+            has_next = len(rows) > page_size
+            rows = rows[:page_size]
+
+            items = [
+                self._execution_history_item(row, bullish_count, bearish_count)
+                for row in rows
+            ]
 
             # 计算分页信息
             total_pages = (total + page_size - 1) // page_size
@@ -1089,8 +1302,75 @@ Investors seeking long-term stable returns who trust in the fundamental value pr
                 "page_size": page_size,
                 "total": total,
                 "total_pages": total_pages,
-                "has_next": page < total_pages,
+                "has_next": has_next,
                 "has_prev": page > 1,
+                "next_cursor": (
+                    self._encode_execution_cursor(rows[-1].execution_time, rows[-1].id)
+                    if has_next else None
+                ),
+            }
+
+        except ValueError as e:
+            raise
+        except Exception as e:
+            logger.error(f"获取策略执行历史失败: {e}", exc_info=True)
+            raise
+
+    async def get_strategy_executions_keyset(
+        self,
+        db: AsyncSession,
+        portfolio_id: str,
+        cursor: Optional[str] = None,
+        page_size: int = 50,
+    ) -> dict:
+        """
+        获取策略执行历史列表（游标分页）
+
+        以 (execution_time, id) 为游标，深页与首页一样只扫描 page_size + 1 行
+
+        Args:
+            db: 数据库会话
+            portfolio_id: 投资组合ID
+            cursor: 上一页返回的 next_cursor（为空则从最新开始）
+            page_size: 每页数量
+
+        Returns:
+            dict: {"items", "page_size", "total", "next_cursor", "has_next"}
+
+        Raises:
+            ValueError: 组合不存在或游标无效
+        """
+        try:
+            bullish_count, bearish_count = await self._get_signal_counts(db, portfolio_id)
+
+            stmt = self._execution_history_stmt(portfolio_id)
+            if cursor:
+                cursor_time, cursor_id = self._decode_execution_cursor(cursor)
+                stmt = stmt.where(
+                    tuple_(StrategyExecution.execution_time, StrategyExecution.id)
+                    < tuple_(cursor_time, cursor_id)
+                )
+
+            # 多取一行判断是否还有下一页
+            result = await db.execute(stmt.limit(page_size + 1))
+            rows = result.all()
+            has_next = len(rows) > page_size
+            rows = rows[:page_size]
+
+            items = [
+                self._execution_history_item(row, bullish_count, bearish_count)
+                for row in rows
+            ]
+
+            return {
+                "items": items,
+                "page_size": page_size,
+                "total": await self._get_execution_count(db, portfolio_id),
+                "next_cursor": (
+                    self._encode_execution_cursor(rows[-1].execution_time, rows[-1].id)
+                    if has_next else None
+                ),
+                "has_next": has_next,
             }
 
         except ValueError as e:
@@ -1232,8 +1512,6 @@ Investors seeking long-term stable returns who trust in the fundamental value pr
                 raise ValueError(f"You have already activated this strategy")
 
             # 4. 克隆策略模板创建新的 Portfolio 实例
-            import uuid
-
             # 从模板复制instance_params
             template_params = template_portfolio.instance_params or {}
 
@@ -1256,6 +1534,7 @@ Investors seeking long-term stable returns who trust in the fundamental value pr
             db.add(new_portfolio)
             await db.commit()
             await db.refresh(new_portfolio)
+            self.invalidate_marketplace_cache()
 
             # 5. 添加到调度器（启动定时执行）
             try:
@@ -20,13 +20,24 @@ from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
 from app.core.config import settings
+from app.core.serialization import ENGINE_JSON_KWARGS
 from app.models import User, Portfolio, PortfolioSnapshot
 from app.services.strategy.strategy_orchestrator import strategy_orchestrator
 from app.services.trading.portfolio_service import portfolio_service
+from app.services.trading.performance_analytics import performance_analytics
+from app.services.strategy.marketplace_service import marketplace_service
+from app.services.strategy.exploration_dashboard import exploration_dashboard
+from app.services.realtime.event_bus import (
+    event_bus,
+    TOPIC_EXECUTION_COMPLETED,
+    TOPIC_EXPLORATION_UPDATED,
+    TOPIC_PORTFOLIO_VALUATION,
+)
 from app.services.market.real_market_data import real_market_data_service
 from app.services.strategy.real_agent_executor import real_agent_executor
 from app.services.indicators.calculator import IndicatorCalculator
 from app.services.data_collectors.manager import data_manager
+from app.services.llm.admission import LLMPriority, llm_priority
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +53,8 @@ class StrategyScheduler:
         self.scheduler = None  # 延迟初始化
         self.engine = None
         self.SessionLocal = None
+        # 上次推送的组合估值 {portfolio_id: (total_value, total_pnl, total_pnl_percent)}，只推送变化的组合
+        self._last_valuations = {}
 
     def _run_async_job(self, coro_func, *args, **kwargs):
         """在新事件循环中运行异步函数(用于BackgroundScheduler)
@@ -63,6 +76,7 @@ class StrategyScheduler:
                     settings.DATABASE_URL,
                     echo=False,
                     pool_pre_ping=True,
+                    **ENGINE_JSON_KWARGS,
                 )
 
                 temp_session_factory = async_sessionmaker(
@@ -77,7 +91,9 @@ class StrategyScheduler:
                 self.SessionLocal = temp_session_factory
 
                 try:
-                    result = loop.run_until_complete(coro_func(*args, **kwargs))
+                    # 调度任务中的LLM调用走交易优先通道（先于研究对话）
+                    with llm_priority(LLMPriority.TRADING):
+                        result = loop.run_until_complete(coro_func(*args, **kwargs))
                     logger.info(f"[Scheduler] _run_async_job completed: {coro_func.__name__}")
                     return result
                 finally:
@@ -102,6 +118,7 @@ class StrategyScheduler:
             settings.DATABASE_URL,
             echo=False,
             pool_pre_ping=True,
+            **ENGINE_JSON_KWARGS,
         )
 
         self.SessionLocal = async_sessionmaker(
@@ -529,6 +546,14 @@ class StrategyScheduler:
                         await db.commit()
 
                         success_count += 1
+                        await event_bus.publish(TOPIC_EXECUTION_COMPLETED, {
+                            "portfolio_id": str(portfolio.id),
+                            "execution_id": str(execution.id),
+                            "batch_id": str(batch_id),
+                            "signal": execution.signal,
+                            "status": execution.status,
+                            "executed_at": portfolio.last_execution_time,
+                        }, user_id=portfolio.user_id)
                         logger.info(
                             f"✅ 实例执行完成 - {portfolio.instance_name}, "
                             f"信号: {execution.signal}, 状态: {execution.status}"
@@ -558,10 +583,10 @@ class StrategyScheduler:
                             portfolio_id=str(portfolio.id),
                             strategy_name=definition.name,
                         )
-                        # ⚠️ 重要：不要rollback！
-                        # strategy_orchestrator的异常处理已经更新了execution状态并commit了
-                        # 如果这里rollback，会回滚execution的状态更新，导致记录卡在RUNNING状态
-                        # 只需要刷新session状态，继续下一个实例
+                        # strategy_orchestrator 的异常处理已把 execution 置为 FAILED 并 commit，
+                        # rollback 只丢弃失败实例未提交的脏状态，避免它随下一个实例的 commit 一起写入
+                        # （error_tracker 不提交本会话）
+                        await db.rollback()
                         await db.refresh(portfolio) if portfolio else None
                         # 继续下一个实例
 
@@ -574,6 +599,14 @@ class StrategyScheduler:
                 f"{'='*60}"
             )
 
+            # 6. 重建 Exploration 页面物化视图（与访问用户无关，每批次只查询一次）
+            async with self.SessionLocal() as db:
+                await exploration_dashboard.rebuild(db)
+            await event_bus.publish(TOPIC_EXPLORATION_UPDATED, {
+                "definition_id": definition_id,
+                "batch_id": str(batch_id),
+            })
+
         except Exception as e:
             logger.error(f"模板 {definition_id} 批量执行失败: {e}", exc_info=True)
 
@@ -603,7 +636,13 @@ class StrategyScheduler:
                 )
                 portfolios = result.scalars().all()
 
-                # 3. 更新组合价值
+                # 停用/删除的组合不再保留上次估值
+                active_ids = {str(portfolio.id) for portfolio in portfolios}
+                for portfolio_id in self._last_valuations.keys() - active_ids:
+                    del self._last_valuations[portfolio_id]
+
+                # 3. 更新组合价值（按所有者分组推送）
+                changed = {}
                 for portfolio in portfolios:
                     try:
                         await portfolio_service.update_portfolio_value(
@@ -612,9 +651,31 @@ class StrategyScheduler:
                             current_btc_price=btc_price,
                         )
 
+                        valuation = (
+                            portfolio.total_value,
+                            portfolio.total_pnl,
+                            portfolio.total_pnl_percent,
+                        )
+                        portfolio_id = str(portfolio.id)
+                        if self._last_valuations.get(portfolio_id) != valuation:
+                            self._last_valuations[portfolio_id] = valuation
+                            changed.setdefault(portfolio.user_id, []).append({
+                                "id": portfolio_id,
+                                "total_value": valuation[0],
+                                "total_pnl": valuation[1],
+                                "total_pnl_percent": valuation[2],
+                            })
+
                     except Exception as e:
                         logger.error(f"更新组合价值失败: {portfolio.name} - {e}")
 
+                # 4. 推送估值增量（只包含变化的组合，每个用户只收到自己的组合）
+                for user_id, user_portfolios in changed.items():
+                    await event_bus.publish(TOPIC_PORTFOLIO_VALUATION, {
+                        "btc_price": btc_price,
+                        "portfolios": user_portfolios,
+                    }, user_id=user_id)
+
                 logger.info(
                     f"市场数据采集完成 - BTC: ${btc_price}, "
                     f"更新了 {len(portfolios)} 个组合"
@@ -689,6 +750,9 @@ class StrategyScheduler:
 
                         db.add(snapshot)
 
+                        # 增量更新最大回撤 / Sharpe (O(1), 随快照一起提交)
+                        performance_analytics.record_snapshot(portfolio, portfolio.total_value)
+
                         logger.info(
                             f"创建组合快照: {portfolio.name}, "
                             f"总价值: ${portfolio.total_value}"
@@ -699,6 +763,9 @@ class StrategyScheduler:
 
                 await db.commit()
 
+                # 新快照改变了历史曲线/回撤/Sharpe, 市场列表缓存失效
+                marketplace_service.invalidate_marketplace_cache()
+
                 logger.info(f"组合快照创建完成 - 共 {len(portfolios)} 个组合")
 
         except Exception as e:
@@ -18,6 +18,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
+from app.core.serialization import to_jsonable
 from app.models import StrategyExecution, Portfolio, StrategyDefinition
 from app.schemas.strategy import TradeType, StrategyStatus, TradeSignal
 from app.services.trading.paper_engine import paper_engine
@@ -64,32 +65,6 @@ class StrategyOrchestrator:
             )
             raise ValueError(f"Failed to load decision agent: {str(e)}")
 
-    @staticmethod
-    def _serialize_for_json(obj: Any) -> Any:
-        """
-        递归序列化对象以便存储到 JSONB
-
-        处理:
-        - datetime → ISO 8601 字符串
-        - Decimal → float
-        - Pydantic models → dict
-        - dict/list → 递归处理
-        """
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, Decimal):
-            return float(obj)
-        elif hasattr(obj, 'dict'):  # Pydantic model
-            return StrategyOrchestrator._serialize_for_json(obj.dict())
-        elif isinstance(obj, dict):
-            return {k: StrategyOrchestrator._serialize_for_json(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [StrategyOrchestrator._serialize_for_json(item) for item in obj]
-        elif isinstance(obj, tuple):
-            return [StrategyOrchestrator._serialize_for_json(item) for item in obj]
-        else:
-            return obj
-
     async def execute_strategy(
         self,
         db: AsyncSession,
@@ -138,7 +113,7 @@ class StrategyOrchestrator:
             logger.info(f"执行策略: {strategy_definition.display_name} (实例: {portfolio.instance_name})")
 
             # Step 1: 先创建策略执行记录（占位），获取 ID
-            serialized_market_data = self._serialize_for_json(market_data)
+            serialized_market_data = to_jsonable(market_data)
 
             strategy_execution = StrategyExecution(
                 user_id=user_id,
@@ -385,7 +360,7 @@ class StrategyOrchestrator:
                     logger.info(f"已更新执行记录状态为FAILED: {strategy_execution.id}")
                 else:
                     # 如果execution记录还没有创建，创建新的失败记录
-                    serialized_market_data = self._serialize_for_json(market_data)
+                    serialized_market_data = to_jsonable(market_data)
                     
                     failed_execution = StrategyExecution(
                         user_id=user_id,
@@ -6,6 +6,7 @@
 from app.services.trading.paper_engine import PaperTradingEngine, paper_engine
 from app.services.trading.portfolio_service import PortfolioService, portfolio_service
 from app.services.trading.oco_order_manager import OCOOrderManager, oco_order_manager
+from app.services.trading.performance_analytics import PerformanceAnalytics, performance_analytics
 
 __all__ = [
     "PaperTradingEngine",
@@ -14,4 +15,6 @@ __all__ = [
     "portfolio_service",
     "OCOOrderManager",
     "oco_order_manager",
+    "PerformanceAnalytics",
+    "performance_analytics",
 ]
@@ -0,0 +1,279 @@
+"""Fixed Point - 定点整数金额表示
+
+交易核心(PaperTradingEngine / PortfolioService / OCOOrderManager)内部统一使用
+int64 定点整数进行计算，只在持久化边界(ORM的 NUMERIC 列)与 Decimal 互相转换。
+
+约定:
+- 金额(USDT余额、成本、手续费、市值): QUOTE_DECIMALS 位小数
+- 价格: PRICE_DECIMALS 位小数
+- 持仓数量: 按币种定义的小数位 (ASSET_DECIMALS)
+- 费率: 百万分之一 (ppm)
+
+所有位数都不能超过数据库列 NUMERIC(20, 8) 的小数位，否则持久化时会被截断。
+"""
+
+from decimal import Decimal, ROUND_HALF_EVEN
+from typing import Dict, Optional, Tuple, Union
+
+Number = Union[int, float, str, Decimal]
+
+# 与 NUMERIC(20, 8) 对齐
+QUOTE_DECIMALS = 8
+PRICE_DECIMALS = 8
+DEFAULT_ASSET_DECIMALS = 8
+
+# 每个币种的数量精度 (小数位)
+ASSET_DECIMALS: Dict[str, int] = {
+    "BTC": 8,
+    "ETH": 8,
+    "SOL": 8,
+}
+
+PPM = 1_000_000
+
+QUOTE_SCALE = 10 ** QUOTE_DECIMALS
+PRICE_SCALE = 10 ** PRICE_DECIMALS
+
+# float 在该范围内乘以 scale 后仍可精确表示为整数 (2^53)
+_FLOAT_EXACT_LIMIT = float(2 ** 53)
+# 预先构造的 Decimal 缩放因子, 避免每次转换都创建
+_DECIMAL_SCALES: Dict[int, Decimal] = {d: Decimal(10 ** d) for d in range(19)}
+
+
+def asset_decimals(symbol: str) -> int:
+    """获取币种数量精度"""
+    return ASSET_DECIMALS.get(symbol, DEFAULT_ASSET_DECIMALS)
+
+
+def asset_scale(symbol: str) -> int:
+    """获取币种数量的缩放因子 (10^decimals)"""
+    return 10 ** asset_decimals(symbol)
+
+
+def rate_to_ppm(rate: Number) -> int:
+    """费率转换为ppm, 例如 0.001 -> 1000"""
+    return to_units(rate, 6)
+
+
+def div_round(numerator: int, denominator: int) -> int:
+    """整数除法, 银行家舍入 (ROUND_HALF_EVEN, 与 Decimal.quantize 默认一致)"""
+    if denominator < 0:
+        numerator, denominator = -numerator, -denominator
+    q, r = divmod(numerator, denominator)
+    twice = r * 2
+    if twice > denominator or (twice == denominator and q & 1):
+        q += 1
+    return q
+
+
+def to_units(value: Optional[Number], decimals: int) -> int:
+    """
+    将 Decimal/float/int/str 转换为定点整数
+
+    Args:
+        value: 原始数值 (None 视为 0)
+        decimals: 小数位
+
+    Returns:
+        int: value * 10^decimals (ROUND_HALF_EVEN)
+    """
+    if value is None:
+        return 0
+    if type(value) is not Decimal:
+        if isinstance(value, int):
+            return value * 10 ** decimals
+        if isinstance(value, float):
+            scaled = value * 10 ** decimals
+            if -_FLOAT_EXACT_LIMIT < scaled < _FLOAT_EXACT_LIMIT:
+                return round(scaled)
+            value = Decimal(repr(value))
+        else:
+            value = Decimal(str(value))
+
+    scale = _DECIMAL_SCALES.get(decimals)
+    scaled = value * scale if scale is not None else value.scaleb(decimals)
+    units = int(scaled)
+    if units != scaled:
+        # 超出精度的部分才需要舍入 (NUMERIC(20, 8) 读出的值走不到这里)
+        units = int(scaled.to_integral_value(rounding=ROUND_HALF_EVEN))
+    return units
+
+
+def from_units(units: int, decimals: int) -> Decimal:
+    """将定点整数转换回 Decimal (仅用于写入 NUMERIC 列或对外展示)"""
+    return Decimal(units).scaleb(-decimals)
+
+
+def quote_to_units(value: Optional[Number]) -> int:
+    """金额 -> 定点整数"""
+    return to_units(value, QUOTE_DECIMALS)
+
+
+def price_to_units(value: Optional[Number]) -> int:
+    """价格 -> 定点整数"""
+    return to_units(value, PRICE_DECIMALS)
+
+
+def amount_to_units(value: Optional[Number], symbol: str) -> int:
+    """持仓数量 -> 定点整数"""
+    return to_units(value, asset_decimals(symbol))
+
+
+def quote_from_units(units: int) -> Decimal:
+    """定点整数 -> 金额 Decimal"""
+    return from_units(units, QUOTE_DECIMALS)
+
+
+def price_from_units(units: int) -> Decimal:
+    """定点整数 -> 价格 Decimal"""
+    return from_units(units, PRICE_DECIMALS)
+
+
+def amount_from_units(units: int, symbol: str) -> Decimal:
+    """定点整数 -> 持仓数量 Decimal"""
+    return from_units(units, asset_decimals(symbol))
+
+
+def notional(amount_units: int, price_units: int, amount_decimals: int) -> int:
+    """
+    计算成交额 (amount * price), 结果为金额定点整数
+
+    amount(10^a) * price(10^p) -> quote(10^q): 除以 10^(a + p - q)
+    """
+    shift = amount_decimals + PRICE_DECIMALS - QUOTE_DECIMALS
+    product = amount_units * price_units
+    if shift <= 0:
+        return product * 10 ** -shift
+    return div_round(product, 10 ** shift)
+
+
+def apply_ppm(units: int, ppm: int) -> int:
+    """按ppm费率计算 (例如手续费)"""
+    return div_round(units * ppm, PPM)
+
+
+def avg_price(cost_units: int, amount_units: int, amount_decimals: int) -> int:
+    """由总成本和数量反推均价 (价格定点整数)"""
+    if amount_units == 0:
+        return 0
+    shift = amount_decimals + PRICE_DECIMALS - QUOTE_DECIMALS
+    if shift >= 0:
+        return div_round(cost_units * 10 ** shift, amount_units)
+    return div_round(cost_units, amount_units * 10 ** -shift)
+
+
+def percent(numerator_units: int, denominator_units: int) -> float:
+    """百分比 (numerator / denominator * 100), 分母<=0 时返回0"""
+    if denominator_units <= 0:
+        return 0.0
+    return numerator_units * 100 / denominator_units
+
+
+# ---------------------------------------------------------------------------
+# 成交与估值内核 (纯整数运算, 不触碰ORM)
+# ---------------------------------------------------------------------------
+
+
+def buy_fill(
+    balance_units: int,
+    holding_amount_units: int,
+    holding_avg_price_units: int,
+    amount_units: int,
+    price_units: int,
+    fee_ppm: int,
+    amount_decimals: int = DEFAULT_ASSET_DECIMALS,
+) -> Dict[str, int]:
+    """
+    买入成交计算
+
+    Returns:
+        {
+            "total_value", "fee", "balance",
+            "amount", "avg_buy_price", "cost_basis"
+        }
+
+    Raises:
+        ValueError: 余额不足
+    """
+    total_value = notional(amount_units, price_units, amount_decimals)
+    fee = apply_ppm(total_value, fee_ppm)
+    total_cost = total_value + fee
+
+    if balance_units < total_cost:
+        raise ValueError(
+            f"余额不足: 需要 {quote_from_units(total_cost)}, "
+            f"但只有 {quote_from_units(balance_units)}"
+        )
+
+    old_cost = notional(holding_amount_units, holding_avg_price_units, amount_decimals)
+    cost_basis = old_cost + total_value
+    new_amount = holding_amount_units + amount_units
+
+    return {
+        "total_value": total_value,
+        "fee": fee,
+        "balance": balance_units - total_cost,
+        "amount": new_amount,
+        "avg_buy_price": avg_price(cost_basis, new_amount, amount_decimals),
+        "cost_basis": cost_basis,
+    }
+
+
+def sell_fill(
+    balance_units: int,
+    holding_amount_units: int,
+    holding_avg_price_units: int,
+    holding_cost_basis_units: int,
+    amount_units: int,
+    price_units: int,
+    fee_ppm: int,
+    amount_decimals: int = DEFAULT_ASSET_DECIMALS,
+) -> Dict[str, int]:
+    """
+    卖出成交计算
+
+    Returns:
+        {
+            "total_value", "fee", "balance", "amount",
+            "cost_basis", "realized_pnl", "cost"
+        }
+
+    Raises:
+        ValueError: 持仓不足
+    """
+    if holding_amount_units < amount_units:
+        raise ValueError(
+            f"持仓不足: 需要卖出 {from_units(amount_units, amount_decimals)}, "
+            f"但只有 {from_units(holding_amount_units, amount_decimals)}"
+        )
+
+    total_value = notional(amount_units, price_units, amount_decimals)
+    fee = apply_ppm(total_value, fee_ppm)
+    sell_value = total_value - fee
+    cost = notional(amount_units, holding_avg_price_units, amount_decimals)
+
+    return {
+        "total_value": total_value,
+        "fee": fee,
+        "balance": balance_units + sell_value,
+        "amount": holding_amount_units - amount_units,
+        "cost_basis": holding_cost_basis_units - cost,
+        "realized_pnl": sell_value - cost,
+        "cost": cost,
+    }
+
+
+def revalue_holding(
+    amount_units: int,
+    price_units: int,
+    cost_basis_units: int,
+    amount_decimals: int = DEFAULT_ASSET_DECIMALS,
+) -> Tuple[int, int]:
+    """
+    持仓重估
+
+    Returns:
+        (market_value, unrealized_pnl) 金额定点整数
+    """
+    market_value = notional(amount_units, price_units, amount_decimals)
+    return market_value, market_value - cost_basis_units
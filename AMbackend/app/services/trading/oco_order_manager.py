@@ -4,7 +4,6 @@
 """
 
 from typing import Optional, List
-from decimal import Decimal
 from datetime import datetime
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,6 +11,7 @@ import logging
 
 from app.models import Portfolio, PortfolioHolding, Trade
 from app.schemas.strategy import TradeType
+from app.services.trading import fixed_point as fp
 
 logger = logging.getLogger(__name__)
 
@@ -89,7 +89,7 @@ class OCOOrderManager:
         db: AsyncSession,
         portfolio: Portfolio,
         symbol: str,
-        current_price: Decimal,
+        current_price: fp.Number,
         paper_engine  # 避免循环导入,使用duck typing
     ) -> Optional[str]:
         """
@@ -99,7 +99,7 @@ class OCOOrderManager:
             db: 数据库会话
             portfolio: 组合对象
             symbol: 币种
-            current_price: 当前价格
+            current_price: 当前价格 (Decimal 或 float)
             paper_engine: PaperTradingEngine实例
         
         Returns:
@@ -122,8 +122,10 @@ class OCOOrderManager:
             return None
         
         oco = holding.metadata["oco_order"]
-        stop_loss_price = Decimal(str(oco["stop_loss_price"]))
-        take_profit_price = Decimal(str(oco["take_profit_price"]))
+        # 定点整数比较, 避免 Decimal(str(float)) 往返
+        current_units = fp.price_to_units(current_price)
+        stop_loss_units = fp.price_to_units(oco["stop_loss_price"])
+        take_profit_units = fp.price_to_units(oco["take_profit_price"])
         side = oco["side"]
         
         # 判断是否触发
@@ -131,24 +133,26 @@ class OCOOrderManager:
         
         if side == "LONG":
             # 做多: 价格跌破止损 或 突破止盈
-            if current_price <= stop_loss_price:
+            if current_units <= stop_loss_units:
                 triggered_type = "STOP_LOSS"
-                execution_price = stop_loss_price
-            elif current_price >= take_profit_price:
+                execution_units = stop_loss_units
+            elif current_units >= take_profit_units:
                 triggered_type = "TAKE_PROFIT"
-                execution_price = take_profit_price
+                execution_units = take_profit_units
         else:  # SHORT
             # 做空: 价格突破止损 或 跌破止盈
-            if current_price >= stop_loss_price:
+            if current_units >= stop_loss_units:
                 triggered_type = "STOP_LOSS"
-                execution_price = stop_loss_price
-            elif current_price <= take_profit_price:
+                execution_units = stop_loss_units
+            elif current_units <= take_profit_units:
                 triggered_type = "TAKE_PROFIT"
-                execution_price = take_profit_price
+                execution_units = take_profit_units
         
         if not triggered_type:
             return None
         
+        execution_price = fp.price_from_units(execution_units)
+        
         # 执行平仓
         logger.info(f"🔔 OCO订单触发: {symbol} {triggered_type} @ {execution_price}")
         
@@ -214,7 +218,7 @@ class OCOOrderManager:
             if symbol not in current_prices:
                 continue
             
-            current_price = Decimal(str(current_prices[symbol]))
+            current_price = current_prices[symbol]
             
             trigger_type = await self.check_and_execute_oco(
                 db=db,
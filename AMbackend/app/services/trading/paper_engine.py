@@ -1,6 +1,8 @@
 """Paper Trading Engine - 模拟交易引擎
 
 执行买入/卖出操作，更新持仓，计算手续费和盈亏
+
+内部使用定点整数计算 (见 fixed_point.py)，仅在读写ORM字段时与 Decimal 转换
 """
 
 from typing import Optional
@@ -11,6 +13,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Portfolio, PortfolioHolding, Trade
 from app.schemas.strategy import TradeType
+from app.services.trading import fixed_point as fp
+from app.services.realtime.event_bus import event_bus, TOPIC_TRADE_EXECUTED
 
 
 class PaperTradingEngine:
@@ -27,6 +31,7 @@ class PaperTradingEngine:
 
     # 手续费配置
     FEE_RATE = 0.001  # 0.1% (Binance Spot手续费)
+    FEE_RATE_PPM = fp.rate_to_ppm(FEE_RATE)  # 定点表示, 避免每笔交易 Decimal(str(float))
 
     async def execute_trade(
         self,
@@ -65,53 +70,53 @@ class PaperTradingEngine:
         )
         portfolio = result.scalar_one()
 
-        # 计算交易金额和手续费
-        total_value = amount * price
-        fee = total_value * Decimal(str(self.FEE_RATE))
+        # 读取当前持仓 (一次查询, 买卖共用)
+        holding = await self._get_holding(db, portfolio_id, symbol)
 
-        # 记录交易前状态
-        balance_before = portfolio.current_balance
-        holding_before = await self._get_holding_amount(db, portfolio_id, symbol)
+        # 持久化边界: Decimal -> 定点整数
+        decimals = fp.asset_decimals(symbol)
+        amount_units = fp.to_units(amount, decimals)
+        price_units = fp.price_to_units(price)
+        balance_before_units = fp.quote_to_units(portfolio.current_balance)
+        holding_before_units = fp.to_units(holding.amount, decimals) if holding else 0
 
         # 执行交易
         if trade_type == TradeType.BUY:
             trade = await self._execute_buy(
                 db=db,
                 portfolio=portfolio,
+                holding=holding,
                 symbol=symbol,
-                amount=amount,
-                price=price,
-                fee=fee,
+                amount_units=amount_units,
+                price_units=price_units,
+                balance_units=balance_before_units,
             )
         else:  # SELL
             trade = await self._execute_sell(
                 db=db,
                 portfolio=portfolio,
+                holding=holding,
                 symbol=symbol,
-                amount=amount,
-                price=price,
-                fee=fee,
+                amount_units=amount_units,
+                price_units=price_units,
+                balance_units=balance_before_units,
             )
 
-        # 记录交易后状态
-        balance_after = portfolio.current_balance
-        holding_after = await self._get_holding_amount(db, portfolio_id, symbol)
-
         # 创建交易记录
         trade_record = Trade(
             portfolio_id=portfolio_id,
             execution_id=execution_id,
             symbol=symbol,
             trade_type=trade_type.value,
-            amount=amount,
-            price=price,
-            total_value=total_value,
-            fee=fee,
+            amount=fp.from_units(amount_units, decimals),
+            price=fp.price_from_units(price_units),
+            total_value=fp.quote_from_units(trade["total_value"]),
+            fee=fp.quote_from_units(trade["fee"]),
             fee_percent=float(self.FEE_RATE * 100),
-            balance_before=balance_before,
-            balance_after=balance_after,
-            holding_before=holding_before,
-            holding_after=holding_after,
+            balance_before=fp.quote_from_units(balance_before_units),
+            balance_after=fp.quote_from_units(trade["balance"]),
+            holding_before=fp.from_units(holding_before_units, decimals),
+            holding_after=fp.from_units(trade["amount"], decimals),
             realized_pnl=trade.get("realized_pnl"),
             realized_pnl_percent=trade.get("realized_pnl_percent"),
             conviction_score=conviction_score,
@@ -137,124 +142,136 @@ class PaperTradingEngine:
         await db.commit()
         await db.refresh(trade_record)
 
+        await event_bus.publish(TOPIC_TRADE_EXECUTED, {
+            "portfolio_id": str(portfolio_id),
+            "trade_id": str(trade_record.id),
+            "execution_id": str(execution_id) if execution_id else None,
+            "symbol": symbol,
+            "side": trade_record.trade_type,
+            "amount": trade_record.amount,
+            "price": trade_record.price,
+            "balance_after": trade_record.balance_after,
+            "realized_pnl": trade_record.realized_pnl,
+            "executed_at": trade_record.executed_at,
+        }, user_id=portfolio.user_id)
+
         return trade_record
 
     async def _execute_buy(
         self,
         db: AsyncSession,
         portfolio: Portfolio,
+        holding: Optional[PortfolioHolding],
         symbol: str,
-        amount: Decimal,
-        price: Decimal,
-        fee: Decimal,
+        amount_units: int,
+        price_units: int,
+        balance_units: int,
     ) -> dict:
         """执行买入"""
-        total_cost = amount * price + fee
+        decimals = fp.asset_decimals(symbol)
 
-        # 检查余额
-        if portfolio.current_balance < total_cost:
-            raise ValueError(f"余额不足: 需要 {total_cost}, 但只有 {portfolio.current_balance}")
+        if holding:
+            holding_amount_units = fp.to_units(holding.amount, decimals)
+            holding_avg_units = fp.price_to_units(holding.avg_buy_price)
+        else:
+            holding_amount_units = 0
+            holding_avg_units = 0
+
+        # 检查余额并计算成交结果 (余额不足时抛出ValueError)
+        fill = fp.buy_fill(
+            balance_units=balance_units,
+            holding_amount_units=holding_amount_units,
+            holding_avg_price_units=holding_avg_units,
+            amount_units=amount_units,
+            price_units=price_units,
+            fee_ppm=self.FEE_RATE_PPM,
+            amount_decimals=decimals,
+        )
 
         # 扣除余额
-        portfolio.current_balance -= total_cost
-
-        # 更新或创建持仓
-        result = await db.execute(
-            select(PortfolioHolding).where(
-                PortfolioHolding.portfolio_id == portfolio.id,
-                PortfolioHolding.symbol == symbol,
-            )
-        )
-        holding = result.scalar_one_or_none()
+        portfolio.current_balance = fp.quote_from_units(fill["balance"])
 
         if holding:
             # 更新现有持仓
-            old_cost = holding.amount * holding.avg_buy_price
-            new_cost = amount * price
-            total_cost_basis = old_cost + new_cost
-            holding.amount += amount
-            holding.avg_buy_price = total_cost_basis / holding.amount
-            holding.cost_basis = total_cost_basis
+            holding.amount = fp.from_units(fill["amount"], decimals)
+            holding.avg_buy_price = fp.price_from_units(fill["avg_buy_price"])
+            holding.cost_basis = fp.quote_from_units(fill["cost_basis"])
         else:
             # 创建新持仓
             holding = PortfolioHolding(
                 portfolio_id=portfolio.id,
                 symbol=symbol,
-                amount=amount,
-                avg_buy_price=price,
-                current_price=price,
-                market_value=amount * price,
-                cost_basis=amount * price,
+                amount=fp.from_units(amount_units, decimals),
+                avg_buy_price=fp.price_from_units(price_units),
+                current_price=fp.price_from_units(price_units),
+                market_value=fp.quote_from_units(fill["total_value"]),
+                cost_basis=fp.quote_from_units(fill["total_value"]),
                 first_buy_time=datetime.utcnow(),
             )
             db.add(holding)
 
-        return {"realized_pnl": None, "realized_pnl_percent": None}
+        fill["realized_pnl"] = None
+        fill["realized_pnl_percent"] = None
+        return fill
 
     async def _execute_sell(
         self,
         db: AsyncSession,
         portfolio: Portfolio,
+        holding: Optional[PortfolioHolding],
         symbol: str,
-        amount: Decimal,
-        price: Decimal,
-        fee: Decimal,
+        amount_units: int,
+        price_units: int,
+        balance_units: int,
     ) -> dict:
         """执行卖出"""
-        # 获取持仓
-        result = await db.execute(
-            select(PortfolioHolding).where(
-                PortfolioHolding.portfolio_id == portfolio.id,
-                PortfolioHolding.symbol == symbol,
-            )
-        )
-        holding = result.scalar_one_or_none()
-
         if not holding:
             raise ValueError(f"没有 {symbol} 持仓")
 
-        if holding.amount < amount:
-            raise ValueError(
-                f"持仓不足: 需要卖出 {amount}, 但只有 {holding.amount}"
-            )
-
-        # 计算已实现盈亏
-        sell_value = amount * price - fee
-        cost = amount * holding.avg_buy_price
-        realized_pnl = sell_value - cost
-        realized_pnl_percent = float(realized_pnl / cost * 100) if cost > 0 else 0
+        decimals = fp.asset_decimals(symbol)
+
+        # 计算已实现盈亏 (持仓不足时抛出ValueError)
+        fill = fp.sell_fill(
+            balance_units=balance_units,
+            holding_amount_units=fp.to_units(holding.amount, decimals),
+            holding_avg_price_units=fp.price_to_units(holding.avg_buy_price),
+            holding_cost_basis_units=fp.quote_to_units(holding.cost_basis),
+            amount_units=amount_units,
+            price_units=price_units,
+            fee_ppm=self.FEE_RATE_PPM,
+            amount_decimals=decimals,
+        )
 
         # 增加余额
-        portfolio.current_balance += sell_value
+        portfolio.current_balance = fp.quote_from_units(fill["balance"])
 
         # 更新持仓
-        holding.amount -= amount
-        holding.cost_basis -= cost
+        holding.amount = fp.from_units(fill["amount"], decimals)
+        holding.cost_basis = fp.quote_from_units(fill["cost_basis"])
 
-        if holding.amount == Decimal("0"):
+        if fill["amount"] == 0:
             # 清空持仓
             await db.delete(holding)
 
-        return {
-            "realized_pnl": realized_pnl,
-            "realized_pnl_percent": realized_pnl_percent,
-        }
+        realized_pnl_units = fill["realized_pnl"]
+        fill["realized_pnl"] = fp.quote_from_units(realized_pnl_units)
+        fill["realized_pnl_percent"] = fp.percent(realized_pnl_units, fill["cost"])
+        return fill
 
-    async def _get_holding_amount(
+    async def _get_holding(
         self,
         db: AsyncSession,
         portfolio_id: str,
         symbol: str
-    ) -> Decimal:
-        """获取持仓数量"""
+    ) -> Optional[PortfolioHolding]:
+        """获取持仓"""
         result = await db.execute(
             select(PortfolioHolding).where(
                 PortfolioHolding.portfolio_id == portfolio_id,
                 PortfolioHolding.symbol == symbol,
             )
         )
-        holding = result.scalar_one_or_none()
-        return holding.amount if holding else Decimal("0")
+        return result.scalar_one_or_none()
 
 
 # 全局实例
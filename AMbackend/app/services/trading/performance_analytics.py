@@ -0,0 +1,176 @@
+"""Performance Analytics - 增量权益曲线分析
+
+为每个组合维护权益曲线的流式统计量，每个新快照 O(1) 更新:
+- 历史峰值 / 最大回撤 (百分比, 正数)
+- 周期收益率的 Welford 均值/方差 -> 年化 Sharpe Ratio
+
+运行状态保存在 Portfolio 的 equity_* / returns_* 列中，
+调度器每写入一个 PortfolioSnapshot 就调用 record_snapshot；
+历史数据通过 backfill / backfill_all 一次性回放。
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Optional, Union
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Portfolio, PortfolioSnapshot
+
+logger = logging.getLogger(__name__)
+
+# 与调度器的组合快照周期一致 (StrategyScheduler: portfolio_snapshots, 每10分钟)
+SNAPSHOT_INTERVAL_MINUTES = 10
+PERIODS_PER_YEAR = 365 * 24 * 60 // SNAPSHOT_INTERVAL_MINUTES
+
+
+@dataclass
+class EquityCurveState:
+    """权益曲线的流式统计状态"""
+    peak_value: float = 0.0
+    last_value: Optional[float] = None
+    max_drawdown: float = 0.0   # 百分比 (0 ~ 100)
+    returns_count: int = 0
+    returns_mean: float = 0.0
+    returns_m2: float = 0.0     # Welford: 与均值差的平方和
+
+    def update(self, value: float) -> None:
+        """加入一个新的权益值 (O(1))"""
+        if value <= 0:
+            return
+
+        # 周期收益率 (Welford 在线均值/方差)
+        if self.last_value:
+            period_return = value / self.last_value - 1
+            self.returns_count += 1
+            delta = period_return - self.returns_mean
+            self.returns_mean += delta / self.returns_count
+            self.returns_m2 += delta * (period_return - self.returns_mean)
+        self.last_value = value
+
+        # 峰值与回撤
+        if value > self.peak_value:
+            self.peak_value = value
+        else:
+            drawdown = (self.peak_value - value) / self.peak_value * 100
+            if drawdown > self.max_drawdown:
+                self.max_drawdown = drawdown
+
+    @property
+    def returns_std(self) -> float:
+        """收益率样本标准差"""
+        if self.returns_count < 2:
+            return 0.0
+        return math.sqrt(self.returns_m2 / (self.returns_count - 1))
+
+    @property
+    def sharpe_ratio(self) -> Optional[float]:
+        """年化 Sharpe Ratio (无风险利率按0计算)"""
+        std = self.returns_std
+        if std <= 0:
+            return None
+        return self.returns_mean / std * math.sqrt(PERIODS_PER_YEAR)
+
+    @classmethod
+    def from_portfolio(cls, portfolio: Portfolio) -> "EquityCurveState":
+        """从组合的持久化列恢复状态"""
+        return cls(
+            peak_value=float(portfolio.equity_peak_value or 0),
+            last_value=float(portfolio.equity_last_value) if portfolio.equity_last_value else None,
+            max_drawdown=portfolio.max_drawdown or 0.0,
+            returns_count=portfolio.returns_count or 0,
+            returns_mean=portfolio.returns_mean or 0.0,
+            returns_m2=portfolio.returns_m2 or 0.0,
+        )
+
+    def apply_to(self, portfolio: Portfolio) -> None:
+        """写回组合的持久化列"""
+        portfolio.equity_peak_value = Decimal(str(self.peak_value))
+        portfolio.equity_last_value = (
+            Decimal(str(self.last_value)) if self.last_value is not None else None
+        )
+        portfolio.returns_count = self.returns_count
+        portfolio.returns_mean = self.returns_mean
+        portfolio.returns_m2 = self.returns_m2
+        portfolio.max_drawdown = round(self.max_drawdown, 4)
+        sharpe = self.sharpe_ratio
+        portfolio.sharpe_ratio = round(sharpe, 4) if sharpe is not None else None
+
+
+class PerformanceAnalytics:
+    """组合绩效分析服务"""
+
+    def record_snapshot(
+        self,
+        portfolio: Portfolio,
+        total_value: Union[Decimal, float],
+    ) -> EquityCurveState:
+        """
+        新快照写入时增量更新 max_drawdown / sharpe_ratio
+
+        只修改组合对象，不提交事务（由调用方与快照一起提交）
+        """
+        state = EquityCurveState.from_portfolio(portfolio)
+        state.update(float(total_value))
+        state.apply_to(portfolio)
+        return state
+
+    async def backfill(
+        self,
+        db: AsyncSession,
+        portfolio: Portfolio,
+        batch_size: int = 1000,
+    ) -> EquityCurveState:
+        """
+        从全部历史快照重建单个组合的统计状态 (一次性回放)
+
+        Args:
+            db: 数据库会话
+            portfolio: 组合对象
+            batch_size: 流式读取的批大小
+
+        Returns:
+            EquityCurveState: 重建后的状态
+        """
+        state = EquityCurveState()
+
+        result = await db.stream(
+            select(PortfolioSnapshot.total_value)
+            .where(PortfolioSnapshot.portfolio_id == portfolio.id)
+            .order_by(PortfolioSnapshot.snapshot_time.asc())
+            .execution_options(yield_per=batch_size)
+        )
+        async for (total_value,) in result:
+            state.update(float(total_value))
+
+        state.apply_to(portfolio)
+        return state
+
+    async def backfill_all(self, db: AsyncSession) -> int:
+        """
+        回放所有组合的历史快照
+
+        Returns:
+            int: 处理的组合数量
+        """
+        result = await db.execute(select(Portfolio))
+        portfolios = result.scalars().all()
+
+        for portfolio in portfolios:
+            state = await self.backfill(db, portfolio)
+            logger.info(
+                f"绩效回放完成: {portfolio.instance_name or portfolio.name}, "
+                f"快照收益数={state.returns_count}, "
+                f"最大回撤={state.max_drawdown:.2f}%, "
+                f"Sharpe={state.sharpe_ratio}"
+            )
+
+        await db.commit()
+        return len(portfolios)
+
+
+# 全局实例
+performance_analytics = PerformanceAnalytics()
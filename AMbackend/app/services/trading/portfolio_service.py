@@ -10,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Portfolio, PortfolioHolding, Trade
 from app.schemas.strategy import PortfolioCreate
+from app.services.trading import fixed_point as fp
 
 
 class PortfolioService:
@@ -80,31 +81,45 @@ class PortfolioService:
         )
         holdings = result.scalars().all()
 
+        # 价格只转换一次 (持久化边界: Decimal -> 定点整数)
+        btc_price_units = fp.price_to_units(current_btc_price)
+        eth_price_units = fp.price_to_units(current_eth_price) if current_eth_price else None
+
         # 计算持仓市值
-        holdings_value = Decimal("0")
+        holdings_value_units = 0
         for holding in holdings:
             if holding.symbol == "BTC":
                 holding.current_price = current_btc_price
-            elif holding.symbol == "ETH" and current_eth_price:
+                price_units = btc_price_units
+            elif holding.symbol == "ETH" and eth_price_units:
                 holding.current_price = current_eth_price
-
-            holding.market_value = holding.amount * holding.current_price
-            holding.unrealized_pnl = holding.market_value - holding.cost_basis
-            holding.unrealized_pnl_percent = (
-                float(holding.unrealized_pnl / holding.cost_basis * 100)
-                if holding.cost_basis > 0 else 0
+                price_units = eth_price_units
+            else:
+                price_units = fp.price_to_units(holding.current_price)
+
+            cost_basis_units = fp.quote_to_units(holding.cost_basis)
+            market_value_units, unrealized_pnl_units = fp.revalue_holding(
+                amount_units=fp.amount_to_units(holding.amount, holding.symbol),
+                price_units=price_units,
+                cost_basis_units=cost_basis_units,
+                amount_decimals=fp.asset_decimals(holding.symbol),
             )
 
-            holdings_value += holding.market_value
+            holding.market_value = fp.quote_from_units(market_value_units)
+            holding.unrealized_pnl = fp.quote_from_units(unrealized_pnl_units)
+            holding.unrealized_pnl_percent = fp.percent(unrealized_pnl_units, cost_basis_units)
+
+            holdings_value_units += market_value_units
 
         # 更新组合总价值和盈亏
-        portfolio.total_value = portfolio.current_balance + holdings_value
+        total_value_units = fp.quote_to_units(portfolio.current_balance) + holdings_value_units
+        initial_balance_units = fp.quote_to_units(portfolio.initial_balance)
         # Total P&L = 当前总价值 - 初始资金（已包含所有手续费和盈亏）
-        portfolio.total_pnl = portfolio.total_value - portfolio.initial_balance
-        portfolio.total_pnl_percent = (
-            float(portfolio.total_pnl / portfolio.initial_balance * 100)
-            if portfolio.initial_balance > 0 else 0
-        )
+        total_pnl_units = total_value_units - initial_balance_units
+
+        portfolio.total_value = fp.quote_from_units(total_value_units)
+        portfolio.total_pnl = fp.quote_from_units(total_pnl_units)
+        portfolio.total_pnl_percent = fp.percent(total_pnl_units, initial_balance_units)
 
         await db.commit()
 
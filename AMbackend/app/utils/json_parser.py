@@ -1,8 +1,36 @@
-"""Robust JSON parser for LLM responses"""
+"""Robust JSON parser for LLM responses
+
+Valid JSON (the whole response, or the first value after a preamble or
+markdown fence) is decoded directly by the C parsers. Anything else is
+repaired in one pass: the scanner starts at the first ``{`` (or ``[``), tracks
+bracket depth and string state, stops at the end of the first complete value
+and fixes the usual LLM slips on the way. A value that still does not parse
+(e.g. ``{the}`` in the preamble) is skipped and the next ``{``/``[`` after it
+is tried.
+
+- markdown fences / prose around the JSON (never scanned)
+- trailing, doubled and missing commas
+- single-quoted strings, unescaped inner quotes, raw newlines/control chars
+- Python literals (True/False/None), NaN, bare-word keys and values, ``//`` comments
+- truncated output (max_tokens): open strings and containers are closed,
+  dropping an incomplete trailing member; with ``schema`` it must still carry
+  every required field
+
+With ``schema`` (a Pydantic model), parsed values are coerced towards the
+model's JSON schema without instantiating it: enum case, numeric strings,
+scalars wrapped into lists. Values outside the field bounds are rejected. A repairable
+response is therefore fixed locally instead of failing output validation and
+costing another LLM round trip.
+"""
 
 import json
 import re
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from app.core.serialization import loads
 
 
 class JSONParseError(Exception):
@@ -10,9 +38,270 @@ class JSONParseError(Exception):
     pass
 
 
+# Next character inside a string that needs attention
+_STRING_SPECIAL = {
+    '"': re.compile(r'[\\"\x00-\x1f]'),
+    "'": re.compile(r'[\\"\'\x00-\x1f]'),
+}
+_NUMBER = re.compile(r"-?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+_WORD = re.compile(r"[A-Za-z_$][\w$.-]*")
+_LITERALS = {
+    "true": "true", "false": "false", "null": "null",
+    "True": "true", "False": "false", "None": "null",
+    "NaN": "null", "Infinity": "null", "undefined": "null",
+}
+_VALID_ESCAPES = set('"\\/bfnrtu')
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+# Last emitted token ended a value (a comma is missing before the next one)
+_VALUE_END = {'"', "}", "]", "v"}
+# raw_decode parses the first value and ignores whatever follows it
+_DECODER = json.JSONDecoder()
+_BOUNDS = ("minimum", "exclusiveMinimum", "maximum", "exclusiveMaximum")
+
+
+def _next_start(text: str, pos: int = 0) -> int:
+    """Index of the next ``{`` (else ``[``) in ``text`` from ``pos``, -1 if none"""
+    start = text.find("{", pos)
+    if start == -1:
+        start = text.find("[", pos)
+    return start
+
+
+def _json_start(text: str) -> int:
+    """Index of the first ``{`` (else ``[``) in ``text``"""
+    start = _next_start(text)
+    if start == -1:
+        raise JSONParseError(f"No valid JSON object or array found in text: {text[:100]}...")
+    return start
+
+
+def scan_json(text: str) -> Tuple[str, bool]:
+    """
+    Extract and repair the first JSON object/array in ``text`` in one pass
+
+    A candidate that does not repair to valid JSON (a brace in the preamble)
+    is skipped; scanning resumes at the next ``{``/``[`` after it.
+
+    Args:
+        text: Raw LLM response
+
+    Returns:
+        (JSON string, whether any repair was applied)
+
+    Raises:
+        JSONParseError: If the text contains no JSON object or array
+    """
+    start = _json_start(text)
+    first = None
+    while start != -1:
+        json_str, repaired, end, _ = _scan(text, start)
+        if _is_valid(json_str):
+            return json_str, repaired
+        first = first or (json_str, repaired)
+        start = _next_start(text, end)
+    return first
+
+
+def _scan(text: str, start: int) -> Tuple[str, bool, int, bool]:
+    """
+    Repair the JSON value starting at ``text[start]``
+
+    Returns:
+        (JSON string, repaired, index after the value, truncated)
+    """
+    out: List[str] = []
+    stack: List[str] = []
+    repaired = False
+    quote: Optional[str] = None
+    last = ""
+    pending_comma = False
+    # Output length and open containers after the last complete member
+    safe: Optional[Tuple[int, List[str]]] = None
+    i, n = start, len(text)
+
+    while i < n:
+        if quote:
+            match = _STRING_SPECIAL[quote].search(text, i)
+            if match is None:
+                out.append(text[i:])
+                i = n
+                break
+            j = match.start()
+            if j > i:
+                out.append(text[i:j])
+            ch = text[j]
+            i = j + 1
+            if ch == "\\":
+                nxt = text[i] if i < n else ""
+                if nxt == "'" and quote == "'":
+                    out.append("'")
+                elif nxt in _VALID_ESCAPES:
+                    out.append("\\" + nxt)
+                else:
+                    # Invalid escape such as \d: keep the backslash literally
+                    out.append("\\\\" + nxt)
+                    repaired = True
+                i += 1
+            elif ch == quote:
+                if _closes_string(text, i):
+                    out.append('"')
+                    quote = None
+                    last = '"'
+                else:
+                    out.append('\\"')
+                    repaired = True
+            elif ch == '"':
+                # Double quote inside a single-quoted string
+                out.append('\\"')
+                repaired = True
+            else:
+                out.append(_CONTROL_ESCAPES.get(ch, ""))
+                repaired = True
+            continue
+
+        ch = text[i]
+        if ch in " \t\r\n":
+            i += 1
+            continue
+
+        if ch == ",":
+            if pending_comma or last in ("{", "[", ":"):
+                repaired = True
+            else:
+                pending_comma = True
+            i += 1
+            continue
+
+        if ch in "}]":
+            i += 1
+            if not stack:
+                repaired = True
+                continue
+            if ch != stack[-1]:
+                ch = stack[-1]
+                repaired = True
+            if pending_comma:
+                pending_comma = False
+                repaired = True
+            if last == ":":
+                out.append("null")
+                repaired = True
+            out.append(stack.pop())
+            last = ch
+            if not stack:
+                break
+            safe = (len(out), list(stack))
+            continue
+
+        if ch == "/" and text.startswith("//", i):
+            end = text.find("\n", i)
+            i = n if end == -1 else end
+            repaired = True
+            continue
+
+        if ch == ":":
+            out.append(":")
+            last = ":"
+            i += 1
+            continue
+
+        # A value or key starts here
+        token = None
+        if ch not in "{[\"'":
+            token = _bare_token(text, i)
+            if token is None:
+                # Stray character (e.g. an ellipsis between members)
+                i += 1
+                repaired = True
+                continue
+
+        if pending_comma:
+            safe = (len(out), list(stack))
+            out.append(",")
+            last = ","
+            pending_comma = False
+        elif last in _VALUE_END:
+            safe = (len(out), list(stack))
+            out.append(",")
+            last = ","
+            repaired = True
+
+        if ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+            out.append(ch)
+            last = ch
+            i += 1
+        elif ch in "\"'":
+            quote = ch
+            out.append('"')
+            repaired = repaired or ch == "'"
+            i += 1
+        else:
+            value, end = token
+            out.append(value)
+            repaired = repaired or value != text[i:end]
+            last = "v"
+            i = end
+
+    if not stack and quote is None:
+        return "".join(out), repaired, i, False
+
+    # Truncated: close the open string and containers
+    closed = out + (['"'] if quote else [])
+    if last == ":" and quote is None:
+        closed.append("null")
+    json_str = "".join(closed) + "".join(reversed(stack))
+    if _is_valid(json_str) or safe is None:
+        return json_str, True, n, True
+
+    # Drop the incomplete last member (e.g. a cut-off key)
+    length, open_stack = safe
+    return "".join(out[:length]) + "".join(reversed(open_stack)), True, n, True
+
+
+def _closes_string(text: str, i: int) -> bool:
+    """Whether the quote before ``text[i]`` ends the string (vs. an unescaped inner quote)"""
+    j = i
+    n = len(text)
+    while j < n and text[j] in " \t\r\n":
+        j += 1
+    if j >= n or text[j] in ",:}]":
+        return True
+    # Next member on a new line with the comma missing
+    return text[j] in "\"'" and "\n" in text[i:j]
+
+
+def _bare_token(text: str, i: int) -> Optional[Tuple[str, int]]:
+    """
+    JSON form of the number/literal/bare word at ``text[i]`` and the index after it
+
+    Bare words other than literals become strings (unquoted keys and enum values).
+    """
+    match = _NUMBER.match(text, i)
+    if match:
+        number = match.group()
+        if number.startswith(".") or number.startswith("-."):
+            number = number.replace(".", "0.", 1)
+        return number.rstrip("."), match.end()
+
+    match = _WORD.match(text, i)
+    if match is None:
+        return None
+    word = match.group()
+    return _LITERALS.get(word) or json.dumps(word, ensure_ascii=False), match.end()
+
+
+def _is_valid(json_str: str) -> bool:
+    try:
+        loads(json_str)
+        return True
+    except ValueError:
+        return False
+
+
 def extract_json_from_text(text: str) -> str:
     """
-    Extract JSON content from text that may contain extra information
+    Extract (and repair) the JSON content of text that may contain extra information
 
     Handles cases like:
     - Text before JSON: "Here's the analysis: {...}"
@@ -24,59 +313,30 @@ def extract_json_from_text(text: str) -> str:
         text: Raw text that contains JSON
 
     Returns:
-        Cleaned JSON string
+        JSON string
 
     Raises:
         JSONParseError: If no valid JSON found
     """
     if not text or not isinstance(text, str):
         raise JSONParseError("Input text is empty or not a string")
+    return scan_json(text)[0]
 
-    # Remove common markdown code block wrappers
-    text = text.strip()
-
-    # Method 1: Try to find JSON in markdown code blocks
-    markdown_patterns = [
-        r"```json\s*\n(.*?)\n```",  # ```json\n...\n```
-        r"```\s*\n(.*?)\n```",       # ```\n...\n```
-    ]
-
-    for pattern in markdown_patterns:
-        matches = re.findall(pattern, text, re.DOTALL)
-        if matches:
-            text = matches[0].strip()
-            break
-
-    # Method 2: Find first { and last } to extract JSON object
-    first_brace = text.find('{')
-    last_brace = text.rfind('}')
-
-    if first_brace == -1 or last_brace == -1 or first_brace >= last_brace:
-        # Try to find JSON array instead
-        first_bracket = text.find('[')
-        last_bracket = text.rfind(']')
-
-        if first_bracket == -1 or last_bracket == -1 or first_bracket >= last_bracket:
-            raise JSONParseError(f"No valid JSON object or array found in text: {text[:100]}...")
 
-        json_str = text[first_bracket:last_bracket + 1]
-    else:
-        # Extract from first { to last }
-        json_str = text[first_brace:last_brace + 1]
-
-    # Clean up the extracted JSON string
-    json_str = json_str.strip()
-
-    return json_str
-
-
-def parse_llm_json(text: str, expected_fields: list = None) -> Dict[str, Any]:
+def parse_llm_json(
+    text: str,
+    expected_fields: list = None,
+    schema: Optional[Type[BaseModel]] = None,
+) -> Dict[str, Any]:
     """
     Parse JSON from LLM response with robust error handling
 
     Args:
         text: Raw LLM response text
         expected_fields: Optional list of field names that must be present
+        schema: Optional output model whose fields guide value coercion; a
+            truncated response must also carry its required fields unless
+            ``expected_fields`` names them
 
     Returns:
         Parsed JSON dictionary
@@ -84,99 +344,204 @@ def parse_llm_json(text: str, expected_fields: list = None) -> Dict[str, Any]:
     Raises:
         JSONParseError: If JSON cannot be parsed or required fields are missing
     """
+    if not text or not isinstance(text, str):
+        raise JSONParseError("Input text is empty or not a string")
+
+    # Fast path (C parser): the whole response
+    stripped = text.strip()
     try:
-        # Step 1: Extract JSON from text
-        json_str = extract_json_from_text(text)
+        data = loads(stripped) if stripped[:1] in ("{", "[") else None
+    except ValueError:
+        data = None
+    truncated = False
+    if data is None:
+        data, truncated = _decode_first(stripped)
 
-        # Step 2: Parse JSON
-        try:
-            data = json.loads(json_str)
-        except json.JSONDecodeError as e:
-            # Try to fix common JSON issues
-            json_str = fix_common_json_issues(json_str)
-            try:
-                data = json.loads(json_str)
-            except json.JSONDecodeError:
-                raise JSONParseError(f"Invalid JSON after cleanup: {str(e)}\nJSON: {json_str[:200]}...")
+    if truncated and schema is not None and not expected_fields:
+        expected_fields = _json_schema(schema).get("required", [])
 
-        # Step 3: Validate expected fields
-        if expected_fields:
-            missing_fields = [field for field in expected_fields if field not in data]
-            if missing_fields:
-                raise JSONParseError(f"Missing required fields: {missing_fields}")
+    if expected_fields:
+        if not isinstance(data, dict):
+            raise JSONParseError(f"Expected a JSON object, got {type(data).__name__}")
+        missing_fields = [field for field in expected_fields if field not in data]
+        if missing_fields:
+            qualifier = "Truncated output is missing" if truncated else "Missing"
+            raise JSONParseError(f"{qualifier} required fields: {missing_fields}")
 
-        return data
+    if schema is not None and isinstance(data, dict):
+        data = conform_to_schema(data, schema)
 
-    except JSONParseError:
-        raise
-    except Exception as e:
-        raise JSONParseError(f"Unexpected error parsing JSON: {str(e)}")
+    return data
 
 
-def fix_common_json_issues(json_str: str) -> str:
+def _decode_first(text: str) -> Tuple[Any, bool]:
     """
-    Fix common JSON formatting issues from LLM responses
+    Decode the first JSON value after any prose/fence, repairing it if needed
 
-    Args:
-        json_str: JSON string that may have issues
+    Each candidate ``{``/``[`` is tried with the C parser, then repaired; one
+    that fails both is skipped up to the end of the value it spans.
 
     Returns:
-        Fixed JSON string
-    """
-    # 1. Remove trailing commas before closing braces/brackets
-    json_str = re.sub(r',(\s*[}\]])', r'\1', json_str)
-
-    # 2. Fix unescaped newlines in string values
-    # This is the most common issue - LLM puts real newlines instead of \n
-    # Use a simple character-by-character approach to properly handle string boundaries
-    result = []
-    in_string = False
-    escape_next = False
-    i = 0
-
-    while i < len(json_str):
-        char = json_str[i]
-
-        if escape_next:
-            # This character is escaped, keep it as-is
-            result.append(char)
-            escape_next = False
-        elif char == '\\':
-            # Next character will be escaped
-            result.append(char)
-            escape_next = True
-        elif char == '"':
-            # Toggle string mode
-            in_string = not in_string
-            result.append(char)
-        elif in_string:
-            # Inside a string - escape special characters
-            if char == '\n':
-                result.append('\\n')
-            elif char == '\t':
-                result.append('\\t')
-            elif char == '\r':
-                result.append('\\r')
-            else:
-                result.append(char)
-        else:
-            # Outside string - keep as-is
-            result.append(char)
+        (decoded value, whether it was truncated)
+    """
+    start = _json_start(text)
+    error = None
+    while start != -1:
+        try:
+            return _DECODER.raw_decode(text, start)[0], False
+        except ValueError:
+            pass
+        json_str, _, end, truncated = _scan(text, start)
+        try:
+            return loads(json_str), truncated
+        except ValueError as e:
+            error = error or JSONParseError(f"Invalid JSON after repair: {str(e)}\nJSON: {json_str[:200]}...")
+        start = _next_start(text, end)
+    raise error
+
 
-        i += 1
+@lru_cache(maxsize=64)
+def _json_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    return model.model_json_schema()
 
-    json_str = ''.join(result)
 
-    # 3. Fix single quotes to double quotes (be careful with this)
-    # Only do this if the string looks like it uses single quotes for strings
-    if json_str.count("'") > json_str.count('"') * 2:
-        # Replace single quotes with double quotes, but not in already quoted strings
-        json_str = json_str.replace("'", '"')
+def conform_to_schema(data: Dict[str, Any], model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Coerce parsed LLM output towards ``model``'s field types (no model instance)
+
+    Only fields present in ``data`` are checked at the top level (output models
+    also carry fields the agent fills in itself); required fields of nested
+    models are enforced.
 
-    # 4. Remove control characters that might break JSON (except \n, \t, \r which are valid when escaped)
-    json_str = re.sub(r'[\x00-\x08\x0b-\x0c\x0e-\x1f\x7f-\x9f]', '', json_str)
+    Raises:
+        JSONParseError: If a value cannot be coerced
+    """
+    schema = _json_schema(model)
+    defs = schema.get("$defs", {})
+    properties = schema.get("properties", {})
+    return {
+        key: _coerce(value, properties[key], defs, key) if key in properties else value
+        for key, value in data.items()
+    }
+
+
+def _coerce(value: Any, schema: Dict[str, Any], defs: Dict[str, Any], path: str) -> Any:
+    if "$ref" in schema:
+        schema = defs.get(schema["$ref"].rsplit("/", 1)[-1], {})
+
+    options = schema.get("anyOf")
+    if options:
+        if value is None and any(option.get("type") == "null" for option in options):
+            return None
+        errors = []
+        for option in options:
+            if option.get("type") == "null":
+                continue
+            try:
+                return _coerce(value, option, defs, path)
+            except JSONParseError as e:
+                errors.append(str(e))
+        raise JSONParseError("; ".join(errors) or f"{path}: unexpected value {value!r}")
+
+    if "enum" in schema:
+        return _coerce_enum(value, schema["enum"], path)
+
+    kind = schema.get("type")
+    if kind in ("number", "integer"):
+        return _coerce_number(value, schema, path, kind == "integer")
+    if kind == "string":
+        if isinstance(value, str):
+            return value
+        if isinstance(value, list) and all(isinstance(item, str) for item in value):
+            return "\n".join(value)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return str(value)
+        raise JSONParseError(f"{path}: expected a string, got {type(value).__name__}")
+    if kind == "array":
+        items = value if isinstance(value, list) else [value]
+        item_schema = schema.get("items")
+        if not item_schema:
+            return items
+        return [_coerce(item, item_schema, defs, f"{path}[{i}]") for i, item in enumerate(items)]
+    if kind == "object":
+        if not isinstance(value, dict):
+            raise JSONParseError(f"{path}: expected an object, got {type(value).__name__}")
+        return _coerce_object(value, schema, defs, path)
+    return value
+
+
+def _coerce_enum(value: Any, allowed: List[Any], path: str) -> Any:
+    if value in allowed:
+        return value
+    if isinstance(value, str):
+        normalized = value.strip().upper().replace(" ", "_")
+        for option in allowed:
+            if isinstance(option, str) and option.upper() == normalized:
+                return option
+    raise JSONParseError(f"{path}: {value!r} is not one of {allowed}")
+
+
+def _coerce_number(value: Any, schema: Dict[str, Any], path: str, integer: bool) -> Any:
+    if isinstance(value, bool) or value is None:
+        raise JSONParseError(f"{path}: expected a number, got {value!r}")
+    if isinstance(value, str):
+        try:
+            value = float(value.strip().rstrip("%").replace(",", ""))
+        except ValueError:
+            raise JSONParseError(f"{path}: expected a number, got {value!r}")
+    if not isinstance(value, (int, float)):
+        raise JSONParseError(f"{path}: expected a number, got {type(value).__name__}")
+
+    if integer:
+        value = int(round(value))
+    out_of_range = (
+        ("minimum" in schema and value < schema["minimum"])
+        or ("exclusiveMinimum" in schema and value <= schema["exclusiveMinimum"])
+        or ("maximum" in schema and value > schema["maximum"])
+        or ("exclusiveMaximum" in schema and value >= schema["exclusiveMaximum"])
+    )
+    if out_of_range:
+        bounds = {key: schema[key] for key in _BOUNDS if key in schema}
+        raise JSONParseError(f"{path}: {value!r} is outside {bounds}")
+    return value
+
+
+def _coerce_object(value: Dict[str, Any], schema: Dict[str, Any], defs: Dict[str, Any], path: str) -> Dict[str, Any]:
+    properties = schema.get("properties", {})
+    missing = [field for field in schema.get("required", []) if field not in value]
+    if missing:
+        raise JSONParseError(f"{path}: missing required fields {missing}")
+
+    extra = schema.get("additionalProperties")
+    result = {}
+    for key, item in value.items():
+        if key in properties:
+            result[key] = _coerce(item, properties[key], defs, f"{path}.{key}")
+        elif isinstance(extra, dict):
+            result[key] = _coerce(item, extra, defs, f"{path}.{key}")
+        else:
+            result[key] = item
+    return result
+
+
+def json_validator(
+    expected_fields: list = None,
+    schema: Optional[Type[BaseModel]] = None,
+) -> Callable[[str], bool]:
+    """
+    Predicate telling whether a response parses with these arguments
+
+    Passed as ``validate`` to ``LLMManager.chat_for_agent`` so only replies
+    the agent can use are stored in the response cache.
+    """
+    def validate(text: str) -> bool:
+        try:
+            parse_llm_json(text, expected_fields=expected_fields, schema=schema)
+        except JSONParseError:
+            return False
+        return True
 
-    return json_str
+    return validate
 
 
 def safe_json_parse(text: str, fallback: Dict[str, Any] = None) -> Dict[str, Any]:
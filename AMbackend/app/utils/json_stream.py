@@ -0,0 +1,116 @@
+"""Incremental extraction of a top-level JSON string field from streamed LLM output"""
+
+import json
+from typing import List, Optional
+
+
+class JsonFieldStreamer:
+    """
+    Decode one top-level string field while the JSON document is still streaming
+
+    Feed raw model output chunk by chunk; ``feed`` returns the newly decoded
+    text of ``field`` (escapes such as ``\\n``, ``\\"`` and ``\\uXXXX`` resolved),
+    so e.g. the ``answer`` of a synthesis response can be shown before the
+    closing brace arrives. Text outside the outermost object (markdown fences,
+    preambles) is ignored. The full response should still be parsed with
+    ``parse_llm_json`` once complete.
+
+    Example:
+        streamer = JsonFieldStreamer("answer")
+        streamer.feed('{"answer": "Hel')   # -> "Hel"
+        streamer.feed('lo\\nworld", "su')  # -> "lo\\nworld"
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+        self.value = ""
+        self.done = False
+
+        self._depth = 0
+        self._in_string = False
+        self._escape: Optional[str] = None
+        self._high_surrogate = ""
+        self._buffer: List[str] = []
+        self._last_key: Optional[str] = None
+        self._awaiting_value = False
+        self._capturing = False
+
+    def feed(self, chunk: str) -> str:
+        """Consume a chunk, returning the field text decoded from it"""
+        out: List[str] = []
+
+        for ch in chunk:
+            if self._in_string:
+                self._consume_string_char(ch, out)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._buffer = []
+                self._capturing = self._awaiting_value and not self.done
+                self._awaiting_value = False
+            elif ch in "{[":
+                self._depth += 1
+                self._awaiting_value = False
+            elif ch in "}]":
+                self._depth -= 1
+            elif ch == ":":
+                self._awaiting_value = self._depth == 1 and self._last_key == self.field
+            elif ch == ",":
+                self._last_key = None
+            elif not ch.isspace():
+                # Non-string value (number, true, null ...)
+                self._awaiting_value = False
+
+        text = "".join(out)
+        self.value += text
+        return text
+
+    def _consume_string_char(self, ch: str, out: List[str]) -> None:
+        if self._escape is not None:
+            self._escape += ch
+            if self._escape[0] == "u" and len(self._escape) < 5:
+                return
+            try:
+                decoded = json.loads(f'"\\{self._escape}"')
+            except ValueError:
+                decoded = self._escape
+            self._escape = None
+            self._append(decoded, out)
+            return
+
+        if ch == "\\":
+            self._escape = ""
+        elif ch == '"':
+            self._end_string(out)
+        else:
+            self._append(ch, out)
+
+    def _append(self, text: str, out: List[str]) -> None:
+        if not self._capturing:
+            if self._depth == 1:
+                self._buffer.append(text)
+            return
+
+        # Join UTF-16 surrogate pairs split across two \u escapes
+        if self._high_surrogate:
+            text = self._high_surrogate + text
+            self._high_surrogate = ""
+            if len(text) >= 2 and "\udc00" <= text[1] <= "\udfff":
+                text = text[:2].encode("utf-16", "surrogatepass").decode("utf-16") + text[2:]
+        if len(text) == 1 and "\ud800" <= text <= "\udbff":
+            self._high_surrogate = text
+            return
+        out.append(text)
+
+    def _end_string(self, out: List[str]) -> None:
+        self._in_string = False
+        if self._capturing:
+            if self._high_surrogate:
+                out.append(self._high_surrogate)
+                self._high_surrogate = ""
+            self._capturing = False
+            self.done = True
+        elif self._depth == 1:
+            self._last_key = "".join(self._buffer)
+        self._buffer = []
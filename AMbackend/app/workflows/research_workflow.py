@@ -2,6 +2,7 @@
 
 from typing import Dict, Any, List, AsyncGenerator, Optional
 import asyncio
+from contextlib import aclosing
 import json
 import time
 from datetime import datetime
@@ -242,9 +243,19 @@ class ResearchWorkflow:
                 },
             }
 
-            final_analysis = await general_analysis_agent.synthesize(
+            # Stream the answer text as it is generated
+            final_analysis = None
+            async with aclosing(general_analysis_agent.synthesize_stream(
                 user_message, agent_outputs, chat_history
-            )
+            )) as synthesis:
+                async for kind, payload in synthesis:
+                    if kind == "answer_delta":
+                        yield {
+                            "type": "answer_delta",
+                            "data": {"delta": payload},
+                        }
+                    else:
+                        final_analysis = payload
 
             yield {
                 "type": "final_answer",
@@ -0,0 +1,43 @@
+"""
+一次性回放历史组合快照，初始化 max_drawdown / sharpe_ratio 的流式统计状态
+
+部署 add_equity_curve_stats_to_portfolio 迁移后运行一次；之后由调度器的
+组合快照任务增量维护。重复运行是安全的（每次都从头重建）。
+
+用法:
+    python scripts/backfill_performance_analytics.py
+"""
+
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.services.trading.performance_analytics import performance_analytics
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    engine = create_async_engine(settings.DATABASE_URL)
+    async_session = sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    try:
+        async with async_session() as db:
+            count = await performance_analytics.backfill_all(db)
+            logger.info(f"✓ 已回放 {count} 个组合的历史快照")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
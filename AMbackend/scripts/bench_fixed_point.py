@@ -0,0 +1,128 @@
+"""交易核心定点整数基准测试
+
+对比 Decimal 实现与定点整数实现的单笔成交 / 单次重估耗时 (不涉及数据库)
+
+用法:
+    python scripts/bench_fixed_point.py [iterations]
+"""
+import sys
+import timeit
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.trading import fixed_point as fp
+
+FEE_RATE = 0.001
+FEE_PPM = fp.rate_to_ppm(FEE_RATE)
+
+# 典型输入: 数据库读出的 NUMERIC 值均为 Decimal
+BALANCE = Decimal("9876.54321000")
+HOLD_AMOUNT = Decimal("0.12345678")
+HOLD_AVG = Decimal("43250.12000000")
+HOLD_COST = Decimal("5339.29812345")
+AMOUNT = Decimal("0.00231000")
+PRICE = Decimal("64321.98000000")
+OCO_STOP = 62000.5
+OCO_TAKE = 70000.25
+
+
+def decimal_buy():
+    """旧实现: Decimal 买入"""
+    total_value = AMOUNT * PRICE
+    fee = total_value * Decimal(str(FEE_RATE))
+    total_cost = total_value + fee
+    if BALANCE < total_cost:
+        raise ValueError
+    balance = BALANCE - total_cost
+    cost_basis = HOLD_AMOUNT * HOLD_AVG + AMOUNT * PRICE
+    amount = HOLD_AMOUNT + AMOUNT
+    avg = cost_basis / amount
+    return balance, amount, avg, cost_basis
+
+
+def fixed_buy():
+    """新实现: 定点整数买入 (含持久化边界的转换)"""
+    fill = fp.buy_fill(
+        balance_units=fp.quote_to_units(BALANCE),
+        holding_amount_units=fp.to_units(HOLD_AMOUNT, 8),
+        holding_avg_price_units=fp.price_to_units(HOLD_AVG),
+        amount_units=fp.to_units(AMOUNT, 8),
+        price_units=fp.price_to_units(PRICE),
+        fee_ppm=FEE_PPM,
+    )
+    return (
+        fp.quote_from_units(fill["balance"]),
+        fp.from_units(fill["amount"], 8),
+        fp.price_from_units(fill["avg_buy_price"]),
+        fp.quote_from_units(fill["cost_basis"]),
+    )
+
+
+def decimal_revalue():
+    """旧实现: Decimal 重估 + OCO 检查"""
+    market_value = HOLD_AMOUNT * PRICE
+    unrealized = market_value - HOLD_COST
+    pct = float(unrealized / HOLD_COST * 100) if HOLD_COST > 0 else 0
+    total_value = BALANCE + market_value
+    stop = Decimal(str(OCO_STOP))
+    take = Decimal(str(OCO_TAKE))
+    triggered = PRICE <= stop or PRICE >= take
+    return market_value, unrealized, pct, total_value, triggered
+
+
+def fixed_revalue():
+    """新实现: 定点整数重估 + OCO 检查"""
+    price_units = fp.price_to_units(PRICE)
+    cost_units = fp.quote_to_units(HOLD_COST)
+    market_value, unrealized = fp.revalue_holding(
+        fp.to_units(HOLD_AMOUNT, 8), price_units, cost_units
+    )
+    pct = fp.percent(unrealized, cost_units)
+    total_value = fp.quote_to_units(BALANCE) + market_value
+    triggered = (
+        price_units <= fp.price_to_units(OCO_STOP)
+        or price_units >= fp.price_to_units(OCO_TAKE)
+    )
+    return (
+        fp.quote_from_units(market_value),
+        fp.quote_from_units(unrealized),
+        pct,
+        fp.quote_from_units(total_value),
+        triggered,
+    )
+
+
+def fixed_revalue_core():
+    """新实现: 纯整数内核 (价格已在批次开始时转换一次)"""
+    market_value, unrealized = fp.revalue_holding(12345678, 6432198000000, 533929812345)
+    return market_value, unrealized, fp.percent(unrealized, 533929812345)
+
+
+def _bench(label: str, func, iterations: int) -> float:
+    seconds = min(timeit.repeat(func, number=iterations, repeat=5))
+    per_call_ns = seconds / iterations * 1e9
+    print(f"  {label:<36} {per_call_ns:10.0f} ns/op")
+    return per_call_ns
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    print(f"iterations={iterations}")
+    print("per-fill:")
+    d = _bench("Decimal buy", decimal_buy, iterations)
+    f = _bench("fixed-point buy (with boundary)", fixed_buy, iterations)
+    print(f"  speedup: {d / f:.2f}x")
+
+    print("per-revaluation:")
+    d = _bench("Decimal revalue + OCO", decimal_revalue, iterations)
+    f = _bench("fixed-point revalue + OCO", fixed_revalue, iterations)
+    c = _bench("fixed-point revalue (int core)", fixed_revalue_core, iterations)
+    print(f"  speedup (with boundary): {d / f:.2f}x")
+    print(f"  speedup (int core):      {d / c:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Prompt 编码基准测试
+
+对比 TAMomentumAgent 旧的逐行文字 prompt 与 PromptEncoder 紧凑表格 prompt
+的字符数、估算 token 数和构建耗时 (不调用 LLM):
+
+- 旧实现: 每个指标一行, 统一保留两位小数
+- 新实现: app.services.llm.prompt_encoder (按量级取有效数字, 表格 + 去重)
+
+用法:
+    python scripts/bench_prompt_encoding.py [iterations]
+"""
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.agents.ta_momentum_agent import TAMomentumAgent
+from app.services.llm.prompt_encoder import estimate_tokens
+
+PRICES = {"BTC": 64321.98, "ETH": 2461.537, "SOL": 148.2731}
+
+
+def build_indicators(price: float) -> dict:
+    """构造单个时间框架的指标数据"""
+    return {
+        "ema_9": price * 1.0012,
+        "ema_21": price * 0.9987,
+        "ema_50": price * 0.9841,
+        "ema_200": price * 0.9123,
+        "rsi_14": 57.318,
+        "macd": {"dif": price * 0.0021, "dea": price * 0.0017, "histogram": price * 0.0004},
+        "bbands": {"upper": price * 1.021, "middle": price, "lower": price * 0.979},
+        "atr_14": price * 0.0083,
+        "volume": 18234.5521,
+        "volume_avg_20": 15873.0914,
+    }
+
+
+def build_inputs():
+    """构造 (assets, indicators_by_asset)"""
+    assets = {asset: {"funding_rate": 0.0100} for asset in PRICES}
+    indicators_by_asset = {
+        asset: {
+            "current_price": price,
+            "price_change_24h": 1.8342,
+            "15m": build_indicators(price),
+            "60m": build_indicators(price * 0.998),
+        }
+        for asset, price in PRICES.items()
+    }
+    return assets, indicators_by_asset
+
+
+def legacy_build_prompt(assets: dict, indicators_by_asset: dict) -> str:
+    """旧实现: TAMomentumAgent._build_analysis_prompt 的指标部分"""
+    prompt = "请分析以下技术指标数据并输出最佳交易机会:\n\n"
+    for asset in TAMomentumAgent.SUPPORTED_ASSETS:
+        if asset not in indicators_by_asset:
+            continue
+        indicators = indicators_by_asset[asset]
+        asset_data = assets.get(asset, {})
+
+        prompt += f"## {asset}\n"
+        prompt += f"**当前价格**: {indicators.get('current_price', 0):.2f}\n"
+        prompt += f"**24h涨跌**: {indicators.get('price_change_24h', 0):.2f}%\n"
+        prompt += f"**资金费率**: {asset_data.get('funding_rate', 0):.4f}%\n\n"
+
+        for timeframe, label in (("15m", "15分钟级别"), ("60m", "60分钟级别")):
+            ind = indicators.get(timeframe, {})
+            if not ind:
+                continue
+            macd = ind.get("macd", {})
+            bbands = ind.get("bbands", {})
+            prompt += f"**{label}**:\n"
+            prompt += f"- EMA: 9={ind.get('ema_9', 0):.2f}, 21={ind.get('ema_21', 0):.2f}, "
+            prompt += f"50={ind.get('ema_50', 0):.2f}, 200={ind.get('ema_200', 0):.2f}\n"
+            prompt += f"- RSI(14): {ind.get('rsi_14', 0):.2f}\n"
+            prompt += f"- MACD: DIF={macd.get('dif', 0):.2f}, DEA={macd.get('dea', 0):.2f}, "
+            prompt += f"Histogram={macd.get('histogram', 0):.2f}\n"
+            prompt += f"- 布林带: Upper={bbands.get('upper', 0):.2f}, Middle={bbands.get('middle', 0):.2f}, "
+            prompt += f"Lower={bbands.get('lower', 0):.2f}\n"
+            prompt += f"- ATR(14): {ind.get('atr_14', 0):.2f}\n"
+            prompt += f"- 成交量: 当前={ind.get('volume', 0):.2f}, 20均={ind.get('volume_avg_20', 0):.2f}\n\n"
+    return prompt
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    agent = TAMomentumAgent()
+    assets, indicators_by_asset = build_inputs()
+    legacy = legacy_build_prompt(assets, indicators_by_asset)
+    # 新 prompt 包含任务说明, 只比较数据部分
+    compact = agent._build_analysis_prompt(assets, indicators_by_asset).split("\n\n请基于以上数据")[0]
+
+    print(f"iterations={iterations}, assets={len(PRICES)}, timeframes=2")
+    print(f"  {'':<10} {'chars':>8} {'~tokens':>8} {'us/op':>10}")
+    for label, text, func in (
+        ("legacy", legacy, lambda: legacy_build_prompt(assets, indicators_by_asset)),
+        ("encoder", compact, lambda: agent._build_analysis_prompt(assets, indicators_by_asset)),
+    ):
+        seconds = min(timeit.repeat(func, number=iterations, repeat=5))
+        print(f"  {label:<10} {len(text):8d} {estimate_tokens(text):8d} {seconds / iterations * 1e6:10.1f}")
+
+    print(f"  token reduction: {1 - estimate_tokens(compact) / estimate_tokens(legacy):.0%}")
+
+
+if __name__ == "__main__":
+    main()
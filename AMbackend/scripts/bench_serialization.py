@@ -0,0 +1,147 @@
+"""JSON 序列化基准测试
+
+对比旧实现 (递归 _serialize_for_json / jsonable_encoder + json.dumps)
+与 app.core.serialization (orjson) 在两类典型负载上的耗时 (不涉及数据库):
+
+- 市场快照: 每次策略执行写入 strategy_executions / agent_executions 的 market_snapshot
+- 执行详情: GET /strategies/{portfolio_id}/executions/{execution_id} 的响应体
+
+用法:
+    python scripts/bench_serialization.py [iterations] [candles]
+"""
+import json
+import sys
+import timeit
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.serialization import dumps, dumps_str, to_jsonable
+
+
+def build_market_snapshot(candles: int) -> dict:
+    """构造市场快照: K线 + 指标 + 宏观/链上数据"""
+    start = datetime(2026, 10, 1)
+    ohlcv = [
+        {
+            "timestamp": start + timedelta(hours=i),
+            "open": Decimal("64000.12") + i,
+            "high": Decimal("64250.50") + i,
+            "low": Decimal("63880.01") + i,
+            "close": Decimal("64120.99") + i,
+            "volume": 1234.5678 + i,
+        }
+        for i in range(candles)
+    ]
+    return {
+        "btc_price": Decimal("64321.98"),
+        "timestamp": datetime.utcnow(),
+        "ohlcv": ohlcv,
+        "indicators": {
+            "ema_20": [63000.0 + i * 0.5 for i in range(candles)],
+            "rsi_14": [50.0 + (i % 30) for i in range(candles)],
+            "macd": {"macd": 120.5, "signal": 98.2, "histogram": 22.3},
+        },
+        "macro": {"fed_rate": 4.25, "dxy": 101.3, "m2_growth": 3.1},
+        "onchain": {"mvrv_z": 1.8, "nupl": 0.52, "exchange_netflow": -1520.4},
+    }
+
+
+def build_execution_detail(agents: int, trades: int) -> dict:
+    """构造执行详情响应: 执行记录 + 各Agent输出 + 成交"""
+    now = datetime.utcnow()
+    return {
+        "id": str(uuid.uuid4()),
+        "execution_time": now,
+        "status": "completed",
+        "signal": "BUY",
+        "conviction_score": 72.5,
+        "market_snapshot": build_market_snapshot(48),
+        "agents": [
+            {
+                "agent_name": f"agent_{i}",
+                "signal": "BULLISH",
+                "confidence": Decimal("0.82"),
+                "score": Decimal("64.50"),
+                "reasoning": "Momentum and on-chain flows remain supportive. " * 20,
+                "executed_at": now,
+                "agent_specific_data": {"factors": [{"name": f"f{j}", "weight": 0.1 * j} for j in range(10)]},
+            }
+            for i in range(agents)
+        ],
+        "trades": [
+            {
+                "id": str(uuid.uuid4()),
+                "symbol": "BTC",
+                "side": "BUY",
+                "amount": Decimal("0.00231000"),
+                "price": Decimal("64321.98000000"),
+                "fee": Decimal("0.14858378"),
+                "executed_at": now,
+            }
+            for _ in range(trades)
+        ],
+    }
+
+
+def legacy_serialize_for_json(obj):
+    """旧实现: StrategyOrchestrator / AgentExecutionRecorder._serialize_for_json"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    elif isinstance(obj, Decimal):
+        return float(obj)
+    elif hasattr(obj, "dict"):
+        return legacy_serialize_for_json(obj.dict())
+    elif isinstance(obj, dict):
+        return {k: legacy_serialize_for_json(v) for k, v in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        return [legacy_serialize_for_json(item) for item in obj]
+    return obj
+
+
+def legacy_response_body(content) -> bytes:
+    """旧实现: FastAPI 默认 JSONResponse (jsonable_encoder + json.dumps)"""
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _bench(label: str, func, iterations: int) -> float:
+    seconds = min(timeit.repeat(func, number=iterations, repeat=5))
+    per_call_us = seconds / iterations * 1e6
+    print(f"  {label:<44} {per_call_us:10.1f} us/op")
+    return per_call_us
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    candles = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    snapshot = build_market_snapshot(candles)
+    detail = build_execution_detail(agents=5, trades=3)
+
+    print(f"iterations={iterations}, candles={candles}")
+    print("market snapshot -> JSONB:")
+    d = _bench("_serialize_for_json + json.dumps", lambda: json.dumps(legacy_serialize_for_json(snapshot)), iterations)
+    f = _bench("orjson dumps_str (engine json_serializer)", lambda: dumps_str(snapshot), iterations)
+    t = _bench("orjson to_jsonable (in-memory snapshot)", lambda: to_jsonable(snapshot), iterations)
+    print(f"  speedup (bind):       {d / f:.2f}x")
+    print(f"  speedup (to_jsonable): {d / t:.2f}x")
+
+    print("execution detail -> response body:")
+    d = _bench("jsonable_encoder + json.dumps", lambda: legacy_response_body(detail), iterations)
+    f = _bench("orjson dumps (ORJSONResponse)", lambda: dumps(detail), iterations)
+    print(f"  speedup: {d / f:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""策略流水线压测 (离线 LLM 桩)
+
+用 StubLLMProvider 代替 OpenRouter/Tuzi, 通过 StrategyScheduler.batch_execute_by_template
+驱动 N 个策略模板 × M 个实例, 输出吞吐量和各阶段耗时, 把我们自身代码的开销
+(调度、准入排队、Agent计算、落库、决策交易) 与供应商延迟分开。
+
+流程:
+1. 创建压测用户、N 个模板 (复制 --base-template 的配置, is_active=False, 不会被
+   正在运行的调度器加载) 和 N×M 个实例
+2. 每轮并发执行所有模板的 batch_execute_by_template; 市场数据使用合成快照,
+   不访问外部 API (--live-market-data 使用真实采集)
+3. 输出各阶段 p50/p95/max 耗时和吞吐量
+4. 删除本次创建的全部数据 (--keep 保留)
+
+⚠️ 会写入数据库 (执行记录、交易、Agent最新状态), 请在开发/测试库上运行。
+
+用法:
+    python scripts/load_test_pipeline.py --templates 3 --instances 20 --rounds 2
+    python scripts/load_test_pipeline.py --ttfb 4 --tokens-per-second 40 --error-rate 0.05
+"""
+import argparse
+import asyncio
+import logging
+import math
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Dict, List, Union
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import delete, select
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models import AgentExecution, Portfolio, StrategyDefinition, StrategyExecution, Trade, User
+from app.schemas.market_data import OHLCVData
+from app.services.llm.admission import LLMPriority, llm_priority
+from app.services.llm.manager import llm_manager
+from app.services.llm.stub import StubLLMProvider, StubProfile
+from app.services.strategy.dynamic_agent_executor import dynamic_agent_executor
+from app.services.strategy.exploration_dashboard import exploration_dashboard
+from app.services.strategy.scheduler import strategy_scheduler
+from app.services.strategy.strategy_orchestrator import strategy_orchestrator
+
+LOADTEST_EMAIL = "loadtest@localhost"
+CANDLES = 240
+
+
+class StageTimer:
+    """按阶段收集异步调用耗时"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def wrap(self, obj, attr: str, stage: Union[str, Callable[..., str]], replacement=None) -> None:
+        """用计时包装替换 obj.attr (stage 可按调用参数命名)"""
+        target = replacement or getattr(obj, attr)
+
+        async def timed(*args, **kwargs):
+            name = stage(*args, **kwargs) if callable(stage) else stage
+            started = time.perf_counter()
+            try:
+                return await target(*args, **kwargs)
+            finally:
+                self.samples[name].append(time.perf_counter() - started)
+
+        setattr(obj, attr, timed)
+
+    def total(self, stage: str) -> float:
+        return sum(self.samples.get(stage, []))
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)] if ordered else 0.0
+
+
+def build_market_snapshot() -> dict:
+    """合成市场快照 (格式同 StrategyScheduler._fetch_market_data)"""
+    start = datetime(2026, 10, 1)
+
+    def candles(price: float, minutes: int) -> list:
+        rows = []
+        for i in range(CANDLES):
+            close = price * (1 + 0.02 * math.sin(i / 15) + 0.0004 * i)
+            rows.append([
+                int((start + timedelta(minutes=minutes * i)).timestamp() * 1000),
+                close * 0.999, close * 1.004, close * 0.996, close, 1000 + 25 * (i % 40),
+            ])
+        return rows
+
+    assets = {}
+    for asset, price in (("BTC", 64000.0), ("ETH", 2450.0), ("SOL", 100.0)):
+        assets[asset] = {
+            "current_price": price,
+            "price_change_24h": 1.5,
+            "volume_24h": 0,
+            "ohlcv_15m": candles(price, 15),
+            "ohlcv_60m": candles(price, 60),
+            "funding_rate": 0.0001,
+            "open_interest_change_24h": 2.5,
+            "futures_premium": 0.3,
+        }
+
+    # 旧策略 TAAgent 读取 ohlcv_data (BTC 1小时K线)
+    ohlcv_data = [
+        OHLCVData(
+            timestamp=datetime.utcfromtimestamp(row[0] / 1000),
+            open=row[1], high=row[2], low=row[3], close=row[4], volume=row[5],
+        )
+        for row in assets["BTC"]["ohlcv_60m"]
+    ]
+
+    return {
+        "assets": assets,
+        "ohlcv_data": ohlcv_data,
+        "btc_price": assets["BTC"]["current_price"],
+        "price_change_24h": assets["BTC"]["price_change_24h"],
+        "macro": {"dxy": 103.0, "fed_rate": 4.25, "m2_growth": 2.5, "treasury_10y": 4.3, "vix": 15.0},
+        "sentiment": {"fear_greed_value": 55, "fear_greed_classification": "Greed"},
+        "onchain": {"btc_mvrv_zscore": 1.8},
+        "timestamp": datetime.utcnow().isoformat(),
+        "last_updated": datetime.utcnow().isoformat(),
+    }
+
+
+async def setup(args, run_id: str):
+    """创建压测用户、模板和实例, 返回 (user_id, definition_ids)"""
+    async with AsyncSessionLocal() as db:
+        base = (
+            await db.execute(select(StrategyDefinition).where(StrategyDefinition.name == args.base_template))
+        ).scalar_one_or_none()
+        if base is None:
+            raise SystemExit(f"基础模板 {args.base_template} 不存在 (先运行 scripts/init_momentum_strategy.py)")
+
+        user = (await db.execute(select(User).where(User.email == LOADTEST_EMAIL))).scalar_one_or_none()
+        if user is None:
+            user = User(email=LOADTEST_EMAIL, full_name="Load Test", is_active=True)
+            db.add(user)
+            await db.flush()
+
+        definition_ids = []
+        for t in range(args.templates):
+            definition = StrategyDefinition(
+                name=f"loadtest_{run_id}_{t}",
+                display_name=f"Load test {run_id} #{t}",
+                description="scripts/load_test_pipeline.py",
+                decision_agent_module=base.decision_agent_module,
+                decision_agent_class=base.decision_agent_class,
+                business_agents=list(base.business_agents or []),
+                trade_channel=base.trade_channel,
+                trade_symbol=base.trade_symbol,
+                rebalance_period_minutes=base.rebalance_period_minutes,
+                default_params=dict(base.default_params or {}),
+                is_active=False,
+            )
+            db.add(definition)
+            await db.flush()
+            definition_ids.append(definition.id)
+
+            for i in range(args.instances):
+                name = f"loadtest {run_id} #{t}-{i}"
+                db.add(Portfolio(
+                    user_id=user.id,
+                    strategy_definition_id=definition.id,
+                    instance_name=name,
+                    name=name,
+                    instance_params=dict(base.default_params or {}),
+                    initial_balance=Decimal(str(args.balance)),
+                    current_balance=Decimal(str(args.balance)),
+                    total_value=Decimal(str(args.balance)),
+                    is_active=True,
+                    consecutive_bullish_count=0,
+                    consecutive_bearish_count=0,
+                ))
+
+        await db.commit()
+        return user.id, definition_ids
+
+
+async def teardown(user_id: int, definition_ids: List[int]) -> None:
+    """删除本次压测创建的实例、执行记录和模板"""
+    async with AsyncSessionLocal() as db:
+        portfolio_ids = select(Portfolio.id).where(Portfolio.strategy_definition_id.in_(definition_ids))
+        execution_ids = select(StrategyExecution.id).where(StrategyExecution.portfolio_id.in_(portfolio_ids))
+
+        await db.execute(delete(Trade).where(Trade.portfolio_id.in_(portfolio_ids)))
+        await db.execute(delete(AgentExecution).where(
+            (AgentExecution.strategy_execution_id.in_(execution_ids)) | (AgentExecution.user_id == user_id)
+        ))
+        await db.execute(delete(StrategyExecution).where(StrategyExecution.portfolio_id.in_(portfolio_ids)))
+        # holdings / snapshots 随 Portfolio 级联删除
+        await db.execute(delete(Portfolio).where(Portfolio.strategy_definition_id.in_(definition_ids)))
+        await db.execute(delete(StrategyDefinition).where(StrategyDefinition.id.in_(definition_ids)))
+        await db.commit()
+
+        # 去掉压测模板在 Exploration 视图中的数据
+        await exploration_dashboard.rebuild(db)
+
+
+def instrument(args, timer: StageTimer) -> StubLLMProvider:
+    """接入 LLM 桩和各阶段计时"""
+    stub = llm_manager.use_stub(StubLLMProvider(StubProfile(
+        ttfb_seconds=args.ttfb,
+        ttfb_sigma=args.ttfb_sigma,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed,
+    )))
+    # 重复轮次不应命中响应缓存
+    settings.LLM_CACHE_ENABLED = args.cache
+
+    snapshot = build_market_snapshot()
+
+    async def synthetic_market_data():
+        return snapshot
+
+    timer.wrap(
+        strategy_scheduler,
+        "_fetch_market_data",
+        "1 market_data",
+        replacement=None if args.live_market_data else synthetic_market_data,
+    )
+    timer.wrap(dynamic_agent_executor, "execute_agents", "2 agents (shared)")
+    timer.wrap(dynamic_agent_executor, "_run_agent", lambda *a, **kw: f"2.{kw.get('agent_name')}")
+    timer.wrap(llm_manager, "chat", "2.llm LLMManager.chat")
+    timer.wrap(strategy_orchestrator, "execute_strategy", "3 instance (orchestrator)")
+    timer.wrap(exploration_dashboard, "rebuild", "4 exploration_rebuild")
+    return stub
+
+
+async def run(args) -> None:
+    run_id = uuid.uuid4().hex[:8]
+    timer = StageTimer()
+    stub = instrument(args, timer)
+    await strategy_scheduler.initialize()
+
+    user_id, definition_ids = await setup(args, run_id)
+    print(f"run={run_id} templates={args.templates} instances/template={args.instances} rounds={args.rounds}")
+
+    wall = []
+    try:
+        for round_no in range(args.rounds):
+            started = time.perf_counter()
+            # 与调度器一致, 批量执行走交易优先通道
+            with llm_priority(LLMPriority.TRADING):
+                await asyncio.gather(*(
+                    strategy_scheduler.batch_execute_by_template(def_id) for def_id in definition_ids
+                ))
+            wall.append(time.perf_counter() - started)
+            print(f"  round {round_no + 1}: {wall[-1]:.2f}s")
+
+        report(args, timer, stub, sum(wall))
+    finally:
+        if not args.keep:
+            await teardown(user_id, definition_ids)
+
+
+def report(args, timer: StageTimer, stub: StubLLMProvider, total_wall: float) -> None:
+    """输出吞吐量、各阶段耗时和 LLM 桩统计"""
+    instances = args.templates * args.instances * args.rounds
+    print("\nthroughput:")
+    print(f"  instances/s:  {instances / total_wall:.2f}")
+    print(f"  templates/s:  {args.templates * args.rounds / total_wall:.2f}")
+
+    print("\nstage latency (seconds):")
+    print(f"  {'stage':<32} {'n':>6} {'p50':>8} {'p95':>8} {'max':>8}")
+    for stage in sorted(timer.samples):
+        values = timer.samples[stage]
+        print(f"  {stage:<32} {len(values):6d} {_percentile(values, 0.5):8.3f} "
+              f"{_percentile(values, 0.95):8.3f} {max(values):8.3f}")
+
+    vendor = stub.stats()
+    vendor_seconds = sum(m["simulated_seconds"] for m in vendor.values())
+    llm_seconds = timer.total("2.llm LLMManager.chat")
+    print("\nLLM (stub):")
+    for model, counters in sorted(vendor.items()):
+        print(f"  {model:<24} calls={int(counters['calls'])} errors={int(counters['errors'])} "
+              f"vendor={counters['simulated_seconds']:.2f}s")
+    print(f"  manager overhead (queue + ours): {llm_seconds - vendor_seconds:.2f}s "
+          f"of {llm_seconds:.2f}s in LLMManager.chat")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Strategy pipeline load test with the offline LLM stub")
+    parser.add_argument("--templates", type=int, default=2)
+    parser.add_argument("--instances", type=int, default=10, help="instances per template")
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--base-template", default="momentum_regime_btc_v1")
+    parser.add_argument("--balance", type=float, default=10000.0)
+    parser.add_argument("--ttfb", type=float, default=settings.LLM_STUB_TTFB_SECONDS)
+    parser.add_argument("--ttfb-sigma", type=float, default=settings.LLM_STUB_TTFB_SIGMA)
+    parser.add_argument("--tokens-per-second", type=float, default=settings.LLM_STUB_TOKENS_PER_SECOND)
+    parser.add_argument("--error-rate", type=float, default=settings.LLM_STUB_ERROR_RATE)
+    parser.add_argument("--malformed-rate", type=float, default=settings.LLM_STUB_MALFORMED_RATE)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--cache", action="store_true", help="keep the LLM response cache enabled")
+    parser.add_argument("--live-market-data", action="store_true", help="fetch real market data")
+    parser.add_argument("--keep", action="store_true", help="keep the created templates and instances")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+TimescaleDB 执行历史管理工具
+
+strategy_executions / agent_executions / portfolio_snapshots 由迁移
+c3f9a8e1d7b2 转换为 hypertable。修改 .env 中的压缩/保留配置后，
+运行 apply-policies 使其生效。
+
+用法:
+    python scripts/manage_timescale.py status
+    python scripts/manage_timescale.py apply-policies [--compress-after DAYS]
+    python scripts/manage_timescale.py compress --older-than DAYS
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db import timescale
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _format_bytes(value) -> str:
+    if value is None:
+        return "-"
+    for unit in ["B", "KB", "MB", "GB"]:
+        if value < 1024:
+            return f"{value:.1f}{unit}"
+        value /= 1024
+    return f"{value:.1f}TB"
+
+
+async def main(args):
+    engine = create_async_engine(settings.DATABASE_URL)
+    async_session = sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    try:
+        async with async_session() as db:
+            if not await timescale.is_timescaledb_enabled(db):
+                logger.error("❌ timescaledb 扩展未安装")
+                return 1
+
+            if args.command == "status":
+                for stat in await timescale.get_hypertable_stats(db):
+                    print(
+                        f"{stat['table']:<22} chunks={stat['total_chunks']:<4} "
+                        f"compressed={stat['compressed_chunks']:<4} "
+                        f"size={_format_bytes(stat['total_bytes']):<9} "
+                        f"before={_format_bytes(stat['before_compression_bytes']):<9} "
+                        f"after={_format_bytes(stat['after_compression_bytes']):<9} "
+                        f"retention={stat['retention_days'] or 'forever'}"
+                    )
+
+            elif args.command == "apply-policies":
+                await timescale.apply_policies(db, compress_after_days=args.compress_after)
+
+            elif args.command == "compress":
+                compressed = await timescale.compress_chunks(db, args.older_than)
+                for table, count in compressed.items():
+                    logger.info(f"✓ {table}: 压缩 {count} 个 chunk")
+    finally:
+        await engine.dispose()
+
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TimescaleDB 执行历史管理")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("status", help="查看 hypertable chunk 和压缩情况")
+
+    apply_parser = subparsers.add_parser("apply-policies", help="按配置应用压缩/保留策略")
+    apply_parser.add_argument("--compress-after", type=int, default=None, help="压缩天数 (默认读取配置)")
+
+    compress_parser = subparsers.add_parser("compress", help="立即压缩旧 chunk")
+    compress_parser.add_argument("--older-than", type=int, required=True, help="压缩早于 N 天的 chunk")
+
+    sys.exit(asyncio.run(main(parser.parse_args())))
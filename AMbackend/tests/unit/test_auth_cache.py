@@ -0,0 +1,99 @@
+"""Unit tests for the Firebase auth cache"""
+
+import time
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from google.auth import crypt
+from google.auth import jwt as google_jwt
+
+from app.core import auth_cache as auth_cache_module
+from app.core.auth_cache import AuthCache, TokenCache
+from app.models.user import User
+
+PROJECT_ID = "automoney-test"
+
+
+def _signed_token(kid="k1", **overrides):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    now = int(time.time())
+    claims = {
+        "iss": f"https://securetoken.google.com/{PROJECT_ID}",
+        "aud": PROJECT_ID,
+        "sub": "firebase-uid-1",
+        "iat": now,
+        "exp": now + 3600,
+        "email": "trader@example.com",
+        **overrides,
+    }
+    signer = crypt.RSASigner.from_string(private_pem, key_id=kid)
+    token = google_jwt.encode(signer, claims).decode("utf-8")
+    return token, {kid: public_pem.decode("utf-8")}
+
+
+def test_token_cache_honors_exp_and_size():
+    """Test entries expire at the token exp and the LRU stays bounded"""
+    cache = TokenCache(max_size=2)
+    cache.set("expired", {"exp": time.time() - 1})
+    cache.set("a", {"exp": time.time() + 60})
+    cache.set("b", {"exp": time.time() + 60})
+    cache.get("a")
+    cache.set("c", {"exp": time.time() + 60})
+
+    assert cache.get("expired") is None
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert len(cache) == 2
+
+
+async def test_verify_token_uses_key_set_then_cache(monkeypatch):
+    """Test tokens are verified locally once, then served from the cache"""
+    monkeypatch.setattr(auth_cache_module.settings, "FIREBASE_PROJECT_ID", PROJECT_ID)
+    token, certs = _signed_token()
+    cache = AuthCache()
+    cache.keys._certs = certs
+    cache.keys._expires_at = time.time() + 3600
+
+    verifications = []
+    original_verify = cache.keys.verify
+    monkeypatch.setattr(
+        cache.keys, "verify", lambda *a: verifications.append(1) or original_verify(*a)
+    )
+
+    first = await cache.verify_token(token)
+    second = await cache.verify_token(token)
+
+    assert first["uid"] == "firebase-uid-1"
+    assert second is first
+    assert len(verifications) == 1
+
+
+async def test_verify_token_rejects_wrong_project(monkeypatch):
+    """Test tokens issued for another project are not accepted or cached"""
+    monkeypatch.setattr(auth_cache_module.settings, "FIREBASE_PROJECT_ID", PROJECT_ID)
+    token, certs = _signed_token(aud="other-project")
+    cache = AuthCache()
+    cache.keys._certs = certs
+    cache.keys._expires_at = time.time() + 3600
+
+    assert await cache.verify_token(token) is None
+    assert len(cache.tokens) == 0
+
+
+def test_forget_user_drops_cached_row():
+    """Test a role or status change evicts the user before the TTL"""
+    cache = AuthCache()
+    user = User(id=1, google_id="uid-1", email="a@example.com", role="trader")
+    cache.remember_user("uid-1", user)
+    cache.forget_user(user)
+
+    assert cache.users.get("uid-1") is None
@@ -0,0 +1,122 @@
+"""Unit tests for response compression and conditional GET"""
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.http_cache import etag_matches, json_response, make_etag, not_modified
+from app.core.middleware import CompressionMiddleware
+
+ETAG = make_etag("test", 1)
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/large")
+    async def large(request: Request):
+        if etag_matches(request, ETAG):
+            return not_modified(ETAG)
+        return json_response({"data": ["x" * 10] * 50}, ETAG)
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def events():
+            yield "event: a\ndata: 1\n\n"
+            yield "event: b\ndata: 2\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return TestClient(app)
+
+
+def test_large_json_is_gzipped_with_suffixed_etag():
+    """Test bodies above the threshold are compressed and get a coding-specific ETag"""
+    response = _client().get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == ETAG[:-1] + '-gzip"'
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json() == {"data": ["x" * 10] * 50}
+
+
+def test_small_and_streaming_responses_pass_through():
+    """Test small bodies and SSE streams are not compressed"""
+    client = _client()
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    stream = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in stream.headers
+    assert stream.text == "event: a\ndata: 1\n\nevent: b\ndata: 2\n\n"
+
+
+def test_compressed_etag_revalidates_with_304():
+    """Test a client holding the gzip ETag gets 304 carrying the same validator"""
+    compressed_etag = ETAG[:-1] + '-gzip"'
+
+    response = _client().get(
+        "/large",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": compressed_etag},
+    )
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == compressed_etag
+    assert response.content == b""
+
+
+def test_choose_encoding_honors_q_zero():
+    """Test gzip;q=0 disables compression"""
+    assert CompressionMiddleware.choose_encoding("gzip;q=0") is None
+    assert CompressionMiddleware.choose_encoding("deflate, gzip") == "gzip"
+
+
+def test_execution_detail_renders_the_same_with_and_without_etag(monkeypatch):
+    """Test finished (ETag) and running (no ETag) executions share one wire format"""
+    from datetime import datetime
+
+    from app.api.v1.endpoints import strategy_instances
+    from app.core.deps import get_current_user, get_db
+    from app.schemas.strategy import StrategyExecutionDetail
+
+    def detail(status):
+        return StrategyExecutionDetail(
+            id="exec-1",
+            execution_time=datetime(2026, 10, 19, 8, 30),
+            strategy_name="momentum",
+            status=status,
+            market_snapshot={"btc_price": 64321.98},
+            conviction_score=72.5,
+            signal="LONG",
+            signal_strength=None,
+            position_size=None,
+            risk_level=None,
+            execution_duration_ms=1200,
+            error_message=None,
+            agent_executions=[],
+        )
+
+    status = {"value": "completed"}
+
+    async def get_execution_detail(db, execution_id):
+        return detail(status["value"])
+
+    monkeypatch.setattr(strategy_instances.marketplace_service, "get_execution_detail", get_execution_detail)
+    app = FastAPI()
+    app.include_router(strategy_instances.router)
+    app.dependency_overrides[get_db] = lambda: None
+    app.dependency_overrides[get_current_user] = lambda: None
+    client = TestClient(app)
+
+    finished = client.get("/executions/exec-1")
+    status["value"] = "running"
+    running = client.get("/executions/exec-1")
+
+    assert "etag" in finished.headers and "etag" not in running.headers
+    assert finished.json()["execution_time"] == "2026-10-19T08:30:00+00:00"
+    assert running.json() == {**finished.json(), "status": "running"}
@@ -0,0 +1,104 @@
+"""Unit tests for the buffered error tracker"""
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.dialects import postgresql
+
+from app.db.background_flusher import BackgroundFlusher
+from app.services.monitoring.error_tracker import (
+    ErrorIngestionQueue,
+    error_fingerprint,
+    upsert_errors_statement,
+)
+
+
+def _values(message="Binance timeout", context=None):
+    return {
+        "error_type": "data_collection",
+        "error_category": "timeout",
+        "severity": "critical",
+        "component": "Scheduler._fetch_market_data",
+        "error_message": message,
+        "error_details": None,
+        "context": context,
+        "user_id": None,
+        "portfolio_id": None,
+        "strategy_name": None,
+        "fingerprint": error_fingerprint("Scheduler._fetch_market_data", message),
+    }
+
+
+def test_occurrences_aggregate_by_fingerprint():
+    """Test repeated errors collapse into one pending row with a count"""
+    queue = ErrorIngestionQueue(flush_interval_seconds=5, max_pending=10)
+    start = datetime(2026, 10, 19, 8, 0, tzinfo=timezone.utc)
+
+    for i in range(3):
+        queue.add(_values(context={"portfolio": i}), occurred_at=start + timedelta(seconds=i))
+    queue.add(_values(message="Glassnode 500"), occurred_at=start)
+
+    pending = {item.values["error_message"]: item for item in queue.drain()}
+
+    assert pending["Binance timeout"].count == 3
+    assert pending["Binance timeout"].values["context"] == {"portfolio": 2}
+    assert pending["Binance timeout"].first_occurred_at == start
+    assert pending["Binance timeout"].last_occurred_at == start + timedelta(seconds=2)
+    assert pending["Glassnode 500"].count == 1
+    assert queue.pending_count == 0
+
+
+def test_requeue_merges_with_new_occurrences():
+    """Test a failed flush is retried together with errors that arrived meanwhile"""
+    queue = ErrorIngestionQueue(flush_interval_seconds=5, max_pending=10)
+    queue.add(_values())
+    failed = queue.drain()
+    queue.add(_values())
+
+    queue.requeue(failed)
+
+    assert [item.count for item in queue.drain()] == [2]
+
+
+def test_upsert_statement_increments_open_row():
+    """Test the flush statement targets the partial unique index and adds counts"""
+    queue = ErrorIngestionQueue(flush_interval_seconds=5, max_pending=10)
+    queue.add(_values())
+    rows = [item.to_row() for item in queue.drain()]
+
+    sql = str(upsert_errors_statement(rows).compile(dialect=postgresql.dialect()))
+
+    assert "ON CONFLICT (fingerprint) WHERE is_resolved = false DO UPDATE" in sql
+    assert "occurrence_count = (system_errors.occurrence_count + excluded.occurrence_count)" in sql
+
+
+async def test_flush_reports_dropped_errors(caplog):
+    """Test errors dropped on a full queue are logged once per flush and kept in stats"""
+    queue = ErrorIngestionQueue(flush_interval_seconds=5, max_pending=1)
+    queue.add(_values())
+    queue.add(_values(message="Glassnode 500"), count=3)
+
+    assert queue.stats() == {"pending": 1, "dropped": 3}
+
+    queue.drain()
+    await queue.flush(db=None)
+    await queue.flush(db=None)
+
+    assert [r.getMessage() for r in caplog.records].count(
+        "错误队列已满 (1 类)，上次刷新后丢弃 3 次错误，累计 3 次"
+    ) == 1
+
+
+def test_background_flusher_flushes_once_more_on_stop():
+    """Test stop() wakes the flush thread, which writes before exiting"""
+    flushed = []
+
+    async def flush(db):
+        flushed.append(db)
+
+    flusher = BackgroundFlusher("test-flusher", interval_seconds=3600, flush=flush)
+    flusher.start()
+    flusher.start()
+    flusher.stop(timeout=5)
+
+    assert len(flushed) == 1
+    assert flusher._thread is None
@@ -0,0 +1,76 @@
+"""Unit tests for the realtime event bus"""
+
+import asyncio
+import json
+import threading
+
+from app.services.realtime.event_bus import EventBus
+
+
+async def test_publish_filters_by_topic():
+    """Test subscribers only receive events for their topics"""
+    bus = EventBus()
+    trades = bus.subscribe(["trade.executed"])
+    everything = bus.subscribe()
+
+    await bus.publish("portfolio.valuation", {"portfolios": []})
+    await bus.publish("trade.executed", {"trade_id": "t1"})
+
+    event = await trades.get(timeout=1)
+    assert event.topic == "trade.executed"
+    assert await trades.get(timeout=0.01) is None
+    assert [(await everything.get(timeout=1)).topic for _ in range(2)] == [
+        "portfolio.valuation",
+        "trade.executed",
+    ]
+
+    trades.close()
+    everything.close()
+    assert bus.subscriber_count == 0
+
+
+async def test_user_events_only_reach_owner():
+    """Test events with a user_id reach that user's subscriptions only; public events reach all"""
+    bus = EventBus()
+    owner = bus.subscribe(user_id=1)
+    other = bus.subscribe(user_id=2)
+
+    await bus.publish("trade.executed", {"trade_id": "t1"}, user_id=1)
+    await bus.publish("exploration.updated", {"batch_id": "b1"})
+
+    assert [(await owner.get(timeout=1)).topic for _ in range(2)] == [
+        "trade.executed",
+        "exploration.updated",
+    ]
+    assert (await other.get(timeout=1)).topic == "exploration.updated"
+    assert await other.get(timeout=0.01) is None
+
+
+async def test_publish_from_scheduler_thread():
+    """Test events published from another event loop reach the subscriber loop"""
+    bus = EventBus()
+
+    with bus.subscribe() as subscription:
+        thread = threading.Thread(
+            target=lambda: asyncio.run(bus.publish("execution.completed", {"signal": "BUY"}))
+        )
+        thread.start()
+        thread.join()
+
+        event = await subscription.get(timeout=1)
+
+    assert json.loads(event.to_sse().split("data: ", 1)[1]) == {"signal": "BUY"}
+
+
+async def test_full_queue_drops_oldest(monkeypatch):
+    """Test a slow subscriber keeps the newest events"""
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "REALTIME_QUEUE_SIZE", 2)
+    bus = EventBus()
+    subscription = bus.subscribe()
+
+    for i in range(3):
+        await bus.publish("trade.executed", {"n": i})
+
+    assert [(await subscription.get(timeout=1)).data["n"] for _ in range(2)] == [1, 2]
+    assert subscription.dropped == 1
@@ -0,0 +1,25 @@
+"""Unit tests for the execution history keyset cursor"""
+
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.services.strategy.marketplace_service import MarketplaceService
+
+
+def test_execution_cursor_round_trip():
+    """Test (execution_time, id) survives cursor encoding"""
+    execution_time = datetime(2026, 10, 19, 8, 30, 15, 123456)
+    execution_id = uuid.uuid4()
+
+    cursor = MarketplaceService._encode_execution_cursor(execution_time, execution_id)
+
+    assert "=" not in cursor
+    assert MarketplaceService._decode_execution_cursor(cursor) == (execution_time, execution_id)
+
+
+def test_execution_cursor_invalid():
+    """Test malformed cursors raise ValueError"""
+    with pytest.raises(ValueError):
+        MarketplaceService._decode_execution_cursor("not-a-cursor")
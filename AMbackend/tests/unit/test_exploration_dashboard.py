@@ -0,0 +1,62 @@
+"""Unit tests for the exploration dashboard materializer"""
+
+import json
+
+from app.services.strategy.exploration_dashboard import ExplorationDashboard
+
+
+async def test_view_built_once_until_rebuild():
+    """Test requests reuse the materialized body until the next rebuild"""
+    dashboard = ExplorationDashboard()
+    versions = iter([1, 2])
+
+    async def build(db):
+        return {"version": next(versions)}
+
+    dashboard.register("view", build)
+
+    body, etag = await dashboard.get("view", db=None)
+    assert await dashboard.get("view", db=None) == (body, etag)
+    assert json.loads(body) == {"version": 1}
+
+    assert await dashboard.rebuild(db=None) == 1
+    rebuilt, new_etag = await dashboard.get("view", db=None)
+
+    assert json.loads(rebuilt) == {"version": 2}
+    assert new_etag != etag
+
+
+async def test_rebuild_keeps_previous_view_on_failure():
+    """Test a failing builder leaves the previous payload in place"""
+    dashboard = ExplorationDashboard()
+    fail = False
+
+    async def build(db):
+        if fail:
+            raise RuntimeError("db unavailable")
+        return {"ok": True}
+
+    dashboard.register("view", build)
+    body, etag = await dashboard.get("view", db=None)
+
+    fail = True
+    assert await dashboard.rebuild(db=None) == 0
+    assert await dashboard.get("view", db=None) == (body, etag)
+
+
+async def test_refreshed_view_has_no_etag():
+    """Test refresh recomputes time-derived fields and the changing body carries no ETag"""
+    dashboard = ExplorationDashboard()
+    ticks = iter([1, 2])
+
+    async def build(db):
+        return {"static": "x", "tick": 0}
+
+    dashboard.register("view", build, refresh=lambda data: {**data, "tick": next(ticks)})
+
+    first, first_etag = await dashboard.get("view", db=None)
+    second, second_etag = await dashboard.get("view", db=None)
+
+    assert json.loads(first)["tick"] == 1
+    assert json.loads(second)["tick"] == 2
+    assert first_etag is None and second_etag is None
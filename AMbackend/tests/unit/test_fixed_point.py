@@ -0,0 +1,95 @@
+"""Unit tests for fixed-point trading arithmetic"""
+
+import pytest
+from decimal import Decimal
+
+from app.services.trading import fixed_point as fp
+
+
+def test_to_units_round_trip():
+    """Test Decimal -> units -> Decimal keeps NUMERIC(20, 8) values exact"""
+    value = Decimal("43250.12345678")
+    units = fp.price_to_units(value)
+
+    assert units == 4325012345678
+    assert fp.price_from_units(units) == value
+
+
+def test_to_units_float_and_str():
+    """Test float and str inputs convert without Decimal(str()) drift"""
+    assert fp.price_to_units(42000.1) == 4200010000000
+    assert fp.price_to_units("0.00000001") == 1
+    assert fp.to_units(None, 8) == 0
+    assert fp.rate_to_ppm(0.001) == 1000
+
+
+def test_div_round_half_even():
+    """Test integer division rounds like Decimal ROUND_HALF_EVEN"""
+    assert fp.div_round(5, 2) == 2
+    assert fp.div_round(7, 2) == 4
+    assert fp.div_round(-5, 2) == -2
+    assert fp.div_round(6, 4) == 2
+
+
+def test_buy_fill_matches_decimal():
+    """Test buy fill matches the Decimal implementation"""
+    amount = Decimal("0.01500000")
+    price = Decimal("60000.00000000")
+    fill = fp.buy_fill(
+        balance_units=fp.quote_to_units(Decimal("10000")),
+        holding_amount_units=fp.to_units(Decimal("0.01"), 8),
+        holding_avg_price_units=fp.price_to_units(Decimal("50000")),
+        amount_units=fp.to_units(amount, 8),
+        price_units=fp.price_to_units(price),
+        fee_ppm=fp.rate_to_ppm(0.001),
+    )
+
+    total_value = amount * price
+    fee = total_value * Decimal("0.001")
+    assert fp.quote_from_units(fill["total_value"]) == total_value
+    assert fp.quote_from_units(fill["fee"]) == fee
+    assert fp.quote_from_units(fill["balance"]) == Decimal("10000") - total_value - fee
+    assert fp.from_units(fill["amount"], 8) == Decimal("0.025")
+    assert fp.price_from_units(fill["avg_buy_price"]) == Decimal("56000")
+
+
+def test_buy_fill_insufficient_balance():
+    """Test buy fill rejects orders above the balance"""
+    with pytest.raises(ValueError):
+        fp.buy_fill(
+            balance_units=fp.quote_to_units(100),
+            holding_amount_units=0,
+            holding_avg_price_units=0,
+            amount_units=fp.to_units(Decimal("1"), 8),
+            price_units=fp.price_to_units(100),
+            fee_ppm=1000,
+        )
+
+
+def test_sell_fill_realized_pnl():
+    """Test sell fill computes realized P&L after fees"""
+    fill = fp.sell_fill(
+        balance_units=0,
+        holding_amount_units=fp.to_units(Decimal("1"), 8),
+        holding_avg_price_units=fp.price_to_units(100),
+        holding_cost_basis_units=fp.quote_to_units(100),
+        amount_units=fp.to_units(Decimal("0.5"), 8),
+        price_units=fp.price_to_units(120),
+        fee_ppm=1000,
+    )
+
+    assert fp.quote_from_units(fill["realized_pnl"]) == Decimal("9.94")
+    assert fp.quote_from_units(fill["cost_basis"]) == Decimal("50")
+    assert fp.from_units(fill["amount"], 8) == Decimal("0.5")
+
+
+def test_revalue_holding():
+    """Test holding revaluation returns market value and unrealized P&L"""
+    market_value, unrealized = fp.revalue_holding(
+        amount_units=fp.to_units(Decimal("0.5"), 8),
+        price_units=fp.price_to_units(Decimal("64000")),
+        cost_basis_units=fp.quote_to_units(Decimal("30000")),
+    )
+
+    assert fp.quote_from_units(market_value) == Decimal("32000")
+    assert fp.quote_from_units(unrealized) == Decimal("2000")
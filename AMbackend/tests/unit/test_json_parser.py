@@ -0,0 +1,92 @@
+"""Unit tests for the single-pass tolerant LLM JSON parser"""
+
+import pytest
+
+from app.schemas.agents import MacroAnalysisOutput
+from app.schemas.research import PlanningAgentOutput
+from app.utils.json_parser import JSONParseError, parse_llm_json, scan_json
+
+
+def test_scan_extracts_first_value_and_repairs_common_slips():
+    """Test fences/prose are skipped and commas, quotes and literals are repaired"""
+    text = (
+        "Here is the analysis:\n```json\n"
+        "{'signal': 'BULLISH', \"reasoning\": \"DXY \"rolled over\"\nsince May\", "
+        "ok: True, 'levels': [1, 2,],\n \"note\": None,}\n```\nLet me know {if} needed"
+    )
+
+    json_str, repaired = scan_json(text)
+
+    assert repaired
+    assert parse_llm_json(text) == {
+        "signal": "BULLISH",
+        "reasoning": 'DXY "rolled over"\nsince May',
+        "ok": True,
+        "levels": [1, 2],
+        "note": None,
+    }
+    assert scan_json('{"a": 1}') == ('{"a":1}', False)
+
+
+def test_brace_in_preamble_is_skipped():
+    """Test a candidate that is not JSON is skipped for the next one after it"""
+    assert parse_llm_json('Here is {the} result: {"a": 1}') == {"a": 1}
+    assert parse_llm_json("Here is {the} result: {'a': 1,}") == {"a": 1}
+    assert scan_json('Here is {the} result: {"a": 1}') == ('{"a":1}', False)
+    assert parse_llm_json('{"a": {"b": 1}, \'c\': 2}') == {"a": {"b": 1}, "c": 2}
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ('{"a": 1, "b": [1, 2, {"c": "cut', {"a": 1, "b": [1, 2, {"c": "cut"}]}),
+        ('{"a": 1, "b": {"c": 2}, "d', {"a": 1, "b": {"c": 2}}),
+        ('{"a": 1, "b":', {"a": 1, "b": None}),
+    ],
+)
+def test_truncated_output_is_closed(text, expected):
+    """Test output cut off by max_tokens keeps every complete member"""
+    assert parse_llm_json(text) == expected
+
+
+def test_truncated_output_must_carry_required_schema_fields():
+    """Test a cut-off response missing required output fields is rejected"""
+    with pytest.raises(JSONParseError, match="Truncated"):
+        parse_llm_json('{"signal": "bullish", "confidence": 0.7, "rea', schema=MacroAnalysisOutput)
+
+    data = parse_llm_json(
+        '{"signal": "bullish", "confidence": 0.7, "reasoning": "DXY rolled ov',
+        expected_fields=["signal", "confidence", "reasoning"],
+        schema=MacroAnalysisOutput,
+    )
+    assert data["reasoning"] == "DXY rolled ov"
+
+
+def test_schema_coerces_values_without_building_models():
+    """Test schema-guided validation fixes enum case, numeric strings and lists"""
+    data = parse_llm_json(
+        '{"signal": "bullish", "confidence": "0.8", "score": "-40", '
+        '"key_factors": "Softer DXY", "reasoning": "x", "extra": 1}',
+        expected_fields=["signal", "confidence"],
+        schema=MacroAnalysisOutput,
+    )
+
+    assert data == {
+        "signal": "BULLISH",
+        "confidence": 0.8,
+        "score": -40.0,
+        "key_factors": ["Softer DXY"],
+        "reasoning": "x",
+        "extra": 1,
+    }
+    with pytest.raises(JSONParseError, match="score"):
+        parse_llm_json('{"signal": "bullish", "confidence": 0.75, "score": -250}', schema=MacroAnalysisOutput)
+    with pytest.raises(JSONParseError, match="confidence"):
+        parse_llm_json('{"signal": "bullish", "confidence": 75}', schema=MacroAnalysisOutput)
+    with pytest.raises(JSONParseError, match="signal"):
+        parse_llm_json('{"signal": "MAYBE"}', schema=MacroAnalysisOutput)
+    with pytest.raises(JSONParseError, match="decision_phase"):
+        parse_llm_json(
+            '{"task_breakdown": {"analysis_phase": []}, "execution_strategy": {}, "reasoning": "x"}',
+            schema=PlanningAgentOutput,
+        )
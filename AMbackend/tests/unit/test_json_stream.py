@@ -0,0 +1,48 @@
+"""Unit tests for incremental JSON field extraction"""
+
+import json
+
+from app.utils.json_stream import JsonFieldStreamer
+
+
+def _feed_all(streamer, text, size):
+    return [streamer.feed(text[i:i + size]) for i in range(0, len(text), size)]
+
+
+def test_answer_streams_before_document_completes():
+    """Test answer text is decoded chunk by chunk, escapes included"""
+    document = json.dumps(
+        {
+            "summary": "s",
+            "answer": 'Line "one"\nLine two é \U0001f680 \\ end',
+            "key_insights": ["answer"],
+            "confidence": 0.7,
+        }
+    )
+
+    for size in (1, 3, 7, len(document)):
+        streamer = JsonFieldStreamer("answer")
+        deltas = _feed_all(streamer, "```json\n" + document + "\n```", size)
+
+        assert streamer.value == 'Line "one"\nLine two é \U0001f680 \\ end'
+        assert "".join(deltas) == streamer.value
+        assert streamer.done
+
+
+def test_partial_answer_available_mid_stream():
+    """Test text is emitted before the closing quote and brace arrive"""
+    streamer = JsonFieldStreamer("answer")
+
+    assert streamer.feed('{"answer": "Hel') == "Hel"
+    assert streamer.feed("lo\\") == "lo"
+    assert streamer.feed('nworld') == "\nworld"
+    assert not streamer.done
+
+
+def test_nested_and_non_string_fields_ignored():
+    """Test only the top-level string field is captured"""
+    streamer = JsonFieldStreamer("answer")
+    streamer.feed('{"metadata": {"answer": "nested"}, "answer_count": 2, "answer": 5}')
+
+    assert streamer.value == ""
+    assert not streamer.done
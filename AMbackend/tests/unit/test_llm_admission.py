@@ -0,0 +1,88 @@
+"""Unit tests for LLM admission control"""
+
+import asyncio
+from contextlib import aclosing
+
+from app.schemas.llm import Message
+from app.services.llm import manager as manager_module
+from app.services.llm.admission import AdmissionController, LLMPriority, _Limiter, llm_priority
+from app.services.llm.stub import StubLLMProvider, StubProfile
+
+
+def _controller(concurrency, tpm=0):
+    controller = AdmissionController()
+    controller._limits_for = lambda provider, model: (concurrency, tpm)
+    return controller
+
+
+async def test_waiters_admitted_by_lane_then_fifo():
+    """Test trading requests jump ahead of queued research requests"""
+    controller = _controller(concurrency=1)
+    holder = await controller.acquire("openrouter", "m", tokens=10)
+    order = []
+
+    async def request(name, lane):
+        with llm_priority(lane):
+            permit = await controller.acquire("openrouter", "m", tokens=10)
+        order.append(name)
+        permit.release(10)
+
+    tasks = [
+        asyncio.create_task(request("research-1", LLMPriority.RESEARCH)),
+        asyncio.create_task(request("research-2", LLMPriority.RESEARCH)),
+        asyncio.create_task(request("trading", LLMPriority.TRADING)),
+    ]
+    await asyncio.sleep(0.01)
+    holder.release(10)
+    await asyncio.gather(*tasks)
+
+    assert order == ["trading", "research-1", "research-2"]
+    lanes = controller.stats()["openrouter:m"]["lanes"]
+    assert lanes["research"]["queued"] == 2
+    assert lanes["trading"]["admitted"] == 1
+
+
+async def test_cancelled_waiter_does_not_leak_slot():
+    """Test a cancelled waiter is skipped and the slot goes to the next one"""
+    controller = _controller(concurrency=1)
+    holder = await controller.acquire("tuzi", "m", tokens=1)
+
+    cancelled = asyncio.create_task(controller.acquire("tuzi", "m", tokens=1))
+    waiting = asyncio.create_task(controller.acquire("tuzi", "m", tokens=1))
+    await asyncio.sleep(0.01)
+    cancelled.cancel()
+    holder.release()
+
+    permit = await asyncio.wait_for(waiting, timeout=1)
+    assert controller.stats()["tuzi:m"]["in_flight"] == 1
+    permit.release()
+    assert controller.stats()["tuzi:m"]["in_flight"] == 0
+
+
+def test_tpm_window_uses_reported_usage():
+    """Test the TPM budget blocks until usage leaves the window"""
+    limiter = _Limiter(concurrency=0, tpm=1000)
+
+    reservation = limiter.admit(800, now=0.0)
+    assert not limiter.can_admit(300, now=1.0)
+
+    reservation[1] = 500.0  # actual usage lower than estimated
+    assert limiter.can_admit(300, now=1.0)
+    assert limiter.can_admit(900, now=61.0)
+
+
+async def test_closed_stream_releases_permit(monkeypatch):
+    """Test closing a stream early frees its admission slot without waiting for GC"""
+    controller = _controller(concurrency=1)
+    monkeypatch.setattr(manager_module, "admission_controller", controller)
+    monkeypatch.setattr(manager_module.settings, "LLM_ADMISSION_ENABLED", True)
+    manager = manager_module.LLMManager()
+    manager.use_stub(StubLLMProvider(StubProfile(ttfb_seconds=0.001, ttfb_sigma=0.0, tokens_per_second=1e6)))
+
+    async with aclosing(
+        manager.chat_stream_for_agent("general_analysis_agent", [Message(role="user", content="q")])
+    ) as stream:
+        await anext(stream)
+        assert controller.stats()["stub:general_analysis_agent"]["in_flight"] == 1
+
+    assert controller.stats()["stub:general_analysis_agent"]["in_flight"] == 0
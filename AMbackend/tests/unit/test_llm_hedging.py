@@ -0,0 +1,98 @@
+"""Unit tests for latency histograms and hedged LLM requests"""
+
+import asyncio
+
+import pytest
+
+from app.schemas.llm import LLMResponse
+from app.services.llm.latency import LatencyHistogram
+from app.services.llm.manager import LLMManager
+
+
+def _call(content, delay=0.0, error=None, started=None):
+    async def call():
+        if started is not None:
+            started.append(content)
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        return LLMResponse(content=content, model="m", provider="openrouter")
+
+    return call
+
+
+def test_histogram_percentiles():
+    """Test percentiles fall in the bucket holding the quantile"""
+    histogram = LatencyHistogram()
+    for _ in range(95):
+        histogram.record(2.0)
+    for _ in range(5):
+        histogram.record(40.0)
+
+    assert 2.0 <= histogram.percentile(0.5) < 2.5
+    assert 2.0 <= histogram.percentile(0.95) < 2.5
+    assert 40.0 <= histogram.percentile(0.99) < 50.0
+
+
+async def test_fast_primary_skips_backup():
+    """Test no hedge is sent when the primary answers within the delay"""
+    started = []
+    response = await LLMManager()._hedged_chat(
+        "ta_agent", _call("primary", started=started), _call("backup", started=started), delay=0.5
+    )
+
+    assert response.content == "primary"
+    assert started == ["primary"]
+
+
+async def test_slow_primary_loses_to_backup():
+    """Test the backup wins after the hedge delay and the primary is cancelled"""
+    response = await LLMManager()._hedged_chat(
+        "ta_agent", _call("primary", delay=5), _call("backup", delay=0.01), delay=0.02
+    )
+
+    assert response.content == "backup"
+    assert response.metadata["hedge"] == "backup_won"
+
+
+async def test_primary_error_fails_over_and_both_errors_raise():
+    """Test an early primary failure starts the backup; double failure raises the primary error"""
+    manager = LLMManager()
+
+    response = await manager._hedged_chat(
+        "macro_agent", _call("p", error=RuntimeError("429")), _call("backup"), delay=5
+    )
+    assert response.content == "backup"
+
+    with pytest.raises(RuntimeError, match="429"):
+        await manager._hedged_chat(
+            "macro_agent", _call("p", error=RuntimeError("429")), _call("", delay=0.01), delay=5
+        )
+
+
+async def test_losing_request_unwinds_before_return():
+    """Test the cancelled request has finished its cleanup when the winner is returned"""
+    cleaned_up = []
+
+    async def slow_primary():
+        try:
+            await asyncio.sleep(5)
+        finally:
+            await asyncio.sleep(0)
+            cleaned_up.append("primary")
+
+    response = await LLMManager()._hedged_chat(
+        "ta_agent", slow_primary, _call("backup", delay=0.01), delay=0.02
+    )
+
+    assert response.content == "backup"
+    assert cleaned_up == ["primary"]
+
+
+def test_fallback_max_tokens_capped_at_model_limit():
+    """Test the hedge fallback never asks for more than its model's output limit"""
+    fallback = LLMManager().get_agent_config("macro_agent")["fallback"]
+
+    assert LLMManager._fallback_max_tokens(fallback, 200000) == fallback["max_tokens"]
+    assert LLMManager._fallback_max_tokens(fallback, 2048) == 2048
+    assert LLMManager._fallback_max_tokens({}, 200000) == 200000
@@ -0,0 +1,92 @@
+"""Unit tests for the agent LLM response cache"""
+
+from app.schemas.llm import LLMResponse, Message
+from app.services.llm import manager as manager_module
+from app.services.llm.manager import LLMManager
+from app.services.llm.response_cache import LLMResponseCache, cache_key, normalize_prompt
+from app.utils.json_parser import json_validator
+
+
+def _response(content="ok"):
+    return LLMResponse(
+        content=content,
+        model="anthropic/claude-sonnet-4.5",
+        provider="openrouter",
+        usage={"prompt_tokens": 900, "completion_tokens": 100, "total_tokens": 1000},
+    )
+
+
+def test_fingerprint_buckets_numbers_and_timestamps():
+    """Test fingerprint mode ignores timestamps and sub-bucket numeric noise"""
+    a = "BTC price: 64321.98\n  RSI  41.27 at 2026-10-19T10:00:00Z, ema_20 ok"
+    b = "BTC price: 64349.02 RSI 41.31 at 2026-10-19T10:10:00Z, ema_20 ok"
+
+    assert normalize_prompt(a) != normalize_prompt(b)
+    assert normalize_prompt(a, 3) == normalize_prompt(b, 3)
+    assert "ema_20" in normalize_prompt(a, 3)
+    assert normalize_prompt("RSI 41.27", 3) != normalize_prompt("RSI 48.9", 3)
+
+
+def test_fingerprint_buckets_numbers_next_to_cjk_text():
+    """Test numbers written against Chinese characters are bucketed too"""
+    a = "BTC价格64321.98美元，资金费率0.0102%，恐慌贪婪指数41"
+    b = "BTC价格64349.02美元，资金费率0.01021%，恐慌贪婪指数41"
+
+    assert normalize_prompt(a, 3) == normalize_prompt(b, 3)
+    assert normalize_prompt(a, 3) == "BTC价格6.43e+04美元，资金费率0.0102%，恐慌贪婪指数41"
+
+
+def test_key_depends_on_signature_and_messages():
+    """Test model/temperature changes produce different keys"""
+    messages = [Message(role="user", content="analyze")]
+    signature = {"model": "m", "temperature": 0.6}
+
+    assert cache_key("ta_agent", signature, messages) == cache_key("ta_agent", dict(signature), messages)
+    assert cache_key("ta_agent", signature, messages) != cache_key(
+        "ta_agent", {**signature, "temperature": 1.0}, messages
+    )
+    assert cache_key("ta_agent", signature, messages) != cache_key("macro_agent", signature, messages)
+
+
+async def test_hits_misses_and_cost_saved():
+    """Test hits are counted with tokens and cost saved, expired entries miss"""
+    cache = LLMResponseCache(max_entries=2)
+
+    assert await cache.get("macro_agent", "k1") is None
+    await cache.set("macro_agent", "k1", _response(), ttl_seconds=60, cost_usd=0.0042)
+
+    hit = await cache.get("macro_agent", "k1")
+    assert hit.content == "ok"
+    assert hit.metadata["cache_hit"] is True
+
+    await cache.set("macro_agent", "k2", _response(), ttl_seconds=0)
+    assert await cache.get("macro_agent", "k2") is None
+
+    stats = cache.stats()["agents"]["macro_agent"]
+    assert (stats["hits"], stats["misses"], stats["stores"]) == (1, 2, 1)
+    assert stats["tokens_saved"] == 1000
+    assert abs(stats["cost_saved_usd"] - 0.0042) < 1e-9
+
+
+async def test_only_usable_replies_are_cached(monkeypatch):
+    """Test truncated or unparseable replies are returned but not cached"""
+    monkeypatch.setattr(manager_module, "llm_response_cache", LLMResponseCache(max_entries=8))
+    manager = LLMManager()
+    replies = [
+        LLMResponse(content='{"signal": "BULL', model="m", provider="stub", metadata={"finish_reason": "length"}),
+        LLMResponse(content="Sorry, I cannot help", model="m", provider="stub"),
+        LLMResponse(content='{"signal": "BULLISH"}', model="m", provider="stub"),
+    ]
+
+    async def chat_for_agent(agent_name, messages, max_tokens=None, **kwargs):
+        return replies.pop(0)
+
+    monkeypatch.setattr(manager, "_chat_for_agent", chat_for_agent)
+    messages = [Message(role="user", content="data")]
+    validate = json_validator(["signal"])
+
+    contents = [
+        (await manager.chat_for_agent("macro_agent", messages, validate=validate)).content for _ in range(4)
+    ]
+
+    assert contents == ['{"signal": "BULL', "Sorry, I cannot help", '{"signal": "BULLISH"}', '{"signal": "BULLISH"}']
@@ -0,0 +1,50 @@
+"""Unit tests for the offline stub LLM provider"""
+
+import httpx
+import pytest
+
+from app.schemas.agents import RegimeFilterOutput, TAMomentumOutput
+from app.schemas.llm import Message
+from app.schemas.research import PlanningAgentOutput, SuperAgentOutput
+from app.services.llm.manager import LLMManager, ProviderType
+from app.services.llm.stub import CANNED_RESPONSES, StubLLMProvider, StubProfile
+from app.utils.json_parser import parse_llm_json
+
+FAST = dict(ttfb_seconds=0.001, ttfb_sigma=0.0, tokens_per_second=1e6)
+
+
+def test_canned_responses_match_output_schemas():
+    """Test canned agent responses validate against the agents' output schemas"""
+    RegimeFilterOutput(**CANNED_RESPONSES["regime_filter_agent"])
+    TAMomentumOutput(**CANNED_RESPONSES["ta_momentum_agent"])
+    SuperAgentOutput(**CANNED_RESPONSES["super_agent"])
+    PlanningAgentOutput(**CANNED_RESPONSES["planning_agent"])
+
+
+async def test_stub_mode_routes_agents_to_canned_json():
+    """Test agent calls in stub mode return the agent's canned JSON with usage"""
+    manager = LLMManager()
+    stub = manager.use_stub(StubLLMProvider(StubProfile(**FAST)))
+
+    response = await manager.chat_for_agent(
+        "regime_filter_agent",
+        [Message(role="system", content="rules"), Message(role="user", content="market data")],
+        use_cache=False,
+    )
+
+    assert manager.get_agent_config("macro_agent")["provider"] == ProviderType.STUB
+    assert response.provider == "stub"
+    assert parse_llm_json(response.content) == CANNED_RESPONSES["regime_filter_agent"]
+    assert response.usage["completion_tokens"] > 0
+    assert stub.stats()["regime_filter_agent"]["calls"] == 1
+
+
+async def test_stub_injects_http_errors():
+    """Test error injection raises provider-like HTTP errors and counts them"""
+    stub = StubLLMProvider(StubProfile(error_rate=1.0, seed=7, **FAST))
+
+    with pytest.raises(httpx.HTTPStatusError) as exc_info:
+        await stub.chat([Message(role="user", content="hi")], model="macro_agent")
+
+    assert exc_info.value.response.status_code in StubLLMProvider.ERROR_STATUSES
+    assert stub.stats()["macro_agent"]["errors"] == 1
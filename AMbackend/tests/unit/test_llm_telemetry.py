@@ -0,0 +1,86 @@
+"""Unit tests for per-call LLM telemetry and the daily cost budget"""
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.schemas.llm import Message
+from app.services.llm import manager as manager_module
+from app.services.llm.admission import LLMPriority
+from app.services.llm.manager import LLMManager
+from app.services.llm.stub import StubLLMProvider, StubProfile
+from app.services.llm.telemetry import LLMCallRecord, LLMTelemetry, percentile
+
+FAST = dict(ttfb_seconds=0.001, ttfb_sigma=0.0, tokens_per_second=1e6)
+
+
+def _record(agent="macro_agent", latency=1.0, cost=0.0, error=None):
+    return LLMCallRecord(
+        agent_name=agent,
+        provider="openrouter",
+        model="anthropic/claude-sonnet-4.5",
+        latency_seconds=latency,
+        ttfb_seconds=latency / 2,
+        prompt_tokens=1000,
+        completion_tokens=200,
+        cost_usd=cost,
+        error=error,
+    )
+
+
+def test_summary_reports_percentiles_and_spend_per_agent():
+    """Test the ring summary groups calls per agent/model with latency percentiles"""
+    telemetry = LLMTelemetry(ring_size=100, rollup_seconds=60)
+    for i in range(1, 101):
+        telemetry.record(_record(latency=i / 10, cost=0.01))
+    telemetry.record(_record(agent="ta_agent", error="HTTPStatusError"))
+
+    summary = telemetry.summary()
+    by_agent = {row["agent_name"]: row for row in summary["by_agent_model"]}
+
+    assert percentile([3.0, 1.0, 2.0], 0.5) == 2.0
+    assert summary["calls_in_ring"] == 100  # oldest call evicted
+    assert by_agent["macro_agent"]["calls"] == 99
+    assert by_agent["macro_agent"]["latency_p50_ms"] == 5100.0
+    assert by_agent["macro_agent"]["latency_p99_ms"] == 10000.0
+    assert by_agent["macro_agent"]["cost_usd"] == pytest.approx(0.99)
+    assert by_agent["ta_agent"]["error_rate"] == 1.0
+    assert by_agent["ta_agent"]["latency_p95_ms"] is None
+
+
+def test_budget_alerts_once_per_level_and_throttles_non_trading(monkeypatch):
+    """Test warning/exceeded alerts fire once per day and only non-trading lanes throttle"""
+    monkeypatch.setattr(settings, "DAILY_COST_ALERT_THRESHOLD", 1.0)
+    monkeypatch.setattr(settings, "ENABLE_COST_ALERTS", True)
+    telemetry = LLMTelemetry(ring_size=100, rollup_seconds=60)
+
+    telemetry.record(_record(cost=0.85))
+    telemetry.record(_record(cost=0.01))
+    assert telemetry.budget_status()["level"] == "warning"
+    assert not telemetry.should_throttle(LLMPriority.DEFAULT)
+
+    telemetry.record(_record(cost=0.2))
+    assert telemetry.budget_status()["level"] == "exceeded"
+    assert [alert["severity"] for alert in telemetry._pending_alerts] == ["warning", "critical"]
+    assert telemetry.should_throttle(LLMPriority.DEFAULT)
+    assert not telemetry.should_throttle(LLMPriority.TRADING)
+    assert telemetry.budget_status()["throttled_requests"] == 1
+
+
+async def test_manager_records_agent_calls_and_failures(monkeypatch):
+    """Test LLMManager records successful and failed provider calls with the agent name"""
+    telemetry = LLMTelemetry(ring_size=100, rollup_seconds=60)
+    monkeypatch.setattr(manager_module, "llm_telemetry", telemetry)
+    manager = LLMManager()
+    manager.use_stub(StubLLMProvider(StubProfile(**FAST)))
+
+    await manager.chat_for_agent("macro_agent", [Message(role="user", content="data")], use_cache=False)
+    manager.use_stub(StubLLMProvider(StubProfile(error_rate=1.0, **FAST)))
+    with pytest.raises(httpx.HTTPStatusError):
+        await manager.chat_for_agent("macro_agent", [Message(role="user", content="data")], use_cache=False)
+
+    row = telemetry.summary()["by_agent_model"][0]
+    assert (row["agent_name"], row["provider"], row["model"]) == ("macro_agent", "stub", "macro_agent")
+    assert row["calls"] == 2 and row["errors"] == 1
+    assert row["ttfb_p50_ms"] is not None
+    assert row["completion_tokens"] > 0
@@ -0,0 +1,42 @@
+"""Unit tests for the log tail reader and indexed log store"""
+
+import logging
+
+from app.services.monitoring.log_store import LogStore
+from app.services.monitoring.log_tail import tail_lines
+
+
+def test_tail_lines_reads_from_end(tmp_path):
+    """Test the last N lines are returned across chunk boundaries"""
+    log_file = tmp_path / "backend.log"
+    log_file.write_text("".join(f"2026-10-19 08:00:00,000 INFO line {i}\n" for i in range(1000)))
+
+    lines = tail_lines(log_file, 3, chunk_size=64)
+
+    assert lines == [f"2026-10-19 08:00:00,000 INFO line {i}" for i in (997, 998, 999)]
+    assert len(tail_lines(log_file, 5000)) == 1000
+
+
+def test_log_store_filters_by_level_window_and_component():
+    """Test queries filter on level, time window and logger-name prefix"""
+    store = LogStore(":memory:")
+
+    def record(name, level, created, msg):
+        rec = logging.LogRecord(name, level, __file__, 1, msg, None, None)
+        rec.created = created
+        return rec
+
+    store.append_many([
+        record("app.services.strategy.scheduler", logging.ERROR, 100.0, "job failed"),
+        record("app.services.strategy.scheduler", logging.INFO, 110.0, "job ok"),
+        record("app.services.llm.manager", logging.WARNING, 120.0, "slow provider"),
+        record("app.services.strategy.orchestrator", logging.WARNING, 200.0, "late"),
+    ])
+
+    assert [r["message"] for r in store.query(min_level=logging.WARNING)] == [
+        "late", "slow provider", "job failed",
+    ]
+    assert [r["message"] for r in store.query(since=90, until=150)] == ["slow provider", "job failed"]
+    assert [r["message"] for r in store.query(component="app.services.strategy")] == ["late", "job failed"]
+
+    assert store.prune(before=150) == 3
@@ -0,0 +1,105 @@
+"""Unit tests for the marketplace list cache"""
+
+from app.schemas.strategy import StrategyMarketplaceCard
+from app.services.strategy.marketplace_service import MarketplaceService
+
+
+def _card(card_id: str) -> StrategyMarketplaceCard:
+    return StrategyMarketplaceCard(
+        id=card_id,
+        name=f"Strategy {card_id}",
+        subtitle="Multi-Agent Strategy",
+        description="",
+        tags=[],
+        annualized_return=10.0,
+        max_drawdown=5.0,
+        sharpe_ratio=1.0,
+        pool_size=10000.0,
+        total_pnl=0.0,
+        squad_size=3,
+        risk_level="low",
+        history=[],
+        is_active=True,
+        deployed_at="2026-01-01T00:00:00",
+    )
+
+
+async def test_marketplace_list_served_from_cache():
+    """Test repeated list requests reuse the cached cards"""
+    service = MarketplaceService()
+    calls = []
+
+    async def build(db, user_id, risk_level, sort_by):
+        calls.append(sort_by)
+        return [(1, _card("a")), (2, _card("b"))]
+
+    service._build_marketplace_cards = build
+
+    first = await service.get_marketplace_list(db=None, sort_by="return")
+    second = await service.get_marketplace_list(db=None, sort_by="return")
+
+    assert calls == ["return"]
+    assert [c.id for c in first.strategies] == [c.id for c in second.strategies]
+
+    await service.get_marketplace_list(db=None, sort_by="tvl")
+    assert calls == ["return", "tvl"]
+
+
+async def test_marketplace_cache_invalidation():
+    """Test invalidate_marketplace_cache forces a rebuild"""
+    service = MarketplaceService()
+    builds = 0
+
+    async def build(db, user_id, risk_level, sort_by):
+        nonlocal builds
+        builds += 1
+        return [(1, _card("a"))]
+
+    service._build_marketplace_cards = build
+
+    await service.get_marketplace_list(db=None)
+    service.invalidate_marketplace_cache()
+    await service.get_marketplace_list(db=None)
+
+    assert builds == 2
+
+
+async def test_marketplace_current_user_flags_not_cached():
+    """Test current-user flags are applied per request without touching cached cards"""
+    service = MarketplaceService()
+
+    async def build(db, user_id, risk_level, sort_by):
+        return [(1, _card("a")), (2, _card("b"))]
+
+    service._build_marketplace_cards = build
+
+    mine = await service.get_marketplace_list(db=None, current_user_id=2)
+    anonymous = await service.get_marketplace_list(db=None)
+
+    assert [c.user_activated for c in mine.strategies] == [False, True]
+    assert mine.strategies[1].activated_portfolio_id == "b"
+    assert not any(c.user_activated for c in anonymous.strategies)
+    assert all(c.activated_portfolio_id is None for c in anonymous.strategies)
+
+
+async def test_execution_count_cache_is_bounded():
+    """Test per-portfolio execution counts are evicted least recently used first"""
+    service = MarketplaceService()
+    service.EXECUTION_COUNT_CACHE_MAX_ENTRIES = 2
+    queries = []
+
+    class Result:
+        def scalar_one(self):
+            return 7
+
+    class DB:
+        async def execute(self, stmt):
+            queries.append(stmt)
+            return Result()
+
+    db = DB()
+    for portfolio_id in ("p1", "p2", "p1", "p3"):
+        assert await service._get_execution_count(db, portfolio_id) == 7
+
+    assert list(service._execution_count_cache) == ["p1", "p3"]
+    assert len(queries) == 3
@@ -0,0 +1,43 @@
+"""Unit tests for incremental equity-curve analytics"""
+
+import math
+import statistics
+
+import pytest
+
+from app.services.trading.performance_analytics import EquityCurveState, PERIODS_PER_YEAR
+
+
+def test_max_drawdown_tracks_running_peak():
+    """Test max drawdown is measured from the running peak"""
+    state = EquityCurveState()
+    for value in [100, 120, 90, 110, 130, 104]:
+        state.update(value)
+
+    assert state.peak_value == 130
+    assert state.max_drawdown == pytest.approx(25.0)
+
+
+def test_welford_matches_batch_statistics():
+    """Test streaming mean/std match a full recomputation"""
+    values = [1000, 1010, 1005, 1020, 990, 1030, 1040]
+    state = EquityCurveState()
+    for value in values:
+        state.update(value)
+
+    returns = [b / a - 1 for a, b in zip(values, values[1:])]
+    assert state.returns_count == len(returns)
+    assert state.returns_mean == pytest.approx(statistics.mean(returns))
+    assert state.returns_std == pytest.approx(statistics.stdev(returns))
+    assert state.sharpe_ratio == pytest.approx(
+        statistics.mean(returns) / statistics.stdev(returns) * math.sqrt(PERIODS_PER_YEAR)
+    )
+
+
+def test_sharpe_undefined_without_variance():
+    """Test Sharpe is None until there are at least two returns"""
+    state = EquityCurveState()
+    state.update(100)
+    state.update(101)
+
+    assert state.sharpe_ratio is None
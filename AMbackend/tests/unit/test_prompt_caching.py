@@ -0,0 +1,46 @@
+"""Unit tests for provider-side prompt caching"""
+
+from app.schemas.llm import Message
+from app.services.llm.openrouter import OpenRouterProvider
+from app.services.llm.tuzi import TuziProvider
+
+MESSAGES = [
+    Message(role="system", content="static instructions", cache_control=True),
+    Message(role="user", content="market data"),
+]
+
+
+def test_openrouter_marks_system_block_for_anthropic_models():
+    """Test cache_control is sent for Anthropic models only"""
+    provider = OpenRouterProvider(api_key="k")
+
+    claude = provider._build_payload(MESSAGES, "anthropic/claude-sonnet-4.5", 0.6, None)
+    assert claude["messages"][0]["content"] == [
+        {"type": "text", "text": "static instructions", "cache_control": {"type": "ephemeral"}}
+    ]
+    assert claude["messages"][1] == {"role": "user", "content": "market data"}
+
+    gpt = provider._build_payload(MESSAGES, "openai/gpt-4o-mini", 0.3, None)
+    assert gpt["messages"][0] == {"role": "system", "content": "static instructions"}
+
+
+def test_tuzi_claude_moves_system_to_top_level_block():
+    """Test the Messages API payload carries the system prompt as a cached block"""
+    payload = TuziProvider(api_key="k")._claude_payload(MESSAGES, "claude-sonnet-4-5-thinking-all", 0.6, None)
+
+    assert payload["system"] == [
+        {"type": "text", "text": "static instructions", "cache_control": {"type": "ephemeral"}}
+    ]
+    assert payload["messages"] == [{"role": "user", "content": "market data"}]
+
+
+def test_cost_discounts_cache_reads():
+    """Test cached prompt tokens are billed at the cache-read ratio"""
+    provider = OpenRouterProvider(api_key="k")
+    usage = provider._build_usage(prompt_tokens=10_000, completion_tokens=0, cache_read_tokens=8_000)
+
+    cost = provider.calculate_cost("anthropic/claude-sonnet-4.5", usage)
+
+    # 2000 uncached + 8000 * 0.1 at $3 / 1M input tokens
+    assert abs(cost - 2_800 * 3.0 / 1_000_000) < 1e-12
+    assert usage["total_tokens"] == 10_000
@@ -0,0 +1,41 @@
+"""Tests for the compact agent prompt encoder"""
+
+from app.services.llm.prompt_encoder import PromptEncoder, encode_table, estimate_tokens, fmt_number
+
+
+def test_fmt_number_keeps_significant_digits():
+    """Test numbers are rounded by magnitude without truncating the whole part"""
+    assert fmt_number(64321.98) == "64322"
+    assert fmt_number(41.273) == "41.27"
+    assert fmt_number(0.000123456) == "0.0001235"
+    assert fmt_number(2.50) == "2.5"
+    assert fmt_number(None) == "-"
+    assert fmt_number(float("nan")) == "-"
+
+
+def test_encode_table_drops_and_hoists_columns():
+    """Test all-missing columns are dropped and constant columns hoisted"""
+    rows = [
+        {"asset": "BTC", "price": 64321.98, "funding": 0.01, "oi": None},
+        {"asset": "ETH", "price": 2461.537, "funding": 0.01, "oi": None},
+    ]
+
+    text = encode_table(rows, ["asset", "price", "funding", "oi"])
+
+    assert text.splitlines() == ["funding=0.01", "asset|price", "BTC|64322", "ETH|2462"]
+
+
+def test_prompt_encoder_drops_lowest_priority_over_budget():
+    """Test sections beyond the token budget are omitted by priority"""
+    long_body = " ".join(["12345.6"] * 200)
+    encoder = PromptEncoder(budget_tokens=60)
+    encoder.add("price", "btc=64322", priority=0)
+    encoder.add("15m", long_body, priority=2)
+    encoder.add("60m", "rsi14=55.1", priority=1)
+
+    text = encoder.render()
+
+    assert "## price" in text and "## 60m" in text
+    assert "## 15m" not in text
+    assert text.endswith("(omitted for length: 15m)")
+    assert estimate_tokens(text) <= 60
@@ -0,0 +1,58 @@
+"""Unit tests for the orjson serialization layer"""
+
+import json
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+
+from app.core.serialization import ORJSONResponse, dumps, to_jsonable
+from app.schemas.agents import SignalType
+from app.schemas.base import UTCAwareBaseModel
+
+
+def test_to_jsonable_matches_legacy_snapshot_format():
+    """Test datetime/Decimal/tuple conversion keeps the stored JSONB format"""
+    executed_at = datetime(2026, 10, 19, 8, 30, 15, 123456)
+    snapshot = {
+        "timestamp": executed_at,
+        "btc_price": Decimal("64321.98"),
+        "range": (1, 2),
+        "signal": SignalType.BULLISH,
+        1: "int key",
+    }
+
+    assert to_jsonable(snapshot) == {
+        "timestamp": executed_at.isoformat(),
+        "btc_price": 64321.98,
+        "range": [1, 2],
+        "signal": SignalType.BULLISH.value,
+        "1": "int key",
+    }
+
+
+def test_dumps_handles_numpy_and_uuid():
+    """Test NumPy values and UUIDs serialize without a Python walk"""
+    execution_id = uuid.uuid4()
+    payload = {"id": execution_id, "ema": np.array([1.5, 2.5]), "rsi": np.float64(55.0)}
+
+    assert json.loads(dumps(payload)) == {"id": str(execution_id), "ema": [1.5, 2.5], "rsi": 55.0}
+
+
+def test_orjson_response_renders_compact_utf8():
+    """Test the default response class renders compact UTF-8 JSON"""
+    response = ORJSONResponse({"name": "动量策略", "value": Decimal("1.5")})
+
+    assert response.body == '{"name":"动量策略","value":1.5}'.encode("utf-8")
+
+
+class _Stamped(UTCAwareBaseModel):
+    created_at: datetime
+
+
+def test_models_keep_their_utc_encoders():
+    """Test naive UTC datetimes in UTCAwareBaseModel go out with an offset, as via jsonable_encoder"""
+    model = _Stamped(created_at=datetime(2026, 10, 19, 8, 30))
+
+    assert json.loads(dumps({"item": model})) == {"item": {"created_at": "2026-10-19T08:30:00+00:00"}}
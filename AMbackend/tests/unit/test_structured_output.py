@@ -0,0 +1,129 @@
+"""Unit tests for structured output via forced tool calls"""
+
+import httpx
+import pytest
+
+from app.agents.macro_agent import MacroAgent
+from app.agents.ta_agent import TAAgent
+from app.schemas.llm import LLMResponse, Message
+from app.services.llm.base import LLMProvider
+from app.services.llm.manager import LLMManager, ProviderType
+from app.services.llm.openrouter import OpenRouterProvider
+from app.services.llm.structured_output import claude_tool_input, openai_tool_arguments
+from app.services.llm.tuzi import TuziProvider
+
+MESSAGES = [Message(role="system", content="rules"), Message(role="user", content="data")]
+
+
+def test_output_tool_schema_is_self_contained():
+    """Test agent tools inline nested models and require only the agent's fields"""
+    tool = TAAgent.OUTPUT_TOOL
+    parameters = tool["parameters"]
+
+    assert tool["name"] == "submit_technical_analysis"
+    assert parameters["required"] == TAAgent.OUTPUT_FIELDS
+    assert "key_patterns" in parameters["properties"]
+    assert "$ref" not in str(parameters) and "title" not in str(parameters)
+    assert parameters["properties"]["signal"]["enum"] == ["BULLISH", "BEARISH", "NEUTRAL"]
+
+
+def test_provider_payloads_force_the_tool_call():
+    """Test OpenRouter and Tuzi (Claude) payloads carry the tool and drop response_format"""
+    tool = MacroAgent.OUTPUT_TOOL
+    openrouter = OpenRouterProvider(api_key="k")._build_payload(
+        MESSAGES,
+        "anthropic/claude-sonnet-4.5",
+        0.5,
+        1024,
+        response_format={"type": "json_object"},
+        structured_output=tool,
+    )
+    claude = TuziProvider(api_key="k")._claude_payload(
+        MESSAGES, "claude-sonnet-4-5", 0.5, 1024, structured_output=tool
+    )
+
+    assert "response_format" not in openrouter
+    assert openrouter["tool_choice"] == {"type": "function", "function": {"name": tool["name"]}}
+    assert openrouter["tools"][0]["function"]["parameters"] == tool["parameters"]
+    assert claude["tool_choice"] == {"type": "tool", "name": tool["name"]}
+    assert claude["tools"][0]["input_schema"] == tool["parameters"]
+
+    message = {"tool_calls": [{"function": {"name": tool["name"], "arguments": '{"signal": "BULLISH"}'}}]}
+    assert openai_tool_arguments(message) == '{"signal": "BULLISH"}'
+    assert claude_tool_input([{"type": "text", "text": "x"}, {"type": "tool_use", "input": {"a": 1}}]) == {
+        "a": 1
+    }
+
+
+class ToolRejectingProvider(LLMProvider):
+    """Provider rejecting tool calls with HTTP 400, like Claude with extended thinking"""
+
+    def __init__(self, error="tool_choice is not supported with extended thinking", prompt_mode_error=None):
+        super().__init__(api_key="k", base_url="https://example.test")
+        self.error = error
+        self.prompt_mode_error = prompt_mode_error
+        self.calls = []
+
+    async def chat(self, messages, model, temperature=0.7, max_tokens=None, **kwargs):
+        structured = "structured_output" in kwargs
+        self.calls.append(structured)
+        error = self.error if structured else self.prompt_mode_error
+        if error:
+            request = httpx.Request("POST", self.base_url)
+            response = httpx.Response(400, request=request, json={"error": {"message": error}})
+            raise httpx.HTTPStatusError(error, request=request, response=response)
+        return LLMResponse(content='{"signal": "NEUTRAL"}', model=model, provider="openrouter")
+
+    async def chat_stream(self, messages, model, temperature=0.7, max_tokens=None, **kwargs):
+        yield ""
+
+    def get_available_models(self):
+        return []
+
+
+async def test_rejected_tool_call_falls_back_to_prompt_mode():
+    """Test a 400 on the tool call retries in prompt mode and later calls skip the tool"""
+    manager = LLMManager()
+    provider = ToolRejectingProvider()
+    manager.providers[ProviderType.OPENROUTER] = provider
+
+    for _ in range(2):
+        response = await manager.chat(
+            MESSAGES,
+            provider=ProviderType.OPENROUTER,
+            model="claude-thinking",
+            structured_output=MacroAgent.OUTPUT_TOOL,
+        )
+        assert response.content == '{"signal": "NEUTRAL"}'
+
+    assert provider.calls == [True, False, False]
+    assert ("openrouter", "claude-thinking") in manager.prompt_mode_models
+
+
+async def test_prompt_mode_is_remembered_only_after_a_successful_retry():
+    """Test non-tool 400s are not retried and a failed retry or expiry resets prompt mode"""
+    manager = LLMManager()
+    kwargs = dict(provider=ProviderType.OPENROUTER, model="m", structured_output=MacroAgent.OUTPUT_TOOL)
+
+    provider = manager.providers[ProviderType.OPENROUTER] = ToolRejectingProvider(
+        error="prompt is too long: 210000 tokens > 200000 maximum"
+    )
+    with pytest.raises(httpx.HTTPStatusError):
+        await manager.chat(MESSAGES, **kwargs)
+    assert provider.calls == [True]
+
+    provider = manager.providers[ProviderType.OPENROUTER] = ToolRejectingProvider(
+        prompt_mode_error="max_tokens: 200000 > 64000"
+    )
+    with pytest.raises(httpx.HTTPStatusError):
+        await manager.chat(MESSAGES, **kwargs)
+    assert provider.calls == [True, False]
+    assert not manager.prompt_mode_models
+
+    manager.providers[ProviderType.OPENROUTER] = ToolRejectingProvider()
+    await manager.chat(MESSAGES, **kwargs)
+    assert manager._in_prompt_mode("openrouter", "m")
+    # Expired entries are dropped and the tool call is tried again
+    manager.prompt_mode_models[("openrouter", "m")] = 0.0
+    assert not manager._in_prompt_mode("openrouter", "m")
+    assert not manager.prompt_mode_models